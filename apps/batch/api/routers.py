@@ -27,6 +27,7 @@ from .viewsets.container_availability import ContainerAvailabilityViewSet
 from .viewsets.workflow_creation import BatchCreationWorkflowViewSet
 from .viewsets.workflow_creation_action import CreationActionViewSet
 from .viewsets.forecast_viewset import ForecastViewSet
+from .viewsets.recompute_scheduler import RecomputeSchedulerViewSet
 
 # Create a router and register our viewsets with it
 router = DefaultRouter()
@@ -54,5 +55,8 @@ router.register(r'history/growth-samples', GrowthSampleHistoryViewSet, basename=
 # Register forecast endpoints
 router.register(r'forecast', ForecastViewSet, basename='batch-forecast')
 
+# Register recompute scheduler metrics
+router.register(r'recompute-scheduler', RecomputeSchedulerViewSet, basename='recompute-scheduler')
+
 # The API URLs are determined automatically by the router
 urlpatterns = router.urls
@@ -3,12 +3,15 @@ Serializer for the Batch model.
 
 This serializer handles the conversion between JSON and Django model instances
 for batch data, including calculated fields for population, biomass, and average weight.
+Calculated fields are read from the denormalised BatchLiveState row, so a
+queryset with ``select_related('live_state')`` serializes without per-row queries.
 """
 from datetime import date, timedelta
 from rest_framework import serializers
 from apps.batch.models import Batch
 from apps.batch.api.serializers.utils import format_decimal, validate_date_order
 from apps.batch.api.serializers.base import BatchBaseSerializer
+from apps.batch.services.live_state import BatchLiveStateService
 from drf_spectacular.utils import extend_schema_field
 
 
@@ -22,7 +25,7 @@ class BatchSerializer(BatchBaseSerializer):
     """
 
     species_name = serializers.CharField(source='species.name', read_only=True, help_text="Name of the species associated with this batch (read-only).")
-    calculated_population_count = serializers.IntegerField(read_only=True, help_text="Total current population count for this batch, calculated from active assignments (read-only).")
+    calculated_population_count = serializers.SerializerMethodField(help_text="Total current population count for this batch, calculated from active assignments (read-only).")
     calculated_biomass_kg = serializers.SerializerMethodField(help_text="Total current biomass in kilograms for this batch, calculated from active assignments and formatted to two decimal places (read-only).")
     calculated_avg_weight_g = serializers.SerializerMethodField(help_text="Current average weight in grams for individuals in this batch, calculated from active assignments and formatted to two decimal places (read-only).")
     current_lifecycle_stage = serializers.SerializerMethodField(help_text="The current lifecycle stage of the batch (ID, name, order), determined by the latest active assignment (read-only).")
@@ -89,13 +92,12 @@ class BatchSerializer(BatchBaseSerializer):
         # Returned dict contains id(int), name(str), order(int)
         # Using JSONField for flexible but typed representation
         # (alternative would be DictField with explicit children but JSONField is simpler here)
-        latest_assignment = obj.batch_assignments.filter(
-            is_active=True).order_by('-assignment_date').first()
-        if latest_assignment and latest_assignment.lifecycle_stage:
+        stage = BatchLiveStateService.for_batch(obj).current_lifecycle_stage
+        if stage:
             return {
-                'id': latest_assignment.lifecycle_stage.id,
-                'name': latest_assignment.lifecycle_stage.name,
-                'order': latest_assignment.lifecycle_stage.order
+                'id': stage.id,
+                'name': stage.name,
+                'order': stage.order
             }
         return None
 
@@ -109,21 +111,22 @@ class BatchSerializer(BatchBaseSerializer):
     @extend_schema_field(serializers.ListField(child=serializers.IntegerField()))
     def get_active_containers(self, obj):
         """Get a list of active container IDs for this batch."""
-        active_assignments = obj.batch_assignments.filter(is_active=True)
-        return [
-            assignment.container.id
-            for assignment in active_assignments if assignment.container
-        ]
+        return list(BatchLiveStateService.for_batch(obj).active_container_ids)
+
+    @extend_schema_field(serializers.IntegerField())
+    def get_calculated_population_count(self, obj):
+        """Get the total population of active assignments."""
+        return BatchLiveStateService.for_batch(obj).population_count
 
     @extend_schema_field(serializers.FloatField())
     def get_calculated_biomass_kg(self, obj):
         """Get the calculated biomass in kilograms, formatted."""
-        return format_decimal(obj.calculated_biomass_kg)
+        return format_decimal(BatchLiveStateService.for_batch(obj).biomass_kg)
 
     @extend_schema_field(serializers.FloatField())
     def get_calculated_avg_weight_g(self, obj):
         """Get the calculated average weight in grams, formatted."""
-        return format_decimal(obj.calculated_avg_weight_g)
+        return format_decimal(BatchLiveStateService.for_batch(obj).avg_weight_g)
 
     def create(self, validated_data):
         """Create a new batch instance."""
@@ -15,3 +15,4 @@ from .assignments import BatchContainerAssignmentViewSet
 from .composition import BatchCompositionViewSet
 from .growth import GrowthSampleViewSet
 from .forecast_viewset import ForecastViewSet
+from .recompute_scheduler import RecomputeSchedulerViewSet
@@ -15,14 +15,12 @@ from django_filters.rest_framework import DjangoFilterBackend
 from aquamind.api.mixins import RBACFilterMixin
 from aquamind.api.permissions import IsOperator
 from aquamind.utils.history_mixins import HistoryReasonMixin
+from aquamind.utils.aggregate_cache import cache_aggregate, TAG_ASSIGNMENTS, TAG_MORTALITY
 
 from rest_framework.authentication import TokenAuthentication
 from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.permissions import IsAuthenticated
 
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
-
 from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
 from drf_spectacular.types import OpenApiTypes
 
@@ -452,7 +450,7 @@ class BatchContainerAssignmentViewSet(RBACFilterMixin, HistoryReasonMixin, Locat
         },
     )
     @action(detail=False, methods=['get'])
-    @method_decorator(cache_page(30))
+    @cache_aggregate(30, tags=(TAG_ASSIGNMENTS, TAG_MORTALITY))
     def summary(self, request):
         """
         Return aggregated metrics about batch-container assignments with optional location filtering.
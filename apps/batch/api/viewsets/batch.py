@@ -87,20 +87,16 @@ class BatchViewSet(RBACFilterMixin, HistoryReasonMixin, BatchAnalyticsMixin, Geo
     ]
     enable_operator_location_filtering = True  # Phase 2: Fine-grained operator filtering
 
-    queryset = Batch.objects.annotate(
-        _calculated_population_count=Sum(
-            'batch_assignments__population_count',
-            filter=Q(batch_assignments__is_active=True)
-        ),
-        _calculated_biomass_kg=Sum(
-            'batch_assignments__biomass_kg',
-            filter=Q(batch_assignments__is_active=True)
-        ),
-        # Use a simple annotation for avg_weight_g filtering - exact calculation is in model property
-        _calculated_avg_weight_g=Sum(
-            'batch_assignments__avg_weight_g',
-            filter=Q(batch_assignments__is_active=True)
-        )
+    # Current metrics come from the denormalised BatchLiveState row (one join,
+    # no per-row aggregates); the annotations keep BatchFilter's range filters.
+    queryset = Batch.objects.select_related(
+        'species',
+        'live_state',
+        'live_state__current_lifecycle_stage',
+    ).annotate(
+        _calculated_population_count=F('live_state__population_count'),
+        _calculated_biomass_kg=F('live_state__biomass_kg'),
+        _calculated_avg_weight_g=F('live_state__avg_weight_g'),
     ).distinct()
     serializer_class = BatchSerializer
     filterset_class = BatchFilter
@@ -25,6 +25,7 @@ from apps.batch.models import (
     Batch, BatchContainerAssignment, ActualDailyAssignmentState,
     ContainerForecastSummary,
 )
+from apps.batch.services.live_state import BatchLiveStateService
 from apps.scenario.models import ScenarioProjection, ProjectionRun
 from apps.planning.models import PlannedActivity
 from apps.infrastructure.models import Geography
@@ -349,7 +350,7 @@ class ForecastViewSet(viewsets.ViewSet):
         total_biomass_tonnes = 0
         days_to_harvest_list = []
         
-        for batch in batches.select_related('species', 'lifecycle_stage'):
+        for batch in batches.select_related('species', 'lifecycle_stage', 'live_state'):
             species_thresholds = get_threshold_for_species(thresholds, batch.species.name)
             target_weight = species_thresholds.get('target_weight_g', 5000)
             
@@ -386,7 +387,7 @@ class ForecastViewSet(viewsets.ViewSet):
             facility = self._get_facility_name(batch)
             
             # Get current biomass
-            current_biomass = float(batch.calculated_biomass_kg) if batch.calculated_biomass_kg else 0
+            current_biomass = float(BatchLiveStateService.for_batch(batch).biomass_kg)
             total_biomass_tonnes += current_biomass / 1000
             
             # Get planned activity
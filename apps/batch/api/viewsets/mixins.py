@@ -14,6 +14,7 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
 from apps.batch.models import GrowthSample, MortalityEvent
+from apps.batch.services.live_state import BatchLiveStateService
 from rest_framework.exceptions import ValidationError
 
 
@@ -382,7 +383,7 @@ class BatchAnalyticsMixin:
             batch_growth = {
                 'batch_id': batch.id,
                 'batch_number': batch.batch_number,
-                'current_avg_weight_g': float(batch.calculated_avg_weight_g),
+                'current_avg_weight_g': float(BatchLiveStateService.for_batch(batch).avg_weight_g),
             }
 
             if first_sample and last_sample and first_sample != last_sample:
@@ -427,7 +428,9 @@ class BatchAnalyticsMixin:
 
             # Calculate mortality rate
             if mortality_data['total_count']:
-                initial_population = batch.calculated_population_count + mortality_data['total_count']
+                initial_population = (
+                    BatchLiveStateService.for_batch(batch).population_count + mortality_data['total_count']
+                )
                 batch_mortality['mortality_rate'] = round(
                     (mortality_data['total_count'] / initial_population) * 100, 2
                 )
@@ -443,6 +446,7 @@ class BatchAnalyticsMixin:
         biomass_metrics = []
 
         for batch in batches:
+            live_state = BatchLiveStateService.for_batch(batch)
             # Get container assignments
             assignments = batch.batch_assignments.filter(is_active=True)
 
@@ -458,13 +462,13 @@ class BatchAnalyticsMixin:
             batch_biomass = {
                 'batch_id': batch.id,
                 'batch_number': batch.batch_number,
-                'current_biomass_kg': float(batch.calculated_biomass_kg),
-                'population_count': batch.calculated_population_count,
+                'current_biomass_kg': float(live_state.biomass_kg),
+                'population_count': live_state.population_count,
             }
 
             # Add density if we have container volume
             if containers_with_volume > 0:
-                avg_density = batch.calculated_biomass_kg / total_volume
+                avg_density = live_state.biomass_kg / total_volume
                 batch_biomass['avg_density_kg_m3'] = round(float(avg_density), 2)
 
             biomass_metrics.append(batch_biomass)
@@ -693,12 +697,11 @@ class GeographyAggregationMixin:
         """Calculate aggregated growth metrics across batches."""
         import math
 
-        # Calculate aggregate metrics from batches (always available)
-        total_biomass = sum(
-            float(b.calculated_biomass_kg) for b in batches
-        )
+        # Calculate aggregate metrics from the batches' live state
+        live_states = [BatchLiveStateService.for_batch(b) for b in batches]
+        total_biomass = sum(float(state.biomass_kg) for state in live_states)
         total_population = sum(
-            b.calculated_population_count for b in batches
+            state.population_count for state in live_states
         )
         avg_weight = (
             (total_biomass * 1000 / total_population)
@@ -804,14 +807,18 @@ class GeographyAggregationMixin:
         total_biomass = total_mortality['total_biomass'] or 0
 
         # Calculate average mortality rate across batches
+        mortality_by_batch = dict(
+            mortality_events.order_by().values('batch_id').annotate(
+                total=Sum('count')
+            ).values_list('batch_id', 'total')
+        )
         batch_mortality_rates = []
         for batch in batches:
-            batch_mortality = batch.mortality_events.aggregate(
-                total=Sum('count')
-            )['total'] or 0
+            batch_mortality = mortality_by_batch.get(batch.id) or 0
             if batch_mortality > 0:
                 initial_pop = (
-                    batch.calculated_population_count + batch_mortality
+                    BatchLiveStateService.for_batch(batch).population_count
+                    + batch_mortality
                 )
                 if initial_pop > 0:
                     rate = (batch_mortality / initial_pop) * 100
@@ -7,6 +7,7 @@ from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
 
 from aquamind.utils.history_mixins import HistoryReasonMixin
+from aquamind.utils.pagination import KeysetPagination
 
 from rest_framework.authentication import TokenAuthentication
 from rest_framework_simplejwt.authentication import JWTAuthentication
@@ -54,6 +55,7 @@ class MortalityEventViewSet(HistoryReasonMixin, viewsets.ModelViewSet):
     search_fields = ['batch__batch_number', 'description']
     ordering_fields = ['event_date', 'batch__batch_number', 'count', 'created_at']
     ordering = ['-event_date']
+    pagination_class = KeysetPagination
 
     def list(self, request, *args, **kwargs):
         return super().list(request, *args, **kwargs)
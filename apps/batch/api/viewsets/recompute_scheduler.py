@@ -0,0 +1,82 @@
+"""
+Recompute scheduler viewset.
+
+Exposes the growth assimilation recompute scheduler's queue depth, lag,
+merge ratio and failed marks
+(apps.batch.services.recompute_scheduler.scheduler_stats).
+"""
+from rest_framework import viewsets
+from rest_framework.exceptions import ValidationError
+from rest_framework.permissions import IsAuthenticated
+from rest_framework.response import Response
+
+from drf_spectacular.utils import extend_schema, OpenApiParameter, OpenApiResponse
+from drf_spectacular.types import OpenApiTypes
+
+from apps.batch.services.recompute_scheduler import scheduler_stats
+from aquamind.api.permissions import IsOperator
+
+
+class RecomputeSchedulerViewSet(viewsets.ViewSet):
+    """
+    Read-only metrics for the growth assimilation recompute scheduler.
+
+    Uses an inline response schema instead of a serializer, like
+    ForecastViewSet.
+    """
+    permission_classes = [IsAuthenticated, IsOperator]
+    serializer_classes = {}
+
+    @extend_schema(
+        operation_id="recomputeschedulerviewset_list",
+        summary="Get recompute scheduler queue metrics",
+        description=(
+            "Returns the growth assimilation recompute queue: pending dirty marks "
+            "(queue depth), marks in flight, the age of the oldest open mark (lag), "
+            "how many marks each dispatched task merged over a recent window "
+            "(merge ratio) and the marks given up after too many dispatches."
+        ),
+        parameters=[
+            OpenApiParameter(
+                name="window_hours",
+                type=OpenApiTypes.INT,
+                location=OpenApiParameter.QUERY,
+                description="Hours of dispatch history for the merge ratio (default 24)",
+                required=False,
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(
+                response={
+                    "type": "object",
+                    "properties": {
+                        "queue_depth": {"type": "integer"},
+                        "queue_depth_active_batches": {"type": "integer"},
+                        "pending_assignments": {"type": "integer"},
+                        "in_flight_marks": {"type": "integer"},
+                        "in_flight_tasks": {"type": "integer"},
+                        "stale_marks": {"type": "integer"},
+                        "failed_marks": {"type": "integer"},
+                        "last_failed_at": {"type": "string", "format": "date-time", "nullable": True},
+                        "oldest_open_mark_at": {"type": "string", "format": "date-time", "nullable": True},
+                        "lag_seconds": {"type": "number"},
+                        "window_hours": {"type": "integer"},
+                        "dispatched_marks": {"type": "integer"},
+                        "dispatched_tasks": {"type": "integer"},
+                        "merge_ratio": {"type": "number", "nullable": True},
+                    },
+                },
+                description="Recompute scheduler metrics",
+            ),
+        },
+    )
+    def list(self, request):
+        """Get recompute scheduler queue metrics."""
+        window_hours = request.query_params.get('window_hours', '24')
+        try:
+            window_hours = int(window_hours)
+        except ValueError:
+            raise ValidationError({'window_hours': 'Must be an integer'})
+        if window_hours < 1:
+            raise ValidationError({'window_hours': 'Must be at least 1'})
+        return Response(scheduler_stats(window_hours=window_hours))
@@ -0,0 +1,103 @@
+"""
+Management command to rebuild the BatchLiveState read model.
+
+The live-state table is maintained from BatchContainerAssignment signals.
+This command recomputes it from the assignments, for use after bulk imports
+that bypass signals (bulk_create / queryset update) or to repair drift.
+
+Usage:
+    # Rebuild every batch
+    python manage.py rebuild_batch_live_state
+
+    # Specific batches only
+    python manage.py rebuild_batch_live_state --batch-id 12 --batch-id 15
+
+    # Only batches without a live-state row
+    python manage.py rebuild_batch_live_state --missing
+
+    # Report rows that differ from a fresh computation without writing
+    python manage.py rebuild_batch_live_state --check
+"""
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.batch.models import Batch, BatchLiveState
+from apps.batch.services.live_state import BatchLiveStateService
+
+COMPARED_FIELDS = (
+    'population_count',
+    'avg_weight_g',
+    'biomass_kg',
+    'current_lifecycle_stage_id',
+    'active_container_ids',
+)
+
+
+class Command(BaseCommand):
+    help = "Rebuild the denormalised batch live-state table from active assignments"
+
+    def add_arguments(self, parser):
+        """Add command arguments."""
+        parser.add_argument(
+            '--batch-id',
+            type=int,
+            action='append',
+            dest='batch_ids',
+            help='Rebuild this batch only (repeatable)',
+        )
+        parser.add_argument(
+            '--check',
+            action='store_true',
+            help='Only report batches whose stored live state is stale',
+        )
+        parser.add_argument(
+            '--missing',
+            action='store_true',
+            help='Only create rows for batches that have no live state',
+        )
+
+    def handle(self, *args, **options):
+        batch_ids = options.get('batch_ids')
+        if batch_ids:
+            missing = set(batch_ids) - set(
+                Batch.objects.filter(id__in=batch_ids).values_list('id', flat=True)
+            )
+            if missing:
+                raise CommandError(f"Batch(es) not found: {', '.join(map(str, sorted(missing)))}")
+
+        if options['check']:
+            self._check(batch_ids)
+            return
+
+        started = time.monotonic()
+        if options['missing']:
+            if batch_ids:
+                raise CommandError("--missing cannot be combined with --batch-id")
+            states = BatchLiveStateService.rebuild_missing()
+        else:
+            states = BatchLiveStateService.rebuild(batch_ids)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt live state for {len(states)} batch(es) in {time.monotonic() - started:.2f}s"
+        ))
+
+    def _check(self, batch_ids):
+        ids = batch_ids or list(Batch.objects.order_by('id').values_list('id', flat=True))
+        stored = BatchLiveState.objects.in_bulk(ids)
+        stale = []
+        for start in range(0, len(ids), BatchLiveStateService.REBUILD_CHUNK_SIZE):
+            chunk = ids[start:start + BatchLiveStateService.REBUILD_CHUNK_SIZE]
+            for fresh in BatchLiveStateService.compute(chunk):
+                current = stored.get(fresh.batch_id)
+                if current is None or any(
+                    getattr(current, field) != getattr(fresh, field) for field in COMPARED_FIELDS
+                ):
+                    stale.append(fresh.batch_id)
+
+        if stale:
+            self.stdout.write(self.style.WARNING(
+                f"{len(stale)} of {len(ids)} batch(es) have stale live state: "
+                f"{', '.join(map(str, stale[:50]))}{' ...' if len(stale) > 50 else ''}"
+            ))
+        else:
+            self.stdout.write(self.style.SUCCESS(f"Live state is current for {len(ids)} batch(es)"))
@@ -0,0 +1,159 @@
+"""
+Load test: replay concurrent dynamic FW→Sea handoffs.
+
+Creates a throwaway test database for the configured backend, builds
+synthetic dynamic transfer workflows from the batch test fixtures and
+replays them from concurrent workers through build_execution_context,
+start_dynamic_handoff, TransferAction.complete_handoff and
+complete_dynamic (aquamind/benchmarks/handoff_replay.py). Reports
+throughput, deadlocks, lock timeouts, lock waits (PostgreSQL) and
+per-step latency.
+
+The workload is fixed by --seed; compare runs with the same arguments
+before and after an index or transaction-scope change. SQLite serializes
+writers, so run against PostgreSQL (default settings) for realistic
+contention; under SQLite the test database is a file so workers get
+their own connections, and lock upgrades fail fast with "database is
+locked" (raise --retries there).
+
+Recompute signals are skipped during the replay unless
+--recompute-signals is given (they need a Celery broker).
+
+Usage:
+    python manage.py replay_handoffs --workflows 32 --concurrency 8
+    python manage.py replay_handoffs --rings 4 --output /tmp/handoffs.json
+    python manage.py replay_handoffs --settings=aquamind.settings_ci --workflows 4 --retries 8
+"""
+import contextlib
+import json
+import os
+import tempfile
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from aquamind.benchmarks.dataset import _skip_recompute_signals
+from aquamind.benchmarks.handoff_replay import STEPS, build_handoff_fixtures, replay_handoffs
+
+
+class Command(BaseCommand):
+    help = "Replay concurrent dynamic FW->Sea handoffs and report throughput, lock waits and latency"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--workflows', type=int, default=16, help='Workflows to replay (default: 16)')
+        parser.add_argument('--concurrency', type=int, default=4, help='Concurrent workers (default: 4)')
+        parser.add_argument('--loads', type=int, default=2, help='Wellboat loads per workflow (default: 2)')
+        parser.add_argument(
+            '--rings', type=int, help='Sea rings shared round-robin (default: one per workflow)'
+        )
+        parser.add_argument('--seed', type=int, default=42, help='Random seed (default: 42)')
+        parser.add_argument(
+            '--retries', type=int, default=3, help='Retries per deadlocked step (default: 3)'
+        )
+        parser.add_argument(
+            '--sample-ms', type=int, default=50, help='Lock wait sampling interval (default: 50)'
+        )
+        parser.add_argument(
+            '--recompute-signals', action='store_true', help='Keep growth recompute signals enabled'
+        )
+        parser.add_argument('--output', help='Also write the report as JSON to this path')
+
+    def handle(self, *args, **options):
+        for name in ('workflows', 'concurrency', 'loads', 'sample_ms'):
+            if options[name] < 1:
+                raise CommandError(f"--{name.replace('_', '-')} must be positive")
+        if options['rings'] is not None and options['rings'] < 1:
+            raise CommandError("--rings must be positive")
+
+        verbosity = options['verbosity']
+        with tempfile.TemporaryDirectory() as directory:
+            if connection.vendor == 'sqlite':
+                # File database: in-memory test databases share one connection cache
+                connection.settings_dict.setdefault('TEST', {})['NAME'] = os.path.join(
+                    directory, 'handoff_replay.sqlite3'
+                )
+            setup_test_environment()
+            try:
+                old_config = setup_databases(verbosity, interactive=False)
+                try:
+                    report = self._run(options)
+                finally:
+                    teardown_databases(old_config, verbosity)
+            finally:
+                teardown_test_environment()
+
+        self._report(report, options)
+
+    def _run(self, options):
+        self.stdout.write(
+            f"Building {options['workflows']} dynamic workflow(s) x {options['loads']} load(s) "
+            f"on {connection.vendor} (seed {options['seed']})..."
+        )
+        plans = build_handoff_fixtures(
+            workflows=options['workflows'],
+            loads=options['loads'],
+            rings=options['rings'],
+            seed=options['seed'],
+        )
+        self.stdout.write(f"Replaying with {options['concurrency']} worker(s)...")
+        signals = contextlib.nullcontext() if options['recompute_signals'] else _skip_recompute_signals()
+        with signals:
+            return replay_handoffs(
+                plans,
+                concurrency=options['concurrency'],
+                retries=options['retries'],
+                sample_interval_ms=options['sample_ms'],
+            )
+
+    def _report(self, report, options):
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump(report, handle, indent=2)
+
+        self.stdout.write(
+            f"  {report['workflows_completed']}/{report['workflows']} workflows, "
+            f"{report['handoffs_completed']} handoffs in {report['wall_seconds']:.2f} s "
+            f"({report['handoffs_per_second']:.2f} handoffs/s)"
+        )
+        self.stdout.write(
+            f"  deadlocks={report['deadlocks']} lock_timeouts={report['lock_timeouts']} "
+            f"retries={report['retries']} server_deadlocks={report['server_deadlocks']}"
+        )
+        self.stdout.write(
+            f"  {'step':<28}{'count':>6}{'ok':>6}{'fail':>6}{'p50 ms':>10}{'p95 ms':>10}"
+            f"{'max ms':>10}{'lock wait s':>13}"
+        )
+        for step in STEPS:
+            metrics = report['steps'].get(step)
+            if not metrics:
+                continue
+            lock_wait = '-' if metrics['lock_wait_s'] is None else f"{metrics['lock_wait_s']:.3f}"
+            self.stdout.write(
+                f"  {step:<28}{metrics['count']:>6}{metrics['ok']:>6}"
+                f"{metrics['count'] - metrics['ok']:>6}{metrics['p50_ms']:>10.1f}"
+                f"{metrics['p95_ms']:>10.1f}{metrics['max_ms']:>10.1f}{lock_wait:>13}"
+            )
+
+        lock_waits = report['lock_waits']
+        if lock_waits:
+            self.stdout.write(
+                f"  lock waits: {lock_waits['wait_seconds']:.3f} s over {lock_waits['samples']} "
+                f"samples, max {lock_waits['max_waiters']} waiting"
+            )
+            for statement in lock_waits['top_statements']:
+                self.stdout.write(f"    {statement['samples']:>5}  {statement['query']}")
+        for error in report['errors']:
+            self.stdout.write(self.style.WARNING(f"  {error}"))
+
+        if report['workflows_completed'] == report['workflows']:
+            self.stdout.write(self.style.SUCCESS("All workflows completed"))
+        else:
+            self.stdout.write(self.style.ERROR(
+                f"{report['workflows'] - report['workflows_completed']} workflow(s) aborted"
+            ))
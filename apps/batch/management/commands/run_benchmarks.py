@@ -0,0 +1,138 @@
+"""
+Query-budget and latency regression benchmarks for hot endpoints and engines.
+
+Creates a throwaway test database for the configured backend (SQLite under
+aquamind.settings_ci, PostgreSQL under aquamind.settings), seeds the
+deterministic benchmark dataset with the scripts/data_generation bootstrap
+and event engine, then measures every hot path in aquamind.benchmarks:
+query count, median wall time and peak traced memory.
+
+Results are compared with the committed baseline for the database vendor
+(aquamind/benchmarks/baselines/<vendor>.json). With ``--check`` the command
+exits non-zero when a metric regresses beyond its threshold; wall-time limits
+are machine dependent, so ``--skip-timing`` limits the check to query counts
+and memory.
+
+Usage:
+    python manage.py run_benchmarks --settings=aquamind.settings_ci --check
+    python manage.py run_benchmarks --only batch_list --only forecast_harvest
+    python manage.py run_benchmarks --update-baselines
+"""
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test.utils import (
+    setup_databases,
+    setup_test_environment,
+    teardown_databases,
+    teardown_test_environment,
+)
+
+from aquamind.benchmarks import harness
+from aquamind.benchmarks.dataset import seed_dataset
+from aquamind.benchmarks.hot_paths import BenchmarkError
+
+
+class Command(BaseCommand):
+    help = "Benchmark hot endpoints and engines against committed query/latency baselines"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--batches', type=int, default=2, help='Batches to simulate (default: 2)')
+        parser.add_argument('--days', type=int, default=180, help='Days simulated per batch (default: 180)')
+        parser.add_argument('--seed', type=int, default=42, help='Base random seed (default: 42)')
+        parser.add_argument('--repeat', type=int, default=5, help='Timed runs per hot path (default: 5)')
+        parser.add_argument('--only', action='append', metavar='NAME', help='Benchmark only this hot path (repeatable)')
+        parser.add_argument('--check', action='store_true', help='Exit non-zero on regressions')
+        parser.add_argument('--update-baselines', action='store_true', help='Write results to the baseline file')
+        parser.add_argument('--skip-timing', action='store_true', help='Do not check wall time')
+        parser.add_argument('--query-threshold', type=float, default=harness.DEFAULT_THRESHOLDS['queries'])
+        parser.add_argument('--time-threshold', type=float, default=harness.DEFAULT_THRESHOLDS['wall_ms'])
+        parser.add_argument('--memory-threshold', type=float, default=harness.DEFAULT_THRESHOLDS['peak_kb'])
+        parser.add_argument('--output', help='Also write the results as JSON to this path')
+        parser.add_argument('--keepdb', action='store_true', help='Reuse the test database if it exists')
+
+    def handle(self, *args, **options):
+        if options['batches'] < 1 or options['days'] < 1 or options['repeat'] < 1:
+            raise CommandError("--batches, --days and --repeat must be positive")
+        try:
+            paths = harness.select_hot_paths(options['only'])
+        except KeyError as exc:
+            raise CommandError(exc.args[0])
+
+        verbosity = options['verbosity']
+        setup_test_environment()
+        try:
+            old_config = setup_databases(verbosity, interactive=False, keepdb=options['keepdb'])
+            try:
+                with transaction.atomic():
+                    dataset, results = self._run(paths, options)
+                    transaction.set_rollback(True)
+            finally:
+                teardown_databases(old_config, verbosity, keepdb=options['keepdb'])
+        finally:
+            teardown_test_environment()
+
+        self._report(dataset, results, options)
+
+    def _run(self, paths, options):
+        self.stdout.write(
+            f"Seeding {options['batches']} batch(es) x {options['days']} days "
+            f"on {connection.vendor} (seed {options['seed']})..."
+        )
+        dataset = seed_dataset(
+            batches=options['batches'],
+            days=options['days'],
+            seed=options['seed'],
+            verbose=options['verbosity'] > 1,
+        )
+        results = {}
+        for path in paths:
+            try:
+                results[path.name] = harness.measure(path, dataset, options['repeat'])
+            except BenchmarkError as exc:
+                raise CommandError(f"{path.name}: {exc}")
+            metrics = results[path.name]
+            self.stdout.write(
+                f"  {path.name:<28}{metrics['queries']:>6} queries"
+                f"{metrics['wall_ms']:>11.1f} ms{metrics['peak_kb']:>11.1f} KB"
+            )
+        return dataset, results
+
+    def _report(self, dataset, results, options):
+        if options['output']:
+            with open(options['output'], 'w') as handle:
+                json.dump({'dataset': dataset.params, 'results': results}, handle, indent=2)
+
+        path = harness.baseline_path()
+        if options['update_baselines']:
+            harness.write_baseline(path, dataset, results)
+            self.stdout.write(self.style.SUCCESS(f"Baselines written to {path}"))
+            return
+
+        baseline = harness.load_baseline(path)
+        if baseline is None:
+            self.stdout.write(self.style.WARNING(f"No baseline at {path}; run with --update-baselines"))
+            return
+        if baseline['dataset'] != dataset.params:
+            raise CommandError(
+                f"Baseline dataset {baseline['dataset']} differs from this run's {dataset.params}"
+            )
+
+        metrics = [m for m in harness.METRICS if not (options['skip_timing'] and m == 'wall_ms')]
+        regressions = harness.compare(
+            results,
+            baseline['results'],
+            thresholds={
+                'queries': options['query_threshold'],
+                'wall_ms': options['time_threshold'],
+                'peak_kb': options['memory_threshold'],
+            },
+            metrics=metrics,
+        )
+        for regression in regressions:
+            self.stdout.write(self.style.ERROR(f"  REGRESSION {regression}"))
+        if regressions and options['check']:
+            raise CommandError(f"{len(regressions)} benchmark regression(s) against {path.name}")
+        if not regressions:
+            self.stdout.write(self.style.SUCCESS(f"No regressions against {path.name}"))
@@ -0,0 +1,127 @@
+# Generated by Django 4.2.11 on 2026-10-18 22:16
+
+from decimal import Decimal
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+def backfill_live_state(apps, schema_editor):
+    """Populate one live-state row per existing batch from its active assignments."""
+    from collections import defaultdict
+
+    Batch = apps.get_model("batch", "Batch")
+    Assignment = apps.get_model("batch", "BatchContainerAssignment")
+    BatchLiveState = apps.get_model("batch", "BatchLiveState")
+
+    by_batch = defaultdict(list)
+    rows = (
+        Assignment.objects.filter(is_active=True)
+        .order_by("batch_id", "-assignment_date", "-id")
+        .values_list(
+            "batch_id", "container_id", "lifecycle_stage_id",
+            "population_count", "avg_weight_g", "biomass_kg",
+        )
+    )
+    for row in rows.iterator(chunk_size=5000):
+        by_batch[row[0]].append(row)
+
+    states = []
+    for batch_id in Batch.objects.values_list("id", flat=True).iterator(chunk_size=5000):
+        assignments = by_batch.get(batch_id, [])
+        population = sum(row[3] for row in assignments)
+        weighted = [(row[3], row[4]) for row in assignments if row[3] > 0 and row[4] is not None]
+        weighted_population = sum(count for count, _ in weighted)
+        avg_weight = (
+            (sum(Decimal(count) * Decimal(str(weight)) for count, weight in weighted)
+             / Decimal(weighted_population)).quantize(Decimal("0.000001"))
+            if weighted_population
+            else Decimal("0")
+        )
+        states.append(
+            BatchLiveState(
+                batch_id=batch_id,
+                population_count=population,
+                avg_weight_g=avg_weight,
+                biomass_kg=sum((Decimal(str(row[5] or 0)) for row in assignments), Decimal("0")).quantize(Decimal("0.01")),
+                current_lifecycle_stage_id=assignments[0][2] if assignments else None,
+                active_container_ids=[row[1] for row in assignments],
+            )
+        )
+    BatchLiveState.objects.bulk_create(states, batch_size=1000)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("batch", "0051_drop_legacy_batchtransfer_tables"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="BatchLiveState",
+            fields=[
+                (
+                    "batch",
+                    models.OneToOneField(
+                        help_text="Batch this state belongs to",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        primary_key=True,
+                        related_name="live_state",
+                        serialize=False,
+                        to="batch.batch",
+                    ),
+                ),
+                (
+                    "population_count",
+                    models.BigIntegerField(
+                        default=0,
+                        help_text="Sum of population_count over active assignments",
+                    ),
+                ),
+                (
+                    "avg_weight_g",
+                    models.DecimalField(
+                        decimal_places=6,
+                        default=Decimal("0"),
+                        help_text="Population-weighted average weight over active assignments",
+                        max_digits=16,
+                    ),
+                ),
+                (
+                    "biomass_kg",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=Decimal("0.00"),
+                        help_text="Sum of biomass_kg over active assignments",
+                        max_digits=16,
+                    ),
+                ),
+                (
+                    "active_container_ids",
+                    models.JSONField(
+                        blank=True,
+                        default=list,
+                        help_text="Container ids of active assignments, most recent assignment first",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                (
+                    "current_lifecycle_stage",
+                    models.ForeignKey(
+                        blank=True,
+                        help_text="Lifecycle stage of the most recent active assignment",
+                        null=True,
+                        on_delete=django.db.models.deletion.SET_NULL,
+                        related_name="+",
+                        to="batch.lifecyclestage",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Batch Live State",
+                "verbose_name_plural": "Batch Live States",
+                "db_table": "batch_batchlivestate",
+            },
+        ),
+        migrations.RunPython(backfill_live_state, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,102 @@
+# Generated by Django 4.2.11 on 2026-10-19 03:37
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("batch", "0052_batchlivestate"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="RecomputeMark",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("start_date", models.DateField(help_text="Earliest dirty date")),
+                ("end_date", models.DateField(help_text="Latest dirty date")),
+                (
+                    "reason",
+                    models.CharField(
+                        choices=[
+                            ("growth_sample", "Growth Sample"),
+                            ("transfer", "Transfer with Measured Weight"),
+                            ("mortality", "Mortality Event"),
+                            ("treatment", "Treatment with Weighing"),
+                            ("planned_activity", "Completed Planned Activity"),
+                            ("manual", "Manual"),
+                        ],
+                        help_text="Event type that marked the window dirty",
+                        max_length=20,
+                    ),
+                ),
+                ("created_at", models.DateTimeField(auto_now_add=True)),
+                (
+                    "dispatched_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the mark was merged into a dispatched recompute task",
+                        null=True,
+                    ),
+                ),
+                (
+                    "completed_at",
+                    models.DateTimeField(
+                        blank=True,
+                        help_text="When the recompute task covering the mark finished",
+                        null=True,
+                    ),
+                ),
+                (
+                    "task_id",
+                    models.CharField(
+                        blank=True,
+                        default="",
+                        help_text="Celery task id of the recompute covering the mark",
+                        max_length=255,
+                    ),
+                ),
+                (
+                    "assignment",
+                    models.ForeignKey(
+                        help_text="Assignment whose daily states are dirty",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recompute_marks",
+                        to="batch.batchcontainerassignment",
+                    ),
+                ),
+                (
+                    "batch",
+                    models.ForeignKey(
+                        help_text="Batch (denormalized for dispatch priority)",
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="recompute_marks",
+                        to="batch.batch",
+                    ),
+                ),
+            ],
+            options={
+                "verbose_name": "Recompute Mark",
+                "verbose_name_plural": "Recompute Marks",
+                "db_table": "batch_recomputemark",
+                "ordering": ["created_at"],
+                "indexes": [
+                    models.Index(
+                        fields=["completed_at", "dispatched_at"],
+                        name="idx_recompute_mark_state",
+                    ),
+                    models.Index(fields=["task_id"], name="idx_recompute_mark_task"),
+                ],
+            },
+        ),
+    ]
@@ -0,0 +1,30 @@
+# Generated by Django 4.2.11 on 2026-10-19 07:02
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("batch", "0053_recomputemark"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="recomputemark",
+            name="attempts",
+            field=models.PositiveIntegerField(
+                default=0,
+                help_text="Number of recompute tasks the mark has been dispatched with",
+            ),
+        ),
+        migrations.AddField(
+            model_name="recomputemark",
+            name="failed_at",
+            field=models.DateTimeField(
+                blank=True,
+                help_text="When the mark was given up after RECOMPUTE_MARK_MAX_ATTEMPTS dispatches",
+                null=True,
+            ),
+        ),
+    ]
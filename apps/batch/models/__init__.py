@@ -11,6 +11,8 @@ This package contains all models related to fish batch management, including:
 - Mortality events
 - Growth samples
 - Individual growth observations
+- Batch live state (denormalised current metrics)
+- Recompute marks (dirty date windows for growth assimilation)
 """
 
 from apps.batch.models.species import Species, LifeCycleStage
@@ -27,6 +29,8 @@ from apps.batch.models.individual_growth_observation import IndividualGrowthObse
 from apps.batch.models.mix_event import BatchMixEvent, BatchMixEventComponent
 from apps.batch.models.actual_daily_state import ActualDailyAssignmentState
 from apps.batch.models.live_projection import LiveForwardProjection, ContainerForecastSummary
+from apps.batch.models.live_state import BatchLiveState
+from apps.batch.models.recompute_mark import RecomputeMark
 
 __all__ = [
     'Species',
@@ -46,4 +50,6 @@ __all__ = [
     'ActualDailyAssignmentState',
     'LiveForwardProjection',
     'ContainerForecastSummary',
+    'BatchLiveState',
+    'RecomputeMark',
 ]
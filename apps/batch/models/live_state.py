@@ -0,0 +1,66 @@
+"""
+BatchLiveState read model.
+
+One row per batch holding the batch's current state (population, weighted
+average weight, biomass, lifecycle stage and active container ids) derived
+from its active BatchContainerAssignment rows. The row is refreshed inside the
+same transaction as every assignment write (see apps.batch.signals), so batch
+list/detail endpoints can read current metrics with a join instead of running
+several aggregate queries per batch.
+
+The Batch.calculated_* properties remain the source of truth for write-path
+validation; this table is a denormalised copy that can always be rebuilt with
+``python manage.py rebuild_batch_live_state``.
+"""
+from decimal import Decimal
+from django.db import models
+
+
+class BatchLiveState(models.Model):
+    """Denormalised current state of a batch, maintained from its assignments."""
+
+    batch = models.OneToOneField(
+        'batch.Batch',
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='live_state',
+        help_text="Batch this state belongs to"
+    )
+    population_count = models.BigIntegerField(
+        default=0,
+        help_text="Sum of population_count over active assignments"
+    )
+    avg_weight_g = models.DecimalField(
+        max_digits=16,
+        decimal_places=6,
+        default=Decimal('0'),
+        help_text="Population-weighted average weight over active assignments"
+    )
+    biomass_kg = models.DecimalField(
+        max_digits=16,
+        decimal_places=2,
+        default=Decimal('0.00'),
+        help_text="Sum of biomass_kg over active assignments"
+    )
+    current_lifecycle_stage = models.ForeignKey(
+        'batch.LifeCycleStage',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name='+',
+        help_text="Lifecycle stage of the most recent active assignment"
+    )
+    active_container_ids = models.JSONField(
+        default=list,
+        blank=True,
+        help_text="Container ids of active assignments, most recent assignment first"
+    )
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = 'batch_batchlivestate'
+        verbose_name = "Batch Live State"
+        verbose_name_plural = "Batch Live States"
+
+    def __str__(self):
+        return f"Live state for batch {self.batch_id}"
@@ -0,0 +1,87 @@
+"""
+RecomputeMark: durable dirty marks for growth assimilation recompute.
+
+Operational events (growth samples, measured transfers, mortality,
+weighing treatments, completed planned activities) mark the affected
+assignment's date window dirty instead of enqueueing a Celery task each.
+The recompute scheduler (apps.batch.services.recompute_scheduler) merges
+pending marks per assignment into minimal date ranges and dispatches one
+task per assignment. Marks are written in the same transaction as the
+event, so a crashed worker or an unavailable broker loses nothing: pending
+and stale in-flight marks are picked up by the next dispatch run. A mark
+still open after RECOMPUTE_MARK_MAX_ATTEMPTS dispatches is marked failed and
+left out of further runs.
+"""
+from django.db import models
+
+
+class RecomputeMark(models.Model):
+    """A date window of one assignment whose daily states need recomputing."""
+
+    REASON_CHOICES = [
+        ('growth_sample', 'Growth Sample'),
+        ('transfer', 'Transfer with Measured Weight'),
+        ('mortality', 'Mortality Event'),
+        ('treatment', 'Treatment with Weighing'),
+        ('planned_activity', 'Completed Planned Activity'),
+        ('manual', 'Manual'),
+    ]
+
+    assignment = models.ForeignKey(
+        'batch.BatchContainerAssignment',
+        on_delete=models.CASCADE,
+        related_name='recompute_marks',
+        help_text="Assignment whose daily states are dirty"
+    )
+    batch = models.ForeignKey(
+        'batch.Batch',
+        on_delete=models.CASCADE,
+        related_name='recompute_marks',
+        help_text="Batch (denormalized for dispatch priority)"
+    )
+    start_date = models.DateField(help_text="Earliest dirty date")
+    end_date = models.DateField(help_text="Latest dirty date")
+    reason = models.CharField(
+        max_length=20,
+        choices=REASON_CHOICES,
+        help_text="Event type that marked the window dirty"
+    )
+    created_at = models.DateTimeField(auto_now_add=True)
+    dispatched_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the mark was merged into a dispatched recompute task"
+    )
+    completed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the recompute task covering the mark finished"
+    )
+    task_id = models.CharField(
+        max_length=255,
+        blank=True,
+        default='',
+        help_text="Celery task id of the recompute covering the mark"
+    )
+    attempts = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of recompute tasks the mark has been dispatched with"
+    )
+    failed_at = models.DateTimeField(
+        null=True,
+        blank=True,
+        help_text="When the mark was given up after RECOMPUTE_MARK_MAX_ATTEMPTS dispatches"
+    )
+
+    class Meta:
+        db_table = 'batch_recomputemark'
+        indexes = [
+            models.Index(fields=['completed_at', 'dispatched_at'], name='idx_recompute_mark_state'),
+            models.Index(fields=['task_id'], name='idx_recompute_mark_task'),
+        ]
+        ordering = ['created_at']
+        verbose_name = "Recompute Mark"
+        verbose_name_plural = "Recompute Marks"
+
+    def __str__(self):
+        return f"Assignment {self.assignment_id} dirty {self.start_date}..{self.end_date} ({self.reason})"
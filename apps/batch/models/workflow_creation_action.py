@@ -220,6 +220,9 @@ class CreationAction(models.Model):
             )
             # Refresh to get updated value
             self.dest_assignment.refresh_from_db()
+            # Queryset update() bypasses signals, so refresh the read model here
+            from apps.batch.services.live_state import BatchLiveStateService
+            BatchLiveStateService.refresh(self.dest_assignment.batch_id)
             
             # Mark action completed
             self.status = 'COMPLETED'
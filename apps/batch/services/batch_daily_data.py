@@ -0,0 +1,423 @@
+"""
+Batch-scoped daily inputs shared by the growth and projection engines.
+
+GrowthAssimilationEngine, OptimizedGrowthAssimilationEngine and
+LiveProjectionEngine each used to load their inputs per assignment (and the
+standard engine per day): temperatures, mortality, feeding, placements,
+weight anchors, stage constraints and lifecycle stages. ``BatchDailyData``
+loads them for *all* of a batch's assignments overlapping a date window in
+one fixed set of grouped queries and keeps them as numpy arrays indexed by
+day offset, keyed by assignment (mortality, placements) or container
+(temperature, feed).
+
+Data is shared through a ``DailyDataCache`` opened with
+``daily_data_scope()`` around a unit of work (a Celery task, a management
+command). Engines call ``get_batch_data()``; outside a scope it returns None
+and they query as before. The cache holds at most
+BATCH_DAILY_DATA_CACHE_SIZE batches (least recently used are evicted), so
+fleet-wide jobs stay bounded. Inputs are not refreshed within a scope, which
+is why scopes should not outlive one task.
+
+Usage:
+    with daily_data_scope():
+        for assignment in assignments:
+            GrowthAssimilationEngine(assignment).recompute_range(start, end)
+"""
+import contextvars
+import logging
+import math
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+from django.conf import settings
+from django.db.models import Avg, Q, Sum
+from django.db.models.functions import TruncDate
+
+from apps.batch.models import (
+    BatchContainerAssignment,
+    GrowthSample,
+    LifeCycleStage,
+    MortalityEvent,
+    TransferAction,
+)
+from apps.environmental.models import EnvironmentalReading
+from apps.health.models import IndividualFishObservation, Treatment
+from apps.inventory.models import FeedingEvent
+from apps.scenario.models import StageConstraint
+
+logger = logging.getLogger(__name__)
+
+# Days searched on each side of a day without readings (interpolation)
+TEMPERATURE_SEARCH_DAYS = 7
+
+_active_cache = contextvars.ContextVar('batch_daily_data_cache', default=None)
+
+
+def selection_bias_factor(selection_method: Optional[str]) -> float:
+    """Population-average correction for transfer weights measured on a selection."""
+    if selection_method == 'LARGEST':
+        return 0.88
+    if selection_method == 'SMALLEST':
+        return 1.12
+    return 1.0
+
+
+class BatchDailyData:
+    """Daily engine inputs of one batch's assignments over ``[start_date, end_date]``."""
+
+    def __init__(
+        self,
+        batch,
+        start_date: date,
+        end_date: date,
+        cache: Optional['DailyDataCache'] = None,
+    ):
+        self.batch = batch
+        self.start_date = start_date
+        self.end_date = end_date
+        self.cache = cache or DailyDataCache()
+        # Temperatures are loaded beyond the window for interpolation
+        self.origin = start_date - timedelta(days=TEMPERATURE_SEARCH_DAYS)
+        self.days = (end_date - self.origin).days + TEMPERATURE_SEARCH_DAYS + 1
+
+        self.assignments = {
+            assignment.id: assignment
+            for assignment in BatchContainerAssignment.objects.filter(
+                batch=batch,
+                assignment_date__lte=end_date,
+            ).filter(
+                Q(departure_date__isnull=True) | Q(departure_date__gte=start_date)
+            ).select_related('container', 'lifecycle_stage')
+        }
+        assignment_ids = list(self.assignments)
+        container_ids = sorted({a.container_id for a in self.assignments.values()})
+
+        self.temperatures = self._load_temperatures(container_ids)
+        self.mortality = self._load_series(
+            MortalityEvent.objects.filter(
+                assignment_id__in=assignment_ids,
+                event_date__gte=start_date,
+                event_date__lte=end_date,
+            ).values('assignment_id', 'event_date').annotate(total=Sum('count')),
+            'assignment_id', 'event_date', np.int64, 0,
+        )
+        self.feeding = self._load_series(
+            FeedingEvent.objects.filter(
+                container_id__in=container_ids,
+                feeding_date__gte=start_date,
+                feeding_date__lte=end_date,
+            ).values('container_id', 'feeding_date').annotate(total=Sum('amount_kg')),
+            'container_id', 'feeding_date', np.float64, 0.0,
+        )
+        self.placements = self._load_series(
+            TransferAction.objects.filter(
+                dest_assignment_id__in=assignment_ids,
+                actual_execution_date__gte=start_date,
+                actual_execution_date__lte=end_date,
+                status='COMPLETED',
+            ).values('dest_assignment_id', 'actual_execution_date').annotate(total=Sum('transferred_count')),
+            'dest_assignment_id', 'actual_execution_date', np.int64, 0,
+        )
+        self._anchors = self._load_anchors(assignment_ids)
+
+        logger.debug(
+            f"Loaded daily inputs for batch {batch.batch_number}: "
+            f"{len(assignment_ids)} assignments, [{start_date}, {end_date}]"
+        )
+
+    # ------------------------------------------------------------------
+    # Loading
+    # ------------------------------------------------------------------
+
+    def _offset(self, day: date) -> int:
+        return (day - self.origin).days
+
+    def _load_series(self, rows, key_field, date_field, dtype, fill) -> Dict[int, np.ndarray]:
+        series = {}
+        for row in rows:
+            if row['total'] is None or row[date_field] is None:
+                continue
+            array = series.get(row[key_field])
+            if array is None:
+                array = series[row[key_field]] = np.full(self.days, fill, dtype=dtype)
+            array[self._offset(row[date_field])] = row['total']
+        return series
+
+    def _load_temperatures(self, container_ids: List[int]) -> Dict[int, np.ndarray]:
+        """Daily average temperature per container; NaN on days without readings."""
+        rows = EnvironmentalReading.objects.filter(
+            container_id__in=container_ids,
+            reading_time__date__gte=self.origin,
+            reading_time__date__lte=self.origin + timedelta(days=self.days - 1),
+            parameter__name='temperature',
+        ).annotate(
+            day=TruncDate('reading_time')
+        ).values('container_id', 'day').annotate(total=Avg('value'))
+        return self._load_series(rows, 'container_id', 'day', np.float64, np.nan)
+
+    def _load_anchors(self, assignment_ids: List[int]) -> Dict[int, Dict[date, Dict]]:
+        """Weight anchors per assignment, highest priority per day (see GrowthAssimilationEngine)."""
+        anchors = defaultdict(dict)
+
+        def place(assignment_id, day, anchor):
+            current = anchors[assignment_id].get(day)
+            if current is None or current['priority'] > anchor['priority']:
+                anchors[assignment_id][day] = anchor
+
+        samples = GrowthSample.objects.filter(
+            assignment_id__in=assignment_ids,
+            sample_date__gte=self.start_date,
+            sample_date__lte=self.end_date,
+            avg_weight_g__isnull=False,
+        ).values_list('assignment_id', 'sample_date', 'avg_weight_g')
+        for assignment_id, sample_date, weight in samples:
+            if weight:
+                place(assignment_id, sample_date, {
+                    'type': 'growth_sample', 'weight': float(weight), 'confidence': 1.0, 'priority': 1,
+                })
+
+        transfers = TransferAction.objects.filter(
+            source_assignment_id__in=assignment_ids,
+            actual_execution_date__gte=self.start_date,
+            actual_execution_date__lte=self.end_date,
+            status='COMPLETED',
+            measured_avg_weight_g__isnull=False,
+        ).values_list('source_assignment_id', 'actual_execution_date', 'measured_avg_weight_g', 'selection_method')
+        for assignment_id, execution_date, weight, selection_method in transfers:
+            place(assignment_id, execution_date, {
+                'type': 'transfer',
+                'weight': float(weight) * selection_bias_factor(selection_method),
+                'confidence': 0.95,
+                'priority': 2,
+                'selection_method': selection_method,
+            })
+
+        treatments = list(Treatment.objects.filter(
+            batch_assignment_id__in=assignment_ids,
+            treatment_date__date__gte=self.start_date,
+            treatment_date__date__lte=self.end_date,
+            includes_weighing=True,
+            sampling_event__isnull=False,
+        ).values_list('batch_assignment_id', 'treatment_date', 'sampling_event_id'))
+        if treatments:
+            weights = dict(IndividualFishObservation.objects.filter(
+                sampling_event_id__in={event_id for _, _, event_id in treatments},
+                weight_g__isnull=False,
+            ).values('sampling_event_id').annotate(avg=Avg('weight_g')).values_list('sampling_event_id', 'avg'))
+            for assignment_id, treatment_date, event_id in treatments:
+                if weights.get(event_id):
+                    place(assignment_id, treatment_date.date(), {
+                        'type': 'vaccination', 'weight': float(weights[event_id]), 'confidence': 0.90, 'priority': 3,
+                    })
+        return dict(anchors)
+
+    # ------------------------------------------------------------------
+    # Lookups
+    # ------------------------------------------------------------------
+
+    def covers(self, assignment_id: Optional[int], start_date: date, end_date: date) -> bool:
+        """True if the window (and the assignment, when given) was loaded."""
+        return (
+            (assignment_id is None or assignment_id in self.assignments)
+            and self.start_date <= start_date
+            and end_date <= self.end_date
+        )
+
+    def _days_in(self, series: Dict[int, np.ndarray], key: int, start_date: date, end_date: date, skip) -> Dict:
+        array = series.get(key)
+        if array is None:
+            return {}
+        first = self._offset(start_date)
+        values = {}
+        for index, value in enumerate(array[first:self._offset(end_date) + 1].tolist()):
+            if not skip(value):
+                values[start_date + timedelta(days=index)] = value
+        return values
+
+    def temperature(self, container_id: int, day: date) -> Optional[Tuple[float, str, float]]:
+        """
+        Sensor-derived temperature as (value, source, confidence), or None.
+
+        Mirrors GrowthAssimilationEngine._get_temperature: the day's average
+        ('measured'), else linear interpolation between the nearest days with
+        readings within TEMPERATURE_SEARCH_DAYS ('interpolated'), else the
+        nearest of them ('nearest_before' / 'nearest_after').
+        """
+        series = self.temperatures.get(container_id)
+        if series is None:
+            return None
+        offset = self._offset(day)
+        measured = series[offset]
+        if not math.isnan(measured) and measured:
+            return float(measured), 'measured', 1.0
+
+        before = after = None
+        for distance in range(1, TEMPERATURE_SEARCH_DAYS + 1):
+            if before is None and not math.isnan(series[offset - distance]):
+                before = distance
+            if after is None and not math.isnan(series[offset + distance]):
+                after = distance
+        if before and after:
+            before_temp = float(series[offset - before])
+            after_temp = float(series[offset + after])
+            days_span = before + after
+            interpolated = before_temp + (after_temp - before_temp) * before / days_span
+            return interpolated, 'interpolated', max(0.4, 0.9 - (days_span / 30))
+        if before:
+            return float(series[offset - before]), 'nearest_before', 0.6
+        if after:
+            return float(series[offset + after]), 'nearest_after', 0.6
+        return None
+
+    def measured_temperatures(self, container_id: int, start_date: date, end_date: date) -> Dict[date, float]:
+        """Days with readings mapped to their average temperature."""
+        return self._days_in(self.temperatures, container_id, start_date, end_date, math.isnan)
+
+    def mortality_count(self, assignment_id: int, day: date) -> int:
+        series = self.mortality.get(assignment_id)
+        return int(series[self._offset(day)]) if series is not None else 0
+
+    def daily_mortality(self, assignment_id: int, start_date: date, end_date: date) -> Dict[date, int]:
+        return self._days_in(self.mortality, assignment_id, start_date, end_date, lambda value: not value)
+
+    def feed_kg(self, container_id: int, day: date) -> float:
+        series = self.feeding.get(container_id)
+        return float(series[self._offset(day)]) if series is not None else 0.0
+
+    def daily_feed(self, container_id: int, start_date: date, end_date: date) -> Dict[date, float]:
+        return self._days_in(self.feeding, container_id, start_date, end_date, lambda value: not value)
+
+    def placements_in(self, assignment_id: int, day: date) -> int:
+        series = self.placements.get(assignment_id)
+        return int(series[self._offset(day)]) if series is not None else 0
+
+    def daily_placements(self, assignment_id: int, start_date: date, end_date: date) -> Dict[date, int]:
+        return self._days_in(self.placements, assignment_id, start_date, end_date, lambda value: not value)
+
+    def anchors(self, assignment_id: int, start_date: date, end_date: date) -> Dict[date, Dict]:
+        return {
+            day: dict(anchor)
+            for day, anchor in self._anchors.get(assignment_id, {}).items()
+            if start_date <= day <= end_date
+        }
+
+    def stage_constraint(self, constraint_set, stage_name: str) -> Optional[StageConstraint]:
+        return self.cache.stage_constraints(constraint_set).get(stage_name)
+
+    def next_stage(self, stage) -> Optional[LifeCycleStage]:
+        return self.cache.next_stage(stage)
+
+
+class DailyDataCache:
+    """LRU of BatchDailyData plus reference data shared by every batch."""
+
+    def __init__(self, max_batches: Optional[int] = None):
+        self.max_batches = max_batches or settings.BATCH_DAILY_DATA_CACHE_SIZE
+        self._batches = OrderedDict()
+        self._stage_constraints = {}
+        self._fcr_stages = {}
+        self._lifecycle_stages = None
+        self.hits = 0
+        self.loads = 0
+        self.evictions = 0
+
+    def batch_data(
+        self,
+        batch,
+        start_date: date,
+        end_date: date,
+        assignment_id: Optional[int] = None,
+    ) -> BatchDailyData:
+        """Cached data covering the window (and assignment), loading it if needed."""
+        data = self._batches.get(batch.id)
+        if data is not None and data.covers(assignment_id, start_date, end_date):
+            self._batches.move_to_end(batch.id)
+            self.hits += 1
+            return data
+
+        if data is not None:
+            # Widen to the union so alternating windows do not thrash
+            start_date = min(start_date, data.start_date)
+            end_date = max(end_date, data.end_date)
+        data = BatchDailyData(batch, start_date, end_date, cache=self)
+        self.loads += 1
+        self._batches[batch.id] = data
+        self._batches.move_to_end(batch.id)
+        while len(self._batches) > self.max_batches:
+            self._batches.popitem(last=False)
+            self.evictions += 1
+        return data
+
+    def lifecycle_stages(self) -> List[LifeCycleStage]:
+        """All lifecycle stages ordered by ``order`` (as LiveProjectionEngine expects)."""
+        if self._lifecycle_stages is None:
+            self._lifecycle_stages = list(LifeCycleStage.objects.order_by('order'))
+        return self._lifecycle_stages
+
+    def next_stage(self, stage) -> Optional[LifeCycleStage]:
+        for candidate in self.lifecycle_stages():
+            if candidate.species_id == stage.species_id and candidate.order > stage.order:
+                return candidate
+        return None
+
+    def stage_constraints(self, constraint_set) -> Dict[str, StageConstraint]:
+        if constraint_set is None:
+            return {}
+        constraints = self._stage_constraints.get(constraint_set.pk)
+        if constraints is None:
+            constraints = self._stage_constraints[constraint_set.pk] = {
+                constraint.lifecycle_stage: constraint
+                for constraint in StageConstraint.objects.filter(constraint_set=constraint_set)
+            }
+        return constraints
+
+    def fcr_stages(self, fcr_model) -> list:
+        """An FCR model's stages with their lifecycle stage, in model order."""
+        stages = self._fcr_stages.get(fcr_model.pk)
+        if stages is None:
+            stages = self._fcr_stages[fcr_model.pk] = list(fcr_model.stages.select_related('stage').all())
+        return stages
+
+
+@contextmanager
+def daily_data_scope(max_batches: Optional[int] = None):
+    """Share a DailyDataCache with every engine in the block (nested scopes reuse the outer one)."""
+    cache = _active_cache.get()
+    if cache is not None:
+        yield cache
+        return
+    cache = DailyDataCache(max_batches)
+    token = _active_cache.set(cache)
+    try:
+        yield cache
+    finally:
+        _active_cache.reset(token)
+        if cache.loads:
+            logger.debug(
+                f"Daily data scope: {cache.loads} batch loads, {cache.hits} hits, "
+                f"{cache.evictions} evictions"
+            )
+
+
+def active_cache() -> Optional[DailyDataCache]:
+    return _active_cache.get()
+
+
+def get_batch_data(
+    batch,
+    start_date: date,
+    end_date: date,
+    assignment_id: Optional[int] = None,
+) -> Optional[BatchDailyData]:
+    """
+    The scope's data for ``batch`` over the window, or None outside a scope
+    (or if the assignment does not overlap the window, e.g. it departed).
+    """
+    cache = _active_cache.get()
+    if cache is None:
+        return None
+    data = cache.batch_data(batch, start_date, end_date, assignment_id)
+    return data if data.covers(assignment_id, start_date, end_date) else None
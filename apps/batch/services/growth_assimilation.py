@@ -33,6 +33,8 @@ from apps.batch.models import (
     TransferAction,
     MortalityEvent
 )
+from apps.batch.services.batch_daily_data import daily_data_scope, get_batch_data
+from apps.batch.services.daily_state_persistence import upsert_daily_states
 from apps.environmental.models import EnvironmentalReading
 from apps.inventory.models import FeedingEvent
 from apps.health.models import Treatment
@@ -57,6 +59,10 @@ class GrowthAssimilationEngine:
     Usage:
         engine = GrowthAssimilationEngine(assignment)
         engine.recompute_range(start_date, end_date)
+
+    Inside a ``daily_data_scope()`` the daily inputs come from the shared
+    batch-level preload (apps.batch.services.batch_daily_data) instead of
+    per-day queries.
     """
     
     def __init__(self, assignment: BatchContainerAssignment):
@@ -78,6 +84,9 @@ class GrowthAssimilationEngine:
         self.mortality_calculator = MortalityCalculator(self.scenario.mortality_model)
         self.bio_constraints = self.scenario.biological_constraints
         
+        # Batch-level preloaded inputs (set by recompute_range inside a scope)
+        self.daily_data = None
+        
         logger.info(
             f"Initialized GrowthAssimilationEngine for assignment {assignment.id} "
             f"(Batch: {self.batch.batch_number}, Container: {self.container.name})"
@@ -135,7 +144,8 @@ class GrowthAssimilationEngine:
             force: If True, recompute even if data exists
             
         Returns:
-            Dict with computation stats (rows_created, rows_updated, anchors_found)
+            Dict with computation stats (rows_created, rows_updated,
+            rows_unchanged, anchors_found)
             
         Raises:
             ValueError: If inputs are invalid
@@ -204,6 +214,8 @@ class GrowthAssimilationEngine:
         
         logger.info(f"Recomputing range [{start_date}, {end_date}] for assignment {self.assignment.id}")
         
+        self.daily_data = get_batch_data(self.batch, start_date, end_date, self.assignment.id)
+        
         # Detect anchors in range
         anchors = self._detect_anchors(start_date, end_date)
         logger.info(f"Detected {len(anchors)} anchors in range")
@@ -215,9 +227,11 @@ class GrowthAssimilationEngine:
         stats = {
             'rows_created': 0,
             'rows_updated': 0,
+            'rows_unchanged': 0,
             'anchors_found': len(anchors),
             'errors': []
         }
+        computed_states = []
         
         current_date = start_date
         prev_weight = initial_state['weight']
@@ -238,17 +252,7 @@ class GrowthAssimilationEngine:
                         anchors=anchors
                     )
                     
-                    # Save to database (upsert)
-                    daily_state, created = ActualDailyAssignmentState.objects.update_or_create(
-                        assignment=self.assignment,
-                        date=current_date,
-                        defaults=state_data
-                    )
-                    
-                    if created:
-                        stats['rows_created'] += 1
-                    else:
-                        stats['rows_updated'] += 1
+                    computed_states.append(state_data)
                     
                     # Update for next iteration
                     prev_weight = state_data['avg_weight_g']
@@ -264,10 +268,17 @@ class GrowthAssimilationEngine:
                     })
                 
                 current_date += timedelta(days=1)
+            
+            # Save to database (one upsert for the range; unchanged rows skipped)
+            persisted = upsert_daily_states(self.assignment, computed_states)
+            stats['rows_created'] = persisted.created
+            stats['rows_updated'] = persisted.updated
+            stats['rows_unchanged'] = persisted.unchanged
         
         logger.info(
             f"Recompute complete: {stats['rows_created']} created, "
-            f"{stats['rows_updated']} updated, {len(stats['errors'])} errors"
+            f"{stats['rows_updated']} updated, {stats['rows_unchanged']} unchanged, "
+            f"{len(stats['errors'])} errors"
         )
         
         return stats
@@ -288,7 +299,11 @@ class GrowthAssimilationEngine:
             
         Returns:
             Dict mapping date -> anchor data {type, weight, confidence, source_obj}
+            (no source_obj when served from the batch preload)
         """
+        if self.daily_data is not None:
+            return self.daily_data.anchors(self.assignment.id, start_date, end_date)
+        
         anchors = {}
         
         # 1. Growth samples (highest priority)
@@ -1044,6 +1059,12 @@ class GrowthAssimilationEngine:
             source: 'measured', 'interpolated', 'profile', or 'none'
             confidence: 1.0 (measured) -> 0.7 (interpolated) -> 0.5 (profile) -> 0.0 (none)
         """
+        if self.daily_data is not None and self.daily_data.covers(None, date, date):
+            sensor_temp = self.daily_data.temperature(self.container.id, date)
+            if sensor_temp is not None:
+                return sensor_temp
+            return self._get_profile_temperature(date)
+        
         # Try measured temperature
         from django.db.models import Avg
         temp_readings = EnvironmentalReading.objects.filter(
@@ -1096,7 +1117,10 @@ class GrowthAssimilationEngine:
             # Use nearest after
             return float(after_reading.value), 'nearest_after', 0.6
         
-        # Fall back to temperature profile
+        return self._get_profile_temperature(date)
+    
+    def _get_profile_temperature(self, date: date) -> Tuple[Optional[float], str, float]:
+        """Temperature from the scenario's profile (the last fallback)."""
         day_number = (date - self.batch.start_date).days + 1
         try:
             profile_temp = self.tgc_calculator._get_temperature_for_day(day_number)
@@ -1130,13 +1154,15 @@ class GrowthAssimilationEngine:
             Tuple of (mortality_count, source, confidence)
         """
         # Try actual mortality events (assignment-specific)
-        from django.db.models import Sum
-        mortality_events = MortalityEvent.objects.filter(
-            assignment=self.assignment,
-            event_date=date
-        )
-        
-        actual_count = mortality_events.aggregate(Sum('count'))['count__sum'] or 0
+        if self.daily_data is not None and self.daily_data.covers(None, date, date):
+            actual_count = self.daily_data.mortality_count(self.assignment.id, date)
+        else:
+            from django.db.models import Sum
+            mortality_events = MortalityEvent.objects.filter(
+                assignment=self.assignment,
+                event_date=date
+            )
+            actual_count = mortality_events.aggregate(Sum('count'))['count__sum'] or 0
         if actual_count > 0:
             # Direct assignment query - full confidence!
             return actual_count, 'actual', 1.0
@@ -1191,16 +1217,18 @@ class GrowthAssimilationEngine:
         Returns:
             Tuple of (feed_kg, source, confidence)
         """
-        from django.db.models import Sum
-        
-        # Query feeding events for this container on this date
-        # Note: FeedingEvent uses 'feeding_date' not 'event_date'
-        feeding_events = FeedingEvent.objects.filter(
-            container=self.container,
-            feeding_date=date
-        )
-        
-        total_feed = feeding_events.aggregate(Sum('amount_kg'))['amount_kg__sum']
+        if self.daily_data is not None and self.daily_data.covers(None, date, date):
+            total_feed = self.daily_data.feed_kg(self.container.id, date)
+        else:
+            from django.db.models import Sum
+            
+            # Query feeding events for this container on this date
+            # Note: FeedingEvent uses 'feeding_date' not 'event_date'
+            feeding_events = FeedingEvent.objects.filter(
+                container=self.container,
+                feeding_date=date
+            )
+            total_feed = feeding_events.aggregate(Sum('amount_kg'))['amount_kg__sum']
         
         if total_feed and total_feed > 0:
             return float(total_feed), 'actual', 1.0
@@ -1220,15 +1248,17 @@ class GrowthAssimilationEngine:
         Returns:
             Number of fish transferred INTO this assignment
         """
-        # Find transfer actions where this assignment is the destination
-        # and transfer was executed on this date
-        transfers_in = TransferAction.objects.filter(
-            dest_assignment=self.assignment,
-            actual_execution_date=date,
-            status='COMPLETED'
-        )
-        
-        total_placements = sum(transfer.transferred_count for transfer in transfers_in)
+        if self.daily_data is not None and self.daily_data.covers(None, date, date):
+            total_placements = self.daily_data.placements_in(self.assignment.id, date)
+        else:
+            # Find transfer actions where this assignment is the destination
+            # and transfer was executed on this date
+            transfers_in = TransferAction.objects.filter(
+                dest_assignment=self.assignment,
+                actual_execution_date=date,
+                status='COMPLETED'
+            )
+            total_placements = sum(transfer.transferred_count for transfer in transfers_in)
         
         if total_placements > 0:
             logger.debug(f"Placements on {date}: {total_placements} fish transferred IN")
@@ -1255,7 +1285,11 @@ class GrowthAssimilationEngine:
         max_weight = None
         
         # Try to get max weight from biological constraints
-        if self.bio_constraints:
+        if self.bio_constraints and self.daily_data is not None:
+            stage_constraint = self.daily_data.stage_constraint(self.bio_constraints, current_stage.name)
+            if stage_constraint is not None and stage_constraint.max_weight_g is not None:
+                max_weight = float(stage_constraint.max_weight_g)
+        elif self.bio_constraints:
             try:
                 from apps.scenario.models import StageConstraint
                 stage_constraint = StageConstraint.objects.get(
@@ -1295,6 +1329,9 @@ class GrowthAssimilationEngine:
         """
         from apps.batch.models import LifeCycleStage
         
+        if self.daily_data is not None:
+            return self.daily_data.next_stage(current_stage) or current_stage
+        
         try:
             # Find next stage by order
             next_stage = LifeCycleStage.objects.filter(
@@ -1356,34 +1393,40 @@ def recompute_batch_assignments(
         'assignments_processed': 0,
         'total_rows_created': 0,
         'total_rows_updated': 0,
+        'total_rows_unchanged': 0,
         'total_errors': 0,
         'assignment_results': []
     }
     
-    for assignment in assignments:
-        try:
-            engine = GrowthAssimilationEngine(assignment)
-            result = engine.recompute_range(start_date, end_date)
-            
-            # Only count as processed if not skipped
-            if not result.get('skipped', False):
-                overall_stats['assignments_processed'] += 1
-                overall_stats['total_rows_created'] += result['rows_created']
-                overall_stats['total_rows_updated'] += result['rows_updated']
-                overall_stats['total_errors'] += len(result['errors'])
-            
-            overall_stats['assignment_results'].append({
-                'assignment_id': assignment.id,
-                'result': result
-            })
-            
-        except Exception as e:
-            logger.error(f"Error processing assignment {assignment.id}: {e}")
-            overall_stats['total_errors'] += 1
-            overall_stats['assignment_results'].append({
-                'assignment_id': assignment.id,
-                'error': str(e)
-            })
+    with daily_data_scope():
+        # One batch-level preload serves every assignment's engine
+        get_batch_data(batch, start_date, end_date)
+        
+        for assignment in assignments:
+            try:
+                engine = GrowthAssimilationEngine(assignment)
+                result = engine.recompute_range(start_date, end_date)
+                
+                # Only count as processed if not skipped
+                if not result.get('skipped', False):
+                    overall_stats['assignments_processed'] += 1
+                    overall_stats['total_rows_created'] += result['rows_created']
+                    overall_stats['total_rows_updated'] += result['rows_updated']
+                    overall_stats['total_rows_unchanged'] += result['rows_unchanged']
+                    overall_stats['total_errors'] += len(result['errors'])
+                
+                overall_stats['assignment_results'].append({
+                    'assignment_id': assignment.id,
+                    'result': result
+                })
+                
+            except Exception as e:
+                logger.error(f"Error processing assignment {assignment.id}: {e}")
+                overall_stats['total_errors'] += 1
+                overall_stats['assignment_results'].append({
+                    'assignment_id': assignment.id,
+                    'error': str(e)
+                })
     
     logger.info(
         f"Batch recompute complete: {overall_stats['assignments_processed']} assignments, "
@@ -1391,4 +1434,3 @@ def recompute_batch_assignments(
     )
     
     return overall_stats
-
@@ -7,7 +7,8 @@ specifically designed for bulk recomputation (e.g., test data generation).
 Key optimizations:
 1. Bulk data loading: Single queries per data type instead of per-day
 2. In-memory processing: Build lookup dicts, iterate without DB queries
-3. Bulk saving: Use bulk_create/bulk_update instead of update_or_create per row
+3. Bulk saving: One INSERT ... ON CONFLICT upsert per range instead of
+   update_or_create per row; unchanged rows are not rewritten
 
 Performance improvement: ~100x faster (400s → 4s per batch)
 """
@@ -16,7 +17,6 @@ from collections import defaultdict
 from datetime import date, timedelta
 from decimal import Decimal
 from typing import Dict, List, Optional, Tuple, Set
-from django.db import transaction
 from django.db.models import Q, Avg, Sum
 from django.utils import timezone
 
@@ -29,6 +29,12 @@ from apps.batch.models import (
     MortalityEvent,
     LifeCycleStage
 )
+from apps.batch.services.batch_daily_data import (
+    daily_data_scope,
+    get_batch_data,
+    selection_bias_factor,
+)
+from apps.batch.services.daily_state_persistence import upsert_daily_states
 from apps.environmental.models import EnvironmentalReading
 from apps.inventory.models import FeedingEvent
 from apps.health.models import Treatment, IndividualFishObservation
@@ -65,6 +71,7 @@ class OptimizedGrowthAssimilationEngine:
         # Cache for stage constraints (loaded once)
         self._stage_constraints_cache: Dict[str, StageConstraint] = {}
         self._next_stage_cache: Dict[int, Optional[LifeCycleStage]] = {}
+        self._daily_data = None
         
         # Pre-loaded data (filled by _bulk_load_data)
         self._anchors: Dict[date, Dict] = {}
@@ -120,17 +127,7 @@ class OptimizedGrowthAssimilationEngine:
         initial_state = self._get_initial_state(start_date)
         
         # Process all days in memory
-        states_to_create = []
-        states_to_update = []
-        
-        # Get existing states for this range (for update detection)
-        existing_states = {
-            s.date: s for s in ActualDailyAssignmentState.objects.filter(
-                assignment=self.assignment,
-                date__gte=start_date,
-                date__lte=end_date
-            )
-        }
+        computed_states = []
         
         current_date = start_date
         prev_weight = initial_state['weight']
@@ -148,20 +145,7 @@ class OptimizedGrowthAssimilationEngine:
                 current_stage=current_stage
             )
             
-            # Check if we need to create or update
-            if current_date in existing_states:
-                # Update existing
-                existing = existing_states[current_date]
-                for key, value in state_data.items():
-                    setattr(existing, key, value)
-                states_to_update.append(existing)
-            else:
-                # Create new
-                state = ActualDailyAssignmentState(
-                    assignment=self.assignment,
-                    **state_data
-                )
-                states_to_create.append(state)
+            computed_states.append(state_data)
             
             # Update for next iteration
             prev_weight = float(state_data['avg_weight_g'])
@@ -171,29 +155,13 @@ class OptimizedGrowthAssimilationEngine:
             
             current_date += timedelta(days=1)
         
-        # OPTIMIZATION: Bulk save
-        with transaction.atomic():
-            if states_to_create:
-                ActualDailyAssignmentState.objects.bulk_create(
-                    states_to_create,
-                    batch_size=500
-                )
-            
-            if states_to_update:
-                ActualDailyAssignmentState.objects.bulk_update(
-                    states_to_update,
-                    fields=[
-                        'batch', 'container', 'lifecycle_stage', 'day_number',
-                        'avg_weight_g', 'population', 'biomass_kg', 'temp_c',
-                        'mortality_count', 'feed_kg', 'observed_fcr', 'anchor_type',
-                        'sources', 'confidence_scores'
-                    ],
-                    batch_size=500
-                )
+        # OPTIMIZATION: Bulk upsert (unchanged rows are skipped)
+        persisted = upsert_daily_states(self.assignment, computed_states)
         
         return {
-            'rows_created': len(states_to_create),
-            'rows_updated': len(states_to_update),
+            'rows_created': persisted.created,
+            'rows_updated': persisted.updated,
+            'rows_unchanged': persisted.unchanged,
             'anchors_found': len(self._anchors),
             'errors': []
         }
@@ -203,8 +171,15 @@ class OptimizedGrowthAssimilationEngine:
         Bulk load all data needed for the date range.
         
         This is THE key optimization - instead of querying per day,
-        we load everything once and build lookup dicts.
+        we load everything once and build lookup dicts. Inside a
+        ``daily_data_scope()`` the dicts are cut from the shared batch-level
+        preload, so sibling assignments do not repeat the queries.
         """
+        daily_data = get_batch_data(self.batch, start_date, end_date, self.assignment.id)
+        if daily_data is not None:
+            self._load_from_daily_data(daily_data, start_date, end_date)
+            return
+        
         # 1. Load anchors (growth samples, transfers, treatments)
         self._load_anchors(start_date, end_date)
         
@@ -223,6 +198,16 @@ class OptimizedGrowthAssimilationEngine:
         # 6. Pre-cache stage constraints
         self._load_stage_constraints()
     
+    def _load_from_daily_data(self, daily_data, start_date: date, end_date: date) -> None:
+        """Fill the lookup dicts from a BatchDailyData preload (no queries)."""
+        self._anchors = daily_data.anchors(self.assignment.id, start_date, end_date)
+        self._temperatures = daily_data.measured_temperatures(self.container.id, start_date, end_date)
+        self._mortality = daily_data.daily_mortality(self.assignment.id, start_date, end_date)
+        self._feeding = daily_data.daily_feed(self.container.id, start_date, end_date)
+        self._placements = daily_data.daily_placements(self.assignment.id, start_date, end_date)
+        self._stage_constraints_cache = daily_data.cache.stage_constraints(self.bio_constraints)
+        self._daily_data = daily_data
+    
     def _load_anchors(self, start_date: date, end_date: date) -> None:
         """Load all anchor points in one query per type."""
         self._anchors = {}
@@ -255,12 +240,8 @@ class OptimizedGrowthAssimilationEngine:
         for t in transfers:
             t_date = t['actual_execution_date']
             if t_date not in self._anchors or self._anchors[t_date]['priority'] > 2:
-                weight = float(t['measured_avg_weight_g'])
                 # Adjust for selection bias
-                if t['selection_method'] == 'LARGEST':
-                    weight *= 0.88
-                elif t['selection_method'] == 'SMALLEST':
-                    weight *= 1.12
+                weight = float(t['measured_avg_weight_g']) * selection_bias_factor(t['selection_method'])
                 
                 self._anchors[t_date] = {
                     'type': 'transfer',
@@ -617,10 +598,13 @@ class OptimizedGrowthAssimilationEngine:
         if current_stage.id in self._next_stage_cache:
             return self._next_stage_cache[current_stage.id]
         
-        next_stage = LifeCycleStage.objects.filter(
-            species=current_stage.species,
-            order__gt=current_stage.order
-        ).order_by('order').first()
+        if self._daily_data is not None:
+            next_stage = self._daily_data.next_stage(current_stage)
+        else:
+            next_stage = LifeCycleStage.objects.filter(
+                species=current_stage.species,
+                order__gt=current_stage.order
+            ).order_by('order').first()
         
         self._next_stage_cache[current_stage.id] = next_stage
         return next_stage
@@ -659,37 +643,43 @@ def recompute_batch_assignments_optimized(
         'assignments_processed': 0,
         'total_rows_created': 0,
         'total_rows_updated': 0,
+        'total_rows_unchanged': 0,
         'total_errors': 0,
         'assignment_results': []
     }
     
-    for assignment in assignments:
-        try:
-            engine = OptimizedGrowthAssimilationEngine(assignment)
-            result = engine.recompute_range(start_date, end_date)
+    with daily_data_scope():
+        get_batch_data(batch, start_date, end_date)
+        
+        for assignment in assignments:
+            try:
+                engine = OptimizedGrowthAssimilationEngine(assignment)
+                result = engine.recompute_range(start_date, end_date)
             
-            if not result.get('skipped', False):
-                overall_stats['assignments_processed'] += 1
-                overall_stats['total_rows_created'] += result['rows_created']
-                overall_stats['total_rows_updated'] += result['rows_updated']
-                overall_stats['total_errors'] += len(result.get('errors', []))
+                if not result.get('skipped', False):
+                    overall_stats['assignments_processed'] += 1
+                    overall_stats['total_rows_created'] += result['rows_created']
+                    overall_stats['total_rows_updated'] += result['rows_updated']
+                    overall_stats['total_rows_unchanged'] += result['rows_unchanged']
+                    overall_stats['total_errors'] += len(result.get('errors', []))
             
-            overall_stats['assignment_results'].append({
-                'assignment_id': assignment.id,
-                'result': result
-            })
+                overall_stats['assignment_results'].append({
+                    'assignment_id': assignment.id,
+                    'result': result
+                })
             
-        except Exception as e:
-            logger.error(f"Error processing assignment {assignment.id}: {e}")
-            overall_stats['total_errors'] += 1
-            overall_stats['assignment_results'].append({
-                'assignment_id': assignment.id,
-                'error': str(e)
-            })
+            except Exception as e:
+                logger.error(f"Error processing assignment {assignment.id}: {e}")
+                overall_stats['total_errors'] += 1
+                overall_stats['assignment_results'].append({
+                    'assignment_id': assignment.id,
+                    'error': str(e)
+                })
     
     logger.info(
         f"Optimized batch recompute: {overall_stats['assignments_processed']} assignments, "
-        f"{overall_stats['total_rows_created']} created, {overall_stats['total_rows_updated']} updated"
+        f"{overall_stats['total_rows_created']} created, {overall_stats['total_rows_updated']} updated, "
+        f"{overall_stats['total_rows_unchanged']} unchanged"
     )
     
     return overall_stats
@@ -36,6 +36,7 @@ from apps.batch.models import (
     LiveForwardProjection,
     ContainerForecastSummary,
 )
+from apps.batch.services.batch_daily_data import active_cache
 from apps.planning.models import PlannedActivity
 from apps.scenario.models import Scenario
 from apps.scenario.services.calculations.tgc_calculator import TGCCalculator
@@ -124,12 +125,17 @@ class LiveProjectionEngine:
         
         This mirrors the ProjectionEngine's stage loading to ensure consistent
         stage transitions. Stages are determined by elapsed time, not weight.
+        Inside a ``daily_data_scope()`` stages are shared across assignments.
         """
         from apps.batch.models import LifeCycleStage
         
-        self.lifecycle_stages = list(
-            LifeCycleStage.objects.order_by('order')
-        )
+        cache = active_cache()
+        if cache is not None:
+            self.lifecycle_stages = cache.lifecycle_stages()
+        else:
+            self.lifecycle_stages = list(
+                LifeCycleStage.objects.order_by('order')
+            )
         
         # Get stage durations from FCR model
         self.stage_durations = {}
@@ -137,7 +143,10 @@ class LiveProjectionEngine:
         
         # Try to load stage durations from FCR model
         if self.scenario.fcr_model and hasattr(self.scenario.fcr_model, 'stages'):
-            fcr_stages = self.scenario.fcr_model.stages.select_related('stage').all()
+            if cache is not None:
+                fcr_stages = cache.fcr_stages(self.scenario.fcr_model)
+            else:
+                fcr_stages = self.scenario.fcr_model.stages.select_related('stage').all()
             cumulative_days = 0
             
             for fcr_stage in fcr_stages:
@@ -432,6 +441,11 @@ class LiveProjectionEngine:
 
         today = timezone.now().date()
 
+        # Profile temperatures for the whole horizon in one preloaded slice
+        profile_temps = self.tgc_calculator.get_temperature_vector(
+            current_day + 1, current_day + horizon_days
+        )
+
         for day_offset in range(1, horizon_days + 1):
             proj_date = start_date + timedelta(days=day_offset)
             day_number = current_day + day_offset
@@ -447,9 +461,7 @@ class LiveProjectionEngine:
                 current_stage = new_stage
 
             # Get temperature for this day (profile + bias)
-            profile_temp = self.tgc_calculator._get_temperature_for_day(
-                day_number
-            )
+            profile_temp = profile_temps[day_offset - 1]
             temp_used = profile_temp + float(bias_c)
 
             # Calculate growth using TGC
@@ -667,21 +679,27 @@ class LiveProjectionEngine:
             }
         )
 
+    def _get_stage_constraint(self, stage_name: str):
+        """Scenario StageConstraint for ``stage_name`` (shared within a daily data scope)."""
+        constraint_set = self.scenario.biological_constraints
+        if not constraint_set:
+            return None
+        cache = active_cache()
+        if cache is not None:
+            return cache.stage_constraints(constraint_set).get(stage_name)
+        from apps.scenario.models import StageConstraint
+        return StageConstraint.objects.filter(
+            constraint_set=constraint_set,
+            lifecycle_stage=stage_name
+        ).first()
+
     def _get_harvest_threshold(self) -> Optional[float]:
         """Get harvest weight threshold from scenario."""
         # Try biological constraints first
         # StageConstraint.lifecycle_stage uses lowercase choices: 'harvest'
-        if self.scenario.biological_constraints:
-            try:
-                from apps.scenario.models import StageConstraint
-                harvest_constraint = StageConstraint.objects.get(
-                    constraint_set=self.scenario.biological_constraints,
-                    lifecycle_stage='harvest'
-                )
-                if harvest_constraint.max_weight_g:
-                    return float(harvest_constraint.max_weight_g)
-            except StageConstraint.DoesNotExist:
-                pass
+        harvest_constraint = self._get_stage_constraint('harvest')
+        if harvest_constraint and harvest_constraint.max_weight_g:
+            return float(harvest_constraint.max_weight_g)
 
         # Default harvest threshold (5kg is common for Atlantic Salmon)
         return 5000.0
@@ -690,17 +708,9 @@ class LiveProjectionEngine:
         """Get sea-transfer weight threshold from scenario."""
         # Try biological constraints first
         # StageConstraint.lifecycle_stage uses lowercase choices: 'smolt'
-        if self.scenario.biological_constraints:
-            try:
-                from apps.scenario.models import StageConstraint
-                smolt_constraint = StageConstraint.objects.get(
-                    constraint_set=self.scenario.biological_constraints,
-                    lifecycle_stage='smolt'
-                )
-                if smolt_constraint.max_weight_g:
-                    return float(smolt_constraint.max_weight_g)
-            except StageConstraint.DoesNotExist:
-                pass
+        smolt_constraint = self._get_stage_constraint('smolt')
+        if smolt_constraint and smolt_constraint.max_weight_g:
+            return float(smolt_constraint.max_weight_g)
 
         # Default smolt transfer weight (80-120g typical)
         return 100.0
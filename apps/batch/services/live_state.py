@@ -0,0 +1,152 @@
+"""
+Maintenance of the BatchLiveState read model.
+
+BatchLiveStateService recomputes a batch's live state from its active
+assignments. It is called from the BatchContainerAssignment post_save /
+post_delete signals (so the refresh commits or rolls back together with the
+assignment write), from code paths that bypass signals with queryset
+``update()``, and from the ``rebuild_batch_live_state`` management command
+and ``rebuild_missing_batch_live_state`` task. The read side (``for_batch``)
+never writes.
+"""
+import logging
+from collections import defaultdict
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional
+
+from django.db import transaction
+
+from apps.batch.models.assignment import BatchContainerAssignment
+from apps.batch.models.batch import Batch
+from apps.batch.models.live_state import BatchLiveState
+
+logger = logging.getLogger(__name__)
+
+AVG_WEIGHT_QUANTUM = Decimal('0.000001')
+BIOMASS_QUANTUM = Decimal('0.01')
+
+
+class BatchLiveStateService:
+    """Compute and persist the denormalised current state of batches."""
+
+    REBUILD_CHUNK_SIZE = 500
+
+    @classmethod
+    def refresh(cls, batch_id: int) -> Optional[BatchLiveState]:
+        """Recompute one batch's live state. Returns None if the batch is gone."""
+        states = cls.rebuild([batch_id])
+        return states.get(batch_id)
+
+    @classmethod
+    def rebuild(cls, batch_ids: Optional[Iterable[int]] = None) -> Dict[int, BatchLiveState]:
+        """
+        Recompute live state for the given batches (all batches when None).
+
+        Active assignments are read in one query per chunk of batches and the
+        rows are written with a single bulk upsert, so rebuilding the whole
+        table costs a handful of queries per REBUILD_CHUNK_SIZE batches.
+        """
+        if batch_ids is None:
+            ids = list(Batch.objects.order_by('id').values_list('id', flat=True))
+        else:
+            ids = sorted(set(Batch.objects.filter(id__in=list(batch_ids)).values_list('id', flat=True)))
+
+        states: Dict[int, BatchLiveState] = {}
+        for start in range(0, len(ids), cls.REBUILD_CHUNK_SIZE):
+            chunk = ids[start:start + cls.REBUILD_CHUNK_SIZE]
+            chunk_states = cls.compute(chunk)
+            with transaction.atomic():
+                BatchLiveState.objects.bulk_create(
+                    chunk_states,
+                    update_conflicts=True,
+                    unique_fields=['batch'],
+                    update_fields=[
+                        'population_count',
+                        'avg_weight_g',
+                        'biomass_kg',
+                        'current_lifecycle_stage',
+                        'active_container_ids',
+                        'updated_at',
+                    ],
+                )
+            states.update({state.batch_id: state for state in chunk_states})
+        return states
+
+    @classmethod
+    def rebuild_missing(cls) -> Dict[int, BatchLiveState]:
+        """Create live-state rows for batches that have none (e.g. bulk-created batches)."""
+        missing = Batch.objects.filter(live_state__isnull=True).values_list('id', flat=True)
+        return cls.rebuild(list(missing))
+
+    @classmethod
+    def for_batch(cls, batch: Batch) -> BatchLiveState:
+        """
+        Return the batch's live state, using the select_related cache if present.
+
+        Read-only: when the row is missing (e.g. for batches created with
+        bulk_create), an unsaved state is computed from the assignments.
+        Missing rows are persisted by the ``rebuild_missing_batch_live_state``
+        task or ``rebuild_batch_live_state --missing``.
+        """
+        try:
+            return batch.live_state
+        except BatchLiveState.DoesNotExist:
+            logger.debug("Live state missing for batch %s; computing unsaved", batch.pk)
+            state = cls.compute([batch.pk])[0]
+            batch.live_state = state
+            return state
+
+    @staticmethod
+    def compute(batch_ids: List[int]) -> List[BatchLiveState]:
+        """Build (unsaved) live-state rows for batch_ids from active assignments."""
+        rows = (
+            BatchContainerAssignment.objects.filter(batch_id__in=batch_ids, is_active=True)
+            .order_by('batch_id', '-assignment_date', '-id')
+            .values_list(
+                'batch_id',
+                'container_id',
+                'lifecycle_stage_id',
+                'population_count',
+                'avg_weight_g',
+                'biomass_kg',
+            )
+        )
+
+        by_batch = defaultdict(list)
+        for row in rows:
+            by_batch[row[0]].append(row)
+
+        states = []
+        for batch_id in batch_ids:
+            population = 0
+            weighted_population = 0
+            weighted_sum = Decimal('0')
+            biomass = Decimal('0')
+            container_ids = []
+            assignments = by_batch.get(batch_id, [])
+            # Rows are newest first, so the first one carries the current stage
+            stage_id = assignments[0][2] if assignments else None
+            for _, container_id, _, count, avg_weight, biomass_kg in assignments:
+                container_ids.append(container_id)
+                population += count
+                biomass += Decimal(str(biomass_kg or 0))
+                if count > 0 and avg_weight is not None:
+                    weighted_population += count
+                    weighted_sum += Decimal(count) * Decimal(str(avg_weight))
+
+            avg_weight_g = (
+                (weighted_sum / Decimal(weighted_population)).quantize(AVG_WEIGHT_QUANTUM)
+                if weighted_population > 0
+                else Decimal('0')
+            )
+            states.append(
+                BatchLiveState(
+                    batch_id=batch_id,
+                    population_count=population,
+                    avg_weight_g=avg_weight_g,
+                    biomass_kg=biomass.quantize(BIOMASS_QUANTUM),
+                    current_lifecycle_stage_id=stage_id,
+                    active_container_ids=container_ids,
+                )
+            )
+        return states
@@ -4,14 +4,34 @@ Read-model style lineage resolver for mixed batches.
 This service builds an ancestry graph and compounded source-share breakdown
 for a batch using container-scoped mix events. It falls back to BatchComposition
 when no mix event is available for a mixed batch.
+
+The reachable graph is loaded breadth-first with a fixed number of queries per
+lineage level. When the default cache is shared (CACHE_REDIS_URL), finished
+payloads are memoised per (batch, as_of_date) under a version counter that
+apps.batch.signals bumps after commit whenever mix events, compositions or
+the lineage fields of a batch change. With a per-process cache the bump
+would not reach other workers, so payloads are then built on every call.
 """
 from __future__ import annotations
 
 from datetime import date
 from decimal import Decimal
-from typing import Dict, List, Tuple
+from typing import Dict, Iterable, List, Tuple
+
+from django.core.cache import cache
+from django.db.models import OuterRef, Subquery
 
-from apps.batch.models import Batch, BatchComposition, BatchMixEvent
+from apps.batch.models import (
+    Batch,
+    BatchComposition,
+    BatchMixEvent,
+    BatchMixEventComponent,
+)
+from aquamind.utils.cache_backend import (
+    bump_cache_version,
+    cache_version,
+    default_cache_is_shared,
+)
 
 
 class MixedLineageService:
@@ -22,12 +42,33 @@ class MixedLineageService:
     """
 
     ROOT_SHARE = Decimal("100")
+    CACHE_TIMEOUT = 60 * 60
+    CACHE_VERSION_KEY = "mixed_lineage:version"
+    # Batch fields embedded in payloads or steering the traversal
+    BATCH_LINEAGE_FIELDS = ("batch_number", "batch_type")
 
     @classmethod
     def build_lineage(cls, batch: Batch, as_of_date: date | None = None) -> Dict:
         if as_of_date is None:
             as_of_date = date.today()
+        if not default_cache_is_shared():
+            return cls._build_payload(batch, as_of_date)
+
+        version = cache_version(cls.CACHE_VERSION_KEY)
+        cache_key = f"mixed_lineage:{version}:{batch.id}:{as_of_date.isoformat()}"
+        payload = cache.get(cache_key)
+        if payload is None:
+            payload = cls._build_payload(batch, as_of_date)
+            cache.set(cache_key, payload, cls.CACHE_TIMEOUT)
+        return payload
+
+    @classmethod
+    def invalidate(cls) -> None:
+        """Drop every memoised lineage payload (called after lineage writes commit)."""
+        bump_cache_version(cls.CACHE_VERSION_KEY)
 
+    @classmethod
+    def _build_payload(cls, batch: Batch, as_of_date: date) -> Dict:
         state = {
             "batch_nodes": {},
             "mix_nodes": {},
@@ -36,6 +77,7 @@ class MixedLineageService:
             "unresolved_batches": set(),
             "max_depth": 0,
             "resolution_notes": set(),
+            "resolved": cls._load_graph(batch=batch, as_of_date=as_of_date),
         }
 
         cls._walk_batch(
@@ -127,9 +169,7 @@ class MixedLineageService:
             ) + incoming_share
             return
 
-        resolution, mix_node, source_components = cls._resolve_components(
-            batch=batch, as_of_date=as_of_date
-        )
+        resolution, mix_node, source_components = state["resolved"][batch.id]
         state["resolution_notes"].add(resolution)
 
         if mix_node is not None:
@@ -186,24 +226,115 @@ class MixedLineageService:
                 call_path=next_path,
             )
 
+    @classmethod
+    def _load_graph(
+        cls, *, batch: Batch, as_of_date: date
+    ) -> Dict[int, Tuple[str, Dict | None, List[Dict]]]:
+        """
+        Resolve every reachable mixed batch breadth-first.
+
+        Each level costs three queries (latest mix events, their components,
+        composition fallbacks) regardless of how many mixed batches it holds.
+        """
+        resolved: Dict[int, Tuple[str, Dict | None, List[Dict]]] = {}
+        frontier = {batch.id: batch} if batch.batch_type == "MIXED" else {}
+        while frontier:
+            level = cls._resolve_components_bulk(
+                batches=frontier.values(), as_of_date=as_of_date
+            )
+            resolved.update(level)
+            next_frontier: Dict[int, Batch] = {}
+            for _resolution, _mix_node, components in level.values():
+                for component in components:
+                    source_batch = component["source_batch"]
+                    if (
+                        source_batch.batch_type == "MIXED"
+                        and source_batch.id not in resolved
+                    ):
+                        next_frontier[source_batch.id] = source_batch
+            frontier = next_frontier
+        return resolved
+
     @classmethod
     def _resolve_components(
         cls, *, batch: Batch, as_of_date: date
     ) -> Tuple[str, Dict | None, List[Dict]]:
-        latest_mix_event = (
+        return cls._resolve_components_bulk(batches=[batch], as_of_date=as_of_date)[
+            batch.id
+        ]
+
+    @classmethod
+    def _resolve_components_bulk(
+        cls, *, batches: Iterable[Batch], as_of_date: date
+    ) -> Dict[int, Tuple[str, Dict | None, List[Dict]]]:
+        batches = list(batches)
+        batch_ids = [batch.id for batch in batches]
+
+        latest_event_id = (
             BatchMixEvent.objects.filter(
-                mixed_batch=batch,
+                mixed_batch_id=OuterRef("mixed_batch_id"),
                 mixed_at__date__lte=as_of_date,
             )
-            .prefetch_related("components__source_batch")
-            .select_related("container", "workflow_action")
             .order_by("-mixed_at", "-id")
-            .first()
+            .values("id")[:1]
         )
+        latest_events = {
+            event.mixed_batch_id: event
+            for event in BatchMixEvent.objects.filter(
+                mixed_batch_id__in=batch_ids,
+                id=Subquery(latest_event_id),
+            )
+        }
 
+        components_by_event: Dict[int, List[BatchMixEventComponent]] = {}
+        if latest_events:
+            for component in (
+                BatchMixEventComponent.objects.filter(
+                    mix_event_id__in=[event.id for event in latest_events.values()]
+                )
+                .select_related("source_batch")
+                .order_by("mix_event_id", "-population_count", "-id")
+            ):
+                components_by_event.setdefault(component.mix_event_id, []).append(
+                    component
+                )
+
+        compositions_by_batch: Dict[int, List[BatchComposition]] = {}
+        fallback_ids = [
+            batch_id for batch_id in batch_ids if batch_id not in latest_events
+        ]
+        if fallback_ids:
+            for composition in BatchComposition.objects.filter(
+                mixed_batch_id__in=fallback_ids
+            ).select_related("source_batch"):
+                compositions_by_batch.setdefault(
+                    composition.mixed_batch_id, []
+                ).append(composition)
+
+        return {
+            batch.id: cls._components_for_batch(
+                batch=batch,
+                latest_mix_event=latest_events.get(batch.id),
+                event_components=components_by_event.get(
+                    getattr(latest_events.get(batch.id), "id", None), []
+                ),
+                compositions=compositions_by_batch.get(batch.id, []),
+            )
+            for batch in batches
+        }
+
+    @classmethod
+    def _components_for_batch(
+        cls,
+        *,
+        batch: Batch,
+        latest_mix_event: BatchMixEvent | None,
+        event_components: List[BatchMixEventComponent],
+        compositions: List[BatchComposition],
+    ) -> Tuple[str, Dict | None, List[Dict]]:
         if latest_mix_event:
             by_source_batch: Dict[int, Dict] = {}
-            for component in latest_mix_event.components.all():
+            for component in event_components:
                 aggregate = by_source_batch.setdefault(
                     component.source_batch_id,
                     {
@@ -233,9 +364,6 @@ class MixedLineageService:
                 list(by_source_batch.values()),
             )
 
-        compositions = list(
-            BatchComposition.objects.filter(mixed_batch=batch).select_related("source_batch")
-        )
         if not compositions:
             return (
                 "No BatchMixEvent or BatchComposition available; lineage unresolved at this batch.",
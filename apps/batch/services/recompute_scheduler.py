@@ -0,0 +1,293 @@
+"""
+Recompute scheduler for growth assimilation.
+
+Signal handlers used to enqueue one Celery task per event, deduplicated only
+by a 5-minute cache key per (assignment, trigger date). A back-dated import
+of a few thousand mortality rows therefore enqueued thousands of
+overlapping windows. Now events only record durable dirty marks
+(RecomputeMark) in the same transaction as the event:
+
+    mark_assignment_dirty(assignment, sample_date, window_days=2, reason='growth_sample')
+    mark_batch_dirty(batch, event_date, window_days=1, reason='mortality')
+
+After commit a dispatcher task is requested (debounced by
+RECOMPUTE_DISPATCH_DELAY_SECONDS; Celery Beat also runs it every minute).
+``dispatch_pending`` merges each assignment's pending marks into the
+minimal set of date ranges and dispatches one ``recompute_assignment_ranges``
+task per assignment, active batches first and at a higher Celery priority.
+Marks dispatched but not completed within RECOMPUTE_MARK_STALE_SECONDS
+(worker crash, lost message, task out of retries) are dispatched again, up
+to RECOMPUTE_MARK_MAX_ATTEMPTS times; after that they are marked failed and
+stay out of the queue until ``requeue_failed_marks`` resets them.
+
+``scheduler_stats`` reports queue depth, lag, merge ratio and failed marks for
+GET /api/v1/batch/recompute-scheduler/.
+"""
+import logging
+import uuid
+from collections import defaultdict
+from datetime import date, timedelta
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import Count, F, Max, Min, Q
+from django.utils import timezone
+
+from apps.batch.models import RecomputeMark
+
+logger = logging.getLogger(__name__)
+
+# Set while a dispatcher run is requested but has not started yet
+DISPATCH_REQUESTED_KEY = 'batch:recompute_scheduler:dispatch_requested'
+
+
+def merge_ranges(ranges: Iterable[Tuple[date, date]]) -> List[Tuple[date, date]]:
+    """Merge overlapping or adjacent date ranges into the minimal sorted set."""
+    merged = []
+    for start, end in sorted(ranges):
+        if merged and start <= merged[-1][1] + timedelta(days=1):
+            if end > merged[-1][1]:
+                merged[-1] = (merged[-1][0], end)
+        else:
+            merged.append((start, end))
+    return merged
+
+
+def mark_assignment_dirty(assignment, trigger_date: date, window_days: int, reason: str) -> RecomputeMark:
+    """Mark ``trigger_date ± window_days`` of one assignment for recompute."""
+    mark = RecomputeMark.objects.create(
+        assignment=assignment,
+        batch_id=assignment.batch_id,
+        start_date=trigger_date - timedelta(days=window_days),
+        end_date=trigger_date + timedelta(days=window_days),
+        reason=reason,
+    )
+    request_dispatch()
+    return mark
+
+
+def mark_batch_dirty(batch, trigger_date: date, window_days: int, reason: str) -> int:
+    """
+    Mark ``trigger_date ± window_days`` dirty for every assignment of the
+    batch overlapping the window (as recompute_batch_assignments selects them).
+
+    Returns:
+        Number of marks recorded
+    """
+    start_date = trigger_date - timedelta(days=window_days)
+    end_date = trigger_date + timedelta(days=window_days)
+    assignment_ids = batch.batch_assignments.filter(
+        assignment_date__lte=end_date
+    ).filter(
+        Q(departure_date__isnull=True) | Q(departure_date__gte=start_date)
+    ).values_list('id', flat=True)
+    marks = RecomputeMark.objects.bulk_create([
+        RecomputeMark(
+            assignment_id=assignment_id,
+            batch_id=batch.id,
+            start_date=start_date,
+            end_date=end_date,
+            reason=reason,
+        )
+        for assignment_id in assignment_ids
+    ])
+    if marks:
+        request_dispatch()
+    return len(marks)
+
+
+def request_dispatch() -> None:
+    """Request a dispatcher run once the current transaction commits."""
+    transaction.on_commit(_enqueue_dispatcher)
+
+
+def _enqueue_dispatcher() -> None:
+    from apps.batch.tasks import dispatch_recompute_marks
+
+    delay = settings.RECOMPUTE_DISPATCH_DELAY_SECONDS
+    # Events arriving before the dispatcher starts ride along with it
+    if not cache.add(DISPATCH_REQUESTED_KEY, '1', timeout=delay + 60):
+        return
+    try:
+        dispatch_recompute_marks.apply_async(countdown=delay)
+    except Exception as e:
+        # Marks are durable; the periodic dispatcher picks them up
+        cache.delete(DISPATCH_REQUESTED_KEY)
+        logger.warning(
+            f"Could not enqueue recompute dispatcher: {e}. "
+            f"Pending marks will be dispatched by the periodic run."
+        )
+
+
+def _stale_before():
+    return timezone.now() - timedelta(seconds=settings.RECOMPUTE_MARK_STALE_SECONDS)
+
+
+def _open_marks():
+    return RecomputeMark.objects.filter(completed_at__isnull=True, failed_at__isnull=True)
+
+
+def _due_marks():
+    """Pending marks plus in-flight marks whose task never completed."""
+    return _open_marks().filter(
+        Q(dispatched_at__isnull=True) | Q(dispatched_at__lt=_stale_before())
+    )
+
+
+def fail_exhausted_marks() -> int:
+    """Mark due marks already dispatched RECOMPUTE_MARK_MAX_ATTEMPTS times as failed."""
+    failed = _due_marks().filter(
+        attempts__gte=settings.RECOMPUTE_MARK_MAX_ATTEMPTS
+    ).update(failed_at=timezone.now())
+    if failed:
+        logger.error(
+            f"Recompute scheduler gave up on {failed} marks after "
+            f"{settings.RECOMPUTE_MARK_MAX_ATTEMPTS} attempts"
+        )
+    return failed
+
+
+def requeue_failed_marks() -> int:
+    """Return failed marks to the queue with their attempts reset."""
+    requeued = RecomputeMark.objects.filter(
+        completed_at__isnull=True, failed_at__isnull=False
+    ).update(failed_at=None, dispatched_at=None, task_id='', attempts=0)
+    if requeued:
+        request_dispatch()
+    return requeued
+
+
+def dispatch_pending(max_assignments: Optional[int] = None) -> Dict:
+    """
+    Merge due marks per assignment and dispatch one recompute task each.
+
+    Assignments of ACTIVE batches go first and at RECOMPUTE_PRIORITY_ACTIVE;
+    within a priority the assignment with the oldest mark goes first. Marks
+    out of attempts are failed first and not dispatched.
+
+    Returns:
+        Dict with assignments, marks and ranges dispatched, the number of
+        assignments left for the next run and the marks failed
+    """
+    from apps.batch.tasks import recompute_assignment_ranges
+
+    max_assignments = max_assignments or settings.RECOMPUTE_DISPATCH_MAX_ASSIGNMENTS
+    failed = fail_exhausted_marks()
+    pending = defaultdict(lambda: {'ids': [], 'ranges': [], 'oldest': None, 'active': False})
+    rows = _due_marks().values_list(
+        'id', 'assignment_id', 'start_date', 'end_date', 'created_at', 'batch__status'
+    )
+    for mark_id, assignment_id, start_date, end_date, created_at, batch_status in rows:
+        entry = pending[assignment_id]
+        entry['ids'].append(mark_id)
+        entry['ranges'].append((start_date, end_date))
+        entry['active'] = entry['active'] or batch_status == 'ACTIVE'
+        if entry['oldest'] is None or created_at < entry['oldest']:
+            entry['oldest'] = created_at
+
+    queue = sorted(pending.items(), key=lambda item: (not item[1]['active'], item[1]['oldest']))
+    stats = {
+        'assignments': 0,
+        'marks': 0,
+        'ranges': 0,
+        'remaining': max(0, len(queue) - max_assignments),
+        'failed': failed,
+    }
+    for assignment_id, entry in queue[:max_assignments]:
+        task_id = str(uuid.uuid4())
+        with transaction.atomic():
+            # Claim the marks; a concurrent dispatcher may have taken them
+            claimed = _due_marks().filter(id__in=entry['ids']).update(
+                dispatched_at=timezone.now(),
+                task_id=task_id,
+                attempts=F('attempts') + 1,
+            )
+        if not claimed:
+            continue
+        ranges = merge_ranges(entry['ranges'])
+        priority = (
+            settings.RECOMPUTE_PRIORITY_ACTIVE if entry['active']
+            else settings.RECOMPUTE_PRIORITY_INACTIVE
+        )
+        transaction.on_commit(
+            lambda assignment_id=assignment_id, ranges=ranges, task_id=task_id, priority=priority:
+            recompute_assignment_ranges.apply_async(
+                args=[assignment_id, [[start.isoformat(), end.isoformat()] for start, end in ranges]],
+                task_id=task_id,
+                priority=priority,
+            )
+        )
+        stats['assignments'] += 1
+        stats['marks'] += claimed
+        stats['ranges'] += len(ranges)
+
+    if stats['assignments']:
+        logger.info(
+            f"Recompute scheduler dispatched {stats['assignments']} assignments "
+            f"({stats['marks']} marks merged into {stats['ranges']} ranges), "
+            f"{stats['remaining']} left"
+        )
+    return stats
+
+
+def complete_marks(task_id: str) -> int:
+    """Mark the marks covered by a finished recompute task as completed."""
+    return RecomputeMark.objects.filter(task_id=task_id, completed_at__isnull=True).update(
+        completed_at=timezone.now()
+    )
+
+
+def prune_completed_marks() -> int:
+    """Delete completed marks older than RECOMPUTE_MARK_RETENTION_DAYS."""
+    cutoff = timezone.now() - timedelta(days=settings.RECOMPUTE_MARK_RETENTION_DAYS)
+    deleted, _ = RecomputeMark.objects.filter(completed_at__lt=cutoff).delete()
+    return deleted
+
+
+def scheduler_stats(window_hours: int = 24) -> Dict:
+    """
+    Queue depth, lag and merge ratio of the recompute scheduler.
+
+    - queue_depth: pending (not yet dispatched) marks
+    - lag_seconds: age of the oldest mark not yet completed or failed
+    - merge_ratio: marks per dispatched task over the last ``window_hours``
+    - failed_marks: marks given up after RECOMPUTE_MARK_MAX_ATTEMPTS dispatches
+    """
+    now = timezone.now()
+    open_marks = _open_marks()
+    pending = open_marks.filter(dispatched_at__isnull=True).aggregate(
+        depth=Count('id'),
+        active=Count('id', filter=Q(batch__status='ACTIVE')),
+        assignments=Count('assignment', distinct=True),
+    )
+    in_flight = open_marks.filter(dispatched_at__isnull=False).aggregate(
+        marks=Count('id'),
+        tasks=Count('task_id', distinct=True),
+        stale=Count('id', filter=Q(dispatched_at__lt=_stale_before())),
+    )
+    oldest = open_marks.aggregate(oldest=Min('created_at'))['oldest']
+    failed = RecomputeMark.objects.filter(
+        completed_at__isnull=True, failed_at__isnull=False
+    ).aggregate(marks=Count('id'), latest=Max('failed_at'))
+    recent = RecomputeMark.objects.filter(
+        dispatched_at__gte=now - timedelta(hours=window_hours)
+    ).aggregate(marks=Count('id'), tasks=Count('task_id', distinct=True))
+
+    return {
+        'queue_depth': pending['depth'],
+        'queue_depth_active_batches': pending['active'],
+        'pending_assignments': pending['assignments'],
+        'in_flight_marks': in_flight['marks'],
+        'in_flight_tasks': in_flight['tasks'],
+        'stale_marks': in_flight['stale'],
+        'failed_marks': failed['marks'],
+        'last_failed_at': failed['latest'].isoformat() if failed['latest'] else None,
+        'oldest_open_mark_at': oldest.isoformat() if oldest else None,
+        'lag_seconds': round((now - oldest).total_seconds(), 1) if oldest else 0.0,
+        'window_hours': window_hours,
+        'dispatched_marks': recent['marks'],
+        'dispatched_tasks': recent['tasks'],
+        'merge_ratio': round(recent['marks'] / recent['tasks'], 2) if recent['tasks'] else None,
+    }
@@ -3,35 +3,48 @@ Signal handlers for batch lifecycle management.
 
 This module contains signal handlers that manage:
 1. Automatic batch status transitions (existing)
-2. Growth assimilation recompute triggers (Issue #112 Phase 4)
+2. Batch live-state read model maintenance
+3. Growth assimilation recompute triggers (Issue #112 Phase 4)
+4. Aggregate cache invalidation for assignment and mortality writes
 
 Signal Flow:
     Event (GrowthSample, TransferAction, etc.) 
-    → Signal handler (lightweight, just enqueues task)
+    → Signal handler (lightweight, records a RecomputeMark for the window)
+    → Recompute scheduler (merges marks per assignment, one task each)
     → Celery task (heavy computation in background)
     → ActualDailyAssignmentState updated
     
 Test Data Generation:
-    Set SKIP_CELERY_SIGNALS=1 environment variable to disable Celery
-    task enqueueing during bulk data generation (prevents Redis connection spam).
+    Set SKIP_CELERY_SIGNALS=1 environment variable to disable recompute
+    marks during bulk data generation (prevents Redis connection spam).
 """
 import logging
 import os
+from django.db import transaction
 from django.db.models import Max
-from django.db.models.signals import post_save
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 
 from apps.batch.models import (
+    Batch,
+    BatchComposition,
     BatchContainerAssignment,
+    BatchLiveState,
+    BatchMixEvent,
+    BatchMixEventComponent,
     GrowthSample,
     TransferAction,
     MortalityEvent,
 )
+from apps.batch.services.live_state import BatchLiveStateService
+from apps.batch.services.mixed_lineage import MixedLineageService
+from aquamind.utils.aggregate_cache import TAG_ASSIGNMENTS, TAG_MORTALITY, invalidate_tags
+from aquamind.utils.cache_backend import default_cache_is_shared
 
 logger = logging.getLogger(__name__)
 
 
-def _should_skip_celery_signals():
+def should_skip_celery_signals():
     """
     Check if Celery signals should be skipped.
     
@@ -52,7 +65,7 @@ def _should_skip_celery_signals():
     return setting_value is True or setting_value == '1'
 
 
-# Legacy constant for backwards compatibility (use _should_skip_celery_signals() instead)
+# Legacy constant for backwards compatibility (use should_skip_celery_signals() instead)
 SKIP_CELERY_SIGNALS = os.environ.get('SKIP_CELERY_SIGNALS') == '1'
 
 
@@ -144,6 +157,105 @@ def check_batch_completion_on_assignment_change(sender, instance, **kwargs):
             )
 
 
+# ------------------------------------------------------------------
+# Batch Live State Maintenance
+# ------------------------------------------------------------------
+
+@receiver(post_save, sender=Batch)
+def create_batch_live_state(sender, instance, created, raw=False, **kwargs):
+    """Give every new batch an (empty) live-state row."""
+    if created and not raw:
+        BatchLiveState.objects.get_or_create(batch_id=instance.pk)
+
+
+@receiver(pre_save, sender=BatchContainerAssignment)
+def remember_assignment_batch(sender, instance, raw=False, **kwargs):
+    """Keep the stored batch_id so moving an assignment also refreshes the old batch."""
+    instance._previous_batch_id = None
+    if raw or instance._state.adding:
+        return
+    instance._previous_batch_id = (
+        BatchContainerAssignment.objects.filter(pk=instance.pk)
+        .values_list('batch_id', flat=True)
+        .first()
+    )
+
+
+@receiver(post_save, sender=BatchContainerAssignment)
+@receiver(post_delete, sender=BatchContainerAssignment)
+def refresh_batch_live_state(sender, instance, raw=False, origin=None, **kwargs):
+    """
+    Recompute the live state of the assignment's batch (and its previous
+    batch when the assignment moved) after an assignment write.
+
+    Runs synchronously so the read model commits (or rolls back) together
+    with the assignment. Skipped while the batch itself is being deleted,
+    since its live-state row is cascaded away in the same delete.
+    """
+    if raw:
+        return
+    if isinstance(origin, Batch) or getattr(origin, 'model', None) is Batch:
+        return
+    batch_ids = {instance.batch_id}
+    previous_batch_id = getattr(instance, '_previous_batch_id', None)
+    if previous_batch_id:
+        batch_ids.add(previous_batch_id)
+    BatchLiveStateService.rebuild(batch_ids)
+
+
+# ------------------------------------------------------------------
+# Mixed Lineage Cache Invalidation
+# ------------------------------------------------------------------
+
+@receiver(post_save, sender=BatchMixEvent)
+@receiver(post_delete, sender=BatchMixEvent)
+@receiver(post_save, sender=BatchMixEventComponent)
+@receiver(post_delete, sender=BatchMixEventComponent)
+@receiver(post_save, sender=BatchComposition)
+@receiver(post_delete, sender=BatchComposition)
+@receiver(post_delete, sender=Batch)
+def invalidate_mixed_lineage_cache(sender, instance, **kwargs):
+    """
+    Drop memoised mixed-lineage payloads once lineage input changes commit.
+
+    Bumping after commit keeps a concurrent reader from caching pre-commit
+    lineage under the new version.
+    """
+    transaction.on_commit(MixedLineageService.invalidate)
+
+
+@receiver(pre_save, sender=Batch)
+def remember_batch_lineage_fields(sender, instance, raw=False, update_fields=None, **kwargs):
+    """Keep the stored lineage fields so post_save can tell whether they changed."""
+    instance._previous_lineage_fields = None
+    if raw or instance._state.adding or not default_cache_is_shared():
+        return
+    fields = MixedLineageService.BATCH_LINEAGE_FIELDS
+    if update_fields is not None and not set(update_fields) & set(fields):
+        return
+    instance._previous_lineage_fields = (
+        Batch.objects.filter(pk=instance.pk).values_list(*fields).first()
+    )
+
+
+@receiver(post_save, sender=Batch)
+def invalidate_mixed_lineage_on_batch_change(sender, instance, created, raw=False, **kwargs):
+    """
+    Drop memoised lineage when a batch's number or type changes.
+
+    Payloads embed batch numbers/types and a batch turning MIXED changes how
+    the graph is traversed; other batch edits leave lineage untouched.
+    """
+    previous = getattr(instance, '_previous_lineage_fields', None)
+    if raw or created or previous is None:
+        return
+    current = tuple(
+        getattr(instance, field) for field in MixedLineageService.BATCH_LINEAGE_FIELDS
+    )
+    if current != previous:
+        transaction.on_commit(MixedLineageService.invalidate)
+
+
 # ------------------------------------------------------------------
 # Growth Assimilation Recompute Signals (Issue #112 Phase 4)
 # ------------------------------------------------------------------
@@ -169,7 +281,7 @@ def on_growth_sample_saved(sender, instance, created, **kwargs):
         **kwargs: Additional signal arguments
     """
     # Skip during test data generation (env var check)
-    if _should_skip_celery_signals():
+    if should_skip_celery_signals():
         return
     
     if not created:
@@ -177,39 +289,24 @@ def on_growth_sample_saved(sender, instance, created, **kwargs):
         logger.debug(f"Skipping recompute for GrowthSample update (id={instance.id})")
         return
     
-    try:
-        # Import here to avoid circular imports
-        from apps.batch.tasks import enqueue_recompute_with_deduplication
-        
-        assignment = instance.assignment
-        sample_date = instance.sample_date
-        
-        logger.debug(
-            f"Growth sample created for assignment {assignment.id} "
-            f"(batch={assignment.batch.batch_number}, date={sample_date}, "
-            f"avg_weight={instance.avg_weight_g}g)"
-        )
-        
-        # Enqueue recompute task (with deduplication)
-        task_id = enqueue_recompute_with_deduplication(
-            assignment_id=assignment.id,
-            trigger_date=sample_date,
-            window_days=2
-        )
-        
-        if task_id:
-            logger.info(
-                f"📋 Enqueued growth assimilation task {task_id} for "
-                f"assignment {assignment.id} after growth sample "
-                f"(window: {sample_date} ± 2 days)"
-            )
-    except Exception as e:
-        # Gracefully handle Celery/Redis unavailability (e.g., in CI tests)
-        logger.warning(
-            f"Could not enqueue growth assimilation task for assignment "
-            f"{instance.assignment.id}: {e}. This is normal in test/CI environments "
-            f"without Redis/Celery running."
-        )
+    # Import here to avoid circular imports
+    from apps.batch.services.recompute_scheduler import mark_assignment_dirty
+    
+    assignment = instance.assignment
+    sample_date = instance.sample_date
+    
+    logger.debug(
+        f"Growth sample created for assignment {assignment.id} "
+        f"(batch={assignment.batch.batch_number}, date={sample_date}, "
+        f"avg_weight={instance.avg_weight_g}g)"
+    )
+    
+    # Mark the window dirty; the recompute scheduler dispatches it
+    mark_assignment_dirty(assignment, sample_date, window_days=2, reason='growth_sample')
+    logger.info(
+        f"📋 Marked assignment {assignment.id} for growth assimilation "
+        f"recompute after growth sample (window: {sample_date} ± 2 days)"
+    )
 
 
 @receiver(post_save, sender=TransferAction)
@@ -233,7 +330,7 @@ def on_transfer_completed(sender, instance, created, **kwargs):
         **kwargs: Additional signal arguments
     """
     # Skip during test data generation (env var check)
-    if _should_skip_celery_signals():
+    if should_skip_celery_signals():
         return
     
     # Check if this transfer has measured weight
@@ -252,53 +349,39 @@ def on_transfer_completed(sender, instance, created, **kwargs):
         )
         return
     
-    try:
-        # Import here to avoid circular imports
-        from apps.batch.tasks import enqueue_recompute_with_deduplication
-        
-        # Get source assignment (where fish came from)
-        source_assignment = instance.source_assignment
-        if not source_assignment:
-            logger.warning(
-                f"TransferAction {instance.id} has no source_assignment, "
-                f"skipping recompute"
-            )
-            return
-        
-        # Use actual_execution_date (field name gotcha from handover)
-        execution_date = instance.actual_execution_date
-        if not execution_date:
-            logger.warning(
-                f"TransferAction {instance.id} has no actual_execution_date, "
-                f"skipping recompute"
-            )
-            return
-        
-        logger.debug(
-            f"Transfer completed with measured weight for assignment "
-            f"{source_assignment.id} (batch={source_assignment.batch.batch_number}, "
-            f"date={execution_date}, avg_weight={instance.measured_avg_weight_g}g)"
-        )
-        
-        # Enqueue recompute task (with deduplication)
-        task_id = enqueue_recompute_with_deduplication(
-            assignment_id=source_assignment.id,
-            trigger_date=execution_date,
-            window_days=2
+    # Import here to avoid circular imports
+    from apps.batch.services.recompute_scheduler import mark_assignment_dirty
+    
+    # Get source assignment (where fish came from)
+    source_assignment = instance.source_assignment
+    if not source_assignment:
+        logger.warning(
+            f"TransferAction {instance.id} has no source_assignment, "
+            f"skipping recompute"
         )
-        
-        if task_id:
-            logger.info(
-                f"📋 Enqueued growth assimilation task {task_id} for "
-                f"assignment {source_assignment.id} after transfer "
-                f"(window: {execution_date} ± 2 days)"
-            )
-    except Exception as e:
-        # Gracefully handle Celery/Redis unavailability
+        return
+    
+    # Use actual_execution_date (field name gotcha from handover)
+    execution_date = instance.actual_execution_date
+    if not execution_date:
         logger.warning(
-            f"Could not enqueue growth assimilation task after transfer "
-            f"{instance.id}: {e}. Normal in test/CI without Redis/Celery."
+            f"TransferAction {instance.id} has no actual_execution_date, "
+            f"skipping recompute"
         )
+        return
+    
+    logger.debug(
+        f"Transfer completed with measured weight for assignment "
+        f"{source_assignment.id} (batch={source_assignment.batch.batch_number}, "
+        f"date={execution_date}, avg_weight={instance.measured_avg_weight_g}g)"
+    )
+    
+    # Mark the window dirty; the recompute scheduler dispatches it
+    mark_assignment_dirty(source_assignment, execution_date, window_days=2, reason='transfer')
+    logger.info(
+        f"📋 Marked assignment {source_assignment.id} for growth assimilation "
+        f"recompute after transfer (window: {execution_date} ± 2 days)"
+    )
 
 
 @receiver(post_save, sender=MortalityEvent)
@@ -322,7 +405,7 @@ def on_mortality_event(sender, instance, created, **kwargs):
         **kwargs: Additional signal arguments
     """
     # Skip during test data generation (env var check)
-    if _should_skip_celery_signals():
+    if should_skip_celery_signals():
         return
     
     if not created:
@@ -330,36 +413,24 @@ def on_mortality_event(sender, instance, created, **kwargs):
         logger.debug(f"Skipping recompute for MortalityEvent update (id={instance.id})")
         return
     
-    try:
-        # Import here to avoid circular imports
-        from apps.batch.tasks import enqueue_batch_recompute
-        
-        batch = instance.batch
-        event_date = instance.event_date
-        
-        logger.debug(
-            f"Mortality event created for batch {batch.batch_number} "
-            f"(date={event_date}, count={instance.count})"
-        )
-        
-        # Enqueue batch-level recompute task (no deduplication needed)
-        task_id = enqueue_batch_recompute(
-            batch_id=batch.id,
-            trigger_date=event_date,
-            window_days=1
-        )
-        
-        logger.info(
-            f"📋 Enqueued batch-level growth assimilation task {task_id} for "
-            f"batch {batch.batch_number} after mortality event "
-            f"(window: {event_date} ± 1 day)"
-        )
-    except Exception as e:
-        # Gracefully handle Celery/Redis unavailability
-        logger.warning(
-            f"Could not enqueue batch recompute task after mortality event "
-            f"{instance.id}: {e}. Normal in test/CI without Redis/Celery."
-        )
+    # Import here to avoid circular imports
+    from apps.batch.services.recompute_scheduler import mark_batch_dirty
+    
+    batch = instance.batch
+    event_date = instance.event_date
+    
+    logger.debug(
+        f"Mortality event created for batch {batch.batch_number} "
+        f"(date={event_date}, count={instance.count})"
+    )
+    
+    # Mark the window dirty on every overlapping assignment
+    marked = mark_batch_dirty(batch, event_date, window_days=1, reason='mortality')
+    logger.info(
+        f"📋 Marked {marked} assignments of batch {batch.batch_number} for "
+        f"growth assimilation recompute after mortality event "
+        f"(window: {event_date} ± 1 day)"
+    )
 
 
 # ------------------------------------------------------------------
@@ -389,7 +460,7 @@ def on_planned_activity_completed(sender, instance, **kwargs):
         **kwargs: Additional signal arguments (created, etc.)
     """
     # Skip during test data generation (env var check)
-    if _should_skip_celery_signals():
+    if should_skip_celery_signals():
         return
     
     # Only trigger when status CHANGES to COMPLETED (not on every save of completed activity)
@@ -421,46 +492,48 @@ def on_planned_activity_completed(sender, instance, **kwargs):
         )
         return
     
-    try:
-        # Import here to avoid circular imports
-        from apps.batch.tasks import enqueue_batch_recompute
-        
-        batch = instance.batch
-        
-        # Use completed_at date, or due_date as fallback
-        # Handle both datetime objects (from DB) and date objects (from tests/manual creation)
-        if instance.completed_at:
-            trigger_date = (
-                instance.completed_at.date() 
-                if hasattr(instance.completed_at, 'date') 
-                else instance.completed_at
-            )
-        else:
-            trigger_date = instance.due_date
-        
-        logger.debug(
-            f"PlannedActivity completed for batch {batch.batch_number} "
-            f"(type={instance.activity_type}, date={trigger_date})"
-        )
-        
-        # Enqueue batch-level recompute task
-        task_id = enqueue_batch_recompute(
-            batch_id=batch.id,
-            trigger_date=trigger_date,
-            window_days=2
-        )
-        
-        logger.info(
-            f"📋 Enqueued growth assimilation task {task_id} for "
-            f"batch {batch.batch_number} after {instance.activity_type} activity "
-            f"completed (window: {trigger_date} ± 2 days)"
-        )
-    except Exception as e:
-        # Gracefully handle Celery/Redis unavailability
-        logger.warning(
-            f"Could not enqueue recompute task after PlannedActivity "
-            f"{instance.id} completion: {e}. Normal in test/CI without Redis/Celery."
+    # Import here to avoid circular imports
+    from apps.batch.services.recompute_scheduler import mark_batch_dirty
+    
+    batch = instance.batch
+    
+    # Use completed_at date, or due_date as fallback
+    # Handle both datetime objects (from DB) and date objects (from tests/manual creation)
+    if instance.completed_at:
+        trigger_date = (
+            instance.completed_at.date() 
+            if hasattr(instance.completed_at, 'date') 
+            else instance.completed_at
         )
+    else:
+        trigger_date = instance.due_date
+    
+    logger.debug(
+        f"PlannedActivity completed for batch {batch.batch_number} "
+        f"(type={instance.activity_type}, date={trigger_date})"
+    )
+    
+    # Mark the window dirty on every overlapping assignment
+    marked = mark_batch_dirty(batch, trigger_date, window_days=2, reason='planned_activity')
+    logger.info(
+        f"📋 Marked {marked} assignments of batch {batch.batch_number} for "
+        f"growth assimilation recompute after {instance.activity_type} activity "
+        f"completed (window: {trigger_date} ± 2 days)"
+    )
+
+
+@receiver(post_save, sender=BatchContainerAssignment)
+@receiver(post_delete, sender=BatchContainerAssignment)
+def invalidate_assignment_aggregates(sender, instance, **kwargs):
+    """Expire cached aggregates (summaries, overview) that read assignments."""
+    transaction.on_commit(lambda: invalidate_tags(TAG_ASSIGNMENTS))
+
+
+@receiver(post_save, sender=MortalityEvent)
+@receiver(post_delete, sender=MortalityEvent)
+def invalidate_mortality_aggregates(sender, instance, **kwargs):
+    """Expire cached aggregates that read mortality."""
+    transaction.on_commit(lambda: invalidate_tags(TAG_MORTALITY))
 
 
 def register_planning_signals():
@@ -4,15 +4,19 @@ Celery tasks for batch growth assimilation and live forward projections.
 This module contains asynchronous tasks for:
 1. Recomputing actual daily states when operational events occur
 2. Computing live forward projections (nightly scheduled task)
+3. Creating missing batch live-state rows (periodic)
 
 Architecture:
-- Lightweight signal handlers enqueue tasks (don't block requests)
+- Lightweight signal handlers record dirty marks (don't block requests)
+- The recompute scheduler merges marks and dispatches one task per assignment
 - Celery workers execute heavy computation in background
-- Redis provides task queue and deduplication
 - Tasks are idempotent (safe to run multiple times)
 
 Usage:
-    # From signal handler
+    # From the recompute scheduler (apps.batch.services.recompute_scheduler)
+    recompute_assignment_ranges.apply_async(args=[assignment_id, ranges], priority=0)
+
+    # Single window
     recompute_assignment_window.delay(assignment_id, start_date, end_date)
 
     # From management command
@@ -31,14 +35,23 @@ Issue: #112 - Phase 4 (Event-Driven Recompute)
 Issue: Live Forward Projection Feature
 """
 import logging
-from datetime import date, timedelta
-from typing import Dict, Optional
+from datetime import date
+from typing import Dict, List, Optional
 
 from celery import shared_task
 from django.core.cache import cache
 from django.db import transaction
 
 from apps.batch.models import BatchContainerAssignment, Batch
+from apps.batch.services.batch_daily_data import daily_data_scope
+from apps.batch.services.live_state import BatchLiveStateService
+from apps.batch.services.recompute_scheduler import (
+    DISPATCH_REQUESTED_KEY,
+    complete_marks,
+    dispatch_pending,
+    prune_completed_marks,
+    request_dispatch,
+)
 from apps.batch.services.growth_assimilation import (
     GrowthAssimilationEngine,
     recompute_batch_assignments
@@ -47,56 +60,6 @@ from apps.batch.services.growth_assimilation import (
 logger = logging.getLogger(__name__)
 
 
-# ------------------------------------------------------------------
-# Deduplication Helpers
-# ------------------------------------------------------------------
-
-def get_dedup_key(assignment_id: int, trigger_date: date) -> str:
-    """
-    Generate Redis key for deduplication tracking.
-    
-    Key format: "growth_assimilation:dedup:{assignment_id}:{date}"
-    
-    Args:
-        assignment_id: BatchContainerAssignment ID
-        trigger_date: Date that triggered the recompute
-        
-    Returns:
-        Redis key string
-    """
-    return f"growth_assimilation:dedup:{assignment_id}:{trigger_date.isoformat()}"
-
-
-def should_enqueue_task(assignment_id: int, trigger_date: date, ttl_seconds: int = 300) -> bool:
-    """
-    Check if task should be enqueued (deduplication).
-    
-    Multiple events on the same day (e.g., 2 growth samples) should only
-    trigger one recompute task. Uses Redis SET with TTL for tracking.
-    
-    Args:
-        assignment_id: BatchContainerAssignment ID
-        trigger_date: Date that triggered the recompute
-        ttl_seconds: TTL for dedup key (default 5 minutes)
-        
-    Returns:
-        True if task should be enqueued, False if already queued
-    """
-    key = get_dedup_key(assignment_id, trigger_date)
-    
-    # Try to set key with NX (only if not exists)
-    # cache.add() returns True if key was set, False if already exists
-    was_set = cache.add(key, '1', timeout=ttl_seconds)
-    
-    if not was_set:
-        logger.debug(
-            f"Deduplication: Skipping task for assignment {assignment_id} "
-            f"on {trigger_date} (already queued)"
-        )
-    
-    return was_set
-
-
 # ------------------------------------------------------------------
 # Task: Assignment-Level Recompute
 # ------------------------------------------------------------------
@@ -153,20 +116,22 @@ def recompute_assignment_window(
                 'assignment_id': assignment_id,
             }
         
-        # Run engine
-        with transaction.atomic():
+        # Run engine (daily inputs preloaded in one set of batch-level queries)
+        with transaction.atomic(), daily_data_scope():
             engine = GrowthAssimilationEngine(assignment)
             result = engine.recompute_range(start, end)
         
         logger.info(
             f"✅ [Task {self.request.id}] Completed assignment {assignment_id}: "
-            f"created={result['rows_created']}, updated={result['rows_updated']}"
+            f"created={result['rows_created']}, updated={result['rows_updated']}, "
+            f"unchanged={result.get('rows_unchanged', 0)}"
         )
         
         return {
             'success': True,
             'rows_created': result['rows_created'],
             'rows_updated': result['rows_updated'],
+            'rows_unchanged': result.get('rows_unchanged', 0),
             'assignment_id': assignment_id,
             'date_range': f"{start} to {end}",
         }
@@ -246,7 +211,8 @@ def recompute_batch_window(
             f"✅ [Task {self.request.id}] Completed batch {batch.batch_number}: "
             f"assignments={result['assignments_processed']}, "
             f"created={result['total_rows_created']}, "
-            f"updated={result['total_rows_updated']}"
+            f"updated={result['total_rows_updated']}, "
+            f"unchanged={result['total_rows_unchanged']}"
         )
         
         return {
@@ -255,6 +221,7 @@ def recompute_batch_window(
             'assignments_processed': result['assignments_processed'],
             'total_rows_created': result['total_rows_created'],
             'total_rows_updated': result['total_rows_updated'],
+            'total_rows_unchanged': result['total_rows_unchanged'],
             'date_range': f"{start} to {end}",
         }
         
@@ -269,107 +236,120 @@ def recompute_batch_window(
 
 
 # ------------------------------------------------------------------
-# Helper: Enqueue with Deduplication
+# Task: Recompute Scheduler
 # ------------------------------------------------------------------
 
-def enqueue_recompute_with_deduplication(
+@shared_task(bind=True)
+def dispatch_recompute_marks(self) -> Dict:
+    """
+    Dispatch pending recompute marks (one task per dirty assignment).
+
+    Requested after commit by the signal handlers and run every minute by
+    Celery Beat as a safety net. Completed marks past their retention are
+    pruned on the way.
+
+    Returns:
+        dict with assignments, marks and ranges dispatched, assignments left
+        for the next run, marks failed and marks pruned
+    """
+    # Marks recorded from now on need another run
+    cache.delete(DISPATCH_REQUESTED_KEY)
+    result = dispatch_pending()
+    result['pruned'] = prune_completed_marks()
+    if result['remaining']:
+        request_dispatch()
+    return result
+
+
+@shared_task(bind=True, max_retries=3, default_retry_delay=60)
+def recompute_assignment_ranges(
+    self,
     assignment_id: int,
-    trigger_date: date,
-    window_days: int = 2
-) -> Optional[str]:
+    ranges: List[List[str]]
+) -> Dict:
     """
-    Enqueue assignment recompute task with deduplication.
-    
-    This is the primary function called by signal handlers. It checks if a
-    task is already queued for this assignment/date and only enqueues if not.
-    
+    Recompute actual daily states for one assignment over merged date ranges.
+
+    Dispatched by the recompute scheduler with the assignment's dirty marks
+    merged into the minimal set of ranges. The marks dispatched with this
+    task's id are completed when it finishes; if it never does, they are
+    dispatched again once stale.
+
     Args:
         assignment_id: BatchContainerAssignment ID
-        trigger_date: Date that triggered the recompute (e.g., sample date)
-        window_days: Number of days before/after trigger to recompute (default 2)
-        
+        ranges: [start_date, end_date] ISO date string pairs, sorted and
+            non-overlapping
+
     Returns:
-        Task ID if enqueued, None if deduplicated
-        
-    Example:
-        # From signal handler
-        enqueue_recompute_with_deduplication(
-            assignment_id=sample.assignment.id,
-            trigger_date=sample.sample_date,
-            window_days=2
-        )
+        dict with success, rows created/updated/unchanged and marks completed
     """
-    # Check deduplication
-    if not should_enqueue_task(assignment_id, trigger_date):
-        return None
-    
-    # Calculate window
-    start_date = trigger_date - timedelta(days=window_days)
-    end_date = trigger_date + timedelta(days=window_days)
-    
-    # Enqueue task
-    result = recompute_assignment_window.delay(
-        assignment_id,
-        start_date.isoformat(),
-        end_date.isoformat()
-    )
-    
-    logger.info(
-        f"📋 Enqueued task {result.id} for assignment {assignment_id} "
-        f"(trigger={trigger_date}, window={start_date} to {end_date})"
-    )
-    
-    return result.id
+    try:
+        assignment = BatchContainerAssignment.objects.select_related(
+            'batch', 'container'
+        ).filter(id=assignment_id).first()
+        if assignment is None:
+            logger.error(f"Assignment {assignment_id} not found")
+            return {
+                'success': False,
+                'error': 'Assignment not found',
+                'assignment_id': assignment_id,
+            }
+
+        totals = {'rows_created': 0, 'rows_updated': 0, 'rows_unchanged': 0}
+        with transaction.atomic(), daily_data_scope():
+            engine = GrowthAssimilationEngine(assignment)
+            for start_date, end_date in ranges:
+                result = engine.recompute_range(
+                    date.fromisoformat(start_date), date.fromisoformat(end_date)
+                )
+                for key in totals:
+                    totals[key] += result.get(key, 0)
+            completed = complete_marks(self.request.id)
+
+        logger.info(
+            f"✅ [Task {self.request.id}] Completed assignment {assignment_id} "
+            f"({len(ranges)} ranges, {completed} marks): "
+            f"created={totals['rows_created']}, updated={totals['rows_updated']}, "
+            f"unchanged={totals['rows_unchanged']}"
+        )
+
+        return {
+            'success': True,
+            'assignment_id': assignment_id,
+            'ranges': ranges,
+            'marks_completed': completed,
+            **totals,
+        }
+
+    except Exception as exc:
+        logger.error(
+            f"❌ [Task {self.request.id}] Failed assignment {assignment_id}: {exc}",
+            exc_info=True
+        )
+
+        # Retry with exponential backoff
+        raise self.retry(exc=exc)
 
 
 # ------------------------------------------------------------------
-# Helper: Enqueue Batch Recompute
+# Task: Batch Live State
 # ------------------------------------------------------------------
 
-def enqueue_batch_recompute(
-    batch_id: int,
-    trigger_date: date,
-    window_days: int = 1
-) -> str:
-    """
-    Enqueue batch-level recompute task (no deduplication).
-    
-    Used for batch-level events (mortality) that affect all assignments.
-    No deduplication since batch-level events are less frequent.
-    
-    Args:
-        batch_id: Batch ID
-        trigger_date: Date that triggered the recompute
-        window_days: Number of days before/after trigger (default 1)
-        
-    Returns:
-        Task ID
-        
-    Example:
-        # From mortality event signal
-        enqueue_batch_recompute(
-            batch_id=mortality_event.batch.id,
-            trigger_date=mortality_event.event_date,
-            window_days=1
-        )
+@shared_task(bind=True)
+def rebuild_missing_batch_live_state(self) -> Dict:
     """
-    # Calculate window
-    start_date = trigger_date - timedelta(days=window_days)
-    end_date = trigger_date + timedelta(days=window_days)
-
-    # Enqueue task
-    result = recompute_batch_window.delay(
-        batch_id,
-        start_date.isoformat(),
-        end_date.isoformat()
-    )
+    Create live-state rows for batches that have none.
 
-    logger.info(
-        f"📋 Enqueued batch task {result.id} for batch {batch_id} "
-        f"(trigger={trigger_date}, window={start_date} to {end_date})"
-    )
+    Batches written without signals (bulk_create, fixtures) have no row;
+    reads compute their state unsaved until this task persists it.
 
-    return result.id
+    Returns:
+        dict with the number of rows created
+    """
+    states = BatchLiveStateService.rebuild_missing()
+    if states:
+        logger.info(f"Created live state for {len(states)} batch(es)")
+    return {'rebuilt': len(states)}
 
 
 # ------------------------------------------------------------------
@@ -424,7 +404,7 @@ def compute_all_live_forward_projections(self) -> Dict:
         'batch__pinned_projection_run__scenario__tgc_model__profile',
         'batch__pinned_projection_run__scenario__mortality_model',
         'container'
-    ).distinct()
+    ).distinct().order_by('batch_id', 'id')
 
     stats = {
         'assignments_processed': 0,
@@ -434,31 +414,33 @@ def compute_all_live_forward_projections(self) -> Dict:
         'computed_date': computed_date.isoformat(),
     }
 
-    for assignment in active_assignments:
-        try:
-            engine = LiveProjectionEngine(assignment)
-            result = engine.compute_and_store(computed_date=computed_date)
-
-            if result.get('success'):
-                stats['assignments_processed'] += 1
-                stats['total_rows_created'] += result.get('rows_created', 0)
-            else:
-                stats['assignments_skipped'] += 1
-                if result.get('error'):
-                    stats['errors'].append({
-                        'assignment_id': assignment.id,
-                        'error': result['error'],
-                    })
-
-        except Exception as e:
-            logger.error(
-                f"Error computing projection for assignment {assignment.id}: "
-                f"{e}", exc_info=True
-            )
-            stats['errors'].append({
-                'assignment_id': assignment.id,
-                'error': str(e),
-            })
+    # Assignments are grouped by batch so shared inputs are loaded once
+    with daily_data_scope():
+        for assignment in active_assignments:
+            try:
+                engine = LiveProjectionEngine(assignment)
+                result = engine.compute_and_store(computed_date=computed_date)
+
+                if result.get('success'):
+                    stats['assignments_processed'] += 1
+                    stats['total_rows_created'] += result.get('rows_created', 0)
+                else:
+                    stats['assignments_skipped'] += 1
+                    if result.get('error'):
+                        stats['errors'].append({
+                            'assignment_id': assignment.id,
+                            'error': result['error'],
+                        })
+
+            except Exception as e:
+                logger.error(
+                    f"Error computing projection for assignment {assignment.id}: "
+                    f"{e}", exc_info=True
+                )
+                stats['errors'].append({
+                    'assignment_id': assignment.id,
+                    'error': str(e),
+                })
 
     logger.info(
         f"✅ [Task] Live projection complete: "
@@ -0,0 +1,170 @@
+"""
+Tests for the batch-scoped daily input preload (BatchDailyData).
+
+Engines must compute the same states with and without a daily data scope,
+with far fewer queries inside one; the scope's cache is LRU-bounded.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from apps.batch.models import ActualDailyAssignmentState, Batch, MortalityEvent
+from apps.batch.services.batch_daily_data import (
+    DailyDataCache,
+    daily_data_scope,
+    get_batch_data,
+)
+from apps.batch.services.growth_assimilation import (
+    GrowthAssimilationEngine,
+    recompute_batch_assignments,
+)
+from apps.batch.services.growth_assimilation_optimized import OptimizedGrowthAssimilationEngine
+from apps.batch.tests import test_phase3_core_engine as core
+from apps.environmental.models import EnvironmentalReading
+
+# Daily input tables; state writes and model lookups are not preloaded
+INPUT_TABLES = (
+    'environmental_environmentalreading', 'batch_mortalityevent', 'inventory_feedingevent',
+    'batch_transferaction', 'batch_growthsample', 'scenario_stageconstraint',
+)
+
+MAX_PRELOADED_INPUT_QUERIES = 8
+
+STATE_FIELDS = (
+    'date', 'avg_weight_g', 'population', 'biomass_kg', 'temp_c', 'mortality_count',
+    'lifecycle_stage_id', 'sources', 'confidence_scores',
+)
+
+
+class BatchDailyDataTest(TestCase):
+
+    setUp = core.GrowthAssimilationCoreTestCase.setUp
+
+    def _add_temperature(self, day, value):
+        EnvironmentalReading.objects.create(
+            parameter=self.temp_parameter,
+            container=self.container,
+            value=Decimal(value),
+            reading_time=timezone.make_aware(
+                timezone.datetime.combine(day, timezone.datetime.min.time())
+            ),
+        )
+
+    def _add_inputs(self):
+        # Readings on days 1 and 4 only, so days 2-3 are interpolated
+        self._add_temperature(date(2024, 1, 1), '10.0')
+        self._add_temperature(date(2024, 1, 4), '13.0')
+        MortalityEvent.objects.create(
+            batch=self.batch,
+            assignment=self.assignment,
+            event_date=date(2024, 1, 2),
+            count=5,
+            biomass_kg=Decimal('0.01'),
+        )
+
+    def _states(self):
+        return list(
+            ActualDailyAssignmentState.objects.filter(assignment=self.assignment)
+            .order_by('date').values(*STATE_FIELDS)
+        )
+
+    def _recompute(self, engine_class, scoped):
+        ActualDailyAssignmentState.objects.filter(assignment=self.assignment).delete()
+        with CaptureQueriesContext(connection) as queries:
+            if scoped:
+                with daily_data_scope():
+                    engine_class(self.assignment).recompute_range(date(2024, 1, 1), date(2024, 1, 10))
+            else:
+                engine_class(self.assignment).recompute_range(date(2024, 1, 1), date(2024, 1, 10))
+        input_queries = [
+            query for query in queries.captured_queries
+            if query['sql'].startswith('SELECT') and any(table in query['sql'] for table in INPUT_TABLES)
+        ]
+        return self._states(), len(input_queries)
+
+    def test_preloaded_recompute_matches_per_day_queries(self):
+        self._add_inputs()
+
+        baseline, baseline_queries = self._recompute(GrowthAssimilationEngine, scoped=False)
+        preloaded, preloaded_queries = self._recompute(GrowthAssimilationEngine, scoped=True)
+
+        self.assertEqual(len(baseline), 10)
+        self.assertEqual(preloaded, baseline)
+        self.assertEqual(baseline[1]['sources']['temp'], 'interpolated')
+        self.assertEqual(baseline[1]['mortality_count'], 5)
+        # One grouped query per input (plus the initial-state transfer
+        # lookups) instead of several per day
+        self.assertLessEqual(preloaded_queries, MAX_PRELOADED_INPUT_QUERIES)
+        self.assertGreater(baseline_queries, 3 * preloaded_queries)
+
+    def test_optimized_engine_uses_the_same_preload(self):
+        self._add_inputs()
+
+        baseline, baseline_queries = self._recompute(OptimizedGrowthAssimilationEngine, scoped=False)
+        preloaded, preloaded_queries = self._recompute(OptimizedGrowthAssimilationEngine, scoped=True)
+
+        self.assertEqual(preloaded, baseline)
+        self.assertLessEqual(preloaded_queries, baseline_queries)
+        self.assertLessEqual(preloaded_queries, MAX_PRELOADED_INPUT_QUERIES)
+
+    def test_interpolated_temperature(self):
+        self._add_inputs()
+        engine = GrowthAssimilationEngine(self.assignment)
+
+        with daily_data_scope():
+            engine.daily_data = get_batch_data(self.batch, date(2024, 1, 1), date(2024, 1, 10))
+            temp, source, confidence = engine._get_temperature(date(2024, 1, 2))
+            fallback_source = engine._get_temperature(date(2024, 1, 11))[1]
+
+        self.assertEqual(source, 'interpolated')
+        self.assertAlmostEqual(temp, 11.0)
+        self.assertLess(confidence, 1.0)
+        # Outside the loaded window the engine queries as before
+        self.assertEqual(fallback_source, 'nearest_before')
+
+    def test_batch_recompute_loads_the_batch_once(self):
+        self._add_inputs()
+
+        result = recompute_batch_assignments(self.batch.id, date(2024, 1, 1), date(2024, 1, 10))
+
+        # The mortality event's signal already recomputed a few days
+        self.assertEqual(
+            result['total_rows_created'] + result['total_rows_updated'] + result['total_rows_unchanged'], 10
+        )
+        self.assertEqual(self._states()[3]['temp_c'], Decimal('13.00'))
+
+    def test_no_data_outside_a_scope(self):
+        self.assertIsNone(get_batch_data(self.batch, date(2024, 1, 1), date(2024, 1, 10)))
+
+        with daily_data_scope() as cache:
+            data = get_batch_data(self.batch, date(2024, 1, 1), date(2024, 1, 10), self.assignment.id)
+            with daily_data_scope() as nested:
+                self.assertIs(nested, cache)
+            # A wider window reloads; a narrower one is served from the cache
+            get_batch_data(self.batch, date(2024, 1, 1), date(2024, 1, 20))
+            get_batch_data(self.batch, date(2024, 1, 5), date(2024, 1, 6))
+
+        self.assertTrue(data.covers(self.assignment.id, date(2024, 1, 2), date(2024, 1, 3)))
+        self.assertEqual((cache.loads, cache.hits), (2, 1))
+        self.assertIsNone(get_batch_data(self.batch, date(2024, 1, 1), date(2024, 1, 10)))
+
+    def test_cache_evicts_least_recently_used_batch(self):
+        other = Batch.objects.create(
+            batch_number=f'{self.batch.batch_number}-B',
+            species=self.species,
+            lifecycle_stage=self.stage,
+            start_date=date(2024, 1, 1),
+            status='ACTIVE',
+        )
+        cache = DailyDataCache(max_batches=1)
+        window = (date(2024, 1, 1), date(2024, 1, 1) + timedelta(days=9))
+
+        cache.batch_data(self.batch, *window)
+        cache.batch_data(other, *window)
+        cache.batch_data(self.batch, *window)
+
+        self.assertEqual((cache.loads, cache.evictions, cache.hits), (3, 2, 0))
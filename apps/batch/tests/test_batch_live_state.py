@@ -0,0 +1,196 @@
+"""
+Tests for the BatchLiveState read model.
+
+Covers signal-driven maintenance from assignment writes, read-only
+fallback for missing rows, the rebuild command, and the batch list endpoint reading it without per-row queries.
+"""
+from datetime import date
+from decimal import Decimal
+from io import StringIO
+
+from django.core.management import call_command
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.batch.models import Batch, BatchContainerAssignment, BatchLiveState
+from apps.batch.services.live_state import BatchLiveStateService
+from apps.batch.tests.api.test_utils import (
+    create_test_batch,
+    create_test_batch_container_assignment,
+    create_test_container,
+    create_test_lifecycle_stage,
+    create_test_species,
+    create_test_user,
+)
+from tests.base import BaseAPITestCase
+
+
+class BatchLiveStateMaintenanceTests(TestCase):
+    """Live state follows assignment writes and matches the model properties."""
+
+    def setUp(self):
+        self.species = create_test_species(name="Atlantic Salmon")
+        self.fry = create_test_lifecycle_stage(species=self.species, name="Fry", order=2)
+        self.parr = create_test_lifecycle_stage(species=self.species, name="Parr", order=3)
+        self.batch = create_test_batch(
+            species=self.species, lifecycle_stage=self.fry, batch_number="LS-001"
+        )
+        self.tank_a = create_test_container(name="Tank A")
+        self.tank_b = create_test_container(name="Tank B")
+
+    def _state(self):
+        return BatchLiveState.objects.get(batch=self.batch)
+
+    def _assert_matches_properties(self):
+        state = self._state()
+        batch = Batch.objects.get(pk=self.batch.pk)
+        self.assertEqual(state.population_count, batch.calculated_population_count)
+        self.assertEqual(state.biomass_kg, batch.calculated_biomass_kg)
+        self.assertEqual(
+            state.avg_weight_g,
+            batch.calculated_avg_weight_g.quantize(Decimal('0.000001')),
+        )
+
+    def test_new_batch_gets_empty_live_state(self):
+        state = self._state()
+        self.assertEqual(state.population_count, 0)
+        self.assertEqual(state.biomass_kg, Decimal('0.00'))
+        self.assertIsNone(state.current_lifecycle_stage)
+        self.assertEqual(state.active_container_ids, [])
+
+    def test_assignment_writes_refresh_live_state(self):
+        first = create_test_batch_container_assignment(
+            batch=self.batch, container=self.tank_a, lifecycle_stage=self.fry,
+            population_count=1000, avg_weight_g=Decimal("10.00"),
+        )
+        second = BatchContainerAssignment.objects.create(
+            batch=self.batch, container=self.tank_b, lifecycle_stage=self.parr,
+            population_count=3000, avg_weight_g=Decimal("20.00"),
+            assignment_date=date.today(), is_active=True,
+        )
+        state = self._state()
+        self.assertEqual(state.population_count, 4000)
+        self.assertEqual(state.biomass_kg, Decimal('70.00'))
+        self.assertEqual(state.avg_weight_g, Decimal('17.500000'))
+        self.assertEqual(state.current_lifecycle_stage, self.parr)
+        self.assertEqual(state.active_container_ids, [self.tank_b.id, self.tank_a.id])
+        self._assert_matches_properties()
+
+        second.is_active = False
+        second.departure_date = date.today()
+        second.save()
+        state = self._state()
+        self.assertEqual(state.population_count, 1000)
+        self.assertEqual(state.current_lifecycle_stage, self.fry)
+        self.assertEqual(state.active_container_ids, [self.tank_a.id])
+        self._assert_matches_properties()
+
+        first.delete()
+        state = self._state()
+        self.assertEqual(state.population_count, 0)
+        self.assertEqual(state.active_container_ids, [])
+
+    def test_batch_delete_cascades_live_state(self):
+        create_test_batch_container_assignment(
+            batch=self.batch, container=self.tank_a, lifecycle_stage=self.fry,
+        )
+        batch_id = self.batch.pk
+        self.batch.delete()
+        self.assertFalse(BatchLiveState.objects.filter(batch_id=batch_id).exists())
+
+    def test_moving_assignment_refreshes_both_batches(self):
+        other = create_test_batch(
+            species=self.species, lifecycle_stage=self.fry, batch_number="LS-002"
+        )
+        assignment = create_test_batch_container_assignment(
+            batch=self.batch, container=self.tank_a, lifecycle_stage=self.fry,
+            population_count=700,
+        )
+
+        assignment.batch = other
+        assignment.save()
+
+        self.assertEqual(self._state().population_count, 0)
+        self.assertEqual(self._state().active_container_ids, [])
+        self.assertEqual(BatchLiveState.objects.get(batch=other).population_count, 700)
+
+    def test_missing_row_is_computed_on_read_without_writing(self):
+        create_test_batch_container_assignment(
+            batch=self.batch, container=self.tank_a, lifecycle_stage=self.fry,
+            population_count=500,
+        )
+        BatchLiveState.objects.filter(batch=self.batch).delete()
+
+        state = BatchLiveStateService.for_batch(Batch.objects.get(pk=self.batch.pk))
+
+        self.assertEqual(state.population_count, 500)
+        self.assertFalse(BatchLiveState.objects.filter(batch=self.batch).exists())
+
+        call_command('rebuild_batch_live_state', '--missing', stdout=StringIO())
+        self.assertEqual(self._state().population_count, 500)
+
+    def test_rebuild_command_repairs_drift(self):
+        create_test_batch_container_assignment(
+            batch=self.batch, container=self.tank_a, lifecycle_stage=self.fry,
+            population_count=800, avg_weight_g=Decimal("5.00"),
+        )
+        # Simulate a bulk import that bypassed signals
+        BatchContainerAssignment.objects.filter(batch=self.batch).update(population_count=900)
+
+        out = StringIO()
+        call_command('rebuild_batch_live_state', '--check', stdout=out)
+        self.assertIn('stale', out.getvalue())
+        self.assertEqual(self._state().population_count, 800)
+
+        call_command('rebuild_batch_live_state', stdout=StringIO())
+        self.assertEqual(self._state().population_count, 900)
+
+        out = StringIO()
+        call_command('rebuild_batch_live_state', '--check', stdout=out)
+        self.assertIn('current', out.getvalue())
+
+
+class BatchListLiveStateQueryTests(BaseAPITestCase):
+    """The batch list serializes current metrics without per-row queries."""
+
+    def setUp(self):
+        self.user = create_test_user()
+        self.client.force_authenticate(user=self.user)
+        self.species = create_test_species(name="Atlantic Salmon")
+        self.stage = create_test_lifecycle_stage(species=self.species, name="Fry", order=2)
+
+    def _add_batches(self, start, count):
+        for index in range(start, start + count):
+            batch = create_test_batch(
+                species=self.species, lifecycle_stage=self.stage, batch_number=f"LQ-{index:03d}"
+            )
+            for tank in range(2):
+                create_test_batch_container_assignment(
+                    batch=batch,
+                    container=create_test_container(name=f"LQ Tank {index}-{tank}"),
+                    lifecycle_stage=self.stage,
+                    population_count=1000 + tank,
+                )
+
+    def _list_query_count(self):
+        url = self.get_api_url('batch', 'batches')
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return len(ctx.captured_queries), response
+
+    def test_query_count_does_not_grow_with_rows(self):
+        self._add_batches(0, 2)
+        # Warm-up request so one-off lookups are not counted against either page
+        self._list_query_count()
+        small_count, _ = self._list_query_count()
+
+        self._add_batches(2, 6)
+        large_count, response = self._list_query_count()
+
+        self.assertEqual(small_count, large_count)
+        first = response.data['results'][0]
+        self.assertEqual(first['calculated_population_count'], 2001)
+        self.assertEqual(first['current_lifecycle_stage']['name'], 'Fry')
+        self.assertEqual(len(first['active_containers']), 2)
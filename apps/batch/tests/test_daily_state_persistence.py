@@ -0,0 +1,109 @@
+"""
+Tests for upsert-based ActualDailyAssignmentState persistence.
+
+Computed series are written with one INSERT ... ON CONFLICT per batch of
+rows; rows whose stored values hash the same are not written.
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.db import connection
+from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+
+from apps.batch.models import ActualDailyAssignmentState
+from apps.batch.services.daily_state_persistence import row_hash, upsert_daily_states
+from apps.batch.services.growth_assimilation import GrowthAssimilationEngine
+from apps.batch.services.growth_assimilation_optimized import OptimizedGrowthAssimilationEngine
+from apps.batch.tests import test_phase3_core_engine as core
+
+
+class UpsertDailyStatesTest(TestCase):
+
+    setUp = core.GrowthAssimilationCoreTestCase.setUp
+
+    def _states(self, days=5, weight=2.0):
+        return [
+            {
+                'batch': self.batch,
+                'container': self.container,
+                'lifecycle_stage': self.stage,
+                'date': date(2024, 1, 1) + timedelta(days=offset),
+                'day_number': offset + 1,
+                'avg_weight_g': Decimal(str(round(weight + offset * 0.1, 2))),
+                'population': 1000 - offset,
+                'biomass_kg': Decimal('2.00'),
+                'temp_c': Decimal('10.5'),
+                'mortality_count': 1,
+                'feed_kg': Decimal('0'),
+                'observed_fcr': None,
+                'anchor_type': None,
+                'sources': {'temp': 'measured', 'weight': 'tgc_computed'},
+                'confidence_scores': {'temp': 1.0, 'weight': 0.8},
+            }
+            for offset in range(days)
+        ]
+
+    def _writes(self, queries):
+        return [
+            query['sql'] for query in queries.captured_queries
+            if query['sql'].startswith(('INSERT', 'UPDATE'))
+        ]
+
+    def test_creates_then_skips_unchanged_rows(self):
+        created = upsert_daily_states(self.assignment, self._states())
+        stamps = dict(
+            ActualDailyAssignmentState.objects.values_list('date', 'last_computed_at')
+        )
+
+        with CaptureQueriesContext(connection) as queries:
+            again = upsert_daily_states(self.assignment, self._states())
+
+        self.assertEqual(created.as_dict(), {'created': 5, 'updated': 0, 'unchanged': 0})
+        self.assertEqual(again.as_dict(), {'created': 0, 'updated': 0, 'unchanged': 5})
+        self.assertEqual(self._writes(queries), [])
+        self.assertEqual(
+            dict(ActualDailyAssignmentState.objects.values_list('date', 'last_computed_at')), stamps
+        )
+
+    def test_changed_and_new_rows_are_upserted_in_one_statement(self):
+        upsert_daily_states(self.assignment, self._states(days=3))
+        states = self._states(days=5)
+        states[1]['population'] = 42
+        states[2]['sources'] = {'weight': 'tgc_computed', 'temp': 'measured'}  # same JSON, new key order
+
+        with CaptureQueriesContext(connection) as queries:
+            result = upsert_daily_states(self.assignment, states)
+
+        self.assertEqual(result.as_dict(), {'created': 2, 'updated': 1, 'unchanged': 2})
+        [write] = self._writes(queries)
+        self.assertIn('ON CONFLICT', write)
+        self.assertEqual(ActualDailyAssignmentState.objects.count(), 5)
+        self.assertEqual(
+            ActualDailyAssignmentState.objects.get(date=date(2024, 1, 2)).population, 42
+        )
+
+    def test_hash_matches_stored_values(self):
+        [state] = self._states(days=1)
+        upsert_daily_states(self.assignment, [state])
+        stored = ActualDailyAssignmentState.objects.values(
+            'batch_id', 'container_id', 'lifecycle_stage_id', 'day_number', 'avg_weight_g',
+            'population', 'biomass_kg', 'temp_c', 'mortality_count', 'feed_kg',
+            'observed_fcr', 'anchor_type', 'sources', 'confidence_scores',
+        ).get()
+        stored = {name.removesuffix('_id'): value for name, value in stored.items()}
+
+        self.assertEqual(row_hash(stored), row_hash(state))
+        self.assertNotEqual(row_hash({**state, 'temp_c': Decimal('10.51')}), row_hash(state))
+
+    def test_engines_report_unchanged_rows_on_recompute(self):
+        for engine_class in (GrowthAssimilationEngine, OptimizedGrowthAssimilationEngine):
+            with self.subTest(engine=engine_class.__name__):
+                ActualDailyAssignmentState.objects.all().delete()
+                first = engine_class(self.assignment).recompute_range(date(2024, 1, 1), date(2024, 1, 7))
+                second = engine_class(self.assignment).recompute_range(date(2024, 1, 1), date(2024, 1, 7))
+
+                self.assertEqual((first['rows_created'], first['rows_unchanged']), (7, 0))
+                self.assertEqual(
+                    (second['rows_created'], second['rows_updated'], second['rows_unchanged']), (0, 0, 7)
+                )
@@ -1,6 +1,8 @@
 from datetime import date, timedelta
 from decimal import Decimal
+from unittest import mock
 
+from django.core.cache import cache
 from django.test import TestCase
 from django.utils import timezone
 
@@ -23,6 +25,7 @@ class MixedLineageServiceTestCase(TestCase):
             name="Fry",
             order=2,
         )
+        cache.clear()
 
     def _create_mixed_batch(self, batch_number: str):
         batch = create_test_batch(
@@ -425,3 +428,156 @@ class MixedLineageServiceTestCase(TestCase):
             payload["boundaries"]["resolution_notes"],
         )
         self.assertEqual(payload["max_depth"], 2)
+
+    def _mix(self, mixed, container, sources, days_ago=1):
+        """Create a mix event on `mixed` from (batch, assignment, percentage) tuples."""
+        event = BatchMixEvent.objects.create(
+            mixed_batch=mixed,
+            container=container,
+            mixed_at=timezone.now() - timedelta(days=days_ago),
+        )
+        for source_batch, source_assignment, percentage in sources:
+            BatchMixEventComponent.objects.create(
+                mix_event=event,
+                source_assignment=source_assignment,
+                source_batch=source_batch,
+                population_count=100,
+                biomass_kg=Decimal("1.0"),
+                percentage=percentage,
+                is_transferred_in=True,
+            )
+        return event
+
+    def _assignment(self, batch, container):
+        return create_test_batch_container_assignment(
+            batch=batch,
+            container=container,
+            lifecycle_stage=self.lifecycle_stage,
+            population_count=100,
+            avg_weight_g=Decimal("10.0"),
+        )
+
+    def test_deep_lineage_is_loaded_level_by_level(self):
+        # M5 <- (M4, R5), M4 <- (M3, R4), ... M1 <- (R0, R1): depth 5 chain
+        container = create_test_container(name="ML-Tank-DEEP")
+        root = create_test_batch(
+            species=self.species,
+            lifecycle_stage=self.lifecycle_stage,
+            batch_number="DEEP-R0",
+        )
+        previous = root
+        for level in range(1, 6):
+            side = create_test_batch(
+                species=self.species,
+                lifecycle_stage=self.lifecycle_stage,
+                batch_number=f"DEEP-R{level}",
+            )
+            mixed = self._create_mixed_batch(f"DEEP-M{level}")
+            self._mix(
+                mixed,
+                container,
+                [
+                    (previous, self._assignment(previous, container), Decimal("50.0")),
+                    (side, self._assignment(side, container), Decimal("50.0")),
+                ],
+            )
+            previous = mixed
+        cache.clear()
+
+        # Two queries per mixed level (latest events + components); no fallbacks.
+        with self.assertNumQueries(10):
+            payload = MixedLineageService.build_lineage(batch=previous, as_of_date=date.today())
+
+        roots = {
+            row["batch_number"]: Decimal(row["percentage"])
+            for row in payload["root_sources"]
+        }
+        self.assertEqual(payload["max_depth"], 5)
+        self.assertEqual(len(payload["graph"]["mix_nodes"]), 5)
+        self.assertEqual(roots["DEEP-R5"], Decimal("50.00"))
+        self.assertEqual(roots["DEEP-R1"], Decimal("3.12"))
+        self.assertEqual(roots["DEEP-R0"], Decimal("3.12"))
+
+    @mock.patch(
+        "apps.batch.services.mixed_lineage.default_cache_is_shared", return_value=True
+    )
+    def test_lineage_is_memoised_until_mix_events_change(self, _shared):
+        container = create_test_container(name="ML-Tank-MEMO")
+        source_a = create_test_batch(
+            species=self.species,
+            lifecycle_stage=self.lifecycle_stage,
+            batch_number="MEMO-A",
+        )
+        source_b = create_test_batch(
+            species=self.species,
+            lifecycle_stage=self.lifecycle_stage,
+            batch_number="MEMO-B",
+        )
+        mixed = self._create_mixed_batch("MEMO-MIX")
+        self._mix(
+            mixed,
+            container,
+            [(source_a, self._assignment(source_a, container), Decimal("100.0"))],
+            days_ago=2,
+        )
+
+        first = MixedLineageService.build_lineage(batch=mixed, as_of_date=date.today())
+        with self.assertNumQueries(0):
+            again = MixedLineageService.build_lineage(batch=mixed, as_of_date=date.today())
+        self.assertEqual(again, first)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self._mix(
+                mixed,
+                container,
+                [(source_b, self._assignment(source_b, container), Decimal("100.0"))],
+            )
+        refreshed = MixedLineageService.build_lineage(batch=mixed, as_of_date=date.today())
+
+        self.assertEqual(first["root_sources"][0]["batch_number"], "MEMO-A")
+        self.assertEqual(refreshed["root_sources"][0]["batch_number"], "MEMO-B")
+
+    @mock.patch("apps.batch.signals.default_cache_is_shared", return_value=True)
+    @mock.patch(
+        "apps.batch.services.mixed_lineage.default_cache_is_shared", return_value=True
+    )
+    def test_only_lineage_fields_of_a_batch_invalidate_the_memo(self, _shared, _signals_shared):
+        container = create_test_container(name="ML-Tank-FIELDS")
+        source = create_test_batch(
+            species=self.species,
+            lifecycle_stage=self.lifecycle_stage,
+            batch_number="FIELDS-A",
+        )
+        mixed = self._create_mixed_batch("FIELDS-MIX")
+        self._mix(
+            mixed,
+            container,
+            [(source, self._assignment(source, container), Decimal("100.0"))],
+        )
+        MixedLineageService.build_lineage(batch=mixed, as_of_date=date.today())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            source.notes = "Unrelated edit"
+            source.save()
+        with self.assertNumQueries(0):
+            MixedLineageService.build_lineage(batch=mixed, as_of_date=date.today())
+
+        with self.captureOnCommitCallbacks(execute=True):
+            source.batch_number = "FIELDS-A2"
+            source.save()
+        refreshed = MixedLineageService.build_lineage(batch=mixed, as_of_date=date.today())
+        self.assertEqual(refreshed["root_sources"][0]["batch_number"], "FIELDS-A2")
+
+    def test_lineage_is_rebuilt_per_call_without_a_shared_cache(self):
+        batch = create_test_batch(
+            species=self.species,
+            lifecycle_stage=self.lifecycle_stage,
+            batch_number="LOCAL-STD",
+        )
+        MixedLineageService.build_lineage(batch=batch, as_of_date=date.today())
+
+        batch.batch_number = "LOCAL-STD2"
+        batch.save()
+        payload = MixedLineageService.build_lineage(batch=batch, as_of_date=date.today())
+
+        self.assertEqual(payload["root_sources"][0]["batch_number"], "LOCAL-STD2")
@@ -3,8 +3,8 @@ Tests for Phase 4 - Event-Driven Recompute (Celery + Signals).
 
 This test suite validates:
 1. Celery tasks execute correctly (unit tests)
-2. Deduplication logic (unit tests)
-3. Signal handlers for simple events (integration tests)
+2. Signal handlers record recompute marks for simple events (integration tests)
+3. Marks are dispatched to one task per assignment (integration tests)
 4. Management command (integration tests)
 
 Complex event tests (TransferAction, Treatment) deferred to Phase 9
@@ -28,14 +28,11 @@ from apps.batch.models import (
     GrowthSample,
     MortalityEvent,
     ActualDailyAssignmentState,
+    RecomputeMark,
 )
 from apps.batch.tasks import (
     recompute_assignment_window,
     recompute_batch_window,
-    enqueue_recompute_with_deduplication,
-    enqueue_batch_recompute,
-    should_enqueue_task,
-    get_dedup_key,
 )
 
 # Reuse existing test helpers (per handover recommendation)
@@ -157,65 +154,14 @@ class CeleryTaskTestCase(TestCase):
         self.assertIn('error', result)
 
 
-class DeduplicationTestCase(TestCase):
-    """Test task deduplication logic."""
-    
-    def tearDown(self):
-        """Clear cache after each test."""
-        cache.clear()
-    
-    def test_dedup_key_generation(self):
-        """Test deduplication key format."""
-        assignment_id = 123
-        trigger_date = date(2024, 1, 15)
-        
-        key = get_dedup_key(assignment_id, trigger_date)
-        
-        self.assertEqual(key, "growth_assimilation:dedup:123:2024-01-15")
-    
-    def test_should_enqueue_task_first_call(self):
-        """Test first call returns True (task should be enqueued)."""
-        assignment_id = 123
-        trigger_date = date(2024, 1, 15)
-        
-        result = should_enqueue_task(assignment_id, trigger_date)
-        
-        self.assertTrue(result)
-    
-    def test_should_enqueue_task_duplicate_call(self):
-        """Test duplicate call returns False (task already queued)."""
-        assignment_id = 123
-        trigger_date = date(2024, 1, 15)
-        
-        # First call - should enqueue
-        first = should_enqueue_task(assignment_id, trigger_date)
-        self.assertTrue(first)
-        
-        # Second call - should skip (duplicate)
-        second = should_enqueue_task(assignment_id, trigger_date)
-        self.assertFalse(second)
-    
-    def test_should_enqueue_task_different_dates(self):
-        """Test different dates can both be enqueued."""
-        assignment_id = 123
-        date1 = date(2024, 1, 15)
-        date2 = date(2024, 1, 16)
-        
-        result1 = should_enqueue_task(assignment_id, date1)
-        result2 = should_enqueue_task(assignment_id, date2)
-        
-        self.assertTrue(result1)
-        self.assertTrue(result2)
-
-
 class SignalHandlerTestCase(TestCase):
-    """Test signal handlers enqueue tasks correctly."""
+    """Test signal handlers record recompute marks correctly."""
     
     def setUp(self):
         """Set up test data."""
         # Respect CI/test policy that may disable Celery signal enqueueing.
-        from apps.batch.signals import _should_skip_celery_signals
-        if _should_skip_celery_signals():
+        from apps.batch.signals import should_skip_celery_signals
+        if should_skip_celery_signals():
             self.skipTest(
                 "Celery signal enqueueing is disabled (SKIP_CELERY_SIGNALS)."
             )
@@ -257,30 +203,31 @@ class SignalHandlerTestCase(TestCase):
         """Clear cache after each test."""
         cache.clear()
     
-    @patch('apps.batch.tasks.recompute_assignment_window.delay')
-    def test_growth_sample_signal_enqueues_task(self, mock_delay):
-        """Test GrowthSample creation enqueues recompute task."""
+    def _marks(self):
+        return list(
+            RecomputeMark.objects.values_list('assignment_id', 'start_date', 'end_date', 'reason')
+        )
+    
+    def test_growth_sample_signal_marks_window(self):
+        """Test GrowthSample creation marks the assignment window dirty."""
         sample_date = date(2024, 1, 10)
         
         # Create growth sample (should trigger signal)
-        sample = GrowthSample.objects.create(
+        GrowthSample.objects.create(
             assignment=self.assignment,
             sample_date=sample_date,
             sample_size=100,
             avg_weight_g=150.0
         )
         
-        # Verify task was enqueued
-        mock_delay.assert_called_once()
-        args = mock_delay.call_args[0]
-        self.assertEqual(args[0], self.assignment.id)
         # Window should be [sample_date - 2, sample_date + 2]
-        self.assertEqual(args[1], '2024-01-08')  # start_date
-        self.assertEqual(args[2], '2024-01-12')  # end_date
+        self.assertEqual(
+            self._marks(),
+            [(self.assignment.id, date(2024, 1, 8), date(2024, 1, 12), 'growth_sample')]
+        )
     
-    @patch('apps.batch.tasks.recompute_assignment_window.delay')
-    def test_growth_sample_update_does_not_enqueue(self, mock_delay):
-        """Test GrowthSample update does NOT enqueue task."""
+    def test_growth_sample_update_does_not_mark(self):
+        """Test GrowthSample update does NOT mark the window again."""
         # Create sample
         sample = GrowthSample.objects.create(
             assignment=self.assignment,
@@ -289,35 +236,34 @@ class SignalHandlerTestCase(TestCase):
             avg_weight_g=150.0
         )
         
-        # Clear mock
-        mock_delay.reset_mock()
-        
         # Update sample (should NOT trigger signal)
         sample.avg_weight_g = 160.0
         sample.save()
         
-        # Verify task was NOT enqueued
-        mock_delay.assert_not_called()
+        self.assertEqual(RecomputeMark.objects.count(), 1)
     
-    @patch('apps.batch.tasks.recompute_batch_window.delay')
-    def test_mortality_event_enqueues_batch_task(self, mock_delay):
-        """Test MortalityEvent enqueues batch-level recompute."""
-        event_date = date(2024, 1, 20)
+    def test_mortality_event_marks_batch_assignments(self):
+        """Test MortalityEvent marks every overlapping assignment of the batch."""
+        event_date = self.assignment.assignment_date + timedelta(days=10)
         
         # Create mortality event
-        mortality = MortalityEvent.objects.create(
+        MortalityEvent.objects.create(
             batch=self.batch,
             event_date=event_date,
             count=50,
             biomass_kg=Decimal('5.0')
         )
         
-        # Verify batch task was enqueued
-        mock_delay.assert_called_once()
-        args = mock_delay.call_args[0]
-        self.assertEqual(args[0], self.batch.id)
-        self.assertEqual(args[1], '2024-01-19')  # event_date - 1
-        self.assertEqual(args[2], '2024-01-21')  # event_date + 1
+        # Window should be [event_date - 1, event_date + 1]
+        self.assertEqual(
+            self._marks(),
+            [(
+                self.assignment.id,
+                event_date - timedelta(days=1),
+                event_date + timedelta(days=1),
+                'mortality',
+            )]
+        )
 
 
 class ManagementCommandTestCase(TestCase):
@@ -447,8 +393,8 @@ class IntegrationTestCase(TestCase):
     def setUp(self):
         """Set up test data."""
         # Respect CI/test policy that may disable Celery signal enqueueing.
-        from apps.batch.signals import _should_skip_celery_signals
-        if _should_skip_celery_signals():
+        from apps.batch.signals import should_skip_celery_signals
+        if should_skip_celery_signals():
             self.skipTest(
                 "Celery signal enqueueing is disabled (SKIP_CELERY_SIGNALS)."
             )
@@ -481,31 +427,27 @@ class IntegrationTestCase(TestCase):
         self.batch.pinned_scenario = self.scenario
         self.batch.save()
     
-    @patch('apps.batch.tasks.recompute_assignment_window.delay')
-    @patch('apps.batch.tasks.cache.add')
-    def test_growth_sample_triggers_signal_flow(self, mock_cache_add, mock_delay):
-        """Test integration: GrowthSample → signal → task enqueued."""
-        # Mock cache.add() returns True (dedup allows enqueue)
-        mock_cache_add.return_value = True
-        
-        sample_date = date(2024, 1, 10)
-        
-        # Create growth sample (triggers signal → enqueues task)
-        sample = GrowthSample.objects.create(
-            assignment=self.assignment,
-            sample_date=sample_date,
-            sample_size=100,
-            avg_weight_g=150.0
+    @patch('apps.batch.tasks.recompute_assignment_ranges.apply_async')
+    def test_growth_sample_triggers_signal_flow(self, mock_apply_async):
+        """Test integration: GrowthSample → mark → dispatcher → task enqueued."""
+        # Two samples two days apart: overlapping windows, one task
+        with self.captureOnCommitCallbacks(execute=True):
+            for sample_date in (date(2024, 1, 10), date(2024, 1, 12)):
+                GrowthSample.objects.create(
+                    assignment=self.assignment,
+                    sample_date=sample_date,
+                    sample_size=100,
+                    avg_weight_g=150.0
+                )
+        
+        # Verify the dispatcher enqueued one task with the merged window
+        mock_apply_async.assert_called_once()
+        kwargs = mock_apply_async.call_args.kwargs
+        self.assertEqual(kwargs['args'], [self.assignment.id, [['2024-01-08', '2024-01-14']]])
+        self.assertEqual(
+            set(RecomputeMark.objects.values_list('task_id', flat=True)),
+            {kwargs['task_id']}
         )
         
-        # Verify signal handler enqueued the task
-        mock_delay.assert_called_once()
-        args = mock_delay.call_args[0]
-        self.assertEqual(args[0], self.assignment.id)
-        
-        # Verify window calculation
-        self.assertEqual(args[1], '2024-01-08')  # sample_date - 2
-        self.assertEqual(args[2], '2024-01-12')  # sample_date + 2
-        
         # Note: Full end-to-end validation (task execution → states created)
         # is deferred to Phase 9 with real Faroe Islands data and Redis running
@@ -0,0 +1,222 @@
+"""
+Tests for the growth assimilation recompute scheduler.
+
+Events record dirty marks; the dispatcher merges them per assignment into
+minimal date ranges, dispatches one task per assignment (active batches
+first) and the task completes the marks it covered.
+"""
+from datetime import date, timedelta
+from unittest.mock import patch
+
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from tests.base import BaseAPITestCase
+
+from apps.batch.models import ActualDailyAssignmentState, Batch, RecomputeMark
+from apps.batch.services.recompute_scheduler import (
+    dispatch_pending,
+    mark_assignment_dirty,
+    mark_batch_dirty,
+    merge_ranges,
+    prune_completed_marks,
+    requeue_failed_marks,
+    scheduler_stats,
+)
+from apps.batch.tests import test_phase3_core_engine as core
+from apps.batch.tests.models.test_utils import (
+    create_test_batch_container_assignment,
+    create_test_container,
+)
+
+
+class MergeRangesTest(TestCase):
+
+    def test_overlapping_and_adjacent_ranges_merge(self):
+        ranges = [
+            (date(2024, 1, 10), date(2024, 1, 14)),
+            (date(2024, 1, 1), date(2024, 1, 3)),
+            (date(2024, 1, 12), date(2024, 1, 13)),
+            (date(2024, 1, 4), date(2024, 1, 5)),
+            (date(2024, 1, 20), date(2024, 1, 22)),
+        ]
+
+        self.assertEqual(merge_ranges(ranges), [
+            (date(2024, 1, 1), date(2024, 1, 5)),
+            (date(2024, 1, 10), date(2024, 1, 14)),
+            (date(2024, 1, 20), date(2024, 1, 22)),
+        ])
+        self.assertEqual(merge_ranges([]), [])
+
+
+class RecomputeSchedulerTest(TestCase):
+
+    setUp = core.GrowthAssimilationCoreTestCase.setUp
+
+    def _completed_assignment(self):
+        batch = Batch.objects.create(
+            batch_number=f'{self.batch.batch_number}-C',
+            species=self.species,
+            lifecycle_stage=self.stage,
+            start_date=date(2023, 1, 1),
+            status='ACTIVE',
+        )
+        assignment = create_test_batch_container_assignment(
+            batch=batch,
+            container=create_test_container(name=f'{self.container.name}-C'),
+            lifecycle_stage=self.stage,
+        )
+        Batch.objects.filter(pk=batch.pk).update(status='COMPLETED')
+        return assignment
+
+    @patch('apps.batch.tasks.recompute_assignment_ranges.apply_async')
+    def test_marks_merge_into_one_task_per_assignment(self, mock_apply_async):
+        # A back-dated import: one mark per day, plus a separate later window
+        for day in range(1, 11):
+            mark_assignment_dirty(self.assignment, date(2024, 1, day), 1, 'mortality')
+        mark_assignment_dirty(self.assignment, date(2024, 2, 1), 2, 'growth_sample')
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            result = dispatch_pending()
+
+        self.assertEqual(result, {'assignments': 1, 'marks': 11, 'ranges': 2, 'remaining': 0, 'failed': 0})
+        mock_apply_async.assert_not_called()  # enqueued on commit
+        for callback in callbacks:
+            callback()
+        mock_apply_async.assert_called_once()
+        kwargs = mock_apply_async.call_args.kwargs
+        self.assertEqual(kwargs['args'], [
+            self.assignment.id,
+            [['2023-12-31', '2024-01-11'], ['2024-01-30', '2024-02-03']],
+        ])
+        self.assertEqual(RecomputeMark.objects.filter(task_id=kwargs['task_id']).count(), 11)
+        # Nothing left to dispatch
+        self.assertEqual(dispatch_pending()['assignments'], 0)
+
+    @override_settings(RECOMPUTE_PRIORITY_ACTIVE=0, RECOMPUTE_PRIORITY_INACTIVE=6)
+    @patch('apps.batch.tasks.recompute_assignment_ranges.apply_async')
+    def test_active_batches_dispatch_first(self, mock_apply_async):
+        completed = self._completed_assignment()
+        mark_assignment_dirty(completed, date(2024, 1, 5), 2, 'manual')
+        mark_assignment_dirty(self.assignment, date(2024, 1, 5), 2, 'manual')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = dispatch_pending(max_assignments=1)
+
+        self.assertEqual(result['remaining'], 1)
+        kwargs = mock_apply_async.call_args.kwargs
+        self.assertEqual((kwargs['args'][0], kwargs['priority']), (self.assignment.id, 0))
+
+        with self.captureOnCommitCallbacks(execute=True):
+            dispatch_pending()
+
+        kwargs = mock_apply_async.call_args.kwargs
+        self.assertEqual((kwargs['args'][0], kwargs['priority']), (completed.id, 6))
+
+    @patch('apps.batch.tasks.recompute_assignment_ranges.apply_async')
+    def test_stale_in_flight_marks_are_dispatched_again(self, mock_apply_async):
+        mark = mark_assignment_dirty(self.assignment, date(2024, 1, 5), 2, 'manual')
+        dispatch_pending()
+        self.assertEqual(dispatch_pending()['assignments'], 0)
+
+        RecomputeMark.objects.filter(pk=mark.pk).update(
+            dispatched_at=timezone.now() - timedelta(hours=2)
+        )
+        self.assertEqual(scheduler_stats()['stale_marks'], 1)
+        result = dispatch_pending()
+
+        self.assertEqual(result['assignments'], 1)
+        mark.refresh_from_db()
+        self.assertGreater(mark.dispatched_at, timezone.now() - timedelta(minutes=1))
+
+    @override_settings(RECOMPUTE_MARK_MAX_ATTEMPTS=2)
+    @patch('apps.batch.tasks.recompute_assignment_ranges.apply_async')
+    def test_marks_out_of_attempts_are_failed_not_dispatched(self, mock_apply_async):
+        mark = mark_assignment_dirty(self.assignment, date(2024, 1, 5), 2, 'manual')
+
+        for attempt in (1, 2):
+            self.assertEqual(dispatch_pending()['assignments'], 1)
+            # The task never completes the mark
+            RecomputeMark.objects.filter(pk=mark.pk).update(
+                dispatched_at=timezone.now() - timedelta(hours=2)
+            )
+        result = dispatch_pending()
+
+        self.assertEqual((result['assignments'], result['failed']), (0, 1))
+        mark.refresh_from_db()
+        self.assertEqual(mark.attempts, 2)
+        self.assertIsNotNone(mark.failed_at)
+        stats = scheduler_stats()
+        self.assertEqual(
+            (stats['failed_marks'], stats['stale_marks'], stats['queue_depth'], stats['lag_seconds']),
+            (1, 0, 0, 0.0)
+        )
+        self.assertIsNotNone(stats['last_failed_at'])
+
+        self.assertEqual(requeue_failed_marks(), 1)
+        self.assertEqual(scheduler_stats()['failed_marks'], 0)
+        self.assertEqual(dispatch_pending()['assignments'], 1)
+
+    def test_batch_marks_cover_overlapping_assignments(self):
+        self._completed_assignment()  # another batch: not marked
+
+        marked = mark_batch_dirty(self.batch, date(2024, 1, 5), 1, 'mortality')
+
+        self.assertEqual(marked, 1)
+        self.assertEqual(
+            list(RecomputeMark.objects.values_list('assignment_id', 'start_date', 'end_date')),
+            [(self.assignment.id, date(2024, 1, 4), date(2024, 1, 6))]
+        )
+
+    def test_dispatched_task_recomputes_and_completes_marks(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            mark_assignment_dirty(self.assignment, date(2024, 1, 3), 2, 'growth_sample')
+            mark_assignment_dirty(self.assignment, date(2024, 1, 5), 2, 'growth_sample')
+
+        self.assertEqual(
+            ActualDailyAssignmentState.objects.filter(assignment=self.assignment).count(), 7
+        )
+        self.assertFalse(RecomputeMark.objects.filter(completed_at__isnull=True).exists())
+        stats = scheduler_stats()
+        self.assertEqual(
+            (stats['queue_depth'], stats['in_flight_marks'], stats['lag_seconds'], stats['merge_ratio']),
+            (0, 0, 0.0, 2.0)
+        )
+
+    def test_stats_report_queue_depth_and_lag(self):
+        mark_assignment_dirty(self.assignment, date(2024, 1, 5), 2, 'manual')
+        mark = mark_assignment_dirty(self.assignment, date(2024, 1, 9), 2, 'manual')
+        RecomputeMark.objects.filter(pk=mark.pk).update(created_at=timezone.now() - timedelta(minutes=5))
+
+        stats = scheduler_stats()
+
+        self.assertEqual(
+            (stats['queue_depth'], stats['queue_depth_active_batches'], stats['pending_assignments']),
+            (2, 2, 1)
+        )
+        self.assertGreaterEqual(stats['lag_seconds'], 300)
+        self.assertIsNone(stats['merge_ratio'])
+
+    @override_settings(RECOMPUTE_MARK_RETENTION_DAYS=7)
+    def test_prune_keeps_open_and_recent_marks(self):
+        old = mark_assignment_dirty(self.assignment, date(2024, 1, 5), 2, 'manual')
+        recent = mark_assignment_dirty(self.assignment, date(2024, 1, 9), 2, 'manual')
+        mark_assignment_dirty(self.assignment, date(2024, 1, 12), 2, 'manual')
+        RecomputeMark.objects.filter(pk=old.pk).update(completed_at=timezone.now() - timedelta(days=8))
+        RecomputeMark.objects.filter(pk=recent.pk).update(completed_at=timezone.now())
+
+        self.assertEqual(prune_completed_marks(), 1)
+        self.assertEqual(RecomputeMark.objects.count(), 2)
+
+
+class RecomputeSchedulerAPITest(BaseAPITestCase):
+
+    def test_metrics_endpoint(self):
+        url = self.get_api_url('batch', 'recompute-scheduler')
+
+        response = self.client.get(url, {'window_hours': 6})
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.data['queue_depth'], 0)
+        self.assertEqual(response.data['window_hours'], 6)
+        self.assertIn('merge_ratio', response.data)
+        self.assertEqual(self.client.get(url, {'window_hours': 'x'}).status_code, 400)
@@ -5,6 +5,7 @@ This module provides services for managing broodstock fish, movements,
 breeding operations, and container capacity management.
 """
 
+from collections import defaultdict
 from typing import List, Dict, Optional, Tuple
 from datetime import datetime, timedelta
 from django.db import transaction, models
@@ -12,14 +13,17 @@ from django.db.models import Count, Sum, Q, F
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from django.conf import settings
+from simple_history.utils import bulk_create_with_history
 
 from apps.broodstock.models import (
     BroodstockFish, FishMovement, BreedingPair, 
     BreedingPlan, MaintenanceTask
 )
 from apps.infrastructure.models import Container
+from aquamind.utils.bulk_history import bulk_update_touching
 
 AVG_FISH_WEIGHT_KG = settings.BROODSTOCK_DEFAULTS.get('AVG_FISH_WEIGHT_KG', 10.0)
+BULK_BATCH_SIZE = 500
 
 class BroodstockService:
     """Service class for broodstock-related business operations."""
@@ -137,12 +141,14 @@ class BroodstockService:
                 )
         
         # Get fish objects and validate they're in the source container
-        fish_list = BroodstockFish.objects.filter(
-            id__in=fish_ids,
-            container=from_container
+        fish_to_move = list(
+            BroodstockFish.objects.filter(
+                id__in=fish_ids,
+                container=from_container
+            ).order_by('id')
         )
         
-        if fish_list.count() != len(fish_ids):
+        if len(fish_to_move) != len(fish_ids):
             raise ValidationError(
                 "Some fish are not in the specified source container."
             )
@@ -165,23 +171,39 @@ class BroodstockService:
                     f"{to_container.max_biomass_kg:.2f} kg)."
                 )
         
-        # Perform bulk movement
-        movements = []
+        # Perform bulk movement: batched inserts for movements and their
+        # history rows, and one batched update (plus history) for the fish
         movement_date = timezone.now()
-        
-        for fish in fish_list:
-            movement = FishMovement.objects.create(
-                fish=fish,
-                from_container=from_container,
-                to_container=to_container,
-                movement_date=movement_date,
-                moved_by=user,
-                notes=notes
-            )
-            movements.append(movement)
-        
-        # Update all fish locations
-        fish_list.update(container=to_container)
+        change_reason = notes or "Bulk fish movement"
+
+        history_kwargs = {
+            'batch_size': BULK_BATCH_SIZE,
+            'default_user': user,
+            'default_change_reason': change_reason,
+            'default_date': movement_date,
+        }
+
+        movements = bulk_create_with_history(
+            [
+                FishMovement(
+                    fish=fish,
+                    from_container=from_container,
+                    to_container=to_container,
+                    movement_date=movement_date,
+                    moved_by=user,
+                    notes=notes
+                )
+                for fish in fish_to_move
+            ],
+            FishMovement,
+            **history_kwargs,
+        )
+
+        for fish in fish_to_move:
+            fish.container = to_container
+        bulk_update_touching(
+            fish_to_move, BroodstockFish, ['container'], updated_at=movement_date, **history_kwargs
+        )
         
         return movements
     
@@ -304,76 +326,120 @@ class BroodstockService:
         Returns:
             Dict: Container statistics including population, health status, etc.
         """
-        # Validate container type
-        if 'broodstock' not in container.container_type.name.lower():
-            raise ValidationError(f"{container.name} is not a broodstock container.")
-        
-        # Get fish in container
-        fish_qs = BroodstockFish.objects.filter(container=container)
-        
-        # Calculate statistics
-        total_population = fish_qs.count()
+        return BroodstockService.get_containers_statistics([container])[0]
+    
+    @staticmethod
+    def get_containers_statistics(containers) -> List[Dict]:
+        """
+        Get statistics for many broodstock containers at once.
         
-        health_distribution = fish_qs.values('health_status').annotate(
-            count=Count('id')
-        ).order_by('health_status')
+        Population, health distribution, 30-day movements, active breeding
+        pairs and maintenance counts come from grouped aggregates, so the
+        query count does not grow with the number of containers.
         
-        # Get recent movements
-        recent_movements_in = FishMovement.objects.filter(
-            to_container=container,
-            movement_date__gte=timezone.now() - timedelta(days=30)
-        ).count()
+        Args:
+            containers: Iterable of Container instances (select_related
+                container_type to avoid per-container lookups)
+            
+        Returns:
+            List[Dict]: One statistics dict per container, in input order,
+            shaped like get_container_statistics
+        """
+        containers = list(containers)
+        for container in containers:
+            if 'broodstock' not in container.container_type.name.lower():
+                raise ValidationError(f"{container.name} is not a broodstock container.")
+        
+        container_ids = [container.id for container in containers]
+        now = timezone.now()
+        since = now - timedelta(days=30)
+        
+        population = defaultdict(int)
+        health = defaultdict(list)
+        for row in (
+            BroodstockFish.objects.filter(container_id__in=container_ids)
+            .values('container_id', 'health_status')
+            .annotate(count=Count('id'))
+            .order_by('container_id', 'health_status')
+        ):
+            population[row['container_id']] += row['count']
+            health[row['container_id']].append(
+                {'health_status': row['health_status'], 'count': row['count']}
+            )
         
-        recent_movements_out = FishMovement.objects.filter(
-            from_container=container,
-            movement_date__gte=timezone.now() - timedelta(days=30)
-        ).count()
+        recent = FishMovement.objects.filter(movement_date__gte=since)
+        movements_in = dict(
+            recent.filter(to_container_id__in=container_ids)
+            .values('to_container_id')
+            .annotate(count=Count('id'))
+            .order_by()
+            .values_list('to_container_id', 'count')
+        )
+        movements_out = dict(
+            recent.filter(from_container_id__in=container_ids)
+            .values('from_container_id')
+            .annotate(count=Count('id'))
+            .order_by()
+            .values_list('from_container_id', 'count')
+        )
         
-        # Get breeding pairs using fish from this container
-        active_breeding_pairs = BreedingPair.objects.filter(
-            Q(male_fish__container=container) | Q(female_fish__container=container),
-            plan__start_date__lte=timezone.now(),
-            plan__end_date__gte=timezone.now()
-        ).count()
+        # A pair counts once per container even when both fish live there
+        breeding_pairs = defaultdict(int)
+        id_set = set(container_ids)
+        for male_container_id, female_container_id in BreedingPair.objects.filter(
+            Q(male_fish__container_id__in=container_ids)
+            | Q(female_fish__container_id__in=container_ids),
+            plan__start_date__lte=now,
+            plan__end_date__gte=now
+        ).values_list('male_fish__container_id', 'female_fish__container_id'):
+            for container_id in {male_container_id, female_container_id} & id_set:
+                breeding_pairs[container_id] += 1
+        
+        maintenance = {
+            row['container_id']: row
+            for row in MaintenanceTask.objects.filter(
+                container_id__in=container_ids,
+                completed_date__isnull=True
+            )
+            .values('container_id')
+            .annotate(
+                pending=Count('id'),
+                overdue=Count('id', filter=Q(scheduled_date__lt=now))
+            )
+            .order_by()
+        }
         
-        # Calculate capacity utilization
         avg_fish_weight_kg = AVG_FISH_WEIGHT_KG
-        estimated_biomass = total_population * avg_fish_weight_kg
-        capacity_utilization = 0
-        
-        if container.max_biomass_kg:
-            capacity_utilization = (estimated_biomass / container.max_biomass_kg) * 100
-        
-        # Get pending maintenance tasks
-        pending_maintenance = MaintenanceTask.objects.filter(
-            container=container,
-            completed_date__isnull=True
-        ).count()
-        
-        overdue_maintenance = MaintenanceTask.objects.filter(
-            container=container,
-            completed_date__isnull=True,
-            scheduled_date__lt=timezone.now()
-        ).count()
-        
-        return {
-            'container_id': container.id,
-            'container_name': container.name,
-            'total_population': total_population,
-            'health_distribution': list(health_distribution),
-            'estimated_biomass_kg': estimated_biomass,
-            'capacity_utilization_percent': round(capacity_utilization, 2),
-            'recent_movements': {
-                'in': recent_movements_in,
-                'out': recent_movements_out,
-                'net': recent_movements_in - recent_movements_out
-            },
-            'active_breeding_pairs': active_breeding_pairs,
-            'maintenance': {
-                'pending': pending_maintenance,
-                'overdue': overdue_maintenance
-            }
-        }
+        statistics = []
+        for container in containers:
+            total_population = population[container.id]
+            estimated_biomass = total_population * avg_fish_weight_kg
+            capacity_utilization = 0
+            if container.max_biomass_kg:
+                capacity_utilization = (estimated_biomass / float(container.max_biomass_kg)) * 100
+            
+            recent_in = movements_in.get(container.id, 0)
+            recent_out = movements_out.get(container.id, 0)
+            tasks = maintenance.get(container.id, {})
+            statistics.append({
+                'container_id': container.id,
+                'container_name': container.name,
+                'total_population': total_population,
+                'health_distribution': health[container.id],
+                'estimated_biomass_kg': estimated_biomass,
+                'capacity_utilization_percent': round(capacity_utilization, 2),
+                'recent_movements': {
+                    'in': recent_in,
+                    'out': recent_out,
+                    'net': recent_in - recent_out
+                },
+                'active_breeding_pairs': breeding_pairs[container.id],
+                'maintenance': {
+                    'pending': tasks.get('pending', 0),
+                    'overdue': tasks.get('overdue', 0)
+                }
+            })
+        return statistics
     
     @staticmethod
     def get_breeding_plan_summary(plan: BreedingPlan) -> Dict:
@@ -5,11 +5,16 @@ This module contains tests to verify that API endpoints are properly configured
 and accessible.
 """
 
+from decimal import Decimal
+
 from django.test import TestCase
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
 
+from apps.broodstock.models import BroodstockFish
+from apps.infrastructure.models import Area, Container, ContainerType, Geography
+
 User = get_user_model()
 
 
@@ -49,4 +54,58 @@ class BroodstockAPITestCase(TestCase):
         """Test that authentication is required for API access."""
         self.client.logout()
         response = self.client.get('/api/v1/broodstock/fish/')
-        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED) 
\ No newline at end of file
+        self.assertEqual(response.status_code, status.HTTP_401_UNAUTHORIZED) 
+
+class ContainerStatisticsAPITestCase(TestCase):
+    """Test the multi-container statistics action."""
+
+    def setUp(self):
+        """Set up broodstock containers with fish."""
+        self.client = APIClient()
+        self.user = User.objects.create_user(username='statsuser', password='testpass123')
+        self.client.force_authenticate(user=self.user)
+        geography = Geography.objects.create(name='Stats Region')
+        area = Area.objects.create(
+            name='Stats Area', geography=geography, latitude=Decimal('60.0'),
+            longitude=Decimal('5.0'), max_biomass=Decimal('100000.0')
+        )
+        broodstock_type = ContainerType.objects.create(
+            name='Broodstock Tank', category='TANK', max_volume_m3=100.0
+        )
+        regular_type = ContainerType.objects.create(
+            name='Regular Tank', category='TANK', max_volume_m3=100.0
+        )
+        self.tank1, self.tank2 = [
+            Container.objects.create(
+                name=f'Broodstock Tank {number}', container_type=broodstock_type,
+                area=area, volume_m3=80.0, max_biomass_kg=500.0
+            )
+            for number in (1, 2)
+        ]
+        Container.objects.create(
+            name='Regular Tank 1', container_type=regular_type,
+            area=area, volume_m3=80.0, max_biomass_kg=500.0
+        )
+        for container, count in ((self.tank1, 2), (self.tank2, 1)):
+            for _ in range(count):
+                BroodstockFish.objects.create(container=container, health_status='healthy')
+        self.url = '/api/v1/broodstock/fish/container_statistics/'
+
+    def test_returns_statistics_for_all_broodstock_containers(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(
+            [(row['container_name'], row['total_population']) for row in response.data],
+            [('Broodstock Tank 1', 2), ('Broodstock Tank 2', 1)]
+        )
+
+    def test_filters_by_container_ids(self):
+        response = self.client.get(self.url, {'container_ids': f'{self.tank2.id}'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual([row['container_id'] for row in response.data], [self.tank2.id])
+
+    def test_rejects_malformed_container_ids(self):
+        response = self.client.get(self.url, {'container_ids': 'a,b'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
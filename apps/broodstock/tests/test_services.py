@@ -190,6 +190,32 @@ class BroodstockServiceTestCase(TestCase):
         self.assertEqual(self.fish1.container, self.container2)
         self.assertEqual(self.fish2.container, self.container2)
     
+    def test_bulk_move_fish_writes_history_in_batches(self):
+        """Test bulk movement records history without per-fish saves."""
+        fish_ids = [self.fish1.id, self.fish2.id, self.sick_fish.id]
+        
+        with self.assertNumQueries(8):
+            movements = BroodstockService.bulk_move_fish(
+                fish_ids=fish_ids,
+                from_container=self.container1,
+                to_container=self.container2,
+                user=self.user,
+                notes="Tank rotation"
+            )
+        
+        self.assertEqual(sorted(m.fish_id for m in movements), sorted(fish_ids))
+        movement_history = FishMovement.history.filter(fish_id__in=fish_ids)
+        self.assertEqual(movement_history.count(), 3)
+        self.assertEqual(
+            set(movement_history.values_list('history_change_reason', 'history_user_id')),
+            {('Tank rotation', self.user.id)}
+        )
+        fish_history = BroodstockFish.history.filter(id__in=fish_ids, history_type='~')
+        self.assertEqual(
+            set(fish_history.values_list('container_id', flat=True)), {self.container2.id}
+        )
+        self.assertEqual(BroodstockFish.objects.filter(container=self.container2).count(), 3)
+    
     def test_validate_breeding_pair(self):
         """Test breeding pair validation."""
         # Create breeding plan
@@ -258,6 +284,38 @@ class BroodstockServiceTestCase(TestCase):
         self.assertIn('capacity_utilization_percent', stats)
         self.assertIn('recent_movements', stats)
         self.assertIn('maintenance', stats)
+    
+    def test_get_containers_statistics_uses_grouped_queries(self):
+        """Test multi-container statistics match the single-container view."""
+        BroodstockService.move_fish(fish=self.fish2, to_container=self.container2, user=self.user)
+        plan = BreedingPlan.objects.create(
+            name='Stats Plan',
+            start_date=timezone.now() - timedelta(days=1),
+            end_date=timezone.now() + timedelta(days=30),
+            created_by=self.user
+        )
+        BreedingPair.objects.create(plan=plan, male_fish=self.fish1, female_fish=self.fish2)
+        containers = Container.objects.select_related('container_type').filter(
+            id__in=[self.container1.id, self.container2.id]
+        ).order_by('id')
+        
+        with self.assertNumQueries(6):
+            stats = BroodstockService.get_containers_statistics(containers)
+        
+        self.assertEqual(
+            stats,
+            [BroodstockService.get_container_statistics(c) for c in containers]
+        )
+        tank1, tank2 = stats
+        self.assertEqual(tank1['total_population'], 2)
+        self.assertEqual(
+            tank1['health_distribution'],
+            [{'health_status': 'healthy', 'count': 1}, {'health_status': 'sick', 'count': 1}]
+        )
+        self.assertEqual(tank1['recent_movements'], {'in': 0, 'out': 1, 'net': -1})
+        self.assertEqual(tank2['recent_movements'], {'in': 1, 'out': 0, 'net': 1})
+        self.assertEqual(tank1['active_breeding_pairs'], 1)
+        self.assertEqual(tank2['active_breeding_pairs'], 1)
 
 
 class EggManagementServiceTestCase(TestCase):
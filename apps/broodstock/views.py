@@ -16,12 +16,14 @@ from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
 from aquamind.utils.history_mixins import HistoryReasonMixin
+from apps.infrastructure.models import Container
 
 from apps.broodstock.models import (
     MaintenanceTask, BroodstockFish, FishMovement, BreedingPlan,
     BreedingTraitPriority, BreedingPair, EggProduction, EggSupplier,
     ExternalEggBatch, BatchParentage
 )
+from apps.broodstock.services import BroodstockService
 from apps.broodstock.serializers import (
     MaintenanceTaskSerializer, BroodstockFishSerializer, FishMovementSerializer,
     BreedingPlanSerializer, BreedingTraitPrioritySerializer, BreedingPairSerializer,
@@ -115,6 +117,39 @@ class BroodstockFishViewSet(HistoryReasonMixin, viewsets.ModelViewSet):
         fish = self.get_queryset().filter(container_id=container_id)
         serializer = self.get_serializer(fish, many=True)
         return Response(serializer.data)
+    
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name='container_ids',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description=(
+                    'Comma-separated broodstock container IDs. '
+                    'Defaults to every broodstock container.'
+                ),
+                required=False,
+            ),
+        ],
+        responses=OpenApiTypes.OBJECT,
+    )
+    @action(detail=False, methods=['get'])
+    def container_statistics(self, request):
+        """Get population, health, movement and maintenance statistics for many containers."""
+        containers = Container.objects.select_related('container_type').filter(
+            container_type__name__icontains='broodstock'
+        ).order_by('name', 'id')
+        container_ids = request.query_params.get('container_ids')
+        if container_ids:
+            try:
+                ids = [int(value) for value in container_ids.split(',') if value.strip()]
+            except ValueError:
+                return Response(
+                    {'error': 'container_ids must be a comma-separated list of integers.'},
+                    status=status.HTTP_400_BAD_REQUEST
+                )
+            containers = containers.filter(id__in=ids)
+        return Response(BroodstockService.get_containers_statistics(containers))
 
 
 class FishMovementViewSet(HistoryReasonMixin, viewsets.ModelViewSet):
@@ -10,6 +10,7 @@ from rest_framework_simplejwt.authentication import JWTAuthentication
 from rest_framework.permissions import IsAuthenticated
 from django_filters.rest_framework import DjangoFilterBackend
 from aquamind.utils.history_mixins import HistoryReasonMixin
+from aquamind.utils.pagination import KeysetPagination
 from django_filters import FilterSet
 from rest_framework.decorators import action
 from rest_framework.response import Response
@@ -124,6 +125,7 @@ class EnvironmentalReadingViewSet(HistoryReasonMixin, viewsets.ModelViewSet):
     search_fields = ['notes', 'parameter__name', 'container__name']
     ordering_fields = ['reading_time', 'value', 'created_at']
     ordering = ['-reading_time']  # Default to most recent readings first
+    pagination_class = KeysetPagination
     
     def get_queryset(self):
         """
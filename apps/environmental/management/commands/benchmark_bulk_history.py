@@ -0,0 +1,163 @@
+"""
+Measure the cost of keeping simple_history audit rows on bulk writes.
+
+Inserts, updates and deletes ``--rows`` PhotoperiodData rows (a small model
+with ``HistoricalRecords`` that nothing references) for a throwaway area,
+three ways, and reports milliseconds per 10k rows:
+
+- save: per-row ``save()``/``delete()``, history written by the signals;
+- bulk: plain ``bulk_create``/``bulk_update``/queryset delete, no history
+  for inserts and updates;
+- bulk+history: ``simple_history.utils`` bulk_create/bulk_update helpers.
+
+simple_history has no bulk delete helper; both bulk variants delete through
+the queryset, whose collector still sends post_delete (and so writes
+history) per row, so the delete column shows no history overhead.
+
+The history overhead column is ``bulk+history - bulk``. Everything runs in
+a transaction that is rolled back, so the database is left untouched.
+
+Usage:
+    python manage.py benchmark_bulk_history
+    python manage.py benchmark_bulk_history --rows 50000 --skip-save
+"""
+import time
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+from simple_history.utils import bulk_create_with_history, bulk_update_with_history
+
+from apps.environmental.models import PhotoperiodData
+from apps.infrastructure.models import Area, Geography
+
+PER_ROWS = 10000
+START_DATE = date(2000, 1, 1)
+CHANGE_REASON = "bulk history benchmark"
+
+
+class _Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = "Benchmark history overhead of bulk writes per 10k rows"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--rows', type=int, default=PER_ROWS, help='Rows per variant (default: 10000)')
+        parser.add_argument('--skip-save', action='store_true', help='Skip the per-row save() variant')
+
+    def handle(self, *args, **options):
+        rows = options['rows']
+        if rows <= 0:
+            raise CommandError("--rows must be positive")
+
+        variants = [('bulk', self._plain), ('bulk+history', self._with_history)]
+        if not options['skip_save']:
+            variants.insert(0, ('save', self._per_row))
+
+        results = {}
+        for label, run in variants:
+            results[label] = self._measure(run, label, rows)
+
+        scale = PER_ROWS / rows
+        self.stdout.write(f"{rows} rows per variant, ms per {PER_ROWS} rows")
+        self.stdout.write(f"  {'variant':<13}{'create':>10}{'update':>10}{'delete':>10}")
+        for label, timings in results.items():
+            self.stdout.write(
+                f"  {label:<13}" + ''.join(f"{timings[op] * scale:10.1f}" for op in ('create', 'update', 'delete'))
+            )
+        overhead = {
+            op: (results['bulk+history'][op] - results['bulk'][op]) * scale
+            for op in ('create', 'update', 'delete')
+        }
+        self.stdout.write(
+            "  history overhead: "
+            + ', '.join(f"{op} {value:.1f} ms" for op, value in overhead.items())
+        )
+
+    def _measure(self, run, label, rows):
+        timings = {}
+        try:
+            with transaction.atomic():
+                geography = Geography.objects.create(name=f"bench-{label}")
+                area = Area.objects.create(
+                    name=f"bench-{label}",
+                    geography=geography,
+                    latitude=Decimal('60.0'),
+                    longitude=Decimal('-7.0'),
+                    max_biomass=Decimal('1000'),
+                )
+                objs = [
+                    PhotoperiodData(
+                        area=area,
+                        date=START_DATE + timedelta(days=index),
+                        day_length_hours=Decimal('12.00'),
+                    )
+                    for index in range(rows)
+                ]
+                run(objs, timings)
+                raise _Rollback
+        except _Rollback:
+            pass
+        return timings
+
+    @staticmethod
+    def _timed(timings, op, func):
+        started = time.perf_counter()
+        result = func()
+        timings[op] = (time.perf_counter() - started) * 1000
+        return result
+
+    def _per_row(self, objs, timings):
+        def create():
+            for obj in objs:
+                obj.save()
+
+        def update():
+            for obj in objs:
+                obj.day_length_hours = Decimal('13.50')
+                obj.save()
+
+        def delete():
+            for obj in objs:
+                obj.delete()
+
+        self._timed(timings, 'create', create)
+        self._timed(timings, 'update', update)
+        self._timed(timings, 'delete', delete)
+
+    def _plain(self, objs, timings):
+        objs = self._timed(timings, 'create', lambda: PhotoperiodData.objects.bulk_create(objs, batch_size=1000))
+        for obj in objs:
+            obj.day_length_hours = Decimal('13.50')
+        self._timed(
+            timings, 'update', lambda: PhotoperiodData.objects.bulk_update(objs, ['day_length_hours'], batch_size=1000)
+        )
+        self._delete(objs, timings)
+
+    def _with_history(self, objs, timings):
+        objs = self._timed(
+            timings,
+            'create',
+            lambda: bulk_create_with_history(
+                objs, PhotoperiodData, batch_size=1000, default_change_reason=CHANGE_REASON
+            ),
+        )
+        for obj in objs:
+            obj.day_length_hours = Decimal('13.50')
+        self._timed(
+            timings,
+            'update',
+            lambda: bulk_update_with_history(
+                objs, PhotoperiodData, ['day_length_hours'], batch_size=1000,
+                default_change_reason=CHANGE_REASON,
+            ),
+        )
+        self._delete(objs, timings)
+
+    def _delete(self, objs, timings):
+        self._timed(
+            timings, 'delete', lambda: PhotoperiodData.objects.filter(pk__in=[obj.pk for obj in objs]).delete()
+        )
@@ -7,9 +7,11 @@ from decimal import Decimal, InvalidOperation
 from typing import Dict, Optional, Tuple
 
 from django.conf import settings
+from django.contrib.auth import get_user_model
 from django.core.exceptions import ValidationError
 from django.db.models import Q
 from django.utils import timezone
+from simple_history.utils import bulk_create_with_history
 
 from apps.batch.access import can_override_transport_compliance
 from apps.batch.models import TransferAction
@@ -74,7 +76,6 @@ def _snapshot_for_assignment(
     executed_by_id: Optional[int],
     moment: str,
 ) -> SnapshotResult:
-    created_count = 0
     skipped_count = 0
     missing_value_count = 0
 
@@ -88,23 +89,30 @@ def _snapshot_for_assignment(
         .order_by("id")
     )
 
+    def marker_for(parameter_id):
+        return (
+            f"action={action.id};side={side};parameter={parameter_id};"
+            f"moment={moment}"
+        )
+
+    # Markers already written for this assignment/time, fetched in one query
+    existing_notes = list(
+        EnvironmentalReading.objects.filter(
+            batch_container_assignment_id=assignment.id,
+            reading_time=reading_time,
+            notes__contains=f"action={action.id};side={side};",
+        ).values_list("notes", flat=True)
+    )
+
+    readings = []
     seen_parameters = set()
     for link in links:
         if link.parameter_id in seen_parameters:
             continue
         seen_parameters.add(link.parameter_id)
 
-        marker = (
-            f"action={action.id};side={side};parameter={link.parameter_id};"
-            f"moment={moment}"
-        )
-        existing = EnvironmentalReading.objects.filter(
-            batch_container_assignment_id=assignment.id,
-            parameter_id=link.parameter_id,
-            reading_time=reading_time,
-            notes__contains=marker,
-        ).exists()
-        if existing:
+        marker = marker_for(link.parameter_id)
+        if any(marker in notes for notes in existing_notes):
             skipped_count += 1
             continue
 
@@ -119,19 +127,37 @@ def _snapshot_for_assignment(
             missing_value_count += 1
             continue
 
-        EnvironmentalReading.objects.create(
-            parameter_id=link.parameter_id,
-            container_id=container_id,
-            batch_id=action.workflow.batch_id,
-            sensor_id=(latest.sensor_id if latest else link.sensor_id),
-            batch_container_assignment_id=assignment.id,
-            value=value,
-            reading_time=reading_time,
-            is_manual=latest is None,
-            recorded_by_id=executed_by_id,
-            notes=(f"{SNAPSHOT_NOTE_PREFIX} {marker};carrier_snapshot=true"),
+        readings.append(
+            EnvironmentalReading(
+                parameter_id=link.parameter_id,
+                container_id=container_id,
+                batch_id=action.workflow.batch_id,
+                sensor_id=(latest.sensor_id if latest else link.sensor_id),
+                batch_container_assignment_id=assignment.id,
+                value=value,
+                reading_time=reading_time,
+                is_manual=latest is None,
+                recorded_by_id=executed_by_id,
+                notes=(f"{SNAPSHOT_NOTE_PREFIX} {marker};carrier_snapshot=true"),
+            )
         )
-        created_count += 1
+
+    if not readings:
+        return SnapshotResult(0, skipped_count, missing_value_count)
+
+    executed_by = (
+        get_user_model().objects.filter(pk=executed_by_id).first()
+        if executed_by_id
+        else None
+    )
+    created_count = len(
+        bulk_create_with_history(
+            readings,
+            EnvironmentalReading,
+            default_user=executed_by,
+            default_change_reason=f"Transfer snapshot ({moment}) for action {action.id}",
+        )
+    )
 
     return SnapshotResult(
         created_count=created_count,
@@ -233,3 +233,60 @@ class EnvironmentalReadingAPITest(APITestCase):
         response = self.client.get(url)
         self.assertEqual(response.status_code, status.HTTP_200_OK)
         self.assertEqual(len(response.data), 1)  # Only one container
+
+    def _add_tied_readings(self, count):
+        """Readings sharing one reading_time, so paging must tie-break on id."""
+        EnvironmentalReading.objects.bulk_create([
+            EnvironmentalReading(
+                parameter=self.parameter,
+                container=self.container,
+                reading_time=self.reading_time - timedelta(minutes=30),
+                value=Decimal('14.00'),
+                is_manual=False,
+            )
+            for _ in range(count)
+        ])
+
+    def test_cursor_pagination_walks_all_readings(self):
+        """Cursor pages seek on (reading_time, id) without gaps or repeats."""
+        self._add_tied_readings(22)
+        expected = list(
+            EnvironmentalReading.objects.order_by('-reading_time', '-id').values_list('id', flat=True)
+        )
+
+        first = self.client.get(self.list_url, {'cursor': ''})
+        self.assertEqual(first.status_code, status.HTTP_200_OK)
+        self.assertEqual(first.data['count'], 28)
+        self.assertFalse(first.data['count_approximate'])
+        self.assertIsNone(first.data['previous'])
+        self.assertIn('cursor=', first.data['next'])
+
+        second = self.client.get(first.data['next'])
+        self.assertIsNone(second.data['next'])
+        seen = [row['id'] for row in first.data['results'] + second.data['results']]
+        self.assertEqual(seen, expected)
+
+        back = self.client.get(second.data['previous'])
+        self.assertEqual([row['id'] for row in back.data['results']], expected[:20])
+        self.assertIsNone(back.data['previous'])
+
+    def test_cursor_pagination_rejects_garbage_cursor(self):
+        response = self.client.get(self.list_url, {'cursor': 'not-a-cursor'})
+        self.assertEqual(response.status_code, status.HTTP_400_BAD_REQUEST)
+
+    def test_count_is_capped_for_page_number_mode(self):
+        """Past the cap the count is an estimate and deep pages still resolve."""
+        from unittest import mock
+        from aquamind.utils.pagination import KeysetPagination
+
+        self._add_tied_readings(22)
+        with mock.patch.object(KeysetPagination, 'count_cap', 5):
+            first = self.client.get(self.list_url)
+            second = self.client.get(self.list_url, {'page': 2})
+
+        self.assertTrue(first.data['count_approximate'])
+        self.assertGreaterEqual(first.data['count'], 6)
+        self.assertIsNotNone(first.data['next'])
+        self.assertEqual(second.status_code, status.HTTP_200_OK)
+        self.assertEqual(len(second.data['results']), 8)
+        self.assertIsNone(second.data['next'])
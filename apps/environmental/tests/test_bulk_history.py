@@ -0,0 +1,22 @@
+"""
+Tests for the benchmark_bulk_history management command.
+"""
+from io import StringIO
+
+from django.core.management import call_command
+from django.test import TestCase
+
+from apps.environmental.models import PhotoperiodData
+
+
+class BenchmarkBulkHistoryCommandTests(TestCase):
+
+    def test_benchmark_command_reports_overhead(self):
+        out = StringIO()
+        call_command('benchmark_bulk_history', '--rows', '20', stdout=out)
+
+        output = out.getvalue()
+        self.assertIn('ms per 10000 rows', output)
+        self.assertIn('history overhead:', output)
+        self.assertFalse(PhotoperiodData.objects.exists())
+        self.assertFalse(PhotoperiodData.history.exists())
@@ -0,0 +1,47 @@
+# Generated by Django 4.2.11 on 2026-10-18 23:27
+
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("finance", "0008_add_egg_delivery_pricing"),
+        ("finance_core", "0002_valuationrun_timescale"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="OpeningBiologySnapshot",
+            fields=[
+                ("snapshot_id", models.BigAutoField(primary_key=True, serialize=False)),
+                ("year", models.PositiveIntegerField()),
+                ("month", models.PositiveSmallIntegerField()),
+                ("source", models.CharField(max_length=32)),
+                ("snapshot_date", models.DateField()),
+                ("latest_recorded_at", models.DateTimeField(blank=True, null=True)),
+                ("rows", models.JSONField(blank=True, default=list)),
+                ("captured_at", models.DateTimeField(auto_now=True)),
+                (
+                    "operating_unit",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="finance_core_opening_snapshots",
+                        to="finance.dimsite",
+                    ),
+                ),
+            ],
+            options={
+                "db_table": "finance_core_openingbiologysnapshot",
+                "ordering": ("-year", "-month", "operating_unit__site_name"),
+            },
+        ),
+        migrations.AddConstraint(
+            model_name="openingbiologysnapshot",
+            constraint=models.UniqueConstraint(
+                fields=("operating_unit", "year", "month"),
+                name="fc_open_bio_ou_per_uniq",
+            ),
+        ),
+    ]
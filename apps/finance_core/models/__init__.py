@@ -13,6 +13,7 @@ from apps.finance_core.models.imports import CostImportBatch, CostImportLine
 from apps.finance_core.models.locking import PeriodLock
 from apps.finance_core.models.valuation import (
     AllocationRule,
+    OpeningBiologySnapshot,
     ValuationRun,
     ValuationRunStatus,
 )
@@ -31,6 +32,7 @@ __all__ = [
     "CostImportLine",
     "PeriodLock",
     "AllocationRule",
+    "OpeningBiologySnapshot",
     "ValuationRun",
     "ValuationRunStatus",
 ]
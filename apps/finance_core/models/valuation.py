@@ -145,3 +145,34 @@ class ValuationRun(models.Model):
             f"{self.company.display_name} / {self.operating_unit.site_name} "
             f"{self.year}-{self.month:02d} v{self.version}"
         )
+
+
+class OpeningBiologySnapshot(models.Model):
+    """Stored opening-of-month biology rows for one operating unit and period."""
+
+    snapshot_id = models.BigAutoField(primary_key=True)
+    operating_unit = models.ForeignKey(
+        "finance.DimSite",
+        on_delete=models.CASCADE,
+        related_name="finance_core_opening_snapshots",
+    )
+    year = models.PositiveIntegerField()
+    month = models.PositiveSmallIntegerField()
+    source = models.CharField(max_length=32)
+    snapshot_date = models.DateField()
+    latest_recorded_at = models.DateTimeField(null=True, blank=True)
+    rows = models.JSONField(default=list, blank=True)
+    captured_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        db_table = "finance_core_openingbiologysnapshot"
+        ordering = ("-year", "-month", "operating_unit__site_name")
+        constraints = [
+            models.UniqueConstraint(
+                fields=["operating_unit", "year", "month"],
+                name="fc_open_bio_ou_per_uniq",
+            )
+        ]
+
+    def __str__(self):
+        return f"{self.operating_unit.site_name} {self.year}-{self.month:02d} opening biology"
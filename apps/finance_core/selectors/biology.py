@@ -9,7 +9,24 @@ from django.db import OperationalError, ProgrammingError
 from django.db.models import Q
 
 from apps.batch.models import ActualDailyAssignmentState, BatchContainerAssignment
-from apps.finance.services.dimension_mapping import DimensionMappingService
+from apps.finance.models import DimSite
+
+DECIMAL_FIELDS = ("population_count", "biomass_kg", "avg_weight_g")
+
+# (row key, ORM path) pairs shared by daily-state and assignment rows; the
+# per-source population/recorded-at paths are appended by the callers.
+_COMMON_PATHS = (
+    ("batch_id", "batch_id"),
+    ("batch_number", "batch__batch_number"),
+    ("container_id", "container_id"),
+    ("container_name", "container__name"),
+    ("lifecycle_stage", "lifecycle_stage__name"),
+    ("cost_center_id", "batch__finance_core_link__cost_center_id"),
+    ("cost_center_code", "batch__finance_core_link__cost_center__code"),
+    ("cost_center_name", "batch__finance_core_link__cost_center__name"),
+    ("biomass_kg", "biomass_kg"),
+    ("avg_weight_g", "avg_weight_g"),
+)
 
 
 def _decimal_value(value) -> Decimal:
@@ -20,31 +37,97 @@ def _decimal_value(value) -> Decimal:
     return Decimal(str(value))
 
 
-def _build_snapshot_row(source, *, population_attr: str, biomass_attr: str, weight_attr: str):
-    batch = source.batch
-    link = getattr(batch, "finance_core_link", None)
-    cost_center = getattr(link, "cost_center", None)
-    container = source.container
-    site = DimensionMappingService.get_site_for_container(container)
-    company = getattr(site, "company", None)
+def _site_container_q(site: DimSite) -> Q:
+    """
+    Containers that DimensionMappingService maps to site.
 
+    Hall containers map through their station; only containers without a
+    hall map through their area.
+    """
+    if site.source_model == DimSite.SourceModel.STATION:
+        return Q(container__hall__freshwater_station_id=site.source_pk)
+    return Q(container__hall__isnull=True, container__area_id=site.source_pk)
+
+
+def _select_rows(queryset, *, site: DimSite, id_path: str, population_path: str, recorded_path: str):
+    """Run one values query and shape it into snapshot rows."""
+
+    paths = (
+        ("assignment_id", id_path),
+        *_COMMON_PATHS,
+        ("population_count", population_path),
+        ("recorded_at", recorded_path),
+    )
+    keys = [key for key, _ in paths]
+    company = site.company
+
+    rows = []
+    latest_recorded_at = None
+    for values in queryset.filter(_site_container_q(site)).values_list(*(path for _, path in paths)):
+        row = dict(zip(keys, values))
+        recorded_at = row.pop("recorded_at")
+        if recorded_at and (latest_recorded_at is None or recorded_at > latest_recorded_at):
+            latest_recorded_at = recorded_at
+        row.update(
+            site_id=site.site_id,
+            site_name=site.site_name,
+            company_id=company.company_id,
+            company_name=company.display_name,
+        )
+        for field in DECIMAL_FIELDS:
+            row[field] = _decimal_value(row[field])
+        rows.append(row)
+    return rows, latest_recorded_at
+
+
+def _details(rows, *, source: str, opening_date: date, latest_recorded_at):
     return {
-        "assignment_id": getattr(source, "assignment_id", getattr(source, "id", None)),
-        "batch_id": batch.id,
-        "batch_number": batch.batch_number,
-        "container_id": container.id,
-        "container_name": container.name,
-        "lifecycle_stage": source.lifecycle_stage.name,
-        "site_id": site.site_id if site else None,
-        "site_name": site.site_name if site else None,
-        "company_id": company.company_id if company else None,
-        "company_name": company.display_name if company else None,
-        "cost_center_id": cost_center.cost_center_id if cost_center else None,
-        "cost_center_code": cost_center.code if cost_center else None,
-        "cost_center_name": cost_center.name if cost_center else None,
-        "population_count": _decimal_value(getattr(source, population_attr)),
-        "biomass_kg": _decimal_value(getattr(source, biomass_attr)),
-        "avg_weight_g": _decimal_value(getattr(source, weight_attr)),
+        "rows": rows,
+        "source": source,
+        "snapshot_date": opening_date.isoformat(),
+        "latest_recorded_at": latest_recorded_at.isoformat()
+        if latest_recorded_at
+        else None,
+    }
+
+
+def _stored_details(*, site: DimSite, year: int, month: int):
+    """Stored snapshot rows for a locked period, None for open periods."""
+    from apps.finance_core.models import OpeningBiologySnapshot, PeriodLock
+
+    try:
+        locked = PeriodLock.objects.filter(
+            operating_unit_id=site.site_id,
+            year=year,
+            month=month,
+            is_locked=True,
+        ).exists()
+        if not locked:
+            return None
+        snapshot = OpeningBiologySnapshot.objects.filter(
+            operating_unit_id=site.site_id,
+            year=year,
+            month=month,
+        ).first()
+    except (ProgrammingError, OperationalError):
+        return None
+    if snapshot is None:
+        return None
+
+    rows = []
+    for stored in snapshot.rows:
+        row = dict(stored)
+        for field in DECIMAL_FIELDS:
+            row[field] = _decimal_value(row.get(field))
+        rows.append(row)
+    return {
+        "rows": rows,
+        "source": snapshot.source,
+        "snapshot_date": snapshot.snapshot_date.isoformat(),
+        "latest_recorded_at": snapshot.latest_recorded_at.isoformat()
+        if snapshot.latest_recorded_at
+        else None,
+        "stored_at": snapshot.captured_at.isoformat(),
     }
 
 
@@ -54,93 +137,57 @@ def get_opening_biology_snapshot_details(
     month: int,
     operating_unit_id: int,
     company_id: int | None = None,
+    use_stored: bool = True,
 ):
-    """Return opening-of-month headcount, biomass rows, and source metadata."""
+    """
+    Return opening-of-month headcount, biomass rows, and source metadata.
+
+    For locked periods rows come from the stored OpeningBiologySnapshot
+    captured when the period was locked (see services.opening_snapshots);
+    open periods, and locked ones without a snapshot, read the daily
+    assignment states on the first of the month, falling back to the
+    assignments active on that date, so corrections show up until close. Site scoping is a filter on the
+    container's station or area, so each source is one values() query.
+    """
 
     opening_date = date(year, month, 1)
-    rows = []
-    source = "assignment_fallback"
-    latest_recorded_at = None
+    site = (
+        DimSite.objects.select_related("company")
+        .filter(site_id=operating_unit_id)
+        .first()
+    )
+    if site is None or (company_id and site.company_id != company_id):
+        return _details([], source="assignment_fallback", opening_date=opening_date, latest_recorded_at=None)
+
+    if use_stored:
+        stored = _stored_details(site=site, year=year, month=month)
+        if stored is not None:
+            return stored
 
     try:
-        daily_states = (
-            ActualDailyAssignmentState.objects.select_related(
-                "assignment",
-                "batch",
-                "container",
-                "lifecycle_stage",
-            )
-            .filter(date=opening_date)
-            .order_by("assignment_id")
+        rows, latest_recorded_at = _select_rows(
+            ActualDailyAssignmentState.objects.filter(date=opening_date).order_by("assignment_id"),
+            site=site,
+            id_path="assignment_id",
+            population_path="population",
+            recorded_path="last_computed_at",
         )
-
-        for state in daily_states:
-            row = _build_snapshot_row(
-                state,
-                population_attr="population",
-                biomass_attr="biomass_kg",
-                weight_attr="avg_weight_g",
-            )
-            if row["site_id"] != operating_unit_id:
-                continue
-            if company_id and row["company_id"] != company_id:
-                continue
-            rows.append(row)
-            state_recorded_at = getattr(state, "last_computed_at", None)
-            if state_recorded_at and (
-                latest_recorded_at is None or state_recorded_at > latest_recorded_at
-            ):
-                latest_recorded_at = state_recorded_at
     except (ProgrammingError, OperationalError):
         rows = []
 
     if rows:
-        return {
-            "rows": rows,
-            "source": "daily_state",
-            "snapshot_date": opening_date.isoformat(),
-            "latest_recorded_at": latest_recorded_at.isoformat()
-            if latest_recorded_at
-            else None,
-        }
-
-    assignments = (
-        BatchContainerAssignment.objects.select_related(
-            "batch",
-            "container",
-            "lifecycle_stage",
-        )
-        .filter(assignment_date__lte=opening_date)
+        return _details(rows, source="daily_state", opening_date=opening_date, latest_recorded_at=latest_recorded_at)
+
+    rows, latest_recorded_at = _select_rows(
+        BatchContainerAssignment.objects.filter(assignment_date__lte=opening_date)
         .filter(Q(departure_date__isnull=True) | Q(departure_date__gte=opening_date))
-        .order_by("assignment_date", "id")
+        .order_by("assignment_date", "id"),
+        site=site,
+        id_path="id",
+        population_path="population_count",
+        recorded_path="updated_at",
     )
-
-    for assignment in assignments:
-        row = _build_snapshot_row(
-            assignment,
-            population_attr="population_count",
-            biomass_attr="biomass_kg",
-            weight_attr="avg_weight_g",
-        )
-        if row["site_id"] != operating_unit_id:
-            continue
-        if company_id and row["company_id"] != company_id:
-            continue
-        rows.append(row)
-        assignment_recorded_at = getattr(assignment, "updated_at", None)
-        if assignment_recorded_at and (
-            latest_recorded_at is None or assignment_recorded_at > latest_recorded_at
-        ):
-            latest_recorded_at = assignment_recorded_at
-
-    return {
-        "rows": rows,
-        "source": source,
-        "snapshot_date": opening_date.isoformat(),
-        "latest_recorded_at": latest_recorded_at.isoformat()
-        if latest_recorded_at
-        else None,
-    }
+    return _details(rows, source="assignment_fallback", opening_date=opening_date, latest_recorded_at=latest_recorded_at)
 
 
 def get_opening_biology_snapshot(
@@ -4,6 +4,11 @@ from apps.finance_core.services.allocation import build_allocation_preview
 from apps.finance_core.services.cost_centers import ensure_cost_center_for_assignment
 from apps.finance_core.services.imports import import_nav_costs
 from apps.finance_core.services.locking import LockGuardService, lock_period, reopen_period
+from apps.finance_core.services.opening_snapshots import (
+    capture_opening_biology_snapshot,
+    capture_opening_biology_snapshots,
+    capture_missing_locked_snapshots,
+)
 from apps.finance_core.services.preclose import build_preclose_summary
 from apps.finance_core.services.valuation import (
     build_movement_report,
@@ -20,6 +25,9 @@ __all__ = [
     "LockGuardService",
     "lock_period",
     "reopen_period",
+    "capture_opening_biology_snapshot",
+    "capture_opening_biology_snapshots",
+    "capture_missing_locked_snapshots",
     "build_preclose_summary",
     "build_movement_report",
     "build_nav_export_preview",
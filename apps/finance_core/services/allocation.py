@@ -5,7 +5,9 @@ from __future__ import annotations
 from collections import defaultdict
 from datetime import date
 from decimal import Decimal, ROUND_HALF_UP
+import hashlib
 
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import models
 
@@ -13,6 +15,8 @@ from apps.finance_core.models import AllocationRule, CostImportLine
 from apps.finance_core.selectors.biology import get_opening_biology_snapshot
 
 TWOPLACES = Decimal("0.01")
+PREVIEW_CACHE_TIMEOUT = 900
+PREVIEW_CACHE_KEY = "finance_core:allocation:{year}:{month}:{operating_unit_id}:{company_id}:{input_hash}"
 DEFAULT_RULE = {
     "mode": "weighted",
     "weights": {"headcount": 0.5, "biomass": 0.5},
@@ -43,35 +47,66 @@ def _normalise_rule(rule_definition):
     }
 
 
-def resolve_allocation_rule(*, account_group, cost_center_id: int | None, as_of_date: date):
-    """Resolve the most specific rule for an allocation candidate."""
+class AllocationRuleIndex:
+    """
+    Active allocation rules for one as-of date, loaded in a single query.
 
-    base_queryset = AllocationRule.objects.filter(
-        is_active=True,
-        effective_from__lte=as_of_date,
-    ).filter(
-        models.Q(effective_to__isnull=True) | models.Q(effective_to__gte=as_of_date)
-    )
+    Resolution matches the per-candidate lookup: the newest rule for the
+    cost center wins, then the newest account-group-wide rule (no cost
+    center), then DEFAULT_RULE.
+    """
 
-    cost_center_rule = None
-    if cost_center_id is not None:
-        cost_center_rule = (
-            base_queryset.filter(cost_center_id=cost_center_id)
+    def __init__(self, rules):
+        self.rules = list(rules)
+        self.by_cost_center = {}
+        self.by_account_group = {}
+        for rule in self.rules:
+            if rule.cost_center_id is not None:
+                self.by_cost_center.setdefault(rule.cost_center_id, rule)
+            else:
+                self.by_account_group.setdefault(rule.account_group_id, rule)
+        self._normalised = {}
+
+    @classmethod
+    def for_date(cls, as_of_date: date) -> "AllocationRuleIndex":
+        return cls(
+            AllocationRule.objects.filter(
+                is_active=True,
+                effective_from__lte=as_of_date,
+            )
+            .filter(models.Q(effective_to__isnull=True) | models.Q(effective_to__gte=as_of_date))
             .order_by("-effective_from", "-rule_id")
-            .first()
         )
-    if cost_center_rule:
-        return cost_center_rule, _normalise_rule(cost_center_rule.rule_definition)
 
-    account_group_rule = (
-        base_queryset.filter(account_group=account_group, cost_center__isnull=True)
-        .order_by("-effective_from", "-rule_id")
-        .first()
-    )
-    if account_group_rule:
-        return account_group_rule, _normalise_rule(account_group_rule.rule_definition)
+    def resolve(self, *, account_group_id, cost_center_id: int | None):
+        rule_obj = None
+        if cost_center_id is not None:
+            rule_obj = self.by_cost_center.get(cost_center_id)
+        if rule_obj is None:
+            rule_obj = self.by_account_group.get(account_group_id)
+        rule_id = rule_obj.rule_id if rule_obj else None
+        if rule_id not in self._normalised:
+            self._normalised[rule_id] = _normalise_rule(
+                rule_obj.rule_definition if rule_obj else DEFAULT_RULE
+            )
+        return rule_obj, self._normalised[rule_id]
+
+    def fingerprint(self):
+        """Identity of the loaded rules, for cache keys."""
+        return [
+            (rule.rule_id, rule.updated_at.isoformat() if rule.updated_at else None)
+            for rule in self.rules
+        ]
+
+
+def resolve_allocation_rule(*, account_group, cost_center_id: int | None, as_of_date: date):
+    """Resolve the most specific rule for an allocation candidate."""
 
-    return None, _normalise_rule(DEFAULT_RULE)
+    account_group_id = getattr(account_group, "pk", account_group)
+    return AllocationRuleIndex.for_date(as_of_date).resolve(
+        account_group_id=account_group_id,
+        cost_center_id=cost_center_id,
+    )
 
 
 def _aggregate_biology_rows(rows):
@@ -114,8 +149,88 @@ def _aggregate_biology_rows(rows):
     return list(grouped.values()), missing
 
 
-def build_allocation_preview(*, year: int, month: int, operating_unit_id: int, company_id: int | None = None):
-    """Build allocation preview rows for a site-period."""
+def _input_hash(*, biology_rows, cost_lines, rule_index) -> str:
+    digest = hashlib.sha256()
+    for row in biology_rows:
+        digest.update(repr(sorted(row.items())).encode())
+    for line in cost_lines:
+        digest.update(
+            repr((line.line_id, line.account_group_id, line.cost_group_code, line.operating_unit_name, line.amount)).encode()
+        )
+    digest.update(repr(rule_index.fingerprint()).encode())
+    return digest.hexdigest()
+
+
+def _line_shares(grouped_biology, rule_index, *, account_group_id, total_population, total_biomass):
+    """Score every cost center once for an account group; returns (entry, share) pairs."""
+
+    line_scores = []
+    for item in grouped_biology:
+        rule_obj, rule = rule_index.resolve(
+            account_group_id=account_group_id,
+            cost_center_id=item["cost_center_id"],
+        )
+        headcount_share = (
+            item["population_count"] / total_population
+            if total_population > 0
+            else Decimal("0")
+        )
+        biomass_share = (
+            item["biomass_kg"] / total_biomass
+            if total_biomass > 0
+            else Decimal("0")
+        )
+
+        if total_population <= 0 and total_biomass <= 0 and rule["fallback"] == "equal_split":
+            score = Decimal("1") / Decimal(len(grouped_biology))
+        else:
+            score = (
+                rule["weights"]["headcount"] * headcount_share
+                + rule["weights"]["biomass"] * biomass_share
+            )
+
+        line_scores.append(
+            {
+                "item": item,
+                "rule": rule,
+                "rule_id": rule_obj.rule_id if rule_obj else None,
+                "score": score,
+                "headcount_share": headcount_share,
+                "biomass_share": biomass_share,
+            }
+        )
+
+    total_score = sum((entry["score"] for entry in line_scores), Decimal("0"))
+    if total_score <= 0:
+        total_score = Decimal(len(line_scores))
+        for entry in line_scores:
+            entry["score"] = Decimal("1")
+
+    return [(entry, entry["score"] / total_score) for entry in line_scores]
+
+
+def build_allocation_preview(
+    *,
+    year: int,
+    month: int,
+    operating_unit_id: int,
+    company_id: int | None = None,
+    use_cache: bool = True,
+):
+    """
+    Build allocation preview rows for a site-period.
+
+    Rules are resolved once for the period into an AllocationRuleIndex.
+    Shares depend only on (account group, cost center), so the share
+    vector is computed once per account group and applied to every cost
+    line of that group, with half-up cent rounding and the rounding
+    remainder booked on the first cost center.
+
+    Results are cached per (period, operating unit, company, input hash),
+    so a preview run and the finalize that follows it share one
+    computation while any change to biology, cost lines or rules produces
+    a new key.
+    """
 
     opening_date = date(year, month, 1)
     biology_rows = get_opening_biology_snapshot(
@@ -136,97 +251,73 @@ def build_allocation_preview(*, year: int, month: int, operating_unit_id: int, c
             }
         )
 
-    cost_lines = list(
-        CostImportLine.objects.select_related("account_group", "operating_unit")
-        .filter(year=year, month=month, operating_unit_id=operating_unit_id)
-        .order_by("cost_group_code", "line_id")
+    cost_lines = CostImportLine.objects.filter(
+        year=year, month=month, operating_unit_id=operating_unit_id
     )
     if company_id:
-        cost_lines = [line for line in cost_lines if line.company_id == company_id]
+        cost_lines = cost_lines.filter(company_id=company_id)
+    cost_lines = list(cost_lines.order_by("cost_group_code", "line_id"))
     if not cost_lines:
         raise ValidationError("No imported actual cost lines exist for the requested period.")
 
+    rule_index = AllocationRuleIndex.for_date(opening_date)
+    cache_key = None
+    if use_cache:
+        cache_key = PREVIEW_CACHE_KEY.format(
+            year=year,
+            month=month,
+            operating_unit_id=operating_unit_id,
+            company_id=company_id or 0,
+            input_hash=_input_hash(biology_rows=biology_rows, cost_lines=cost_lines, rule_index=rule_index),
+        )
+        cached = cache.get(cache_key)
+        if cached is not None:
+            return cached
+
     total_population = sum((item["population_count"] for item in grouped_biology), Decimal("0"))
     total_biomass = sum((item["biomass_kg"] for item in grouped_biology), Decimal("0"))
 
     allocations = []
     rule_snapshots = []
+    seen_snapshots = set()
+    shares_by_group = {}
 
     for line in cost_lines:
-        line_scores = []
-        for item in grouped_biology:
-            rule_obj, rule = resolve_allocation_rule(
-                account_group=line.account_group,
-                cost_center_id=item["cost_center_id"],
-                as_of_date=opening_date,
-            )
-            headcount_share = (
-                item["population_count"] / total_population
-                if total_population > 0
-                else Decimal("0")
-            )
-            biomass_share = (
-                item["biomass_kg"] / total_biomass
-                if total_biomass > 0
-                else Decimal("0")
+        shares = shares_by_group.get(line.account_group_id)
+        if shares is None:
+            shares = shares_by_group[line.account_group_id] = _line_shares(
+                grouped_biology,
+                rule_index,
+                account_group_id=line.account_group_id,
+                total_population=total_population,
+                total_biomass=total_biomass,
             )
 
-            if total_population <= 0 and total_biomass <= 0 and rule["fallback"] == "equal_split":
-                score = Decimal("1") / Decimal(len(grouped_biology))
-            else:
-                score = (
-                    rule["weights"]["headcount"] * headcount_share
-                    + rule["weights"]["biomass"] * biomass_share
+        amounts = [_round_currency(line.amount * share) for _, share in shares]
+        if amounts:
+            amounts[0] += _round_currency(line.amount - sum(amounts, Decimal("0")))
+
+        for (entry, share), amount in zip(shares, amounts):
+            snapshot_key = (entry["rule_id"], line.cost_group_code, entry["item"]["cost_center_id"])
+            if snapshot_key not in seen_snapshots:
+                seen_snapshots.add(snapshot_key)
+                rule_snapshots.append(
+                    {
+                        "rule_id": entry["rule_id"],
+                        "cost_group": line.cost_group_code,
+                        "cost_center_id": entry["item"]["cost_center_id"],
+                        "cost_center_code": entry["item"]["cost_center_code"],
+                        "definition": {
+                            "mode": entry["rule"]["mode"],
+                            "weights": {
+                                "headcount": str(entry["rule"]["weights"]["headcount"]),
+                                "biomass": str(entry["rule"]["weights"]["biomass"]),
+                            },
+                            "fallback": entry["rule"]["fallback"],
+                        },
+                    }
                 )
 
-            line_scores.append(
-                {
-                    "item": item,
-                    "rule": rule,
-                    "rule_id": rule_obj.rule_id if rule_obj else None,
-                    "score": score,
-                    "headcount_share": headcount_share,
-                    "biomass_share": biomass_share,
-                }
-            )
-
-        total_score = sum((entry["score"] for entry in line_scores), Decimal("0"))
-        if total_score <= 0:
-            total_score = Decimal(len(line_scores))
-            for entry in line_scores:
-                entry["score"] = Decimal("1")
-
-        allocated_total = Decimal("0")
-        running_rows = []
-        for entry in line_scores:
-            share = entry["score"] / total_score
-            amount = _round_currency(line.amount * share)
-            allocated_total += amount
-            running_rows.append((entry, share, amount))
-
-        rounding_delta = _round_currency(line.amount - allocated_total)
-        if running_rows:
-            entry, share, amount = running_rows[0]
-            running_rows[0] = (entry, share, amount + rounding_delta)
-
-        for entry, share, amount in running_rows:
-            rule_snapshot = {
-                "rule_id": entry["rule_id"],
-                "cost_group": line.cost_group_code,
-                "cost_center_id": entry["item"]["cost_center_id"],
-                "cost_center_code": entry["item"]["cost_center_code"],
-                "definition": {
-                    "mode": entry["rule"]["mode"],
-                    "weights": {
-                        "headcount": str(entry["rule"]["weights"]["headcount"]),
-                        "biomass": str(entry["rule"]["weights"]["biomass"]),
-                    },
-                    "fallback": entry["rule"]["fallback"],
-                },
-            }
-            if rule_snapshot not in rule_snapshots:
-                rule_snapshots.append(rule_snapshot)
-
             allocations.append(
                 {
                     "source_line_id": line.line_id,
@@ -264,7 +355,7 @@ def build_allocation_preview(*, year: int, month: int, operating_unit_id: int, c
         for line in cost_lines
     ]
 
-    return {
+    preview = {
         "year": year,
         "month": month,
         "operating_unit_id": operating_unit_id,
@@ -281,6 +372,9 @@ def build_allocation_preview(*, year: int, month: int, operating_unit_id: int, c
             ),
         },
     }
+    if cache_key:
+        cache.set(cache_key, preview, PREVIEW_CACHE_TIMEOUT)
+    return preview
 
 
 def summarize_allocations_by_cost_center(allocation_rows):
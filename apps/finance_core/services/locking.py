@@ -10,6 +10,7 @@ from django.utils import timezone
 
 from apps.finance.services.dimension_mapping import DimensionMappingService
 from apps.finance_core.models import PeriodLock
+from apps.finance_core.services.opening_snapshots import capture_opening_biology_snapshot
 
 
 @dataclass(frozen=True)
@@ -96,7 +97,12 @@ class LockGuardService:
 
 
 def lock_period(*, company, operating_unit, year: int, month: int, user=None, reason: str = ""):
-    """Lock a period and return the resulting lock record."""
+    """
+    Lock a period and return the resulting lock record.
+
+    Captures the period's opening biology snapshot, which valuation reads
+    while the period stays locked.
+    """
 
     lock, created = PeriodLock.objects.get_or_create(
         company=company,
@@ -123,6 +129,9 @@ def lock_period(*, company, operating_unit, year: int, month: int, user=None, re
                 "updated_at",
             ]
         )
+    capture_opening_biology_snapshot(
+        year=year, month=month, operating_unit_id=operating_unit.site_id, force=True
+    )
     return lock
 
 
@@ -0,0 +1,106 @@
+"""
+Stored opening-of-month biology snapshots for finance core.
+
+A snapshot is captured when a period is locked (lock_period) and is only
+read for locked periods, so valuation reruns for a closed month read the
+biology as it was at close. Open periods always read live daily states.
+"""
+
+from __future__ import annotations
+
+from datetime import datetime
+from decimal import Decimal
+
+from django.db.models import Exists, OuterRef
+
+from apps.finance.models import DimSite
+from apps.finance_core.models import OpeningBiologySnapshot, PeriodLock
+from apps.finance_core.selectors.biology import get_opening_biology_snapshot_details
+
+
+def _json_row(row):
+    return {
+        key: str(value) if isinstance(value, Decimal) else value
+        for key, value in row.items()
+    }
+
+
+def capture_opening_biology_snapshot(*, year: int, month: int, operating_unit_id: int, force: bool = False):
+    """
+    Store the live opening biology rows for one site-period.
+
+    Periods that are locked keep their existing snapshot unless force is
+    set, so valuation reruns for a closed month read the same biology.
+    Returns the snapshot, or None when a locked snapshot was kept.
+    """
+
+    existing = OpeningBiologySnapshot.objects.filter(
+        operating_unit_id=operating_unit_id, year=year, month=month
+    ).first()
+    if existing and not force:
+        locked = PeriodLock.objects.filter(
+            operating_unit_id=operating_unit_id, year=year, month=month, is_locked=True
+        ).exists()
+        if locked:
+            return None
+
+    details = get_opening_biology_snapshot_details(
+        year=year,
+        month=month,
+        operating_unit_id=operating_unit_id,
+        use_stored=False,
+    )
+    latest_recorded_at = details["latest_recorded_at"]
+    snapshot, _ = OpeningBiologySnapshot.objects.update_or_create(
+        operating_unit_id=operating_unit_id,
+        year=year,
+        month=month,
+        defaults={
+            "source": details["source"],
+            "snapshot_date": details["snapshot_date"],
+            "latest_recorded_at": datetime.fromisoformat(latest_recorded_at) if latest_recorded_at else None,
+            "rows": [_json_row(row) for row in details["rows"]],
+        },
+    )
+    return snapshot
+
+
+def capture_opening_biology_snapshots(*, year: int, month: int, operating_unit_ids=None, force: bool = False):
+    """Capture snapshots for every site (or the given ones); returns a count summary."""
+
+    site_ids = operating_unit_ids
+    if site_ids is None:
+        site_ids = DimSite.objects.order_by("site_id").values_list("site_id", flat=True)
+
+    captured = kept = 0
+    for site_id in site_ids:
+        snapshot = capture_opening_biology_snapshot(
+            year=year, month=month, operating_unit_id=site_id, force=force
+        )
+        if snapshot is None:
+            kept += 1
+        else:
+            captured += 1
+    return {"year": year, "month": month, "captured": captured, "kept_locked": kept}
+
+
+def capture_missing_locked_snapshots():
+    """Capture snapshots for locked periods that have none (e.g. locked before capture existed)."""
+
+    stored = OpeningBiologySnapshot.objects.filter(
+        operating_unit_id=OuterRef("operating_unit_id"),
+        year=OuterRef("year"),
+        month=OuterRef("month"),
+    )
+    missing = (
+        PeriodLock.objects.filter(~Exists(stored), is_locked=True)
+        .values_list("operating_unit_id", "year", "month")
+        .distinct()
+    )
+    captured = 0
+    for operating_unit_id, year, month in missing:
+        capture_opening_biology_snapshot(
+            year=year, month=month, operating_unit_id=operating_unit_id, force=True
+        )
+        captured += 1
+    return {"captured": captured}
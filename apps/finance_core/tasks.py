@@ -3,6 +3,7 @@
 from celery import shared_task
 
 from apps.finance_core.models import Budget
+from apps.finance_core.services.opening_snapshots import capture_missing_locked_snapshots
 from apps.finance_core.services.valuation import (
     create_allocation_preview_run,
     finalize_valuation_run,
@@ -55,3 +56,10 @@ def finalize_valuation_run_task(
         mortality_adjustments=mortality_adjustments,
     )
     return {"run_id": run.run_id, "status": run.status}
+
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=300)
+def capture_opening_biology_snapshots_task(self):
+    """Store opening biology rows for locked periods that have no snapshot yet."""
+
+    return capture_missing_locked_snapshots()
@@ -1,24 +1,36 @@
 """Service tests for finance core."""
 
+from datetime import date
 from io import StringIO
 from decimal import Decimal
+from unittest.mock import patch
 
 from django.contrib.auth import get_user_model
+from django.core.cache import cache
 from django.core.management import call_command
 from django.core.exceptions import ValidationError
 from django.test import TestCase
 
-from apps.batch.models import GrowthSample
+from apps.batch.models import Batch, BatchContainerAssignment, GrowthSample
+from apps.finance_core.models import AllocationRule, OpeningBiologySnapshot
+from apps.finance_core.services import allocation as allocation_service
+from apps.finance_core.selectors.biology import get_opening_biology_snapshot_details
 from apps.finance_core.services import (
     build_allocation_preview,
     build_movement_report,
     build_preclose_summary,
+    capture_missing_locked_snapshots,
+    capture_opening_biology_snapshot,
+    capture_opening_biology_snapshots,
     create_allocation_preview_run,
     finalize_valuation_run,
     import_nav_costs,
     lock_period,
+    reopen_period,
 )
+from apps.finance_core.services.allocation import AllocationRuleIndex, resolve_allocation_rule
 from apps.finance_core.tests.base import FinanceCoreDomainMixin
+from apps.infrastructure.models import Container, FreshwaterStation, Hall
 
 User = get_user_model()
 
@@ -185,3 +197,229 @@ class FinanceCoreServiceTests(FinanceCoreDomainMixin, TestCase):
         call_command("seed_finance_core_demo", prefix="FCDEMO", stdout=stdout)
 
         self.assertEqual(self.budget.__class__.objects.count(), budget_count)
+
+
+class AllocationEngineTests(FinanceCoreDomainMixin, TestCase):
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user(
+            username="finance-allocation",
+            email="finance-allocation@example.com",
+            password="testpass123",
+        )
+        self.create_finance_core_domain(user=self.user)
+        second_container = Container.objects.create(
+            name="Tank FC-2",
+            container_type=self.container_type,
+            hall=self.hall,
+            volume_m3=Decimal("80.00"),
+            max_biomass_kg=Decimal("5000.00"),
+        )
+        second_batch = Batch.objects.create(
+            batch_number="FIN-TEST-002",
+            species=self.species,
+            lifecycle_stage=self.stage,
+            batch_type="STANDARD",
+            status="ACTIVE",
+            start_date=date(2026, 1, 1),
+        )
+        BatchContainerAssignment.objects.create(
+            batch=second_batch,
+            container=second_container,
+            lifecycle_stage=self.stage,
+            population_count=3000,
+            avg_weight_g=Decimal("10.00"),
+            assignment_date=date(2026, 1, 1),
+            is_active=True,
+        )
+        self.second_cost_center = second_batch.finance_core_link.cost_center
+        import_nav_costs(
+            uploaded_file=self.make_cost_import_file(amount="1000.01"),
+            year=2026,
+            month=3,
+            uploaded_by=self.user,
+        )
+
+    def _preview(self, **kwargs):
+        return build_allocation_preview(
+            year=2026,
+            month=3,
+            operating_unit_id=self.site.site_id,
+            company_id=self.company.company_id,
+            **kwargs,
+        )
+
+    def test_rule_index_matches_single_rule_resolution(self):
+        AllocationRule.objects.create(
+            name="Group headcount",
+            account_group=self.account_group,
+            effective_from=date(2026, 1, 1),
+            rule_definition={"weights": {"headcount": 1, "biomass": 0}},
+        )
+        center_rule = AllocationRule.objects.create(
+            name="Center biomass",
+            cost_center=self.second_cost_center,
+            effective_from=date(2026, 2, 1),
+            rule_definition={"weights": {"headcount": 0, "biomass": 1}},
+        )
+        AllocationRule.objects.create(
+            name="Expired",
+            cost_center=self.cost_center,
+            effective_from=date(2025, 1, 1),
+            effective_to=date(2025, 12, 31),
+        )
+
+        as_of = date(2026, 3, 1)
+        index = AllocationRuleIndex.for_date(as_of)
+        for cost_center_id in (self.cost_center.cost_center_id, self.second_cost_center.cost_center_id, None):
+            self.assertEqual(
+                index.resolve(account_group_id=self.account_group.pk, cost_center_id=cost_center_id),
+                resolve_allocation_rule(
+                    account_group=self.account_group, cost_center_id=cost_center_id, as_of_date=as_of
+                ),
+            )
+        self.assertEqual(
+            index.resolve(account_group_id=self.account_group.pk, cost_center_id=self.second_cost_center.cost_center_id)[0],
+            center_rule,
+        )
+
+    def test_allocation_is_exact_and_shared_with_finalize(self):
+        with patch(
+            "apps.finance_core.services.allocation._line_shares",
+            wraps=allocation_service._line_shares,
+        ) as line_shares:
+            preview = self._preview()
+            finalize_valuation_run(budget=self.budget, month=3, operating_unit=self.site, user=self.user)
+
+        self.assertEqual(line_shares.call_count, 1)
+        amounts = [Decimal(row["allocated_amount"]) for row in preview["allocations"]]
+        self.assertEqual(len(amounts), 2)
+        self.assertEqual(sum(amounts), Decimal("1000.01"))
+        self.assertEqual(preview["totals"]["allocated_amount"], "1000.01")
+
+    def test_rule_change_invalidates_cached_preview(self):
+        before = self._preview()
+        AllocationRule.objects.create(
+            name="Headcount only",
+            account_group=self.account_group,
+            effective_from=date(2026, 1, 1),
+            rule_definition={"weights": {"headcount": 1, "biomass": 0}},
+        )
+
+        after = self._preview()
+
+        self.assertNotEqual(before["allocations"], after["allocations"])
+        self.assertEqual(after, self._preview(use_cache=False))
+        self.assertEqual(
+            [row["share_percent"] for row in after["allocations"]], ["25.00", "75.00"]
+        )
+
+
+class OpeningBiologySnapshotTests(FinanceCoreDomainMixin, TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="finance-snapshot",
+            email="finance-snapshot@example.com",
+            password="testpass123",
+        )
+        self.create_finance_core_domain(user=self.user)
+        other_station = FreshwaterStation.objects.create(
+            geography=self.geo,
+            name="Other Station",
+            station_type="FRESHWATER",
+            latitude=Decimal("61.000000"),
+            longitude=Decimal("11.000000"),
+        )
+        other_hall = Hall.objects.create(freshwater_station=other_station, name="Hall O1")
+        other_container = Container.objects.create(
+            name="Tank O-1",
+            container_type=self.container_type,
+            hall=other_hall,
+            volume_m3=Decimal("80.00"),
+            max_biomass_kg=Decimal("5000.00"),
+        )
+        BatchContainerAssignment.objects.create(
+            batch=self.batch,
+            container=other_container,
+            lifecycle_stage=self.stage,
+            population_count=500,
+            avg_weight_g=Decimal("100.00"),
+            assignment_date=date(2026, 1, 1),
+            is_active=True,
+        )
+
+    def _details(self, **kwargs):
+        return get_opening_biology_snapshot_details(
+            year=2026, month=3, operating_unit_id=self.site.site_id, **kwargs
+        )
+
+    def test_rows_are_scoped_to_site_in_sql(self):
+        with self.assertNumQueries(4):
+            details = self._details()
+
+        self.assertEqual(details["source"], "assignment_fallback")
+        self.assertEqual([row["container_id"] for row in details["rows"]], [self.container.id])
+        row = details["rows"][0]
+        self.assertEqual(row["site_id"], self.site.site_id)
+        self.assertEqual(row["company_id"], self.company.company_id)
+        self.assertEqual(row["cost_center_code"], self.cost_center.code)
+        self.assertEqual(row["population_count"], Decimal("1000"))
+        self.assertEqual(
+            self._details(company_id=self.company.company_id + 1)["rows"], []
+        )
+
+    def _lock(self):
+        return lock_period(
+            company=self.company,
+            operating_unit=self.site,
+            year=2026,
+            month=3,
+            user=self.user,
+            reason="Month close",
+        )
+
+    def test_open_periods_read_live_biology(self):
+        capture_opening_biology_snapshots(year=2026, month=3)
+        BatchContainerAssignment.objects.filter(pk=self.assignment.pk).update(population_count=900)
+
+        details = self._details()
+
+        self.assertNotIn("stored_at", details)
+        self.assertEqual(details["rows"][0]["population_count"], Decimal("900"))
+
+    def test_locking_captures_snapshot_reproducible_until_forced(self):
+        BatchContainerAssignment.objects.filter(pk=self.assignment.pk).update(population_count=900)
+        self._lock()
+        BatchContainerAssignment.objects.filter(pk=self.assignment.pk).update(population_count=800)
+
+        summary = capture_opening_biology_snapshots(year=2026, month=3, operating_unit_ids=[self.site.site_id])
+        details = self._details()
+
+        self.assertEqual(summary["kept_locked"], 1)
+        self.assertIn("stored_at", details)
+        self.assertEqual(details["rows"][0]["population_count"], Decimal("900"))
+        self.assertEqual(self._details(use_stored=False)["rows"][0]["population_count"], Decimal("800"))
+
+        capture_opening_biology_snapshot(
+            year=2026, month=3, operating_unit_id=self.site.site_id, force=True
+        )
+        self.assertEqual(self._details()["rows"][0]["population_count"], Decimal("800"))
+
+    def test_reopened_period_reads_live_and_relock_recaptures(self):
+        lock = self._lock()
+        reopen_period(period_lock=lock, user=self.user, reason="Correction")
+        BatchContainerAssignment.objects.filter(pk=self.assignment.pk).update(population_count=700)
+
+        self.assertEqual(self._details()["rows"][0]["population_count"], Decimal("700"))
+
+        self._lock()
+        BatchContainerAssignment.objects.filter(pk=self.assignment.pk).update(population_count=600)
+        self.assertEqual(self._details()["rows"][0]["population_count"], Decimal("700"))
+
+    def test_missing_locked_snapshots_are_captured(self):
+        self._lock()
+        OpeningBiologySnapshot.objects.all().delete()
+
+        self.assertEqual(capture_missing_locked_snapshots(), {"captured": 1})
+        self.assertEqual(capture_missing_locked_snapshots(), {"captured": 0})
+        self.assertIn("stored_at", self._details())
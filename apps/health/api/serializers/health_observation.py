@@ -7,6 +7,9 @@ HealthParameter, HealthSamplingEvent, IndividualFishObservation, and FishParamet
 
 from rest_framework import serializers
 from django.db import transaction
+from django.utils import timezone
+from simple_history.utils import bulk_create_with_history
+from aquamind.utils.bulk_history import bulk_update_touching, delete_with_history
 from typing import Dict, Any, Optional
 
 from ...models import (
@@ -59,13 +62,36 @@ class FishParameterScoreSerializer(HealthBaseSerializer):
         read_only_fields = ['id', 'parameter_name', 'created_at', 'updated_at']
 
 
+class ActiveHealthParameterField(serializers.PrimaryKeyRelatedField):
+    """Primary key field that resolves active parameters with one query per payload.
+
+    A sampling event carries one score per fish and parameter, so the default
+    per-value lookup would issue hundreds of identical queries. The active
+    parameters are loaded once and kept on the root serializer.
+    """
+
+    def to_internal_value(self, data):
+        parameters = getattr(self.root, '_active_health_parameters', None)
+        if parameters is None:
+            parameters = {parameter.pk: parameter for parameter in self.get_queryset()}
+            self.root._active_health_parameters = parameters
+        if isinstance(data, bool):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        try:
+            return parameters[int(data)]
+        except (TypeError, ValueError):
+            self.fail('incorrect_type', data_type=type(data).__name__)
+        except KeyError:
+            self.fail('does_not_exist', pk_value=data)
+
+
 class FishParameterScoreInputSerializer(serializers.Serializer):
     """Input serializer for nested fish parameter scores.
     
     Note: Score validation is performed dynamically based on the parameter's min/max range.
     """
 
-    parameter = serializers.PrimaryKeyRelatedField(
+    parameter = ActiveHealthParameterField(
         queryset=HealthParameter.objects.filter(is_active=True),
         help_text="ID of the active health parameter being scored."
     )
@@ -410,11 +436,12 @@ class HealthSamplingEventSerializer(HealthDecimalFieldsMixin, NestedHealthModelM
 
         This method handles a complex nested creation process:
         1. Creates the parent HealthSamplingEvent object.
-        2. Creates IndividualFishObservation objects for each fish.
-        3. Creates FishParameterScore objects for each parameter score.
-        4. Calculates aggregate metrics based on the individual observations.
+        2. Bulk-creates the IndividualFishObservation objects (one insert).
+        3. Bulk-creates the FishParameterScore objects (one insert).
+        4. Calculates aggregate metrics from the submitted observations in memory.
 
-        The entire operation is wrapped in a transaction to ensure data integrity.
+        History rows for the nested objects are written in bulk as well. The
+        entire operation is wrapped in a transaction to ensure data integrity.
 
         Args:
             validated_data (dict): The data for creating the event.
@@ -432,25 +459,11 @@ class HealthSamplingEventSerializer(HealthDecimalFieldsMixin, NestedHealthModelM
         
         # Create the parent health sampling event
         health_sampling_event = HealthSamplingEvent.objects.create(**validated_data)
-        
-        # Create individual fish observations (children of the sampling event)
-        for fish_data in individual_fish_observations_data:
-            parameter_scores_data = fish_data.pop('parameter_scores', [])
 
-            fish_observation = IndividualFishObservation.objects.create(
-                sampling_event=health_sampling_event,
-                **fish_data
-            )
+        observations = self._create_observations(health_sampling_event, individual_fish_observations_data)
 
-            for score_data in parameter_scores_data:
-                FishParameterScore.objects.create(
-                    individual_fish_observation=fish_observation,
-                    **score_data
-                )
-        
-        # Calculate aggregate metrics (avg weight, length, etc.) based on individual observations
-        # Always calculate metrics after creation to ensure data consistency
-        health_sampling_event.calculate_aggregate_metrics()
+        # Calculate aggregate metrics (avg weight, length, etc.) from the rows just written
+        health_sampling_event.calculate_aggregate_metrics(observations=observations)
         
         return health_sampling_event
         
@@ -460,14 +473,17 @@ class HealthSamplingEventSerializer(HealthDecimalFieldsMixin, NestedHealthModelM
 
         This method handles a complex nested update process:
         1. Updates the parent HealthSamplingEvent object with new field values.
-        2. If individual fish observations are provided:
-           - Removes all existing observations (with cascade delete to parameter scores).
-           - Creates new IndividualFishObservation objects for each fish.
-           - Creates new FishParameterScore objects for each parameter score.
+        2. If individual fish observations are provided, diffs them against the
+           stored ones by fish_identifier (and scores by parameter):
+           - new fish/scores are bulk-created,
+           - changed measurements/scores are bulk-updated,
+           - fish/scores missing from the payload are deleted,
+           - unchanged rows are left alone (no history noise).
         3. Recalculates aggregate metrics based on the updated individual observations.
 
-        The entire operation is wrapped in a transaction to ensure data integrity.
-        Note: This uses a replace-all approach for nested objects.
+        The submitted list is the full set of observations for the event, as
+        with the previous replace-all strategy. The entire operation is
+        wrapped in a transaction to ensure data integrity.
 
         Args:
             instance (HealthSamplingEvent): The instance to update.
@@ -483,36 +499,109 @@ class HealthSamplingEventSerializer(HealthDecimalFieldsMixin, NestedHealthModelM
             setattr(instance, attr, value)
         instance.save()
         
-        # Update individual fish observations if provided
+        observations = None
         if individual_fish_observations_data is not None:
-            # Replace strategy: Clear all existing observations and create new ones
-            # This also cascades to delete all associated parameter scores
-            instance.individual_fish_observations.all().delete()
-            
-            # Create new observations with the updated data
-            for fish_data in individual_fish_observations_data:
-                # Set the reference to the parent sampling event
-                fish_data['sampling_event'] = instance
-                
-                # Extract parameter scores data if present
-                parameter_scores_data = fish_data.pop('parameter_scores', [])
-                
-                # Create the new fish observation
-                fish_observation = IndividualFishObservation.objects.create(**fish_data)
-                
-                # Create new parameter scores for this fish observation
-                for score_data in parameter_scores_data:
-                    FishParameterScore.objects.create(
-                        individual_fish_observation=fish_observation,
-                        **score_data
-                    )
+            observations = self._sync_observations(instance, individual_fish_observations_data)
         
         # Recalculate all aggregate metrics based on the updated observations
         # This ensures that derived values (averages, min/max, etc.) are consistent
-        instance.calculate_aggregate_metrics()
+        instance.calculate_aggregate_metrics(observations=observations)
         
         return instance
 
+    def _history_kwargs(self, action):
+        """History user/reason for nested bulk writes, matching HistoryReasonMixin."""
+        request = self.context.get('request')
+        view = self.context.get('view')
+        user = getattr(request, 'user', None)
+        return {
+            'default_user': user if getattr(user, 'is_authenticated', False) else None,
+            'default_change_reason': view._reason(action) if hasattr(view, '_reason') else None,
+        }
+
+    def _create_observations(self, sampling_event, fish_data_list, history=None):
+        """Bulk-create observations and their scores; returns the observations."""
+        if not fish_data_list:
+            return []
+        history = history or self._history_kwargs('created')
+        scores_by_position = []
+        observations = []
+        for fish_data in fish_data_list:
+            fish_data = dict(fish_data)
+            scores_by_position.append(fish_data.pop('parameter_scores', []))
+            observations.append(IndividualFishObservation(sampling_event=sampling_event, **fish_data))
+
+        observations = bulk_create_with_history(observations, IndividualFishObservation, **history)
+        bulk_create_with_history(
+            [
+                FishParameterScore(individual_fish_observation=observation, **score_data)
+                for observation, scores_data in zip(observations, scores_by_position)
+                for score_data in scores_data
+            ],
+            FishParameterScore,
+            **history,
+        )
+        return observations
+
+    def _sync_observations(self, sampling_event, fish_data_list):
+        """Diff the submitted observations against the stored ones; returns the final set."""
+        history = self._history_kwargs('updated')
+        existing = {
+            observation.fish_identifier: observation
+            for observation in sampling_event.individual_fish_observations.all()
+        }
+        existing_scores = {}
+        for score in FishParameterScore.objects.filter(
+            individual_fish_observation__sampling_event=sampling_event
+        ):
+            existing_scores[(score.individual_fish_observation_id, score.parameter_id)] = score
+
+        kept = {}
+        new_fish = []
+        changed_fish = []
+        new_scores = []
+        changed_scores = []
+        kept_score_keys = set()
+        for fish_data in fish_data_list:
+            observation = existing.get(fish_data['fish_identifier'])
+            if observation is None:
+                new_fish.append(fish_data)
+                continue
+            kept[observation.fish_identifier] = observation
+            weight_g, length_cm = fish_data.get('weight_g'), fish_data.get('length_cm')
+            if (observation.weight_g, observation.length_cm) != (weight_g, length_cm):
+                observation.weight_g, observation.length_cm = weight_g, length_cm
+                changed_fish.append(observation)
+            for score_data in fish_data.get('parameter_scores', []):
+                key = (observation.pk, score_data['parameter'].pk)
+                kept_score_keys.add(key)
+                score = existing_scores.get(key)
+                if score is None:
+                    new_scores.append(FishParameterScore(individual_fish_observation=observation, **score_data))
+                elif score.score != score_data['score']:
+                    score.score = score_data['score']
+                    changed_scores.append(score)
+
+        removed_fish = [
+            observation for identifier, observation in existing.items() if identifier not in kept
+        ]
+        # Scores of removed fish are deleted along with dropped scores, before their fish
+        removed_scores = [
+            score for key, score in existing_scores.items() if key not in kept_score_keys
+        ]
+
+        delete_with_history(removed_scores, **history)
+        delete_with_history(removed_fish, **history)
+        now = timezone.now()
+        bulk_update_touching(
+            changed_fish, IndividualFishObservation, ['weight_g', 'length_cm'], updated_at=now, **history
+        )
+        bulk_update_touching(changed_scores, FishParameterScore, ['score'], updated_at=now, **history)
+        bulk_create_with_history(new_scores, FishParameterScore, **history)
+        created = self._create_observations(sampling_event, new_fish, history)
+
+        return list(kept.values()) + created
+
 
 class HealthParameterSerializer(HealthBaseSerializer):
     """Serializer for the HealthParameter model with nested score definitions.
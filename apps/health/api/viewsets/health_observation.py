@@ -5,6 +5,7 @@ This module defines viewsets for health observation models, including
 HealthParameter, HealthSamplingEvent, IndividualFishObservation, and FishParameterScore.
 """
 
+from django.db.models import prefetch_related_objects
 from rest_framework import viewsets, permissions
 
 from apps.health.models import (
@@ -114,6 +115,19 @@ class HealthSamplingEventViewSet(HistoryReasonMixin, UserAssignmentMixin, Optimi
     }
     search_fields = ['notes']
 
+    def perform_create(self, serializer):
+        super().perform_create(serializer)
+        self._prefetch_nested(serializer.instance)
+
+    def perform_update(self, serializer):
+        super().perform_update(serializer)
+        self._prefetch_nested(serializer.instance)
+
+    def _prefetch_nested(self, instance):
+        """Reload nested observations for the response in one query per level."""
+        getattr(instance, '_prefetched_objects_cache', {}).pop('individual_fish_observations', None)
+        prefetch_related_objects([instance], *self.prefetch_related_fields)
+
 
 class IndividualFishObservationViewSet(HistoryReasonMixin, OptimizedQuerysetMixin, StandardFilterMixin, 
                                       viewsets.ModelViewSet):
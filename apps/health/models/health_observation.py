@@ -6,12 +6,11 @@ sampling events, individual fish observations, and parameter scores.
 """
 
 from django.db import models
-from django.db.models import Avg, StdDev, Min, Max, Count
 from django.contrib.auth import get_user_model
 from django.core.validators import MinValueValidator, MaxValueValidator
 from django.core.exceptions import ValidationError
 from django.utils import timezone
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 from simple_history.models import HistoricalRecords
 
 from apps.batch.models import BatchContainerAssignment
@@ -111,6 +110,50 @@ class ParameterScoreDefinition(models.Model):
         return f"{self.parameter.name} - {self.score_value}: {self.label}"
 
 
+def _quantize(value, places):
+    return value.quantize(Decimal(1).scaleb(-places), rounding=ROUND_HALF_UP)
+
+
+def _series_stats(values):
+    """avg/std/min/max of a non-empty Decimal series; std is population std, None for one value."""
+    count = len(values)
+    mean = sum(values) / count
+    std = None
+    if count > 1:
+        std = _quantize((sum((value - mean) ** 2 for value in values) / count).sqrt(), 2)
+    return _quantize(mean, 2), std, min(values), max(values)
+
+
+def summarize_fish_measurements(measurements):
+    """
+    Aggregate (weight_g, length_cm) pairs into HealthSamplingEvent metric fields.
+
+    Mirrors the SQL aggregates (Avg, population StdDev, Min, Max) in one pass
+    over in-memory values. Only metrics with at least one valid measurement
+    are returned; ``calculated_sample_size`` is the number of fish with a
+    valid K-factor (weight and non-zero length).
+    """
+    weights = [Decimal(weight) for weight, _ in measurements if weight is not None]
+    lengths = [Decimal(length) for _, length in measurements if length is not None]
+    # K-factor formula: (weight_g / length_cm^3) * 100
+    k_factors = [
+        (Decimal(weight) / (Decimal(length) ** 3)) * 100
+        for weight, length in measurements
+        if weight is not None and length is not None and length != 0
+    ]
+
+    metrics = {'calculated_sample_size': len(k_factors)}
+    if weights:
+        (metrics['avg_weight_g'], metrics['std_dev_weight_g'],
+         metrics['min_weight_g'], metrics['max_weight_g']) = _series_stats(weights)
+    if lengths:
+        (metrics['avg_length_cm'], metrics['std_dev_length_cm'],
+         metrics['min_length_cm'], metrics['max_length_cm']) = _series_stats(lengths)
+    if k_factors:
+        metrics['avg_k_factor'] = _quantize(sum(k_factors) / len(k_factors), 4)
+    return metrics
+
+
 class HealthSamplingEvent(models.Model):
     """Parent event for a health sampling session, linked to a BatchContainerAssignment."""
     assignment = models.ForeignKey(
@@ -222,84 +265,32 @@ class HealthSamplingEvent(models.Model):
         """
         return f"Health Sample - {self.assignment} - {self.sampling_date}"
 
-    def calculate_aggregate_metrics(self):
-        """Calculates and updates aggregate metrics from individual fish observations."""
-        observations = self.individual_fish_observations.all()
-        
-        if not observations.exists():
+    def calculate_aggregate_metrics(self, observations=None):
+        """
+        Calculates and updates aggregate metrics from individual fish observations.
+
+        Args:
+            observations: Optional iterable of observations (or objects with
+                ``weight_g``/``length_cm``) already in memory, e.g. the rows a
+                serializer just wrote. When omitted, the measurements are read
+                in a single query.
+        """
+        if observations is None:
+            measurements = list(
+                self.individual_fish_observations.values_list('weight_g', 'length_cm')
+            )
+        else:
+            measurements = [(obs.weight_g, obs.length_cm) for obs in observations]
+
+        if not measurements:
             # No observations to calculate from
             self.calculated_sample_size = 0
             self.save()
             return
-        
-        # Initialize counters for valid measurements
-        valid_weight_count = 0
-        valid_length_count = 0
-        valid_k_factor_count = 0
-        
-        # Get weight statistics if any fish have weight
-        weight_stats = observations.exclude(
-            weight_g__isnull=True
-        ).aggregate(
-            avg=Avg('weight_g'),
-            std=StdDev('weight_g'),
-            min=Min('weight_g'),
-            max=Max('weight_g'),
-            count=Count('id')
-        )
-        
-        if weight_stats['avg'] is not None:
-            self.avg_weight_g = weight_stats['avg']
-            self.std_dev_weight_g = weight_stats['std'] if weight_stats['count'] > 1 else None
-            self.min_weight_g = weight_stats['min']
-            self.max_weight_g = weight_stats['max']
-            valid_weight_count = weight_stats['count']
-        
-        # Get length statistics if any fish have length
-        length_stats = observations.exclude(
-            length_cm__isnull=True
-        ).aggregate(
-            avg=Avg('length_cm'),
-            std=StdDev('length_cm'),
-            min=Min('length_cm'),
-            max=Max('length_cm'),
-            count=Count('id')
-        )
-        
-        if length_stats['avg'] is not None:
-            self.avg_length_cm = length_stats['avg']
-            self.std_dev_length_cm = length_stats['std'] if length_stats['count'] > 1 else None
-            self.min_length_cm = length_stats['min']
-            self.max_length_cm = length_stats['max']
-            valid_length_count = length_stats['count']
-        
-        # Calculate K-factor for fish with both weight and length
-        # K-factor formula: (weight_g / length_cm^3) * 100
-        valid_k_factor_count = 0
-        
-        # Get fish with both weight and length
-        fish_with_both = observations.exclude(
-            weight_g__isnull=True
-        ).exclude(
-            length_cm__isnull=True
-        ).exclude(
-            length_cm=0  # Avoid division by zero
-        )
-        
-        # Calculate average K-factor
-        k_factors = []
-        for fish in fish_with_both:
-            k_factor = (fish.weight_g / (fish.length_cm ** 3)) * 100
-            k_factors.append(k_factor)
-        
-        if k_factors:
-            self.avg_k_factor = sum(k_factors) / len(k_factors)
-            valid_k_factor_count = len(k_factors)
-        
-        # Set calculated sample size based on the number of fish with valid K-factor data
-        # This is important for tests that expect calculated_sample_size to be 0 when there are no valid K-factor observations
-        self.calculated_sample_size = valid_k_factor_count
-        
+
+        for attr, value in summarize_fish_measurements(measurements).items():
+            setattr(self, attr, value)
+
         # Save the updated instance
         self.save()
 
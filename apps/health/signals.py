@@ -54,52 +54,41 @@ def on_treatment_with_weighing(sender, instance, created, **kwargs):
         )
         return
     
-    try:
-        # Import here to avoid circular imports
-        from apps.batch.tasks import enqueue_recompute_with_deduplication
-        
-        # Get batch container assignment
-        # Treatment has FK to batch_container_assignment
-        assignment = instance.batch_container_assignment
-        if not assignment:
-            logger.warning(
-                f"Treatment {instance.id} has no batch_container_assignment, "
-                f"skipping recompute"
-            )
-            return
-        
-        # Get treatment date
-        treatment_date = instance.treatment_date
-        if not treatment_date:
-            logger.warning(
-                f"Treatment {instance.id} has no treatment_date, "
-                f"skipping recompute"
-            )
-            return
-        
-        logger.debug(
-            f"Treatment with weighing created for assignment {assignment.id} "
-            f"(batch={assignment.batch.batch_number}, date={treatment_date}, "
-            f"treatment_type={instance.treatment_type})"
-        )
-        
-        # Enqueue recompute task (with deduplication)
-        task_id = enqueue_recompute_with_deduplication(
-            assignment_id=assignment.id,
-            trigger_date=treatment_date,
-            window_days=2
+    # Import here to avoid circular imports
+    from apps.batch.services.recompute_scheduler import mark_assignment_dirty
+    
+    # Get batch container assignment
+    # Treatment has FK to batch_container_assignment
+    assignment = instance.batch_container_assignment
+    if not assignment:
+        logger.warning(
+            f"Treatment {instance.id} has no batch_container_assignment, "
+            f"skipping recompute"
         )
-        
-        if task_id:
-            logger.info(
-                f"📋 Enqueued growth assimilation task {task_id} for "
-                f"assignment {assignment.id} after treatment with weighing "
-                f"(window: {treatment_date} ± 2 days)"
-            )
-    except Exception as e:
-        # Gracefully handle Celery/Redis unavailability
+        return
+    
+    # Get treatment date
+    treatment_date = instance.treatment_date
+    if not treatment_date:
         logger.warning(
-            f"Could not enqueue growth assimilation task after treatment "
-            f"{instance.id}: {e}. Normal in test/CI without Redis/Celery."
+            f"Treatment {instance.id} has no treatment_date, "
+            f"skipping recompute"
         )
+        return
+    if hasattr(treatment_date, 'date'):
+        treatment_date = treatment_date.date()
+    
+    logger.debug(
+        f"Treatment with weighing created for assignment {assignment.id} "
+        f"(batch={assignment.batch.batch_number}, date={treatment_date}, "
+        f"treatment_type={instance.treatment_type})"
+    )
+    
+    # Mark the window dirty; the recompute scheduler dispatches it
+    mark_assignment_dirty(assignment, treatment_date, window_days=2, reason='treatment')
+    logger.info(
+        f"📋 Marked assignment {assignment.id} for growth assimilation "
+        f"recompute after treatment with weighing "
+        f"(window: {treatment_date} ± 2 days)"
+    )
 
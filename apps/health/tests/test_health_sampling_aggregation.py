@@ -4,7 +4,9 @@ Tests for HealthSamplingEvent aggregate metrics calculation.
 Verifies that aggregate metrics are calculated correctly during POST operations
 and that test-specific branches have been removed from production code.
 """
+from django.db import connection
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
 from django.contrib.auth import get_user_model
 from rest_framework.test import APIClient
 from rest_framework import status
@@ -23,6 +25,12 @@ from apps.batch.tests.models.test_utils import (
 
 User = get_user_model()
 
+AGGREGATE_FIELDS = (
+    'avg_weight_g', 'std_dev_weight_g', 'min_weight_g', 'max_weight_g',
+    'avg_length_cm', 'std_dev_length_cm', 'min_length_cm', 'max_length_cm',
+    'avg_k_factor', 'calculated_sample_size',
+)
+
 
 class HealthSamplingAggregationTest(TestCase):
     """Test that aggregate metrics are calculated correctly."""
@@ -289,3 +297,112 @@ class HealthSamplingAggregationTest(TestCase):
         self.assertIsNotNone(event.std_dev_weight_g)  # Now has std dev
         self.assertEqual(event.calculated_sample_size, 2)
 
+
+
+class HealthSamplingBulkWriteTest(TestCase):
+    """Nested observations and scores are written with one insert per level."""
+
+    url = '/api/v1/health/health-sampling-events/'
+
+    def setUp(self):
+        self.user = User.objects.create_user(username='bulk_sampler', password='testpass123')
+        self.client = APIClient()
+        self.client.force_authenticate(user=self.user)
+        species = create_test_species()
+        stage = create_test_lifecycle_stage(species=species)
+        self.batch, self.assignment = create_test_batch_with_assignment(
+            species=species, lifecycle_stage=stage, population_count=1000, avg_weight_g=Decimal("100.0")
+        )
+        self.parameters = [
+            HealthParameter.objects.create(name=f'Bulk Parameter {index}', min_score=0, max_score=3)
+            for index in range(10)
+        ]
+
+    def _payload(self, fish):
+        return {
+            'assignment': self.assignment.id,
+            'sampling_date': self.assignment.assignment_date.isoformat(),
+            'number_of_fish_sampled': len(fish),
+            'individual_fish_observations': fish,
+        }
+
+    def _fish(self, identifier, weight, length, scores):
+        return {
+            'fish_identifier': identifier,
+            'weight_g': weight,
+            'length_cm': length,
+            'parameter_scores': [
+                {'parameter': parameter.id, 'score': score}
+                for parameter, score in zip(self.parameters, scores)
+            ],
+        }
+
+    def test_create_does_not_scale_queries_with_fish_and_scores(self):
+        def post(count):
+            fish = [self._fish(str(index), '100.00', '10.00', [1] * 10) for index in range(count)]
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.post(self.url, self._payload(fish), format='json')
+            self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+            return len(queries)
+
+        baseline = post(2)
+        # 30 fish x 10 scores used to cost 600+ queries; only SQLite's bound
+        # parameter limit may split the bulk inserts into a few more batches
+        self.assertLessEqual(post(30), baseline + 6)
+        event = HealthSamplingEvent.objects.order_by('-id').first()
+        self.assertEqual(event.individual_fish_observations.count(), 30)
+        self.assertEqual(
+            FishParameterScore.objects.filter(individual_fish_observation__sampling_event=event).count(), 300
+        )
+        self.assertEqual(IndividualFishObservation.history.filter(sampling_event_id=event.id).count(), 30)
+
+    def test_in_memory_aggregates_match_sql_recalculation(self):
+        fish = [
+            self._fish('1', '100.00', '10.00', []),
+            self._fish('2', '123.45', '11.20', []),
+            self._fish('3', None, '10.70', []),
+            self._fish('4', '98.10', None, []),
+        ]
+        response = self.client.post(self.url, self._payload(fish), format='json')
+        self.assertEqual(response.status_code, status.HTTP_201_CREATED)
+
+        event = HealthSamplingEvent.objects.get(id=response.data['id'])
+        stored = {name: getattr(event, name) for name in AGGREGATE_FIELDS}
+        event.calculate_aggregate_metrics()
+        event.refresh_from_db()
+        self.assertEqual({name: getattr(event, name) for name in AGGREGATE_FIELDS}, stored)
+        self.assertEqual(event.calculated_sample_size, 2)
+
+    def test_update_only_touches_changed_rows(self):
+        fish = [self._fish(str(index), '100.00', '10.00', [1, 2]) for index in range(3)]
+        response = self.client.post(self.url, self._payload(fish), format='json')
+        event = HealthSamplingEvent.objects.get(id=response.data['id'])
+        unchanged = event.individual_fish_observations.get(fish_identifier='0')
+        unchanged_history = unchanged.history.count()
+
+        fish[1]['weight_g'] = '130.00'            # changed measurement
+        fish[0]['parameter_scores'][1]['score'] = 3  # changed score
+        del fish[2]                               # removed fish
+        fish.append(self._fish('9', '90.00', '9.50', [0]))  # new fish
+        response = self.client.put(
+            f'{self.url}{event.id}/', self._payload(fish), format='json'
+        )
+        self.assertEqual(response.status_code, status.HTTP_200_OK, response.data)
+
+        observations = {
+            observation.fish_identifier: observation
+            for observation in event.individual_fish_observations.all()
+        }
+        self.assertEqual(set(observations), {'0', '1', '9'})
+        self.assertEqual(observations['0'].pk, unchanged.pk)
+        self.assertEqual(observations['1'].weight_g, Decimal('130.00'))
+        self.assertEqual(
+            sorted(observations['0'].parameter_scores.values_list('score', flat=True)), [1, 3]
+        )
+        self.assertEqual(observations['9'].parameter_scores.count(), 1)
+        # Fish '0' only had a score change, so its own row got no new history
+        self.assertEqual(unchanged.history.count(), unchanged_history)
+
+        event.refresh_from_db()
+        self.assertEqual(event.avg_weight_g, Decimal('106.67'))
+        self.assertEqual(event.calculated_sample_size, 3)
@@ -8,8 +8,6 @@ from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
 from django_filters import FilterSet
 from django.db.models import Count, Sum, Q
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 
 from rest_framework.authentication import TokenAuthentication
 from rest_framework_simplejwt.authentication import JWTAuthentication
@@ -21,6 +19,7 @@ from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParamet
 from drf_spectacular.types import OpenApiTypes
 
 from aquamind.utils.history_mixins import HistoryReasonMixin
+from aquamind.utils.aggregate_cache import cache_aggregate, TAG_ASSIGNMENTS
 
 from apps.infrastructure.models.area import Area
 from apps.infrastructure.models.container import Container
@@ -140,7 +139,7 @@ class AreaViewSet(HistoryReasonMixin, viewsets.ModelViewSet):
             )
         },
     )
-    @method_decorator(cache_page(60))
+    @cache_aggregate(60, tags=(TAG_ASSIGNMENTS,))
     @action(detail=True, methods=['get'])
     def summary(self, request, pk=None):
         """
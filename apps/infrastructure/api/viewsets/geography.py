@@ -5,8 +5,6 @@ This module defines the viewset for the Geography model.
 """
 
 from django.db.models import Count, Sum, Q
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 
 from rest_framework import viewsets, filters
 from rest_framework.decorators import action
@@ -16,6 +14,7 @@ from django_filters.rest_framework import DjangoFilterBackend
 from drf_spectacular.utils import extend_schema, OpenApiResponse
 
 from aquamind.utils.history_mixins import HistoryReasonMixin
+from aquamind.utils.aggregate_cache import cache_aggregate, TAG_ASSIGNMENTS
 
 from apps.infrastructure.models.geography import Geography
 from apps.infrastructure.models.area import Area
@@ -80,7 +79,7 @@ class GeographyViewSet(HistoryReasonMixin, viewsets.ModelViewSet):
     def destroy(self, request, *args, **kwargs):
         return super().destroy(request, *args, **kwargs)
 
-    @method_decorator(cache_page(60), name="summary")
+    @cache_aggregate(60, tags=(TAG_ASSIGNMENTS,))
     @action(detail=True, methods=['get'], url_path="summary")
     @extend_schema(
         operation_id="geography-summary",
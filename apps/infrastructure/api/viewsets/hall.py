@@ -9,8 +9,6 @@ from rest_framework import viewsets, filters
 from django_filters.rest_framework import DjangoFilterBackend
 from django_filters import FilterSet
 from django.db.models import Count, Sum
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 
 from rest_framework.authentication import TokenAuthentication
 from rest_framework_simplejwt.authentication import JWTAuthentication
@@ -22,6 +20,7 @@ from drf_spectacular.utils import extend_schema, OpenApiResponse, OpenApiParamet
 from drf_spectacular.types import OpenApiTypes
 
 from aquamind.utils.history_mixins import HistoryReasonMixin
+from aquamind.utils.aggregate_cache import cache_aggregate, TAG_ASSIGNMENTS
 
 from apps.infrastructure.models.hall import Hall
 from apps.infrastructure.models.container import Container
@@ -131,7 +130,7 @@ class HallViewSet(HistoryReasonMixin, viewsets.ModelViewSet):
         },
         tags=["Infrastructure"],
     )
-    @method_decorator(cache_page(60))
+    @cache_aggregate(60, tags=(TAG_ASSIGNMENTS,))
     @action(detail=True, methods=['get'], url_path='summary')
     def summary(self, request, pk=None):
         """
@@ -8,8 +8,6 @@ from datetime import timedelta
 
 from django.db.models import Count, Sum
 from django.utils import timezone
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -21,6 +19,7 @@ from drf_spectacular.utils import extend_schema, OpenApiResponse
 from apps.infrastructure.models.container import Container
 from apps.batch.models.assignment import BatchContainerAssignment
 from apps.inventory.models.feeding import FeedingEvent
+from aquamind.utils.aggregate_cache import cache_aggregate, TAG_ASSIGNMENTS, TAG_FEEDING
 
 
 class InfrastructureOverviewView(APIView):
@@ -37,7 +36,7 @@ class InfrastructureOverviewView(APIView):
     authentication_classes = [TokenAuthentication, JWTAuthentication]
     permission_classes = [IsAuthenticated]
     
-    @method_decorator(cache_page(60))  # Cache for 60 seconds
+    @cache_aggregate(60, tags=(TAG_ASSIGNMENTS, TAG_FEEDING))
     @extend_schema(
         operation_id="infrastructure_overview",
         description="Retrieve aggregated infrastructure overview metrics. "
@@ -9,12 +9,11 @@ from django_filters.rest_framework import DjangoFilterBackend
 from django_filters import FilterSet
 from rest_framework.decorators import action
 from rest_framework.response import Response
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
 from django.db.models import Count, Sum
 from drf_spectacular.utils import extend_schema
 
 from aquamind.utils.history_mixins import HistoryReasonMixin
+from aquamind.utils.aggregate_cache import cache_aggregate, TAG_ASSIGNMENTS
 
 from apps.infrastructure.models.station import FreshwaterStation
 from apps.infrastructure.models.hall import Hall
@@ -89,7 +88,7 @@ class FreshwaterStationViewSet(HistoryReasonMixin, viewsets.ModelViewSet):
     def partial_update(self, request, *args, **kwargs):
         return super().partial_update(request, *args, **kwargs)
 
-    @method_decorator(cache_page(60))
+    @cache_aggregate(60, tags=(TAG_ASSIGNMENTS,))
     @action(detail=True, methods=['get'], url_path='summary')
     @extend_schema(
         operation_id="freshwater-station-summary",
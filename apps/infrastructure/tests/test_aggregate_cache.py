@@ -0,0 +1,150 @@
+"""
+Tests for the shared aggregate cache in aquamind.utils.aggregate_cache.
+"""
+import threading
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+from rest_framework.response import Response
+from rest_framework.test import APIRequestFactory, force_authenticate
+from rest_framework.views import APIView
+
+from apps.users.models import Geography, Role, Subsidiary
+from aquamind.utils import aggregate_cache
+from aquamind.utils.aggregate_cache import (
+    TAG_FEEDING,
+    build_cache_key,
+    cache_aggregate,
+    cache_metrics,
+    invalidate_tags,
+    reset_cache_metrics,
+    scope_fingerprint,
+)
+
+User = get_user_model()
+
+
+class _SummaryView(APIView):
+    calls = 0
+
+    @cache_aggregate(60, tags=(TAG_FEEDING,), endpoint='test-summary')
+    def get(self, request):
+        type(self).calls += 1
+        if request.query_params.get('fail'):
+            return Response({'error': 'bad'}, status=400)
+        return Response({'calls': type(self).calls})
+
+
+class AggregateCacheTests(TestCase):
+    """Scope-aware keys, tag invalidation, stampede protection and metrics."""
+
+    def setUp(self):
+        cache.clear()
+        reset_cache_metrics()
+        # The CI cache is LocMem; behave as with Redis unless a test says otherwise
+        patcher = mock.patch.object(aggregate_cache, 'default_cache_is_shared', return_value=True)
+        self.cache_is_shared = patcher.start()
+        self.addCleanup(patcher.stop)
+        _SummaryView.calls = 0
+        self.factory = APIRequestFactory()
+        self.user = User.objects.create_user(username='cache_manager', password='pw')
+        self.view = _SummaryView.as_view()
+
+    def _get(self, user=None, **params):
+        request = self.factory.get('/summary/', params)
+        force_authenticate(request, user=user or self.user)
+        return self.view(request)
+
+    def _key(self):
+        request = self.factory.get('/summary/')
+        force_authenticate(request, user=self.user)
+        return build_cache_key('test-summary', _SummaryView().initialize_request(request), (TAG_FEEDING,))
+
+    def _set_profile(self, user, geography, role):
+        profile = user.profile
+        profile.geography = geography
+        profile.subsidiary = Subsidiary.ALL
+        profile.role = role
+        profile.save()
+
+    def test_second_request_is_served_from_cache(self):
+        self.assertEqual(self._get()['X-Cache'], 'MISS')
+        response = self._get()
+
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data, {'calls': 1})
+        self.assertEqual(cache_metrics()['test-summary']['hits'], 1)
+        self.assertEqual(cache_metrics()['test-summary']['misses'], 1)
+
+    def test_process_local_cache_is_bypassed(self):
+        # A tag bump in one worker's LocMemCache would leave the others stale
+        self.cache_is_shared.return_value = False
+
+        self.assertEqual(self._get().data, {'calls': 1})
+        response = self._get()
+
+        self.assertEqual(response.data, {'calls': 2})
+        self.assertNotIn('X-Cache', response)
+        self.assertEqual(cache_metrics(), {})
+
+    def test_query_string_order_does_not_split_entries(self):
+        self._get(a='1', b='2')
+        request = self.factory.get('/summary/?b=2&a=1')
+        force_authenticate(request, user=self.user)
+        self.assertEqual(self.view(request)['X-Cache'], 'HIT')
+
+    def test_scopes_get_separate_entries(self):
+        self._set_profile(self.user, Geography.SCOTLAND, Role.MANAGER)
+        other = User.objects.create_user(username='cache_faroe', password='pw')
+        self._set_profile(other, Geography.FAROE_ISLANDS, Role.MANAGER)
+        same = User.objects.create_user(username='cache_scotland', password='pw')
+        self._set_profile(same, Geography.SCOTLAND, Role.MANAGER)
+        users = [User.objects.get(pk=pk) for pk in (self.user.pk, other.pk, same.pk)]
+
+        self.assertNotEqual(scope_fingerprint(users[0]), scope_fingerprint(users[1]))
+        self.assertEqual(scope_fingerprint(users[0]), scope_fingerprint(users[2]))
+        self._get(users[0])
+        self.assertEqual(self._get(users[1])['X-Cache'], 'MISS')
+        self.assertEqual(self._get(users[2])['X-Cache'], 'HIT')
+
+    def test_invalidating_a_tag_expires_dependent_entries(self):
+        self._get()
+        invalidate_tags(TAG_FEEDING)
+
+        response = self._get()
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(response.data, {'calls': 2})
+
+    def test_error_responses_are_not_cached(self):
+        self._get(fail='1')
+        self.assertEqual(self._get(fail='1')['X-Cache'], 'MISS')
+
+    def test_concurrent_miss_waits_for_the_entry_being_computed(self):
+        key = self._key()
+        cache.add(f"{key}:lock", 1)
+        # The request holding the lock stores its result shortly afterwards
+        timer = threading.Timer(0.1, lambda: cache.set(key, (200, {'calls': 'other worker'}), 60))
+        timer.start()
+        try:
+            response = self._get()
+        finally:
+            timer.cancel()
+
+        self.assertEqual(response['X-Cache'], 'HIT')
+        self.assertEqual(response.data, {'calls': 'other worker'})
+        self.assertEqual(_SummaryView.calls, 0)
+
+    def test_gives_up_waiting_and_computes(self):
+        key = self._key()
+        cache.add(f"{key}:lock", 1)
+        original = aggregate_cache.STAMPEDE_WAIT_SECONDS
+        aggregate_cache.STAMPEDE_WAIT_SECONDS = 0.1
+        try:
+            response = self._get()
+        finally:
+            aggregate_cache.STAMPEDE_WAIT_SECONDS = original
+
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(_SummaryView.calls, 1)
@@ -13,6 +13,7 @@ from rest_framework.authtoken.models import Token
 import json
 from decimal import Decimal
 from datetime import timedelta
+from unittest import mock
 
 from apps.infrastructure.models.container import Container
 from apps.infrastructure.models.container_type import ContainerType
@@ -183,7 +184,9 @@ class InfrastructureOverviewAPITestCase(TestCase):
         self.assertEqual(data['active_biomass_kg'], 250.0)
         self.assertEqual(data['feeding_events_today'], 1)
     
-    def test_caching_behavior(self):
+    # Responses are only cached when the default cache is shared (Redis)
+    @mock.patch('aquamind.utils.aggregate_cache.default_cache_is_shared', return_value=True)
+    def test_caching_behavior(self, _cache_is_shared):
         """Test that responses are cached and cache is used."""
         # Authenticate the request
         self.client.defaults['HTTP_AUTHORIZATION'] = f'Token {self.token.key}'
@@ -283,3 +286,43 @@ class InfrastructureOverviewAPITestCase(TestCase):
         
         # Check that only today's feeding event is counted
         self.assertEqual(data['feeding_events_today'], 1)
+
+    @mock.patch('aquamind.utils.aggregate_cache.default_cache_is_shared', return_value=True)
+    def test_feeding_write_invalidates_cached_overview(self, _cache_is_shared):
+        """A committed feeding event expires the cached overview."""
+        self.client.defaults['HTTP_AUTHORIZATION'] = f'Token {self.token.key}'
+        container = Container.objects.create(
+            name="Invalidation Tank",
+            container_type=self.container_type,
+            area=self.area,
+            volume_m3=Decimal('100.0'),
+            max_biomass_kg=Decimal('2000.0')
+        )
+        batch = Batch.objects.create(
+            batch_number="INV001",
+            species=self.species,
+            lifecycle_stage=self.lifecycle_stage,
+            start_date=timezone.now().date(),
+            status="ACTIVE",
+            batch_type="PRODUCTION"
+        )
+
+        first = self.client.get(self.url)
+        self.assertEqual(first['X-Cache'], 'MISS')
+        self.assertEqual(self.client.get(self.url)['X-Cache'], 'HIT')
+
+        with self.captureOnCommitCallbacks(execute=True):
+            FeedingEvent.objects.create(
+                batch=batch,
+                container=container,
+                feed=self.feed,
+                feeding_date=timezone.now().date(),
+                feeding_time=timezone.now().time(),
+                amount_kg=Decimal('10.0'),
+                batch_biomass_kg=Decimal('250.0'),
+                method="MANUAL"
+            )
+
+        response = self.client.get(self.url)
+        self.assertEqual(response['X-Cache'], 'MISS')
+        self.assertEqual(json.loads(response.content)['feeding_events_today'], 1)
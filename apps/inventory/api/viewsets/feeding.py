@@ -6,9 +6,9 @@ from rest_framework import viewsets, filters, status, permissions
 from rest_framework.decorators import action
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
+from django_filters.utils import translate_validation
 
-from django.utils.decorators import method_decorator
-from django.views.decorators.cache import cache_page
+from django.conf import settings
 from django.db.models import Count, Sum
 from datetime import date, datetime
 from django.utils import timezone
@@ -16,13 +16,17 @@ from django.utils import timezone
 from drf_spectacular.utils import extend_schema, OpenApiParameter
 from drf_spectacular.types import OpenApiTypes
 
-from apps.inventory.models import FeedingEvent
+from apps.inventory.models import FeedConsumptionDailyRollup, FeedingEvent
 from apps.inventory.api.serializers.feeding import FeedingEventSerializer
 from apps.inventory.api.filters.feeding import FeedingEventFilter
 from apps.inventory.services import FinanceReportingService
 from aquamind.api.mixins import RBACFilterMixin
+from aquamind.api.rbac_scope import get_access_scope
 from aquamind.api.permissions import IsOperator
 from aquamind.utils.history_mixins import HistoryReasonMixin
+from aquamind.utils.pagination import KeysetPagination
+from apps.users.models import Role
+from aquamind.utils.aggregate_cache import cache_aggregate, TAG_FEEDING
 
 logger = logging.getLogger(__name__)
 
@@ -79,6 +83,28 @@ class FeedingEventViewSet(RBACFilterMixin, HistoryReasonMixin, viewsets.ModelVie
     search_fields = ['notes']
     ordering_fields = ['feeding_date', 'feeding_time', 'amount_kg']
     ordering = ['-feeding_date', '-feeding_time']
+    pagination_class = KeysetPagination
+
+    # finance_report parameters that do not filter rows
+    FINANCE_REPORT_OPTIONS = frozenset({
+        'start_date', 'end_date', 'include_breakdowns', 'include_time_series',
+        'group_by', 'ordering', 'format',
+    })
+    # FeedingEventFilter parameters the daily (container, feed) rollups can
+    # answer; batch, amount, per-event cost, method and search need raw events
+    ROLLUP_FILTER_PARAMS = frozenset({
+        'feeding_date', 'feeding_date_after', 'feeding_date_before',
+        'container', 'container__in', 'container_name',
+        'area', 'area__in', 'hall', 'hall__in',
+        'freshwater_station', 'freshwater_station__in',
+        'geography', 'geography__in',
+        'feed', 'feed__in', 'feed_name',
+        'feed__protein_percentage__gte', 'feed__protein_percentage__lte',
+        'feed__fat_percentage__gte', 'feed__fat_percentage__lte',
+        'feed__carbohydrate_percentage__gte', 'feed__carbohydrate_percentage__lte',
+        'feed__brand', 'feed__brand__in', 'feed__brand__icontains',
+        'feed__size_category', 'feed__size_category__in',
+    })
 
     @extend_schema(
         parameters=[
@@ -235,7 +261,7 @@ class FeedingEventViewSet(RBACFilterMixin, HistoryReasonMixin, viewsets.ModelVie
         },
     )
     @action(detail=False, methods=['get'])
-    @method_decorator(cache_page(30))  # Cache for 30 seconds
+    @cache_aggregate(30, tags=(TAG_FEEDING,))
     def summary(self, request):
         """
         Return aggregated statistics for feeding events.
@@ -571,7 +597,7 @@ class FeedingEventViewSet(RBACFilterMixin, HistoryReasonMixin, viewsets.ModelVie
         }
     )
     @action(detail=False, methods=['get'])
-    @method_decorator(cache_page(60))  # Cache for 1 minute
+    @cache_aggregate(60, tags=(TAG_FEEDING,))
     def finance_report(self, request):
         """
         Comprehensive finance report with flexible filtering and breakdowns.
@@ -620,8 +646,9 @@ class FeedingEventViewSet(RBACFilterMixin, HistoryReasonMixin, viewsets.ModelVie
                 status=status.HTTP_400_BAD_REQUEST
             )
         
-        # Apply all filters (geographic, nutritional, cost, etc.)
-        queryset = self.filter_queryset(self.get_queryset())
+        # Apply all filters (geographic, nutritional, cost, etc.) to the
+        # daily rollups where possible, otherwise to the raw events
+        queryset = self._finance_report_queryset(request)
         
         # Apply date range filter
         queryset = queryset.filter(feeding_date__range=(start, end))
@@ -649,3 +676,33 @@ class FeedingEventViewSet(RBACFilterMixin, HistoryReasonMixin, viewsets.ModelVie
                 },
                 status=status.HTTP_500_INTERNAL_SERVER_ERROR
             )
+
+    def _can_use_feed_rollups(self, request):
+        """
+        Whether finance_report can aggregate FeedConsumptionDailyRollup rows.
+
+        Requires every filter to be on a rollup dimension. Operators fall back
+        to raw events because their location scope also admits events through
+        the event's batch, which the rollups do not carry.
+        """
+        if not getattr(settings, 'FINANCE_REPORT_USE_ROLLUPS', True):
+            return False
+        params = set(request.query_params) - self.FINANCE_REPORT_OPTIONS
+        if not params <= self.ROLLUP_FILTER_PARAMS:
+            return False
+        user = request.user
+        if user.is_superuser:
+            return True
+        scope = get_access_scope(user, request)
+        return scope is None or scope.role != Role.OPERATOR
+
+    def _finance_report_queryset(self, request):
+        """RBAC- and filter-scoped rollup queryset, or raw events when needed."""
+        if not self._can_use_feed_rollups(request):
+            return self.filter_queryset(self.get_queryset())
+
+        rollups = self.apply_rbac_filters(FeedConsumptionDailyRollup.objects.all())
+        filterset = FeedingEventFilter(request.query_params, queryset=rollups, request=request)
+        if not filterset.is_valid():
+            raise translate_validation(filterset.errors)
+        return filterset.qs
@@ -0,0 +1,52 @@
+"""
+Rebuild daily feed consumption rollups from feeding events.
+
+Usage:
+    python manage.py refresh_feed_rollups                 # trailing 7 days
+    python manage.py refresh_feed_rollups --days 30
+    python manage.py refresh_feed_rollups --start 2024-01-01 --end 2024-12-31
+    python manage.py refresh_feed_rollups --all           # full backfill
+"""
+from datetime import date, timedelta
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Max, Min
+from django.utils import timezone
+
+from apps.inventory.models import FeedingEvent
+from apps.inventory.services.feed_rollup_service import FeedRollupService
+
+
+class Command(BaseCommand):
+    help = "Rebuild daily feed consumption rollups for a date range"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--days', type=int, default=7, help='Trailing days to rebuild (default: 7)')
+        parser.add_argument('--start', type=date.fromisoformat, help='First day to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--end', type=date.fromisoformat, help='Last day to rebuild (YYYY-MM-DD)')
+        parser.add_argument('--all', action='store_true', help='Rebuild every day that has feeding events')
+
+    def handle(self, *args, **options):
+        if options['all']:
+            bounds = FeedingEvent.objects.aggregate(start=Min('feeding_date'), end=Max('feeding_date'))
+            if bounds['start'] is None:
+                self.stdout.write("No feeding events; nothing to rebuild")
+                return
+            start, end = bounds['start'], bounds['end']
+        elif options['start'] or options['end']:
+            if not (options['start'] and options['end']):
+                raise CommandError("--start and --end must be given together")
+            start, end = options['start'], options['end']
+        else:
+            if options['days'] <= 0:
+                raise CommandError("--days must be positive")
+            end = timezone.now().date()
+            start = end - timedelta(days=options['days'] - 1)
+
+        if start > end:
+            raise CommandError("--start must be on or before --end")
+
+        rows = FeedRollupService.refresh_range(start, end)
+        self.stdout.write(self.style.SUCCESS(
+            f"Rebuilt {rows} feed consumption rollups for {start} to {end}"
+        ))
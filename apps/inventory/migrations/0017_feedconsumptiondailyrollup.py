@@ -0,0 +1,91 @@
+# Generated by Django 4.2.11 on 2026-10-19 01:11
+
+from decimal import Decimal
+import django.core.validators
+from django.db import migrations, models
+import django.db.models.deletion
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("infrastructure", "0010_areagroup_container_hierarchy_role_and_more"),
+        ("inventory", "0016_remove_feedingevent_idx_feeding_container_date_and_more"),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name="FeedConsumptionDailyRollup",
+            fields=[
+                (
+                    "id",
+                    models.BigAutoField(
+                        auto_created=True,
+                        primary_key=True,
+                        serialize=False,
+                        verbose_name="ID",
+                    ),
+                ),
+                ("updated_at", models.DateTimeField(auto_now=True)),
+                ("feeding_date", models.DateField(help_text="Day the feed was given")),
+                (
+                    "total_kg",
+                    models.DecimalField(
+                        decimal_places=4,
+                        help_text="Sum of amount_kg over the day's feeding events",
+                        max_digits=14,
+                        validators=[
+                            django.core.validators.MinValueValidator(Decimal("0"))
+                        ],
+                    ),
+                ),
+                (
+                    "total_cost",
+                    models.DecimalField(
+                        decimal_places=2,
+                        default=0,
+                        help_text="Sum of feed_cost over the day's feeding events (uncosted events count as 0)",
+                        max_digits=14,
+                        validators=[
+                            django.core.validators.MinValueValidator(Decimal("0"))
+                        ],
+                    ),
+                ),
+                (
+                    "events_count",
+                    models.PositiveIntegerField(
+                        default=0, help_text="Number of feeding events in this cell"
+                    ),
+                ),
+                (
+                    "container",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="feed_consumption_rollups",
+                        to="infrastructure.container",
+                    ),
+                ),
+                (
+                    "feed",
+                    models.ForeignKey(
+                        on_delete=django.db.models.deletion.CASCADE,
+                        related_name="consumption_rollups",
+                        to="inventory.feed",
+                    ),
+                ),
+            ],
+            options={
+                "ordering": ["-feeding_date", "container", "feed"],
+                "indexes": [
+                    models.Index(
+                        fields=["feeding_date"], name="inventory_f_feeding_da5d38_idx"
+                    ),
+                    models.Index(
+                        fields=["container", "feeding_date"],
+                        name="inventory_f_contain_cb4344_idx",
+                    ),
+                ],
+                "unique_together": {("container", "feed", "feeding_date")},
+            },
+        ),
+    ]
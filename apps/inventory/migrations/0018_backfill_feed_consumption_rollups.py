@@ -0,0 +1,63 @@
+# Backfill FeedConsumptionDailyRollup from existing feeding events.
+#
+# Finance reports read the rollups by default (FINANCE_REPORT_USE_ROLLUPS),
+# so the table must hold every historical day before they are served from
+# it. Mirrors FeedRollupService.refresh_range, one year of events at a time.
+from datetime import date
+from decimal import Decimal
+
+from django.db import migrations
+from django.db.models import Count, Max, Min, Sum
+
+WRITE_BATCH_SIZE = 1000
+
+
+def backfill_feed_rollups(apps, schema_editor):
+    FeedingEvent = apps.get_model('inventory', 'FeedingEvent')
+    FeedConsumptionDailyRollup = apps.get_model('inventory', 'FeedConsumptionDailyRollup')
+
+    bounds = FeedingEvent.objects.aggregate(start=Min('feeding_date'), end=Max('feeding_date'))
+    if bounds['start'] is None:
+        return
+
+    for year in range(bounds['start'].year, bounds['end'].year + 1):
+        year_range = (date(year, 1, 1), date(year, 12, 31))
+        rows = (
+            FeedingEvent.objects.filter(feeding_date__range=year_range)
+            .values('container_id', 'feed_id', 'feeding_date')
+            .annotate(
+                total_kg=Sum('amount_kg'),
+                total_cost=Sum('feed_cost'),
+                events_count=Count('id'),
+            )
+            .order_by()
+        )
+        FeedConsumptionDailyRollup.objects.filter(feeding_date__range=year_range).delete()
+        FeedConsumptionDailyRollup.objects.bulk_create(
+            [
+                FeedConsumptionDailyRollup(
+                    container_id=row['container_id'],
+                    feed_id=row['feed_id'],
+                    feeding_date=row['feeding_date'],
+                    total_kg=row['total_kg'] or Decimal('0'),
+                    total_cost=row['total_cost'] or Decimal('0'),
+                    events_count=row['events_count'],
+                )
+                for row in rows
+            ],
+            batch_size=WRITE_BATCH_SIZE,
+        )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("inventory", "0017_feedconsumptiondailyrollup"),
+    ]
+
+    operations = [
+        migrations.RunPython(
+            backfill_feed_rollups,
+            reverse_code=migrations.RunPython.noop,
+        ),
+    ]
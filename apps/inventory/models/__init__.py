@@ -9,6 +9,7 @@ from .purchase import FeedPurchase
 from .feeding import FeedingEvent
 from .summary import BatchFeedingSummary, ContainerFeedingSummary
 from .container_stock import FeedContainerStock
+from .rollup import FeedConsumptionDailyRollup
 
 __all__ = [
     'Feed',
@@ -17,4 +18,5 @@ __all__ = [
     'BatchFeedingSummary',
     'ContainerFeedingSummary',
     'FeedContainerStock',
+    'FeedConsumptionDailyRollup',
 ]
@@ -0,0 +1,60 @@
+"""
+Daily feed consumption rollup model for the inventory app.
+"""
+from django.db import models
+
+from apps.infrastructure.models import Container
+from .feed import Feed
+from apps.inventory.utils import UpdatedModelMixin, DecimalFieldMixin
+
+
+class FeedConsumptionDailyRollup(UpdatedModelMixin, models.Model):
+    """
+    Feed consumed and its cost per container, feed and day.
+
+    Derived from FeedingEvent rows (one row per non-empty cell) and kept in
+    step by the inventory signals and the incremental refresh job in
+    apps.inventory.services.feed_rollup_service. Finance reports aggregate
+    these rows instead of the raw events. The date column is named
+    ``feeding_date`` so feeding event filters apply unchanged.
+    """
+    container = models.ForeignKey(
+        Container,
+        on_delete=models.CASCADE,
+        related_name='feed_consumption_rollups'
+    )
+    feed = models.ForeignKey(
+        Feed,
+        on_delete=models.CASCADE,
+        related_name='consumption_rollups'
+    )
+    feeding_date = models.DateField(help_text="Day the feed was given")
+    total_kg = DecimalFieldMixin.positive_decimal_field(
+        max_digits=14,
+        decimal_places=4,
+        help_text="Sum of amount_kg over the day's feeding events"
+    )
+    total_cost = DecimalFieldMixin.positive_decimal_field(
+        max_digits=14,
+        decimal_places=2,
+        default=0,
+        help_text="Sum of feed_cost over the day's feeding events (uncosted events count as 0)"
+    )
+    events_count = models.PositiveIntegerField(
+        default=0,
+        help_text="Number of feeding events in this cell"
+    )
+
+    class Meta:
+        ordering = ['-feeding_date', 'container', 'feed']
+        unique_together = ['container', 'feed', 'feeding_date']
+        indexes = [
+            models.Index(fields=['feeding_date']),
+            models.Index(fields=['container', 'feeding_date']),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.container} / {self.feed} on {self.feeding_date}: "
+            f"{self.total_kg} kg"
+        )
@@ -9,9 +9,11 @@ This package contains business logic services for inventory management.
 from .fifo_service import FIFOInventoryService
 from .fcr_service import FCRCalculationService
 from .finance_reporting_service import FinanceReportingService
+from .feed_rollup_service import FeedRollupService
 
 __all__ = [
     'FIFOInventoryService',
     'FCRCalculationService',
     'FinanceReportingService',
+    'FeedRollupService',
 ]
@@ -0,0 +1,186 @@
+"""
+Feed Consumption Rollup Service
+
+Maintains FeedConsumptionDailyRollup, the per (container, feed, day) feed
+and cost totals that finance reports aggregate instead of raw feeding events.
+
+Two maintenance paths keep the rollups exact:
+- write path: the FeedingEvent signals refresh the one or two cells an event
+  save/delete touches (``refresh_cells``) inside the writing transaction;
+- incremental job: ``refresh_recent`` rebuilds cells touched in the feeding
+  event history since a point in time plus a trailing window of days, which
+  catches writes that bypass signals (bulk_create, queryset update/delete).
+  ``refresh_range`` rebuilds any date range (backfills, repairs).
+
+A cell is always recomputed from the raw events, never incremented, so
+refreshing is idempotent and safe to repeat.
+"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from django.db import transaction
+from django.db.models import Count, Q, Sum
+from django.utils import timezone
+
+from apps.inventory.models import FeedConsumptionDailyRollup, FeedingEvent
+
+# (container_id, feed_id, feeding_date)
+Cell = Tuple[int, int, date]
+
+CELL_FIELDS = ('container_id', 'feed_id', 'feeding_date')
+UNIQUE_FIELDS = ['container', 'feed', 'feeding_date']
+CELLS_PER_QUERY = 200
+WRITE_BATCH_SIZE = 1000
+
+
+class FeedRollupService:
+    """Rebuilds daily feed consumption rollups from feeding events."""
+
+    @staticmethod
+    def cell_for(event: FeedingEvent) -> Cell:
+        return (event.container_id, event.feed_id, event.feeding_date)
+
+    @staticmethod
+    def _aggregate(events) -> List[FeedConsumptionDailyRollup]:
+        rows = events.values(*CELL_FIELDS).annotate(
+            total_kg=Sum('amount_kg'),
+            total_cost=Sum('feed_cost'),
+            events_count=Count('id'),
+        ).order_by()
+        return [
+            FeedConsumptionDailyRollup(
+                container_id=row['container_id'],
+                feed_id=row['feed_id'],
+                feeding_date=row['feeding_date'],
+                total_kg=row['total_kg'] or Decimal('0'),
+                total_cost=row['total_cost'] or Decimal('0'),
+                events_count=row['events_count'],
+            )
+            for row in rows
+        ]
+
+    @staticmethod
+    def _cells_q(cells: Iterable[Cell]) -> Q:
+        condition = Q()
+        for container_id, feed_id, feeding_date in cells:
+            condition |= Q(container_id=container_id, feed_id=feed_id, feeding_date=feeding_date)
+        return condition
+
+    @classmethod
+    def refresh_cells(cls, cells: Iterable[Cell]) -> int:
+        """
+        Recompute the given cells from raw events.
+
+        Each cell row is claimed first (insert-or-touch), which row-locks it
+        until the surrounding transaction ends, and only then aggregated: a
+        concurrent refresh of the same cell waits for this one to commit and
+        its aggregate then includes this transaction's events. Non-empty
+        cells are upserted on (container, feed, feeding_date); cells without
+        events are deleted.
+
+        Returns:
+            Number of cells written (upserted or deleted)
+        """
+        cells = sorted({cell for cell in cells if None not in cell})
+        written = 0
+        for offset in range(0, len(cells), CELLS_PER_QUERY):
+            chunk = cells[offset:offset + CELLS_PER_QUERY]
+            with transaction.atomic():
+                FeedConsumptionDailyRollup.objects.bulk_create(
+                    [
+                        FeedConsumptionDailyRollup(
+                            container_id=container_id,
+                            feed_id=feed_id,
+                            feeding_date=feeding_date,
+                            total_kg=Decimal('0'),
+                        )
+                        for container_id, feed_id, feeding_date in chunk
+                    ],
+                    update_conflicts=True,
+                    unique_fields=UNIQUE_FIELDS,
+                    update_fields=['updated_at'],
+                )
+                rollups = cls._aggregate(FeedingEvent.objects.filter(cls._cells_q(chunk)))
+                if rollups:
+                    FeedConsumptionDailyRollup.objects.bulk_create(
+                        rollups,
+                        update_conflicts=True,
+                        unique_fields=UNIQUE_FIELDS,
+                        update_fields=['total_kg', 'total_cost', 'events_count', 'updated_at'],
+                    )
+                found = {cls.cell_for(rollup) for rollup in rollups}
+                empty = [cell for cell in chunk if cell not in found]
+                if empty:
+                    FeedConsumptionDailyRollup.objects.filter(cls._cells_q(empty)).delete()
+            written += len(chunk)
+        return written
+
+    @classmethod
+    def refresh_range(
+        cls,
+        start_date: date,
+        end_date: date,
+        container_ids: Optional[Iterable[int]] = None,
+    ) -> int:
+        """
+        Rebuild every rollup between start_date and end_date (inclusive).
+
+        Args:
+            start_date: First day to rebuild
+            end_date: Last day to rebuild
+            container_ids: Restrict the rebuild to these containers
+
+        Returns:
+            Number of rollup rows written
+        """
+        events = FeedingEvent.objects.filter(feeding_date__range=(start_date, end_date))
+        rollups = FeedConsumptionDailyRollup.objects.filter(
+            feeding_date__range=(start_date, end_date)
+        )
+        if container_ids is not None:
+            container_ids = list(container_ids)
+            events = events.filter(container_id__in=container_ids)
+            rollups = rollups.filter(container_id__in=container_ids)
+
+        with transaction.atomic():
+            rollups.delete()
+            created = FeedConsumptionDailyRollup.objects.bulk_create(
+                cls._aggregate(events), batch_size=WRITE_BATCH_SIZE
+            )
+        return len(created)
+
+    @classmethod
+    def touched_cells_since(cls, since: datetime) -> Set[Cell]:
+        """Cells of feeding events created, changed or deleted since ``since``."""
+        return set(
+            FeedingEvent.history.filter(history_date__gte=since)
+            .values_list(*CELL_FIELDS)
+            .distinct()
+        )
+
+    @classmethod
+    def refresh_recent(cls, since: Optional[datetime] = None, days: int = 7) -> Dict[str, int]:
+        """
+        Incremental refresh for the scheduled job.
+
+        Rebuilds the trailing ``days`` (including today) in full, then every
+        older cell the feeding event history shows as touched since ``since``
+        (back-dated entries and corrections).
+
+        Returns:
+            Dict with rows written by the window rebuild and cells refreshed
+        """
+        today = timezone.now().date()
+        window_start = today - timedelta(days=max(days, 1) - 1)
+        window_rows = cls.refresh_range(window_start, today)
+
+        touched = 0
+        if since is not None:
+            cells = [
+                cell for cell in cls.touched_cells_since(since)
+                if cell[2] < window_start
+            ]
+            touched = cls.refresh_cells(cells)
+
+        return {'window_rows': window_rows, 'touched_cells': touched}
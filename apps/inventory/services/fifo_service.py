@@ -12,6 +12,7 @@ from apps.inventory.models import (
     FeedContainerStock, FeedingEvent, FeedPurchase
 )
 from apps.infrastructure.models import FeedContainer
+from aquamind.utils.bulk_history import bulk_update_touching, delete_with_history
 
 class InsufficientStockError(ValueError):
     """Exception raised when there's insufficient stock for an operation."""
@@ -69,15 +70,24 @@ class FIFOInventoryService:
         cls,
         feed_container: FeedContainer,
         quantity_kg: Decimal,
-        feeding_event: Optional[FeedingEvent] = None
+        feeding_event: Optional[FeedingEvent] = None,
+        user=None,
+        change_reason: Optional[str] = None,
     ) -> Tuple[Decimal, List[dict]]:
         """
         Consume feed from container using FIFO method and calculate cost.
         
+        Stock rows are locked and read once; partially consumed rows are
+        written with one bulk update (historical rows inserted in bulk) and
+        depleted rows are deleted one by one so their delete history is kept.
+        
         Args:
             feed_container: Container to consume feed from
             quantity_kg: Amount of feed to consume
             feeding_event: Optional feeding event to update with cost
+            user: User recorded on the stock history rows (defaults to the
+                feeding event's recorder)
+            change_reason: Change reason for the stock history rows
             
         Returns:
             Tuple[Decimal, List[dict]]: Total cost and list of consumed batches
@@ -85,25 +95,38 @@ class FIFOInventoryService:
         Raises:
             InsufficientStockError: If not enough feed available
         """
-        # Get available stock in FIFO order
-        available_stocks = FeedContainerStock.objects.filter(
-            feed_container=feed_container,
-            quantity_kg__gt=0
-        ).order_by('entry_date')
-        
-        # Check if enough feed is available
-        total_available = sum(stock.quantity_kg for stock in available_stocks)
-        if quantity_kg > total_available:
-            raise InsufficientStockError(
-                f"Insufficient feed in {feed_container.name}. "
-                f"Requested: {quantity_kg}kg, Available: {total_available}kg"
+        if user is None and feeding_event is not None:
+            user = feeding_event.recorded_by
+        if change_reason is None:
+            change_reason = (
+                f"FIFO consumption for feeding event {feeding_event.pk}"
+                if feeding_event is not None and feeding_event.pk
+                else "FIFO feed consumption"
             )
-        
+
         total_cost = Decimal('0.00')
         remaining_to_consume = quantity_kg
         consumed_batches = []
         
         with transaction.atomic():
+            # Get available stock in FIFO order
+            available_stocks = list(
+                FeedContainerStock.objects.select_for_update(of=('self',))
+                .select_related('feed_purchase')
+                .filter(feed_container=feed_container, quantity_kg__gt=0)
+                .order_by('entry_date', 'id')
+            )
+            
+            # Check if enough feed is available
+            total_available = sum(stock.quantity_kg for stock in available_stocks)
+            if quantity_kg > total_available:
+                raise InsufficientStockError(
+                    f"Insufficient feed in {feed_container.name}. "
+                    f"Requested: {quantity_kg}kg, Available: {total_available}kg"
+                )
+            
+            updated_stocks = []
+            depleted_stocks = []
             for stock in available_stocks:
                 if remaining_to_consume <= 0:
                     break
@@ -124,14 +147,18 @@ class FIFOInventoryService:
                     'total_cost': portion_cost
                 })
                 
-                # Update stock quantity
+                # Update stock quantity; depleted stock is removed
                 stock.quantity_kg -= consume_from_stock
                 if stock.quantity_kg == 0:
-                    stock.delete()  # Remove depleted stock
+                    depleted_stocks.append(stock)
                 else:
-                    stock.save()
+                    updated_stocks.append(stock)
                 
                 remaining_to_consume -= consume_from_stock
+
+            history = {'default_user': user, 'default_change_reason': change_reason}
+            bulk_update_touching(updated_stocks, FeedContainerStock, ['quantity_kg'], **history)
+            delete_with_history(depleted_stocks, **history)
         
         # Update feeding event with calculated cost if provided
         if feeding_event:
@@ -3,14 +3,18 @@ Finance Reporting Service for Feed Inventory.
 
 Provides comprehensive aggregation and breakdown capabilities for finance reporting,
 including multi-dimensional analysis by geography, feed type, container, and time periods.
+
+Every method accepts either a FeedingEvent queryset (raw events) or a
+FeedConsumptionDailyRollup queryset (daily per container/feed totals) and
+returns the same figures for both; the rollups share the container, feed and
+feeding_date relations, so only the measures differ.
 """
 from decimal import Decimal
 from typing import Dict, List, Any, Optional
 from datetime import date, timedelta
-from django.db.models import QuerySet, Sum, Count, Avg, Min, Max, Q, F
-from django.db.models.functions import TruncDate, TruncWeek, TruncMonth
+from django.db.models import QuerySet, Sum, Count, Min, Max
 
-from apps.inventory.models import FeedingEvent
+from apps.inventory.models import FeedConsumptionDailyRollup
 
 
 class FinanceReportingService:
@@ -21,10 +25,25 @@ class FinanceReportingService:
     and time series analysis for feed usage and costs.
     """
 
+    @staticmethod
+    def _measures(queryset: QuerySet) -> Dict[str, Any]:
+        """Aggregates for total_kg, total_cost and events_count on the queryset's model."""
+        if queryset.model is FeedConsumptionDailyRollup:
+            return {
+                'total_kg': Sum('total_kg'),
+                'total_cost': Sum('total_cost'),
+                'events_count': Sum('events_count'),
+            }
+        return {
+            'total_kg': Sum('amount_kg'),
+            'total_cost': Sum('feed_cost'),
+            'events_count': Count('id'),
+        }
+
     @classmethod
     def generate_finance_report(
         cls,
-        queryset: QuerySet[FeedingEvent],
+        queryset: QuerySet,
         include_breakdowns: bool = True,
         include_time_series: bool = False,
         group_by: Optional[str] = None
@@ -33,7 +52,7 @@ class FinanceReportingService:
         Generate comprehensive finance report from filtered queryset.
         
         Args:
-            queryset: Pre-filtered FeedingEvent queryset
+            queryset: Pre-filtered FeedingEvent or FeedConsumptionDailyRollup queryset
             include_breakdowns: Include dimensional breakdowns
             include_time_series: Include daily/weekly time series
             group_by: Primary grouping dimension ('feed_type', 'area', 'geography', 'container')
@@ -67,45 +86,39 @@ class FinanceReportingService:
         return report
 
     @classmethod
-    def calculate_summary(cls, queryset: QuerySet[FeedingEvent]) -> Dict[str, Any]:
+    def calculate_summary(cls, queryset: QuerySet) -> Dict[str, Any]:
         """
         Calculate top-level summary metrics.
         
         Args:
-            queryset: FeedingEvent queryset to summarize
+            queryset: FeedingEvent or rollup queryset to summarize
             
         Returns:
             Dict with total_feed_kg, total_feed_cost, events_count, date_range
         """
         aggregates = queryset.aggregate(
-            total_feed_kg=Sum('amount_kg'),
-            total_feed_cost=Sum('feed_cost'),
-            events_count=Count('id')
-        )
-        
-        # Get date range
-        date_range = queryset.aggregate(
             start_date=Min('feeding_date'),
-            end_date=Max('feeding_date')
+            end_date=Max('feeding_date'),
+            **cls._measures(queryset)
         )
         
         return {
-            'total_feed_kg': float(aggregates['total_feed_kg'] or 0),
-            'total_feed_cost': float(aggregates['total_feed_cost'] or 0),
+            'total_feed_kg': float(aggregates['total_kg'] or 0),
+            'total_feed_cost': float(aggregates['total_cost'] or 0),
             'events_count': aggregates['events_count'] or 0,
             'date_range': {
-                'start': date_range['start_date'].isoformat() if date_range['start_date'] else None,
-                'end': date_range['end_date'].isoformat() if date_range['end_date'] else None
+                'start': aggregates['start_date'].isoformat() if aggregates['start_date'] else None,
+                'end': aggregates['end_date'].isoformat() if aggregates['end_date'] else None
             }
         }
 
     @classmethod
-    def breakdown_by_feed_type(cls, queryset: QuerySet[FeedingEvent]) -> List[Dict[str, Any]]:
+    def breakdown_by_feed_type(cls, queryset: QuerySet) -> List[Dict[str, Any]]:
         """
         Aggregate feeding events by feed type with nutritional information.
         
         Args:
-            queryset: FeedingEvent queryset to analyze
+            queryset: FeedingEvent or rollup queryset to analyze
             
         Returns:
             List of dicts with feed type details and aggregated metrics
@@ -119,9 +132,7 @@ class FinanceReportingService:
             'feed__carbohydrate_percentage',
             'feed__size_category'
         ).annotate(
-            total_kg=Sum('amount_kg'),
-            total_cost=Sum('feed_cost'),
-            events_count=Count('id')
+            **cls._measures(queryset)
         ).order_by('-total_kg')
         
         results = []
@@ -149,12 +160,12 @@ class FinanceReportingService:
         return results
 
     @classmethod
-    def breakdown_by_geography(cls, queryset: QuerySet[FeedingEvent]) -> List[Dict[str, Any]]:
+    def breakdown_by_geography(cls, queryset: QuerySet) -> List[Dict[str, Any]]:
         """
         Aggregate feeding events by geography with area counts.
         
         Args:
-            queryset: FeedingEvent queryset to analyze
+            queryset: FeedingEvent or rollup queryset to analyze
             
         Returns:
             List of dicts with geography details and aggregated metrics
@@ -165,9 +176,7 @@ class FinanceReportingService:
             'container__area__geography__id',
             'container__area__geography__name'
         ).annotate(
-            total_kg=Sum('amount_kg'),
-            total_cost=Sum('feed_cost'),
-            events_count=Count('id'),
+            **cls._measures(queryset),
             area_count=Count('container__area', distinct=True),
             container_count=Count('container', distinct=True)
         ).order_by('-total_kg')
@@ -187,12 +196,12 @@ class FinanceReportingService:
         return results
 
     @classmethod
-    def breakdown_by_area(cls, queryset: QuerySet[FeedingEvent]) -> List[Dict[str, Any]]:
+    def breakdown_by_area(cls, queryset: QuerySet) -> List[Dict[str, Any]]:
         """
         Aggregate feeding events by area with container counts.
         
         Args:
-            queryset: FeedingEvent queryset to analyze
+            queryset: FeedingEvent or rollup queryset to analyze
             
         Returns:
             List of dicts with area details and aggregated metrics
@@ -204,9 +213,7 @@ class FinanceReportingService:
             'container__area__name',
             'container__area__geography__name'
         ).annotate(
-            total_kg=Sum('amount_kg'),
-            total_cost=Sum('feed_cost'),
-            events_count=Count('id'),
+            **cls._measures(queryset),
             container_count=Count('container', distinct=True)
         ).order_by('-total_kg')
         
@@ -225,12 +232,12 @@ class FinanceReportingService:
         return results
 
     @classmethod
-    def breakdown_by_container(cls, queryset: QuerySet[FeedingEvent]) -> List[Dict[str, Any]]:
+    def breakdown_by_container(cls, queryset: QuerySet) -> List[Dict[str, Any]]:
         """
         Aggregate feeding events by container with feed diversity.
         
         Args:
-            queryset: FeedingEvent queryset to analyze
+            queryset: FeedingEvent or rollup queryset to analyze
             
         Returns:
             List of dicts with container details and aggregated metrics
@@ -241,9 +248,7 @@ class FinanceReportingService:
             'container__area__name',
             'container__hall__name'
         ).annotate(
-            total_kg=Sum('amount_kg'),
-            total_cost=Sum('feed_cost'),
-            events_count=Count('id'),
+            **cls._measures(queryset),
             feed_type_count=Count('feed', distinct=True)
         ).order_by('-total_kg')
         
@@ -265,14 +270,14 @@ class FinanceReportingService:
     @classmethod
     def generate_time_series(
         cls,
-        queryset: QuerySet[FeedingEvent],
+        queryset: QuerySet,
         interval: str = 'day'
     ) -> List[Dict[str, Any]]:
         """
         Generate time series with specified interval.
         
         Args:
-            queryset: FeedingEvent queryset to analyze
+            queryset: FeedingEvent or rollup queryset to analyze
             interval: Time bucket interval ('day', 'week', 'month')
             
         Returns:
@@ -284,66 +289,64 @@ class FinanceReportingService:
         if interval not in ['day', 'week', 'month']:
             raise ValueError(f"Unsupported interval: {interval}. Use 'day', 'week', or 'month'.")
         
-        # For daily interval, use simple values grouping (SQLite compatible)
+        # Group by day in the database (portable across backends), then fold
+        # days into Monday-starting weeks or calendar months in Python; at
+        # most one row per day reaches Python.
+        daily = queryset.values('feeding_date').annotate(
+            **cls._measures(queryset)
+        ).order_by('feeding_date')
+        
         if interval == 'day':
-            time_series = queryset.values('feeding_date').annotate(
-                total_kg=Sum('amount_kg'),
-                total_cost=Sum('feed_cost'),
-                events_count=Count('id')
-            ).order_by('feeding_date')
-            
-            results = []
-            for item in time_series:
-                results.append({
+            return [
+                {
                     'date': item['feeding_date'].isoformat() if item['feeding_date'] else None,
                     'total_kg': float(item['total_kg'] or 0),
                     'total_cost': float(item['total_cost'] or 0),
                     'events_count': item['events_count'] or 0
-                })
-            
-            return results
+                }
+                for item in daily
+            ]
         
-        # For week/month, use Trunc functions (PostgreSQL optimal)
-        # On SQLite, fall back to Python-side grouping
-        try:
-            trunc_func = {
-                'week': TruncWeek,
-                'month': TruncMonth
-            }[interval]
-            
-            time_series = queryset.annotate(
-                period=trunc_func('feeding_date')
-            ).values('period').annotate(
-                total_kg=Sum('amount_kg'),
-                total_cost=Sum('feed_cost'),
-                events_count=Count('id')
-            ).order_by('period')
-            
-            results = []
-            for item in time_series:
-                results.append({
-                    'period': item['period'].isoformat() if item['period'] else None,
-                    'total_kg': float(item['total_kg'] or 0),
-                    'total_cost': float(item['total_cost'] or 0),
-                    'events_count': item['events_count'] or 0
-                })
-            
-            return results
-        except Exception:
-            # Fallback to daily if week/month truncation fails (e.g., SQLite)
-            return cls.generate_time_series(queryset, 'day')
+        buckets: Dict[date, Dict[str, Any]] = {}
+        for item in daily:
+            period = cls._period_start(item['feeding_date'], interval)
+            bucket = buckets.setdefault(period, {
+                'total_kg': Decimal('0'),
+                'total_cost': Decimal('0'),
+                'events_count': 0
+            })
+            bucket['total_kg'] += item['total_kg'] or 0
+            bucket['total_cost'] += item['total_cost'] or 0
+            bucket['events_count'] += item['events_count'] or 0
+        
+        return [
+            {
+                'period': period.isoformat(),
+                'total_kg': float(bucket['total_kg']),
+                'total_cost': float(bucket['total_cost']),
+                'events_count': bucket['events_count']
+            }
+            for period, bucket in buckets.items()
+        ]
+
+    @staticmethod
+    def _period_start(day: date, interval: str) -> date:
+        """First day of the week (Monday, as TruncWeek) or month containing ``day``."""
+        if interval == 'week':
+            return day - timedelta(days=day.weekday())
+        return day.replace(day=1)
 
     @classmethod
     def _determine_time_series_interval(
         cls,
-        queryset: QuerySet[FeedingEvent],
+        queryset: QuerySet,
         group_by: Optional[str]
     ) -> str:
         """
         Determine appropriate time series interval based on data range and grouping.
         
         Args:
-            queryset: FeedingEvent queryset to analyze
+            queryset: FeedingEvent or rollup queryset to analyze
             group_by: User-specified grouping preference
             
         Returns:
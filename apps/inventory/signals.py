@@ -10,14 +10,19 @@ Key behaviors:
 - Uses 30-day rolling window for continuous updates
 - Skips calculation for inactive assignments
 - Includes proper error handling and logging
+- Feeding writes refresh the daily feed consumption rollups
+- Feeding writes also expire cached feeding aggregates
 """
 import logging
 from datetime import date, timedelta
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import post_delete, post_save, pre_save
 from django.dispatch import receiver
 from apps.inventory.models import FeedingEvent
 from apps.batch.models import GrowthSample
 from apps.inventory.services.fcr_service import FCRCalculationService
+from apps.inventory.services.feed_rollup_service import FeedRollupService
+from aquamind.utils.aggregate_cache import TAG_FEEDING, invalidate_tags
 
 logger = logging.getLogger(__name__)
 
@@ -210,3 +215,38 @@ def update_fcr_on_growth_sample(sender, instance, created, **kwargs):
             exc_info=True
         )
 
+
+@receiver(pre_save, sender=FeedingEvent)
+def remember_feeding_rollup_cell(sender, instance, **kwargs):
+    """Keep the stored (container, feed, date) so a move also refreshes the old cell."""
+    instance._previous_rollup_cell = None
+    if not instance._state.adding:
+        previous = (
+            FeedingEvent.objects.filter(pk=instance.pk)
+            .values_list('container_id', 'feed_id', 'feeding_date')
+            .first()
+        )
+        instance._previous_rollup_cell = previous
+
+
+@receiver(post_save, sender=FeedingEvent)
+@receiver(post_delete, sender=FeedingEvent)
+def refresh_feed_consumption_rollups(sender, instance, **kwargs):
+    """
+    Recompute the rollup cells a feeding event write touched.
+
+    Runs in the writing transaction, so the rollups commit or roll back with
+    the event (refresh_cells locks each cell before aggregating it).
+    """
+    cells = {FeedRollupService.cell_for(instance)}
+    previous = getattr(instance, '_previous_rollup_cell', None)
+    if previous:
+        cells.add(previous)
+    FeedRollupService.refresh_cells(cells)
+
+
+@receiver(post_save, sender=FeedingEvent)
+@receiver(post_delete, sender=FeedingEvent)
+def invalidate_feeding_aggregates(sender, instance, **kwargs):
+    """Expire cached feeding summaries, finance reports and overview counts."""
+    transaction.on_commit(lambda: invalidate_tags(TAG_FEEDING))
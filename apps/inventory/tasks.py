@@ -0,0 +1,23 @@
+"""Celery tasks for inventory rollup maintenance."""
+from datetime import timedelta
+
+from celery import shared_task
+from django.conf import settings
+from django.utils import timezone
+
+from apps.inventory.services.feed_rollup_service import FeedRollupService
+
+
+@shared_task(bind=True, max_retries=2, default_retry_delay=300)
+def refresh_feed_consumption_rollups_task(self, days: int | None = None, lookback_hours: int = 25):
+    """
+    Incrementally refresh daily feed consumption rollups.
+
+    Rebuilds the trailing FEED_ROLLUP_REFRESH_DAYS and any older cell the
+    feeding event history shows as touched in the last ``lookback_hours``
+    (slightly more than the schedule interval so consecutive runs overlap).
+    """
+    if days is None:
+        days = getattr(settings, 'FEED_ROLLUP_REFRESH_DAYS', 7)
+    since = timezone.now() - timedelta(hours=lookback_hours)
+    return FeedRollupService.refresh_recent(since=since, days=days)
@@ -240,6 +240,31 @@ class FIFOInventoryServiceTest(TestCase):
         )
         self.assertEqual(remaining_stock.quantity_kg, Decimal("70.00"))
     
+    def test_consume_feed_fifo_writes_stock_history(self):
+        """Consumption writes stock rows and their history with one reason."""
+        FIFOInventoryService.add_feed_to_container(
+            self.feed_container, self.purchase1, Decimal("100.00")
+        )
+        FIFOInventoryService.add_feed_to_container(
+            self.feed_container, self.purchase2, Decimal("150.00")
+        )
+        FIFOInventoryService.add_feed_to_container(
+            self.feed_container, self.purchase3, Decimal("50.00")
+        )
+
+        FIFOInventoryService.consume_feed_fifo(
+            feed_container=self.feed_container,
+            quantity_kg=Decimal("180.00"),
+            change_reason="Morning feeding",
+        )
+
+        history = FeedContainerStock.history.filter(history_type__in=['~', '-'])
+        self.assertEqual(
+            sorted((row.history_type, row.quantity_kg) for row in history),
+            [('-', Decimal("0.00")), ('~', Decimal("70.00"))],
+        )
+        self.assertEqual({row.history_change_reason for row in history}, {"Morning feeding"})
+
     def test_consume_feed_insufficient_stock(self):
         """Test consuming more feed than available."""
         # Add limited feed to container
@@ -0,0 +1,258 @@
+"""
+Tests for the daily feed consumption rollups behind finance reports.
+
+Covers write-path maintenance through the FeedingEvent signals, range and
+incremental refreshes, parity between rollup and raw-event reports, and the
+finance_report endpoint's choice of source.
+"""
+from datetime import date, datetime, timedelta
+from decimal import Decimal
+from io import StringIO
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import TestCase, override_settings
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from apps.batch.models import Batch, LifeCycleStage, Species
+from apps.infrastructure.models import (
+    Area, Container, ContainerType, FreshwaterStation, Geography, Hall
+)
+from apps.inventory.models import Feed, FeedConsumptionDailyRollup, FeedingEvent
+from apps.inventory.services import FeedRollupService, FinanceReportingService
+
+START = date(2024, 1, 1)
+
+
+class FeedRollupTestBase(TestCase):
+    """Two marine containers, one freshwater container, two feeds."""
+
+    def setUp(self):
+        self.geography = Geography.objects.create(name="Rollup Geo")
+        self.area = Area.objects.create(
+            name="Rollup Area", geography=self.geography,
+            latitude=Decimal("62.0"), longitude=Decimal("-7.0"), max_biomass=Decimal("10000"),
+        )
+        station = FreshwaterStation.objects.create(
+            name="Rollup Station", station_type="HATCHERY", geography=self.geography,
+            latitude=Decimal("62.1"), longitude=Decimal("-7.1"),
+        )
+        self.hall = Hall.objects.create(name="Rollup Hall", freshwater_station=station)
+        container_type = ContainerType.objects.create(
+            name="Rollup Pen", category="PEN", max_volume_m3=Decimal("1000"),
+        )
+        self.pen_a, self.pen_b = [
+            Container.objects.create(
+                name=f"Pen {suffix}", container_type=container_type, area=self.area,
+                volume_m3=Decimal("500"), max_biomass_kg=Decimal("5000"),
+            )
+            for suffix in ("A", "B")
+        ]
+        self.tank = Container.objects.create(
+            name="Tank 1", container_type=container_type, hall=self.hall,
+            volume_m3=Decimal("50"), max_biomass_kg=Decimal("500"),
+        )
+        species = Species.objects.create(name="Atlantic Salmon")
+        stage = LifeCycleStage.objects.create(name="Smolt", species=species, order=1)
+        self.batch = Batch.objects.create(
+            batch_number="ROLLUP-1", species=species, lifecycle_stage=stage, start_date=START,
+        )
+        self.feed_small = Feed.objects.create(
+            name="Starter", brand="Alpha", size_category="SMALL", protein_percentage=Decimal("50"),
+        )
+        self.feed_large = Feed.objects.create(
+            name="Grower", brand="Beta", size_category="LARGE", protein_percentage=Decimal("42"),
+        )
+
+    def _event(self, container, feed, feeding_date, amount, cost=None, save=True):
+        event = FeedingEvent(
+            batch=self.batch, container=container, feed=feed,
+            feeding_date=feeding_date, feeding_time=datetime.min.time(),
+            amount_kg=Decimal(amount), batch_biomass_kg=Decimal("1000"),
+            feed_cost=Decimal(cost) if cost is not None else None, method="MANUAL",
+        )
+        if save:
+            event.save()
+        return event
+
+    def _cell(self, container, feed, feeding_date):
+        return FeedConsumptionDailyRollup.objects.filter(
+            container=container, feed=feed, feeding_date=feeding_date
+        ).values_list('total_kg', 'total_cost', 'events_count').first()
+
+
+class FeedRollupMaintenanceTest(FeedRollupTestBase):
+    """Signals and refresh jobs keep each cell equal to its raw events."""
+
+    def test_event_writes_keep_cells_current(self):
+        first = self._event(self.pen_a, self.feed_small, START, "10.5", "21.00")
+        self._event(self.pen_a, self.feed_small, START, "4.5")
+        self.assertEqual(
+            self._cell(self.pen_a, self.feed_small, START),
+            (Decimal("15.0000"), Decimal("21.00"), 2),
+        )
+
+        # Moving an event refreshes both the old and the new cell
+        first.container = self.pen_b
+        first.feeding_date = START + timedelta(days=1)
+        first.save()
+        self.assertEqual(
+            self._cell(self.pen_a, self.feed_small, START),
+            (Decimal("4.5000"), Decimal("0.00"), 1),
+        )
+        self.assertEqual(
+            self._cell(self.pen_b, self.feed_small, START + timedelta(days=1)),
+            (Decimal("10.5000"), Decimal("21.00"), 1),
+        )
+
+        first.delete()
+        self.assertIsNone(self._cell(self.pen_b, self.feed_small, START + timedelta(days=1)))
+        self.assertEqual(FeedConsumptionDailyRollup.objects.count(), 1)
+
+    def test_refresh_range_catches_bulk_writes(self):
+        FeedingEvent.objects.bulk_create([
+            self._event(self.pen_a, self.feed_large, START + timedelta(days=day), "100", "250", save=False)
+            for day in range(3)
+        ])
+        self.assertFalse(FeedConsumptionDailyRollup.objects.exists())
+
+        written = FeedRollupService.refresh_range(START, START + timedelta(days=1))
+
+        self.assertEqual(written, 2)
+        self.assertEqual(
+            sorted(FeedConsumptionDailyRollup.objects.values_list('feeding_date', flat=True)),
+            [START, START + timedelta(days=1)],
+        )
+
+    def test_refresh_recent_rebuilds_window_and_touched_cells(self):
+        today = timezone.now().date()
+        old = self._event(self.pen_a, self.feed_small, today - timedelta(days=30), "5", "10")
+        recent = self._event(self.tank, self.feed_small, today, "2", "4")
+        # Rows drift from the events (e.g. a queryset update that skipped signals)
+        FeedConsumptionDailyRollup.objects.update(total_kg=Decimal("999"))
+
+        since = timezone.now() - timedelta(hours=1)
+        result = FeedRollupService.refresh_recent(since=since, days=7)
+
+        self.assertEqual(result, {'window_rows': 1, 'touched_cells': 1})
+        self.assertEqual(self._cell(self.pen_a, self.feed_small, old.feeding_date)[0], Decimal("5.0000"))
+        self.assertEqual(self._cell(self.tank, self.feed_small, recent.feeding_date)[0], Decimal("2.0000"))
+
+    def test_management_command_backfills_all_days(self):
+        FeedingEvent.objects.bulk_create([
+            self._event(self.pen_b, self.feed_small, START + timedelta(days=day * 40), "8", save=False)
+            for day in range(3)
+        ])
+        out = StringIO()
+        call_command('refresh_feed_rollups', '--all', stdout=out)
+
+        self.assertIn("Rebuilt 3 feed consumption rollups", out.getvalue())
+        self.assertEqual(FeedConsumptionDailyRollup.objects.count(), 3)
+
+
+class FeedRollupParityTest(FeedRollupTestBase):
+    """Reports from rollups equal reports from the raw events."""
+
+    def setUp(self):
+        super().setUp()
+        containers = [self.pen_a, self.pen_b, self.tank]
+        feeds = [self.feed_small, self.feed_large]
+        # ~400 days, several events per cell, some without a cost
+        for day in range(0, 400, 3):
+            for index, container in enumerate(containers):
+                feed = feeds[(day + index) % 2]
+                for slot in range(1 + (day // 3) % 3):
+                    cost = None if (day + slot) % 7 == 0 else f"{(day % 11) + slot + 1}.25"
+                    self._event(
+                        container, feed, START + timedelta(days=day),
+                        f"{10 + index + slot}.{day % 10}", cost,
+                    )
+
+    def _normalise(self, value):
+        if isinstance(value, float):
+            return round(value, 6)
+        if isinstance(value, dict):
+            return {key: self._normalise(item) for key, item in value.items()}
+        if isinstance(value, list):
+            return [self._normalise(item) for item in value]
+        return value
+
+    def _reports(self, start, end, **filters):
+        raw = FeedingEvent.objects.filter(feeding_date__range=(start, end), **filters)
+        rollups = FeedConsumptionDailyRollup.objects.filter(feeding_date__range=(start, end), **filters)
+        return raw, rollups
+
+    def test_full_report_matches_raw_events(self):
+        raw, rollups = self._reports(START, START + timedelta(days=400))
+        for group_by in (None, 'week', 'month'):
+            with self.subTest(group_by=group_by):
+                expected = FinanceReportingService.generate_finance_report(
+                    raw, include_time_series=True, group_by=group_by
+                )
+                actual = FinanceReportingService.generate_finance_report(
+                    rollups, include_time_series=True, group_by=group_by
+                )
+                self.assertEqual(self._normalise(actual), self._normalise(expected))
+        self.assertGreater(raw.count(), rollups.count())
+
+    def test_filtered_daily_series_matches_raw_events(self):
+        raw, rollups = self._reports(
+            START + timedelta(days=30), START + timedelta(days=90),
+            container__area__geography=self.geography, feed__brand='Alpha',
+        )
+        self.assertEqual(
+            self._normalise(FinanceReportingService.generate_time_series(rollups, 'day')),
+            self._normalise(FinanceReportingService.generate_time_series(raw, 'day')),
+        )
+
+    def test_week_and_month_buckets_start_on_period_boundaries(self):
+        raw, _ = self._reports(START, START + timedelta(days=60))
+        weeks = FinanceReportingService.generate_time_series(raw, 'week')
+        months = FinanceReportingService.generate_time_series(raw, 'month')
+
+        self.assertTrue(all(date.fromisoformat(row['period']).weekday() == 0 for row in weeks))
+        self.assertEqual([row['period'] for row in months], ['2024-01-01', '2024-02-01', '2024-03-01'])
+        self.assertEqual(
+            sum(row['events_count'] for row in months), raw.count()
+        )
+
+
+class FinanceReportRollupSourceTest(FeedRollupTestBase):
+    """finance_report reads rollups unless a filter needs raw events."""
+
+    url = '/api/v1/inventory/feeding-events/finance_report/'
+
+    def setUp(self):
+        super().setUp()
+        cache.clear()
+        self.client = APIClient()
+        self.client.force_authenticate(
+            get_user_model().objects.create_superuser('rollup_admin', 'r@example.com', 'pw')
+        )
+        self._event(self.pen_a, self.feed_small, START, "10", "20")
+        # Inserted behind the rollups' back, so only raw-event reports see it
+        FeedingEvent.objects.bulk_create([
+            self._event(self.pen_a, self.feed_small, START, "5", "10", save=False)
+        ])
+
+    def _total(self, **params):
+        response = self.client.get(
+            self.url, {'start_date': '2024-01-01', 'end_date': '2024-01-31', **params}
+        )
+        self.assertEqual(response.status_code, 200, response.content)
+        return response.data['summary']['total_feed_kg']
+
+    def test_dimension_filters_use_rollups(self):
+        self.assertEqual(self._total(), 10.0)
+        self.assertEqual(self._total(area=self.area.id, feed__brand='alpha'), 10.0)
+        self.assertEqual(self._total(hall=self.hall.id), 0.0)
+
+    def test_event_level_filters_use_raw_events(self):
+        self.assertEqual(self._total(batch=self.batch.id), 15.0)
+        self.assertEqual(self._total(amount_min=1), 15.0)
+
+    @override_settings(FINANCE_REPORT_USE_ROLLUPS=False)
+    def test_rollups_can_be_disabled(self):
+        self.assertEqual(self._total(), 15.0)
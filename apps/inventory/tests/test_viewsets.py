@@ -393,6 +393,60 @@ class FeedingEventViewSetTest(TestCase):
             # Restore the original client.get method
             self.client.get = original_get
 
+    def _add_feeding_events(self):
+        """Events spread over three days and two times, with ties on both."""
+        today = timezone.now().date()
+        times = [timezone.datetime(2024, 1, 1, 8).time(), timezone.datetime(2024, 1, 1, 16).time()]
+        FeedingEvent.objects.bulk_create([
+            FeedingEvent(
+                batch=self.batch,
+                batch_assignment=self.assignment,
+                container=self.container,
+                feed=self.feed,
+                feeding_date=today - timedelta(days=index % 3),
+                feeding_time=times[index % 2],
+                amount_kg=Decimal("1.0") + index % 4,
+                batch_biomass_kg=Decimal("200.0"),
+                method="MANUAL",
+            )
+            for index in range(30)
+        ])
+
+    def _walk_cursor_pages(self, params):
+        """Follow next links from the first cursor page; returns ids and the last page."""
+        response = self.client.get(self.url, {**params, 'cursor': ''})
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        seen = [row['id'] for row in response.data['results']]
+        while response.data['next']:
+            response = self.client.get(response.data['next'])
+            seen += [row['id'] for row in response.data['results']]
+        return seen, response
+
+    def test_cursor_pages_follow_full_default_ordering(self):
+        """Cursor mode orders like page mode: -feeding_date, -feeding_time, then -id."""
+        self._add_feeding_events()
+        expected = list(
+            FeedingEvent.objects.order_by('-feeding_date', '-feeding_time', '-id')
+            .values_list('id', flat=True)
+        )
+
+        seen, last = self._walk_cursor_pages({})
+        self.assertEqual(seen, expected)
+
+        back = self.client.get(last.data['previous'])
+        self.assertEqual([row['id'] for row in back.data['results']], expected[:20])
+
+    def test_cursor_pages_keep_mixed_directions(self):
+        """Each ordering term keeps its own direction; id breaks ties."""
+        self._add_feeding_events()
+        expected = list(
+            FeedingEvent.objects.order_by('feeding_date', '-amount_kg', '-id')
+            .values_list('id', flat=True)
+        )
+
+        seen, _ = self._walk_cursor_pages({'ordering': 'feeding_date,-amount_kg'})
+        self.assertEqual(seen, expected)
+
     @mock.patch('apps.inventory.models.FeedingEvent.objects.get')
     @mock.patch('apps.inventory.api.viewsets.FeedingEventViewSet.get_serializer')
     @mock.patch('rest_framework.generics.get_object_or_404')
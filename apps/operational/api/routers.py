@@ -5,6 +5,7 @@ Registers all operational API endpoints with explicit kebab-case basenames
 following api_standards.md guidelines.
 """
 from rest_framework.routers import DefaultRouter
+from apps.operational.api.viewsets.bulk_export import BulkExportViewSet
 from apps.operational.api.viewsets.fcr_trends import FCRTrendsViewSet
 
 # Create router instance
@@ -17,3 +18,10 @@ router.register(
     FCRTrendsViewSet,
     basename='fcr-trends'
 )
+
+# Register bulk export endpoint
+router.register(
+    r'exports',
+    BulkExportViewSet,
+    basename='bulk-export'
+)
@@ -1,6 +1,7 @@
 """
 Operational API viewsets.
 """
+from .bulk_export import BulkExportViewSet
 from .fcr_trends import FCRTrendsViewSet
 
-__all__ = ['FCRTrendsViewSet']
+__all__ = ['BulkExportViewSet', 'FCRTrendsViewSet']
@@ -0,0 +1,384 @@
+"""
+Bulk Export Service for Operational App
+
+Streams feeding, mortality, growth-sample and environmental rows as NDJSON,
+CSV or Parquet for downstream BI loads. Rows are read with a values_list()
+projection through ``QuerySet.iterator()`` (a server-side cursor on
+PostgreSQL), so no model instances or serializers are built and memory stays
+flat regardless of export size.
+
+Incremental exports use a (watermark field, id) watermark: pass the
+watermark value and id of the last exported row as ``since``/``since_id``
+to resume strictly after it. Rows are always ordered by (watermark, id).
+"""
+import csv
+from dataclasses import dataclass, field
+from datetime import datetime, time
+from typing import Dict, Iterable, Iterator, Optional, Tuple
+
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q
+
+from apps.batch.models import GrowthSample, MortalityEvent
+from apps.environmental.models import EnvironmentalReading
+from apps.inventory.models import FeedingEvent
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:  # pragma: no cover
+    pa = pq = None
+    HAS_PYARROW = False
+
+EXPORT_CHUNK_SIZE = 2000
+EXPORT_FORMATS = ('ndjson', 'csv', 'parquet')
+CONTENT_TYPES = {
+    'ndjson': 'application/x-ndjson',
+    'csv': 'text/csv',
+    'parquet': 'application/vnd.apache.parquet',
+}
+
+CONTAINER_GEOGRAPHY_PATHS = (
+    'container__area__geography',
+    'container__hall__freshwater_station__geography',
+)
+
+
+class ExportError(ValueError):
+    """Raised for invalid export requests."""
+
+
+@dataclass(frozen=True)
+class ExportDataset:
+    """
+    Export definition for one model.
+
+    ``columns`` are (output column, ORM path) pairs; ``geography_filter_fields``
+    and ``location_path`` (container id path used for operator scoping) mirror
+    the RBACFilterMixin configuration of the dataset's list endpoint.
+    """
+
+    name: str
+    model: type
+    columns: Tuple[Tuple[str, str], ...]
+    watermark_field: str
+    geography_filter_fields: Tuple[str, ...]
+    location_path: Optional[str] = None
+    description: str = field(default='', compare=False)
+
+    @property
+    def column_names(self) -> Tuple[str, ...]:
+        return tuple(name for name, _ in self.columns)
+
+    @property
+    def paths(self) -> Tuple[str, ...]:
+        return tuple(path for _, path in self.columns)
+
+
+DATASETS: Dict[str, ExportDataset] = {
+    dataset.name: dataset
+    for dataset in (
+        ExportDataset(
+            name='feeding',
+            model=FeedingEvent,
+            description='Feeding events',
+            watermark_field='updated_at',
+            geography_filter_fields=CONTAINER_GEOGRAPHY_PATHS,
+            location_path='container_id',
+            columns=(
+                ('id', 'id'),
+                ('batch_id', 'batch_id'),
+                ('batch_number', 'batch__batch_number'),
+                ('batch_assignment_id', 'batch_assignment_id'),
+                ('container_id', 'container_id'),
+                ('container_name', 'container__name'),
+                ('feed_id', 'feed_id'),
+                ('feed_name', 'feed__name'),
+                ('feeding_date', 'feeding_date'),
+                ('feeding_time', 'feeding_time'),
+                ('amount_kg', 'amount_kg'),
+                ('batch_biomass_kg', 'batch_biomass_kg'),
+                ('feeding_percentage', 'feeding_percentage'),
+                ('feed_cost', 'feed_cost'),
+                ('method', 'method'),
+                ('notes', 'notes'),
+                ('recorded_by_id', 'recorded_by_id'),
+                ('created_at', 'created_at'),
+                ('updated_at', 'updated_at'),
+            ),
+        ),
+        ExportDataset(
+            name='mortality',
+            model=MortalityEvent,
+            description='Batch mortality events',
+            watermark_field='updated_at',
+            geography_filter_fields=(
+                'batch__batch_assignments__container__area__geography',
+                'batch__batch_assignments__container__hall__freshwater_station__geography',
+            ),
+            columns=(
+                ('id', 'id'),
+                ('batch_id', 'batch_id'),
+                ('batch_number', 'batch__batch_number'),
+                ('assignment_id', 'assignment_id'),
+                ('container_id', 'assignment__container_id'),
+                ('event_date', 'event_date'),
+                ('count', 'count'),
+                ('biomass_kg', 'biomass_kg'),
+                ('cause', 'cause'),
+                ('description', 'description'),
+                ('created_at', 'created_at'),
+                ('updated_at', 'updated_at'),
+            ),
+        ),
+        ExportDataset(
+            name='growth',
+            model=GrowthSample,
+            description='Growth samples',
+            watermark_field='updated_at',
+            geography_filter_fields=(
+                'assignment__container__area__geography',
+                'assignment__container__hall__freshwater_station__geography',
+            ),
+            location_path='assignment__container_id',
+            columns=(
+                ('id', 'id'),
+                ('assignment_id', 'assignment_id'),
+                ('batch_id', 'assignment__batch_id'),
+                ('batch_number', 'assignment__batch__batch_number'),
+                ('container_id', 'assignment__container_id'),
+                ('sample_date', 'sample_date'),
+                ('sample_size', 'sample_size'),
+                ('avg_weight_g', 'avg_weight_g'),
+                ('avg_length_cm', 'avg_length_cm'),
+                ('std_deviation_weight', 'std_deviation_weight'),
+                ('std_deviation_length', 'std_deviation_length'),
+                ('min_weight_g', 'min_weight_g'),
+                ('max_weight_g', 'max_weight_g'),
+                ('condition_factor', 'condition_factor'),
+                ('notes', 'notes'),
+                ('created_at', 'created_at'),
+                ('updated_at', 'updated_at'),
+            ),
+        ),
+        ExportDataset(
+            name='environmental',
+            model=EnvironmentalReading,
+            description='Environmental readings (append-only, watermarked on created_at)',
+            watermark_field='created_at',
+            geography_filter_fields=CONTAINER_GEOGRAPHY_PATHS,
+            location_path='container_id',
+            columns=(
+                ('id', 'id'),
+                ('parameter_id', 'parameter_id'),
+                ('parameter_name', 'parameter__name'),
+                ('container_id', 'container_id'),
+                ('batch_id', 'batch_id'),
+                ('sensor_id', 'sensor_id'),
+                ('batch_container_assignment_id', 'batch_container_assignment_id'),
+                ('value', 'value'),
+                ('reading_time', 'reading_time'),
+                ('is_manual', 'is_manual'),
+                ('recorded_by_id', 'recorded_by_id'),
+                ('notes', 'notes'),
+                ('created_at', 'created_at'),
+            ),
+        ),
+    )
+}
+
+
+def get_dataset(name: str) -> ExportDataset:
+    try:
+        return DATASETS[name]
+    except KeyError:
+        raise ExportError(
+            f"Unknown dataset '{name}'. Available: {', '.join(sorted(DATASETS))}"
+        )
+
+
+def export_queryset(
+    dataset: ExportDataset,
+    queryset=None,
+    *,
+    since: Optional[datetime] = None,
+    since_id: Optional[int] = None,
+    limit: Optional[int] = None,
+):
+    """
+    Watermark-filtered values_list() queryset in (watermark, id) order.
+
+    ``queryset`` is the already scoped base queryset (defaults to all rows).
+    """
+    if queryset is None:
+        queryset = dataset.model.objects.all()
+    watermark = dataset.watermark_field
+    if since is not None:
+        queryset = queryset.filter(
+            Q(**{f'{watermark}__gt': since})
+            | Q(**{watermark: since, 'id__gt': since_id or 0})
+        )
+    queryset = queryset.order_by(watermark, 'id').values_list(*dataset.paths)
+    if limit:
+        queryset = queryset[:limit]
+    return queryset
+
+
+def iter_rows(queryset, chunk_size: int = EXPORT_CHUNK_SIZE) -> Iterator[tuple]:
+    """Stream tuples through a server-side cursor where the backend has one."""
+    return queryset.iterator(chunk_size=chunk_size)
+
+
+class _ExportJSONEncoder(DjangoJSONEncoder):
+    """Keep full microsecond precision so exported watermarks resume exactly."""
+
+    def default(self, o):
+        if isinstance(o, (datetime, time)):
+            return o.isoformat()
+        return super().default(o)
+
+
+def stream_ndjson(dataset: ExportDataset, rows: Iterable[tuple]) -> Iterator[bytes]:
+    names = dataset.column_names
+    encoder = _ExportJSONEncoder(separators=(',', ':'))
+    for row in rows:
+        yield (encoder.encode(dict(zip(names, row))) + '\n').encode()
+
+
+class _Echo:
+    """File-like object whose write() returns the value (csv streaming)."""
+
+    def write(self, value):
+        return value
+
+
+def stream_csv(dataset: ExportDataset, rows: Iterable[tuple]) -> Iterator[bytes]:
+    writer = csv.writer(_Echo())
+    yield writer.writerow(dataset.column_names).encode()
+    for row in rows:
+        yield writer.writerow(
+            ['' if value is None else _csv_value(value) for value in row]
+        ).encode()
+
+
+def _csv_value(value):
+    if hasattr(value, 'isoformat'):
+        return value.isoformat()
+    return value
+
+
+class _ParquetSink:
+    """Write-only file object that hands back bytes as row groups are written."""
+
+    closed = False
+
+    def __init__(self):
+        self._chunks = []
+        self._position = 0
+
+    def write(self, data) -> int:
+        data = bytes(data)
+        self._chunks.append(data)
+        self._position += len(data)
+        return len(data)
+
+    def tell(self) -> int:
+        return self._position
+
+    def flush(self):
+        pass
+
+    def close(self):
+        self.closed = True
+
+    def drain(self) -> bytes:
+        data = b''.join(self._chunks)
+        self._chunks = []
+        return data
+
+
+def _arrow_type(model_field):
+    if isinstance(model_field, models.ForeignKey):
+        model_field = model_field.target_field
+    if isinstance(model_field, models.BooleanField):
+        return pa.bool_()
+    if isinstance(model_field, (models.AutoField, models.BigAutoField, models.IntegerField)):
+        return pa.int64()
+    if isinstance(model_field, models.DecimalField):
+        return pa.decimal128(model_field.max_digits, model_field.decimal_places)
+    if isinstance(model_field, models.FloatField):
+        return pa.float64()
+    if isinstance(model_field, models.DateTimeField):
+        return pa.timestamp('us', tz='UTC')
+    if isinstance(model_field, models.DateField):
+        return pa.date32()
+    if isinstance(model_field, models.TimeField):
+        return pa.time64('us')
+    return pa.string()
+
+
+def _resolve_field(model, path: str):
+    parts = path.split('__')
+    for part in parts[:-1]:
+        model = model._meta.get_field(part).related_model
+    # get_field() also resolves FK attnames such as "container_id"
+    return model._meta.get_field(parts[-1])
+
+
+def parquet_schema(dataset: ExportDataset):
+    return pa.schema([
+        (name, _arrow_type(_resolve_field(dataset.model, path)))
+        for name, path in dataset.columns
+    ])
+
+
+def stream_parquet(
+    dataset: ExportDataset,
+    rows: Iterable[tuple],
+    chunk_size: int = EXPORT_CHUNK_SIZE,
+) -> Iterator[bytes]:
+    """One Parquet row group per chunk, yielded as soon as it is encoded."""
+    if not HAS_PYARROW:
+        raise ExportError("Parquet export requires pyarrow")
+    schema = parquet_schema(dataset)
+    sink = _ParquetSink()
+    writer = pq.ParquetWriter(sink, schema)
+
+    def flush(batch):
+        columns = list(zip(*batch))
+        writer.write_table(pa.Table.from_arrays(
+            [pa.array(column, type=schema.field(index).type) for index, column in enumerate(columns)],
+            schema=schema,
+        ))
+        return sink.drain()
+
+    batch = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= chunk_size:
+            yield flush(batch)
+            batch = []
+    if batch:
+        yield flush(batch)
+    writer.close()
+    yield sink.drain()
+
+
+STREAMERS = {
+    'ndjson': stream_ndjson,
+    'csv': stream_csv,
+    'parquet': stream_parquet,
+}
+
+
+def stream_export(dataset: ExportDataset, queryset, file_format: str) -> Iterator[bytes]:
+    """Encode the rows of an export_queryset() in the requested format."""
+    if file_format not in STREAMERS:
+        raise ExportError(
+            f"Unsupported format '{file_format}'. Use one of: {', '.join(EXPORT_FORMATS)}"
+        )
+    if file_format == 'parquet' and not HAS_PYARROW:
+        raise ExportError("Parquet export requires pyarrow")
+    return STREAMERS[file_format](dataset, iter_rows(queryset))
@@ -4,9 +4,13 @@ FCR Trends Service for Operational App
 Provides comprehensive FCR trend analysis with actual and predicted FCR calculations,
 supporting batch, container assignment, and geography level aggregations.
 """
+import hashlib
 from decimal import Decimal
+
+import numpy as np
+from django.core.cache import cache
 from django.db import models
-from django.db.models import Avg, Sum, F, Case, When, Value
+from django.db.models import Avg, Count, Max, Sum, F, Case, When, Value
 from django.db.models.functions import TruncWeek, TruncMonth, TruncDay
 from typing import List, Dict, Optional, Tuple, Any
 from datetime import date, timedelta
@@ -15,9 +19,11 @@ from enum import Enum
 from apps.inventory.models import BatchFeedingSummary, ContainerFeedingSummary
 from apps.inventory.services.fcr_service import FCRCalculationService
 from apps.batch.models import Batch, BatchContainerAssignment
-from apps.scenario.models import Scenario, FCRModelStage
+from apps.scenario.models import Scenario, FCRModelStage, ScenarioProjection
 from apps.infrastructure.models import Geography
 
+PREDICTED_FCR_CACHE_TIMEOUT = 60 * 60 * 24
+
 
 class AggregationLevel(Enum):
     """Supported aggregation levels for FCR trends."""
@@ -347,7 +353,6 @@ class FCRTrendsService:
             summaries = list(queryset)
             if summaries:
                 # Weight by total feed consumption using Decimal for precision
-                from decimal import Decimal
                 total_weighted_fcr = Decimal('0')
                 total_weight = Decimal('0')
                 worst_confidence = 'VERY_HIGH'
@@ -397,124 +402,181 @@ class FCRTrendsService:
         """
         Get predicted FCR series from scenario data.
 
-        For predicted FCR, we use the FCR values from scenario projections.
+        Each scenario contributes the mean predicted FCR of its days in every
+        bucket (see _scenario_bucket_means); buckets overlapping the requested
+        range are averaged across scenarios.
         """
-        # Find relevant scenarios
-        scenario_filters = {}
+        scenarios = Scenario.objects.filter(start_date__lte=end_date)
 
         if aggregation_level == AggregationLevel.BATCH and batch_id:
-            scenario_filters['batch_id'] = batch_id
+            scenarios = scenarios.filter(batch_id=batch_id)
         elif aggregation_level == AggregationLevel.CONTAINER_ASSIGNMENT and assignment_id:
-            # Get batch_id from assignment
-            try:
-                assignment = BatchContainerAssignment.objects.get(id=assignment_id)
-                scenario_filters['batch_id'] = assignment.batch_id
-            except BatchContainerAssignment.DoesNotExist:
+            assignment_batch = BatchContainerAssignment.objects.filter(
+                id=assignment_id
+            ).values_list('batch_id', flat=True).first()
+            if assignment_batch is None:
                 # If assignment doesn't exist, no scenarios to filter
                 return []
+            scenarios = scenarios.filter(batch_id=assignment_batch)
         elif aggregation_level == AggregationLevel.GEOGRAPHY and geography_id:
-            # Get batches in the specified geography
-            # Containers can be in areas directly or through stations
-            batch_ids = Batch.objects.filter(
+            # Batches with containers in the geography's areas or stations,
+            # kept as a subquery rather than a materialised id list
+            geography_batches = Batch.objects.filter(
                 models.Q(batch_assignments__container__area__geography_id=geography_id) |
-                models.Q(batch_assignments__container__station__area__geography_id=geography_id)
-            ).values_list('id', flat=True).distinct()
-            scenario_filters['batch_id__in'] = list(batch_ids)
-
-        if not scenario_filters:
-            # No specific filters, get all active scenarios
-            scenarios = Scenario.objects.filter(
-                start_date__lte=end_date,
-                duration_days__gt=0
-            )
-        else:
-            scenarios = Scenario.objects.filter(**scenario_filters)
-
-        if not scenarios.exists():
+                models.Q(batch_assignments__container__hall__freshwater_station__geography_id=geography_id)
+            ).values('id')
+            scenarios = scenarios.filter(batch_id__in=geography_batches)
+
+        scenario_rows = list(scenarios.annotate(
+            latest_run_id=Max('projection_runs__run_id'),
+            stages_updated_at=Max('fcr_model__stages__updated_at'),
+            stage_count=Count('fcr_model__stages', distinct=True),
+        ).values(
+            'scenario_id', 'start_date', 'duration_days', 'fcr_model_id', 'updated_at',
+            'latest_run_id', 'stages_updated_at', 'stage_count',
+        ))
+        if not scenario_rows:
             return []
 
-        # For each scenario, get predicted FCR values
-        predicted_data = []
-
-        for scenario in scenarios:
-            # Get FCR model stages for this scenario
-            fcr_stages = FCRModelStage.objects.filter(
-                model=scenario.fcr_model
-            ).order_by('stage__order')
-
-            # Generate predicted FCR for each time bucket
-            current_date = scenario.start_date
-
-            while current_date <= end_date:
-                # Find appropriate FCR stage for current date
-                days_elapsed = (current_date - scenario.start_date).days
-                fcr_value = cls._get_fcr_for_date(fcr_stages, days_elapsed)
-
-                if fcr_value:
-                    bucket_start = cls._get_bucket_start(current_date, interval)
-                    bucket_end = cls._calculate_period_end(bucket_start, interval)  # Already returns ISO string
-
-                    predicted_data.append({
-                        "period_start": bucket_start.isoformat(),
-                        "period_end": bucket_end,  # Already a string from _calculate_period_end
-                        "predicted_fcr": round(float(fcr_value), 3),
-                        "scenario_name": scenario.name
-                    })
-
-                # Move to next interval
-                current_date = cls._get_next_bucket_date(current_date, interval)
-
-        # Aggregate predicted data by bucket
-        bucketed_predictions = {}
-        for item in predicted_data:
-            bucket_key = item['period_start']
-            if bucket_key not in bucketed_predictions:
-                bucketed_predictions[bucket_key] = {
-                    "period_start": item['period_start'],
-                    "period_end": item['period_end'],
-                    "predicted_fcr_values": [],
-                    "scenario_count": 0
-                }
-
-            bucketed_predictions[bucket_key]["predicted_fcr_values"].append(item["predicted_fcr"])
-            bucketed_predictions[bucket_key]["scenario_count"] += 1
+        first_bucket = cls._get_bucket_start(start_date, interval).isoformat()
+        last_bucket = end_date.isoformat()
+        buckets: Dict[str, List[float]] = {}
+        for bucket_means in cls._scenario_bucket_means(scenario_rows, interval):
+            for bucket_start, predicted_fcr in bucket_means:
+                if first_bucket <= bucket_start <= last_bucket:
+                    buckets.setdefault(bucket_start, []).append(predicted_fcr)
 
-        # Calculate averages for each bucket
         series = []
-        for bucket_data in bucketed_predictions.values():
-            if bucket_data["predicted_fcr_values"]:
-                avg_predicted = sum(bucket_data["predicted_fcr_values"]) / len(bucket_data["predicted_fcr_values"])
-                series.append({
-                    "period_start": bucket_data["period_start"],
-                    "period_end": bucket_data["period_end"],
-                    "predicted_fcr": round(avg_predicted, 3),
-                    "scenarios_used": bucket_data["scenario_count"]
-                })
+        for bucket_start in sorted(buckets):
+            values = buckets[bucket_start]
+            series.append({
+                "period_start": bucket_start,
+                "period_end": cls._calculate_period_end(date.fromisoformat(bucket_start), interval),
+                "predicted_fcr": round(sum(values) / len(values), 3),
+                "scenarios_used": len(values)
+            })
 
-        return sorted(series, key=lambda x: x['period_start'])
+        return series
 
     @classmethod
-    def _get_fcr_for_date(
+    def _scenario_bucket_means(
         cls,
-        fcr_stages: models.QuerySet,
-        days_elapsed: int
-    ) -> Optional[Decimal]:
-        """Get the appropriate FCR value for a given day in the scenario."""
-        total_days = 0
+        scenario_rows: List[Dict[str, Any]],
+        interval: TimeInterval
+    ) -> List[List[Tuple[str, float]]]:
+        """
+        Per-scenario (bucket start, mean predicted FCR) lists, cached.
+
+        Entries are cached per (scenario, interval) under a key that includes
+        the scenario's updated_at, its latest projection run and the FCR
+        model's stage count and latest stage edit, so editing the scenario,
+        re-running its projection or changing the FCR model moves readers
+        onto a fresh entry.
+        """
+        keys = {
+            cls._predicted_cache_key(row, interval): row
+            for row in scenario_rows
+        }
+        cached = cache.get_many(list(keys))
+        results = []
+        for key, row in keys.items():
+            bucket_means = cached.get(key)
+            if bucket_means is None:
+                dates, values = cls._scenario_fcr_timeline(row)
+                bucket_means = cls._bucket_means(dates, values, interval)
+                cache.set(key, bucket_means, PREDICTED_FCR_CACHE_TIMEOUT)
+            results.append(bucket_means)
+        return results
+
+    @staticmethod
+    def _predicted_cache_key(row: Dict[str, Any], interval: TimeInterval) -> str:
+        version = hashlib.sha1(repr((
+            row['updated_at'], row['fcr_model_id'], row['latest_run_id'],
+            row['stages_updated_at'], row['stage_count'],
+        )).encode()).hexdigest()[:16]
+        return f"fcr_trends:predicted:{row['scenario_id']}:{interval.value}:{version}"
 
-        for stage in fcr_stages:
-            stage_end = total_days + stage.duration_days
+    @classmethod
+    def _scenario_fcr_timeline(cls, row: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Daily (date, predicted FCR) arrays for one scenario.
 
-            if total_days <= days_elapsed < stage_end:
-                return stage.fcr_value
+        Uses the stage of each day in the scenario's latest projection run
+        joined to the FCR model's stage values. Without a projection run the
+        FCR model's stage durations are laid end to end from the scenario
+        start (the last stage continues to the end of the scenario).
+        Days whose stage has no FCR value are NaN.
+        """
+        stage_fcr = dict(
+            FCRModelStage.objects.filter(model_id=row['fcr_model_id'])
+            .values_list('stage_id', 'fcr_value')
+        )
 
-            total_days = stage_end
+        if row['latest_run_id']:
+            projection = list(
+                ScenarioProjection.objects.filter(projection_run_id=row['latest_run_id'])
+                .order_by('day_number')
+                .values_list('projection_date', 'current_stage_id')
+            )
+            if projection:
+                dates = np.array([day for day, _ in projection], dtype='datetime64[D]')
+                stage_ids = np.array([stage for _, stage in projection], dtype=np.int64)
+                return dates, cls._lookup(stage_ids, stage_fcr)
+
+        stages = list(
+            FCRModelStage.objects.filter(model_id=row['fcr_model_id'])
+            .order_by('stage__order')
+            .values_list('fcr_value', 'duration_days')
+        )
+        duration = row['duration_days']
+        if not stages or duration <= 0:
+            return np.array([], dtype='datetime64[D]'), np.array([], dtype=float)
+
+        fcr_values = np.array([fcr for fcr, _ in stages], dtype=float)
+        durations = np.array([days for _, days in stages], dtype=np.int64)
+        values = np.repeat(fcr_values, durations)[:duration]
+        if len(values) < duration:
+            values = np.concatenate([values, np.full(duration - len(values), fcr_values[-1])])
+        dates = np.datetime64(row['start_date'], 'D') + np.arange(duration)
+        return dates, values
+
+    @staticmethod
+    def _lookup(stage_ids: np.ndarray, stage_fcr: Dict[int, float]) -> np.ndarray:
+        """Map stage ids to FCR values (NaN for stages without one)."""
+        if not stage_fcr:
+            return np.full(len(stage_ids), np.nan)
+        keys = np.array(sorted(stage_fcr), dtype=np.int64)
+        table = np.array([stage_fcr[key] for key in keys], dtype=float)
+        index = np.clip(np.searchsorted(keys, stage_ids), 0, len(keys) - 1)
+        return np.where(keys[index] == stage_ids, table[index], np.nan)
+
+    @staticmethod
+    def _bucket_means(
+        dates: np.ndarray,
+        values: np.ndarray,
+        interval: TimeInterval
+    ) -> List[Tuple[str, float]]:
+        """Mean of the finite values per bucket, as (ISO bucket start, FCR) pairs."""
+        valid = np.isfinite(values)
+        dates, values = dates[valid], values[valid]
+        if not len(values):
+            return []
 
-        # If we've exceeded all stages, use the last stage's FCR
-        if fcr_stages.exists():
-            return fcr_stages.last().fcr_value
+        days = dates.astype(np.int64)
+        if interval == TimeInterval.WEEKLY:
+            # 1970-01-01 was a Thursday: (days + 3) % 7 is days since Monday
+            keys = days - (days + 3) % 7
+        elif interval == TimeInterval.MONTHLY:
+            keys = dates.astype('datetime64[M]').astype('datetime64[D]').astype(np.int64)
+        else:  # DAILY
+            keys = days
 
-        return None
+        bucket_keys, inverse = np.unique(keys, return_inverse=True)
+        means = np.bincount(inverse, weights=values) / np.bincount(inverse)
+        return [
+            (str(np.datetime64(int(key), 'D')), round(float(mean), 3))
+            for key, mean in zip(bucket_keys, means)
+        ]
 
     @classmethod
     def _merge_series(
@@ -620,16 +682,3 @@ class FCRTrendsService:
             return date_val.replace(day=1)
         else:  # DAILY
             return date_val
-
-    @classmethod
-    def _get_next_bucket_date(cls, current_date: date, interval: TimeInterval) -> date:
-        """Get the next bucket date."""
-        if interval == TimeInterval.WEEKLY:
-            return current_date + timedelta(days=7)
-        elif interval == TimeInterval.MONTHLY:
-            if current_date.month == 12:
-                return date(current_date.year + 1, 1, 1)
-            else:
-                return date(current_date.year, current_date.month + 1, 1)
-        else:  # DAILY
-            return current_date + timedelta(days=1)
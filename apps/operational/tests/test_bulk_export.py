@@ -0,0 +1,160 @@
+"""
+Tests for the operational bulk export API.
+
+Covers NDJSON/CSV/Parquet encoding, (watermark, id) resume and RBAC scoping.
+"""
+import csv
+import io
+import json
+import unittest
+from datetime import timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework import status
+from rest_framework.test import APITestCase
+
+from apps.environmental.models import EnvironmentalParameter, EnvironmentalReading
+from apps.infrastructure.models import (
+    Area, Container, ContainerType, FreshwaterStation, Geography as GeographyModel, Hall,
+)
+from apps.operational.services.bulk_export import HAS_PYARROW
+from apps.users.models import Geography, Role, Subsidiary
+
+User = get_user_model()
+
+
+class BulkExportAPITest(APITestCase):
+    """Streaming exports of environmental readings."""
+
+    def setUp(self):
+        cache.clear()
+        self.geo = GeographyModel.objects.create(name='Scotland', description='Scotland operations')
+        self.area = Area.objects.create(
+            name='Export Area', geography=self.geo, latitude=56.0, longitude=-4.0, max_biomass=1000000
+        )
+        station = FreshwaterStation.objects.create(
+            name='Export Station', station_type='FRESHWATER', geography=self.geo,
+            latitude=56.1, longitude=-4.1,
+        )
+        hall = Hall.objects.create(name='Export Hall', freshwater_station=station)
+        container_type = ContainerType.objects.create(name='Export Tank', category='TANK', max_volume_m3=100)
+        self.pen = Container.objects.create(
+            name='Pen', container_type=container_type, area=self.area, volume_m3=100, max_biomass_kg=10000
+        )
+        self.tank = Container.objects.create(
+            name='Tank', container_type=container_type, hall=hall, volume_m3=50, max_biomass_kg=5000
+        )
+        parameter = EnvironmentalParameter.objects.create(name='Temperature', unit='°C')
+
+        base = timezone.now() - timedelta(hours=6)
+        self.readings = [
+            EnvironmentalReading.objects.create(
+                parameter=parameter,
+                container=container,
+                reading_time=base + timedelta(minutes=index),
+                value=Decimal('10.00') + index,
+            )
+            for index, container in enumerate([self.pen, self.tank, self.pen, self.tank])
+        ]
+
+        self.admin = User.objects.create_superuser('export_admin', 'admin@example.com', 'password')
+        self.client.force_authenticate(self.admin)
+        self.url = reverse('bulk-export-detail', kwargs={'dataset': 'environmental'})
+
+    def _ndjson(self, response):
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        body = b''.join(response.streaming_content).decode()
+        return [json.loads(line) for line in body.splitlines()]
+
+    def test_list_describes_datasets(self):
+        response = self.client.get(reverse('bulk-export-list'))
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        datasets = {entry['dataset']: entry for entry in response.data}
+        self.assertEqual(set(datasets), {'feeding', 'mortality', 'growth', 'environmental'})
+        self.assertEqual(datasets['environmental']['watermark_field'], 'created_at')
+
+    def test_every_dataset_streams_in_every_format(self):
+        for dataset in ('feeding', 'mortality', 'growth'):
+            for file_format in ('ndjson', 'csv'):
+                response = self.client.get(
+                    reverse('bulk-export-detail', kwargs={'dataset': dataset}),
+                    {'file_format': file_format},
+                )
+                self.assertEqual(response.status_code, status.HTTP_200_OK, (dataset, file_format))
+                b''.join(response.streaming_content)
+
+    def test_ndjson_streams_rows_in_watermark_order(self):
+        response = self.client.get(self.url)
+
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        self.assertEqual(response['X-Export-Watermark-Field'], 'created_at')
+        rows = self._ndjson(response)
+        self.assertEqual([row['id'] for row in rows], [reading.id for reading in self.readings])
+        self.assertEqual(rows[0]['container_id'], self.pen.id)
+        self.assertEqual(rows[0]['parameter_name'], 'Temperature')
+
+    def test_since_and_since_id_resume_after_last_row(self):
+        first_page = self._ndjson(self.client.get(self.url, {'limit': 2}))
+        self.assertEqual(len(first_page), 2)
+
+        last = first_page[-1]
+        rest = self._ndjson(self.client.get(
+            self.url, {'since': last['created_at'], 'since_id': last['id']}
+        ))
+
+        self.assertEqual(
+            [row['id'] for row in first_page + rest],
+            [reading.id for reading in self.readings],
+        )
+
+    def test_csv_has_header_and_one_line_per_row(self):
+        response = self.client.get(self.url, {'file_format': 'csv'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response['Content-Type'], 'text/csv')
+        rows = list(csv.reader(io.StringIO(b''.join(response.streaming_content).decode())))
+        self.assertEqual(rows[0][:3], ['id', 'parameter_id', 'parameter_name'])
+        self.assertEqual(len(rows), 1 + len(self.readings))
+
+    @unittest.skipUnless(HAS_PYARROW, 'pyarrow is not installed')
+    def test_parquet_round_trips(self):
+        import pyarrow.parquet as pq
+
+        response = self.client.get(self.url, {'file_format': 'parquet'})
+
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        table = pq.read_table(io.BytesIO(b''.join(response.streaming_content)))
+        self.assertEqual(table.num_rows, len(self.readings))
+        self.assertEqual(table.column('value').to_pylist()[0], Decimal('10.00'))
+
+    def test_invalid_parameters_are_rejected(self):
+        self.assertEqual(
+            self.client.get(self.url, {'file_format': 'xlsx'}).status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            self.client.get(self.url, {'since': 'yesterday'}).status_code, status.HTTP_400_BAD_REQUEST
+        )
+        self.assertEqual(
+            self.client.get(reverse('bulk-export-detail', kwargs={'dataset': 'salaries'})).status_code,
+            status.HTTP_404_NOT_FOUND,
+        )
+
+    def test_operator_only_exports_assigned_containers(self):
+        operator = User.objects.create_user(username='export_operator', password='password')
+        profile = operator.profile
+        profile.geography = Geography.SCOTLAND
+        profile.subsidiary = Subsidiary.ALL
+        profile.role = Role.OPERATOR
+        profile.save()
+        profile.allowed_areas.add(self.area)
+        self.client.force_authenticate(User.objects.get(pk=operator.pk))
+
+        rows = self._ndjson(self.client.get(self.url))
+
+        self.assertEqual({row['container_id'] for row in rows}, {self.pen.id})
+        self.assertEqual(len(rows), 2)
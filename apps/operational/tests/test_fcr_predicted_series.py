@@ -0,0 +1,159 @@
+"""
+Tests for the predicted FCR series of FCRTrendsService.
+
+Predicted FCR comes from per-scenario daily stage timelines (latest
+projection run, or FCR stage durations without one), bucketed per interval
+and cached per (scenario, interval).
+"""
+from datetime import date, timedelta
+from decimal import Decimal
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.batch.models import Batch, BatchContainerAssignment, LifeCycleStage, Species
+from apps.infrastructure.models import Area, Container, ContainerType, Geography
+from apps.operational.services.fcr_trends_service import (
+    AggregationLevel,
+    FCRTrendsService,
+    TimeInterval,
+)
+from apps.scenario.models import (
+    FCRModel,
+    FCRModelStage,
+    MortalityModel,
+    ProjectionRun,
+    Scenario,
+    ScenarioProjection,
+    TemperatureProfile,
+    TGCModel,
+)
+
+START = date(2024, 1, 1)  # a Monday
+
+
+class PredictedFCRSeriesTest(TestCase):
+
+    def setUp(self):
+        cache.clear()
+        species = Species.objects.create(name="Atlantic Salmon")
+        self.fry = LifeCycleStage.objects.create(name="Fry", species=species, order=1)
+        self.parr = LifeCycleStage.objects.create(name="Parr", species=species, order=2)
+        self.batch = Batch.objects.create(
+            batch_number="PRED-1", species=species, lifecycle_stage=self.fry, start_date=START,
+        )
+        self.geography = Geography.objects.create(name="Predicted Geo")
+        area = Area.objects.create(
+            name="Predicted Area", geography=self.geography,
+            latitude=Decimal("62.0"), longitude=Decimal("-7.0"), max_biomass=Decimal("10000"),
+        )
+        container = Container.objects.create(
+            name="Pen P", area=area, volume_m3=Decimal("100"), max_biomass_kg=Decimal("1000"),
+            container_type=ContainerType.objects.create(
+                name="Pen", category="PEN", max_volume_m3=Decimal("1000"),
+            ),
+        )
+        BatchContainerAssignment.objects.create(
+            batch=self.batch, container=container, lifecycle_stage=self.fry,
+            population_count=1000, biomass_kg=Decimal("10"), assignment_date=START,
+        )
+
+        self.fcr_model = FCRModel.objects.create(name="Predicted FCR")
+        self.fry_fcr = FCRModelStage.objects.create(
+            model=self.fcr_model, stage=self.fry, fcr_value=1.0, duration_days=10,
+        )
+        FCRModelStage.objects.create(
+            model=self.fcr_model, stage=self.parr, fcr_value=2.0, duration_days=10,
+        )
+        profile = TemperatureProfile.objects.create(name="Predicted Temps")
+        self.scenario = Scenario.objects.create(
+            name="Predicted Scenario", start_date=START, duration_days=28,
+            initial_count=1000, genotype="G", supplier="S",
+            tgc_model=TGCModel.objects.create(
+                name="Predicted TGC", location="Loc", release_period="Spring",
+                tgc_value=2.5, exponent_n=0.33, exponent_m=0.66, profile=profile,
+            ),
+            fcr_model=self.fcr_model,
+            mortality_model=MortalityModel.objects.create(
+                name="Predicted Mortality", frequency="daily", rate=0.01,
+            ),
+            batch=self.batch,
+            created_by=get_user_model().objects.create_user('planner', password='pw'),
+        )
+
+    def _series(self, interval=TimeInterval.WEEKLY, start=START, end=START + timedelta(days=27), **filters):
+        filters.setdefault('batch_id', self.batch.id)
+        level = (
+            AggregationLevel.GEOGRAPHY if 'geography_id' in filters else AggregationLevel.BATCH
+        )
+        return FCRTrendsService._get_predicted_fcr_series(start, end, interval, level, **filters)
+
+    def _project(self, stages):
+        run = ProjectionRun.objects.create(scenario=self.scenario, run_number=1)
+        ScenarioProjection.objects.bulk_create([
+            ScenarioProjection(
+                projection_run=run, projection_date=START + timedelta(days=day), day_number=day,
+                average_weight=1, population=1000, biomass=1, daily_feed=0, cumulative_feed=0,
+                temperature=10, current_stage=stage,
+            )
+            for day, stage in enumerate(stages)
+        ])
+        return run
+
+    def test_stage_durations_without_projection(self):
+        weekly = self._series()
+
+        self.assertEqual(
+            [(row['period_start'], row['predicted_fcr']) for row in weekly],
+            # days 0-9 at 1.0, 10-19 at 2.0, then the last stage continues
+            [('2024-01-01', 1.0), ('2024-01-08', round((3 * 1.0 + 4 * 2.0) / 7, 3)),
+             ('2024-01-15', 2.0), ('2024-01-22', 2.0)],
+        )
+        self.assertEqual(weekly[0]['period_end'], '2024-01-07')
+        self.assertEqual({row['scenarios_used'] for row in weekly}, {1})
+
+    def test_projection_stage_timeline_is_preferred(self):
+        self._project([self.fry] * 3 + [self.parr] * 11)
+
+        weekly = self._series(end=START + timedelta(days=13))
+
+        self.assertEqual(
+            [(row['period_start'], row['predicted_fcr']) for row in weekly],
+            [('2024-01-01', round((3 * 1.0 + 4 * 2.0) / 7, 3)), ('2024-01-08', 2.0)],
+        )
+
+    def test_series_is_clipped_to_requested_range(self):
+        monthly = self._series(TimeInterval.MONTHLY, end=START + timedelta(days=5))
+        daily = self._series(TimeInterval.DAILY, start=START + timedelta(days=9), end=START + timedelta(days=10))
+
+        self.assertEqual([row['period_start'] for row in monthly], ['2024-01-01'])
+        self.assertEqual(
+            [(row['period_start'], row['predicted_fcr']) for row in daily],
+            [('2024-01-10', 1.0), ('2024-01-11', 2.0)],
+        )
+
+    def test_cached_per_scenario_and_invalidated_on_model_edit(self):
+        first = self._series()
+        # Scenario lookup only; the timeline comes from the cache
+        with self.assertNumQueries(1):
+            self.assertEqual(self._series(), first)
+
+        self.fry_fcr.fcr_value = 1.5
+        self.fry_fcr.save()
+        self.assertEqual(self._series()[0]['predicted_fcr'], 1.5)
+
+        self.scenario.duration_days = 7
+        self.scenario.save()
+        self.assertEqual(len(self._series()), 1)
+
+    def test_geography_level_averages_scenarios(self):
+        self.scenario.pk = None
+        self.scenario.name = "Second Scenario"
+        self.scenario.save()
+
+        weekly = self._series(geography_id=self.geography.id, batch_id=None)
+
+        self.assertEqual(weekly[0]['scenarios_used'], 2)
+        self.assertEqual(weekly[0]['predicted_fcr'], 1.0)
+        self.assertEqual(self._series(geography_id=self.geography.id + 1, batch_id=None), [])
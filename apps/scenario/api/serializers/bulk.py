@@ -1,5 +1,6 @@
 """Serializers supporting CSV import/export and scenario duplication."""
 
+import codecs
 from datetime import date
 from typing import Any, Dict
 
@@ -20,6 +21,11 @@ class CSVUploadSerializer(serializers.Serializer):
     data_type = serializers.ChoiceField(choices=["temperature", "fcr", "mortality"])
     profile_name = serializers.CharField(max_length=255)
     validate_only = serializers.BooleanField(default=False)
+    import_id = serializers.CharField(
+        max_length=64,
+        required=False,
+        help_text="Client-chosen id; progress can be polled via import_status.",
+    )
 
     def validate_file(self, value):
         if not value.name.endswith(".csv"):
@@ -27,7 +33,11 @@ class CSVUploadSerializer(serializers.Serializer):
         if value.size > 10 * 1024 * 1024:
             raise serializers.ValidationError("File size cannot exceed 10MB")
         try:
-            value.read().decode("utf-8")
+            # Decode chunk by chunk so the upload is never held in memory whole
+            decoder = codecs.getincrementaldecoder("utf-8")()
+            for chunk in value.chunks():
+                decoder.decode(chunk)
+            decoder.decode(b"", final=True)
         except Exception as exc:  # pragma: no cover - defensive check
             raise serializers.ValidationError("File must be valid UTF-8 encoded CSV") from exc
         finally:
@@ -25,6 +25,10 @@ from apps.scenario.models import (
     Scenario, ProjectionRun, BiologicalConstraints, ScenarioModelChange
 )
 from apps.scenario.services import BulkDataImportService, DateRangeInputService
+from apps.scenario.services.bulk_import import (
+    cache_progress_callback,
+    get_import_progress,
+)
 from apps.scenario.services.calculations import ProjectionEngine
 # Import serializers directly from the serializers.py file
 from apps.scenario.api.serializers import (
@@ -76,13 +80,17 @@ class TemperatureProfileViewSet(HistoryReasonMixin, viewsets.ModelViewSet):
         csv_file = serializer.validated_data['file']
         profile_name = serializer.validated_data['profile_name']
         validate_only = serializer.validated_data['validate_only']
+        import_id = serializer.validated_data.get('import_id')
         
-        # Convert uploaded file to StringIO
-        file_content = csv_file.read().decode('utf-8')
-        csv_io = io.StringIO(file_content)
+        # Decode the upload as it is read, so rows are streamed in chunks
+        csv_io = io.TextIOWrapper(csv_file, encoding='utf-8', newline='')
         
-        # Process with service
-        service = BulkDataImportService()
+        # Process with service; progress is published for import_status polling
+        service = BulkDataImportService(
+            progress_callback=(
+                cache_progress_callback(request.user.pk, import_id) if import_id else None
+            )
+        )
         success, result = service.import_temperature_data(
             csv_io, profile_name, validate_only
         )
@@ -956,10 +964,9 @@ class DataEntryViewSet(viewsets.ViewSet):
         # Force validation only
         serializer.validated_data['validate_only'] = True
         
-        # Get file content
+        # Decode the upload as it is read, so rows are streamed in chunks
         csv_file = serializer.validated_data['file']
-        file_content = csv_file.read().decode('utf-8')
-        csv_io = io.StringIO(file_content)
+        csv_io = io.TextIOWrapper(csv_file, encoding='utf-8', newline='')
         
         # Validate based on data type
         data_type = serializer.validated_data['data_type']
@@ -1047,14 +1054,48 @@ class DataEntryViewSet(viewsets.ViewSet):
                 status=status.HTTP_400_BAD_REQUEST
             )
     
+    @extend_schema(
+        parameters=[
+            OpenApiParameter(
+                name='import_id',
+                type=OpenApiTypes.STR,
+                location=OpenApiParameter.QUERY,
+                description='Import id supplied with the CSV upload.',
+                required=True,
+            ),
+        ],
+        responses={
+            200: OpenApiResponse(description='Latest progress of the import'),
+            404: OpenApiResponse(description='Unknown or expired import id'),
+        },
+    )
     @action(detail=False, methods=['get'])
     def import_status(self, request):
-        """Check status of recent imports."""
-        # This would track import jobs if we implement async processing
-        return Response({
-            'message': 'Import status tracking not yet implemented',
-            'recent_imports': []
-        })
+        """
+        Progress of a CSV import started with an import_id.
+        
+        Progress is kept in the default cache; with several workers this
+        needs CACHE_REDIS_URL, otherwise only the worker that ran the
+        import can answer.
+        
+        Returns phase (parsing, validated, saving, done, failed),
+        rows_processed, chunks_processed, rows_written, error_count and
+        warning_count.
+        """
+        import_id = request.query_params.get('import_id')
+        if not import_id:
+            return Response(
+                {'error': 'import_id query parameter is required'},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+        
+        progress = get_import_progress(request.user.pk, import_id)
+        if progress is None:
+            return Response(
+                {'error': f'No progress recorded for import {import_id}'},
+                status=status.HTTP_404_NOT_FOUND
+            )
+        return Response({'import_id': import_id, **progress})
 
 
 class ProjectionRunViewSet(viewsets.ReadOnlyModelViewSet):
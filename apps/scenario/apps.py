@@ -5,3 +5,7 @@ class ScenarioConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'apps.scenario'
     verbose_name = 'Scenario Planning'
+
+    def ready(self):
+        """Connect signal handlers."""
+        import apps.scenario.signals  # noqa: F401
@@ -48,6 +48,22 @@ class TemperatureProfile(models.Model):
         return self.name
 
 
+class TemperatureReadingQuerySet(models.QuerySet):
+    """Deletes touch the affected profiles once, not once per reading."""
+
+    def delete(self):
+        from apps.scenario.services.calculations.temperature_series import touch_profiles
+
+        profile_ids = set(self.order_by().values_list('profile_id', flat=True).distinct())
+        result = super().delete()
+        if result[0]:
+            touch_profiles(profile_ids)
+        return result
+
+    delete.alters_data = True
+    delete.queryset_only = True
+
+
 class TemperatureReading(models.Model):
     """
     Individual temperature reading for a temperature profile.
@@ -71,6 +87,8 @@ class TemperatureReading(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
+    objects = TemperatureReadingQuerySet.as_manager()
+
     class Meta:
         verbose_name = "Temperature Reading"
         verbose_name_plural = "Temperature Readings"
@@ -80,6 +98,13 @@ class TemperatureReading(models.Model):
     def __str__(self):
         return f"{self.profile.name} - Day {self.day_number}: {self.temperature}°C"
 
+    def delete(self, *args, **kwargs):
+        from apps.scenario.services.calculations.temperature_series import touch_profiles
+
+        result = super().delete(*args, **kwargs)
+        touch_profiles([self.profile_id])
+        return result
+
 
 class TGCModel(models.Model):
     """
@@ -3,13 +3,34 @@ Bulk data import service for scenario planning.
 
 Handles CSV upload processing for temperature, FCR, and mortality data
 with validation, error handling, and preview generation.
+
+Files are streamed through ``csv.reader`` in fixed-size chunks. Each chunk
+is split into typed columns (dates, floats, ints) that are parsed in one
+pass, and row errors/warnings are recorded as each chunk is validated, so
+memory stays bounded by the parsed values rather than per-row dicts.
+
+Validated rows are held as compact tuples until the write phase, which
+runs in a single transaction: existing rows are upserted
+(``bulk_create(update_conflicts=True)``) instead of deleted and
+re-inserted, unchanged rows are skipped, and rows no longer present are
+trimmed. Readers therefore see either the old or the new profile, never
+an empty one. Progress is reported through an optional callback; the API
+uses ``cache_progress_callback`` so clients can poll an import.
+
+Progress lives in the default cache, so polling ``import_status`` from
+another worker needs a shared cache (CACHE_REDIS_URL). With the
+per-process LocMemCache only the worker that ran the import knows it and
+other workers answer 404.
 """
 import csv
 import io
 from datetime import datetime, date
-from typing import Dict, List, Tuple, Any, Optional
+from operator import itemgetter
+from typing import Callable, Dict, List, Tuple, Any, Optional, TextIO
+from django.core.cache import cache
 from django.core.exceptions import ValidationError
 from django.db import transaction
+from django.db.models.functions import Lower
 
 from ..models import (
     TemperatureProfile, TemperatureReading, FCRModel,
@@ -17,6 +38,40 @@ from ..models import (
 )
 from apps.batch.models import LifeCycleStage
 
+IMPORT_CHUNK_SIZE = 5000
+IMPORT_PROGRESS_TIMEOUT = 3600
+
+DATE_FORMATS = (
+    '%Y-%m-%d',
+    '%d/%m/%Y',
+    '%m/%d/%Y',
+    '%Y/%m/%d',
+    '%d-%m-%Y',
+    '%m-%d-%Y'
+)
+
+ProgressCallback = Callable[[Dict[str, Any]], None]
+
+
+def import_progress_key(user_id: int, import_id: str) -> str:
+    """Cache key holding progress for one client-supplied import id."""
+    return f"scenario_import_progress:{user_id}:{import_id}"
+
+
+def cache_progress_callback(user_id: int, import_id: str) -> ProgressCallback:
+    """Progress callback that publishes each update to the cache."""
+    key = import_progress_key(user_id, import_id)
+
+    def publish(progress: Dict[str, Any]) -> None:
+        cache.set(key, progress, IMPORT_PROGRESS_TIMEOUT)
+
+    return publish
+
+
+def get_import_progress(user_id: int, import_id: str) -> Optional[Dict[str, Any]]:
+    """Last published progress for an import, or None if unknown/expired."""
+    return cache.get(import_progress_key(user_id, import_id))
+
 
 class BulkDataImportService:
     """
@@ -31,15 +86,29 @@ class BulkDataImportService:
     FCR_HEADERS = ['stage', 'fcr_value', 'duration_days']
     MORTALITY_HEADERS = ['date', 'rate']
 
-    def __init__(self):
-        """Initialize the bulk import service."""
+    def __init__(
+        self,
+        chunk_size: int = IMPORT_CHUNK_SIZE,
+        progress_callback: Optional[ProgressCallback] = None
+    ):
+        """
+        Initialize the bulk import service.
+
+        Args:
+            chunk_size: Rows parsed/validated (and written) per chunk
+            progress_callback: Called with a progress dict after every
+                chunk and phase change
+        """
+        self.chunk_size = max(1, chunk_size)
+        self.progress_callback = progress_callback
         self.errors = []
         self.warnings = []
         self.preview_data = []
+        self.progress = {}
 
     def import_temperature_data(
         self,
-        csv_file: io.StringIO,
+        csv_file: TextIO,
         profile_name: str,
         validate_only: bool = False
     ) -> Tuple[bool, Dict[str, Any]]:
@@ -47,7 +116,7 @@ class BulkDataImportService:
         Import temperature data from CSV file.
 
         Args:
-            csv_file: CSV file content as StringIO
+            csv_file: CSV text stream (e.g. the upload in an io.TextIOWrapper)
             profile_name: Name for the temperature profile
             validate_only: If True, only validate without saving
 
@@ -58,20 +127,22 @@ class BulkDataImportService:
         self._reset_state()
 
         try:
-            reader = csv.DictReader(csv_file)
-            headers = self.TEMP_HEADERS
-            if not self._validate_headers(reader.fieldnames, headers):
-                return False, self._get_result()
+            reader = csv.reader(csv_file)
+            if not self._validate_headers(
+                next(reader, None), self.TEMP_HEADERS
+            ):
+                return self._finish(), self._get_result()
 
             temperature_data = self._collect_temperature_rows(reader)
             self._finalize_temperature_data(temperature_data)
 
             if validate_only or self.errors:
-                return len(self.errors) == 0, self._get_result()
+                return self._finish(), self._get_result()
 
             created = self._save_temperature_data(
                 profile_name, temperature_data
             )
+            self._finish()
             return True, {
                 **self._get_result(),
                 'created_objects': created
@@ -79,11 +150,12 @@ class BulkDataImportService:
 
         except Exception as e:  # pragma: no cover - defensive guard
             self.errors.append(f"Import failed: {str(e)}")
+            self._finish()
             return False, self._get_result()
 
     def import_fcr_data(
         self,
-        csv_file: io.StringIO,
+        csv_file: TextIO,
         model_name: str,
         validate_only: bool = False
     ) -> Tuple[bool, Dict[str, Any]]:
@@ -91,7 +163,7 @@ class BulkDataImportService:
         Import FCR (Feed Conversion Ratio) data from CSV file.
 
         Args:
-            csv_file: CSV file content as StringIO
+            csv_file: CSV text stream (e.g. the upload in an io.TextIOWrapper)
             model_name: Name for the FCR model
             validate_only: If True, only validate without saving
 
@@ -102,19 +174,20 @@ class BulkDataImportService:
         self._reset_state()
 
         try:
-            reader = csv.DictReader(csv_file)
+            reader = csv.reader(csv_file)
             if not self._validate_headers(
-                reader.fieldnames, self.FCR_HEADERS
+                next(reader, None), self.FCR_HEADERS
             ):
-                return False, self._get_result()
+                return self._finish(), self._get_result()
 
             fcr_data = self._collect_fcr_rows(reader)
             self._finalize_fcr_data(fcr_data)
 
             if validate_only or self.errors:
-                return len(self.errors) == 0, self._get_result()
+                return self._finish(), self._get_result()
 
             created = self._save_fcr_data(model_name, fcr_data)
+            self._finish()
             return True, {
                 **self._get_result(),
                 'created_objects': created
@@ -122,11 +195,12 @@ class BulkDataImportService:
 
         except Exception as e:  # pragma: no cover - defensive guard
             self.errors.append(f"Import failed: {str(e)}")
+            self._finish()
             return False, self._get_result()
 
     def import_mortality_data(
         self,
-        csv_file: io.StringIO,
+        csv_file: TextIO,
         model_name: str,
         validate_only: bool = False
     ) -> Tuple[bool, Dict[str, Any]]:
@@ -137,7 +211,7 @@ class BulkDataImportService:
         from the provided time-series data and creates a MortalityModel.
 
         Args:
-            csv_file: CSV file content as StringIO
+            csv_file: CSV text stream (e.g. the upload in an io.TextIOWrapper)
             model_name: Name for the mortality model
             validate_only: If True, only validate without saving
 
@@ -148,21 +222,22 @@ class BulkDataImportService:
         self._reset_state()
 
         try:
-            reader = csv.DictReader(csv_file)
+            reader = csv.reader(csv_file)
             if not self._validate_headers(
-                reader.fieldnames, self.MORTALITY_HEADERS
+                next(reader, None), self.MORTALITY_HEADERS
             ):
-                return False, self._get_result()
+                return self._finish(), self._get_result()
 
             mortality_data = self._collect_mortality_rows(reader)
             self._finalize_mortality_data(mortality_data)
 
             if validate_only or self.errors:
-                return len(self.errors) == 0, self._get_result()
+                return self._finish(), self._get_result()
 
             created = self._save_mortality_data(
                 model_name, mortality_data
             )
+            self._finish()
             return True, {
                 **self._get_result(),
                 'created_objects': created
@@ -170,11 +245,12 @@ class BulkDataImportService:
 
         except Exception as e:  # pragma: no cover - defensive guard
             self.errors.append(f"Import failed: {str(e)}")
+            self._finish()
             return False, self._get_result()
 
     def validate_csv_structure(
         self,
-        csv_file: io.StringIO,
+        csv_file: TextIO,
         expected_headers: List[str]
     ) -> Tuple[bool, List[str]]:
         """
@@ -288,76 +364,138 @@ class BulkDataImportService:
         self.errors = []
         self.warnings = []
         self.preview_data = []
+        self.progress = {
+            'phase': 'parsing',
+            'rows_processed': 0,
+            'chunks_processed': 0,
+            'rows_written': 0,
+            'error_count': 0,
+            'warning_count': 0,
+        }
+        self._report_progress()
+
+    def _report_progress(self, **changes: Any) -> None:
+        """Update progress counters and notify the callback, if any."""
+        self.progress.update(changes)
+        self.progress['error_count'] = len(self.errors)
+        self.progress['warning_count'] = len(self.warnings)
+        if self.progress_callback is not None:
+            self.progress_callback(dict(self.progress))
+
+    def _finish(self) -> bool:
+        """Report the final phase and return whether the import succeeded."""
+        self._report_progress(phase='failed' if self.errors else 'done')
+        return not self.errors
+
+    def _iter_chunks(self, reader):
+        """
+        Yield (first_row_num, rows) blocks of at most chunk_size data rows.
 
-    def _collect_temperature_rows(
-        self, reader: csv.DictReader
-    ) -> List[Dict[str, Any]]:
-        temperature_data: List[Dict[str, Any]] = []
-        row_num = 1
+        Row numbers count the header as row 1. Blank lines are skipped
+        without being counted, as csv.DictReader does.
+        """
+        rows: List[List[str]] = []
+        first_row = 2
         for row in reader:
-            row_num += 1
-            parsed = self._parse_temperature_row(row, row_num)
-            if parsed:
-                temperature_data.append(parsed)
-        return temperature_data
-
-    def _parse_temperature_row(
-        self, row: Dict[str, Any], row_num: int
-    ) -> Optional[Dict[str, Any]]:
-        date_str = row.get('date', '').strip()
-        reading_date = self._parse_date(date_str)
-        if not reading_date:
-            self.errors.append(f"Row {row_num}: Invalid date format")
-            return None
+            if not row:
+                continue
+            rows.append(row)
+            if len(rows) >= self.chunk_size:
+                yield first_row, rows
+                first_row += len(rows)
+                rows = []
+        if rows:
+            yield first_row, rows
+
+    def _chunk_done(self, row_count: int) -> None:
+        self._report_progress(
+            rows_processed=self.progress['rows_processed'] + row_count,
+            chunks_processed=self.progress['chunks_processed'] + 1
+        )
 
-        temp_str = row.get('temperature', '').strip()
-        try:
-            temperature = float(temp_str)
-        except ValueError:
-            self.errors.append(
-                f"Row {row_num}: Invalid temperature value '{temp_str}'"
-            )
-            return None
+    @staticmethod
+    def _column(rows: List[List[str]], index: int) -> List[str]:
+        """Stripped values of one column; short rows yield ''."""
+        return [row[index].strip() if len(row) > index else '' for row in rows]
+
+    @staticmethod
+    def _parse_number_column(
+        values: List[str], cast: Callable[[str], Any]
+    ) -> List[Any]:
+        """Cast a column of strings, using None for unparseable values."""
+        parsed = []
+        for value in values:
+            try:
+                parsed.append(cast(value))
+            except ValueError:
+                parsed.append(None)
+        return parsed
 
-        if temperature < -50 or temperature > 50:
-            self.warnings.append(
-                f"Row {row_num}: Unusual temperature {temperature}°C"
-            )
+    def _parse_date_column(self, values: List[str]) -> List[Optional[date]]:
+        return [self._parse_date(value) for value in values]
 
-        return {'date': reading_date, 'temperature': temperature}
+    def _collect_temperature_rows(
+        self, reader
+    ) -> List[Tuple[date, float]]:
+        """Parse and validate (date, temperature) rows chunk by chunk."""
+        temperature_data: List[Tuple[date, float]] = []
+        for first_row, rows in self._iter_chunks(reader):
+            raw_temperatures = self._column(rows, 1)
+            dates = self._parse_date_column(self._column(rows, 0))
+            temperatures = self._parse_number_column(raw_temperatures, float)
+
+            for offset, reading_date in enumerate(dates):
+                row_num = first_row + offset
+                if reading_date is None:
+                    self.errors.append(f"Row {row_num}: Invalid date format")
+                    continue
+
+                temperature = temperatures[offset]
+                if temperature is None:
+                    self.errors.append(
+                        f"Row {row_num}: Invalid temperature value "
+                        f"'{raw_temperatures[offset]}'"
+                    )
+                    continue
+
+                if temperature < -50 or temperature > 50:
+                    self.warnings.append(
+                        f"Row {row_num}: Unusual temperature {temperature}°C"
+                    )
+
+                temperature_data.append((reading_date, temperature))
+            self._chunk_done(len(rows))
+        return temperature_data
 
     def _finalize_temperature_data(
-        self, temperature_data: List[Dict[str, Any]]
+        self, temperature_data: List[Tuple[date, float]]
     ) -> None:
-        dates = [entry['date'] for entry in temperature_data]
-        if len(dates) != len(set(dates)):
+        if len({reading_date for reading_date, _ in temperature_data}) != len(temperature_data):
             self.errors.append("Duplicate dates found in CSV")
 
-        # Sort by date to establish day sequence
-        temperature_data.sort(key=lambda item: item['date'])
-
-        # Convert dates to day numbers (starting from 1)
-        for idx, data in enumerate(temperature_data, start=1):
-            data['day_number'] = idx
+        # Sort by date to establish day sequence; day numbers start at 1
+        temperature_data.sort(key=itemgetter(0))
 
-        self.preview_data = temperature_data[:10]
+        self.preview_data = [
+            {'date': reading_date, 'temperature': temperature, 'day_number': idx}
+            for idx, (reading_date, temperature)
+            in enumerate(temperature_data[:10], start=1)
+        ]
+        self._report_progress(phase='validated')
 
     def _parse_date(self, date_str: str) -> Optional[date]:
         """Parse date string in various formats."""
         if not date_str:
             return None
 
-        # Try common date formats
-        formats = [
-            '%Y-%m-%d',
-            '%d/%m/%Y',
-            '%m/%d/%Y',
-            '%Y/%m/%d',
-            '%d-%m-%Y',
-            '%m-%d-%Y'
-        ]
+        # Fast path for ISO dates, the format templates and exports use
+        if len(date_str) == 10 and date_str[4] == '-' and date_str[7] == '-':
+            try:
+                return date.fromisoformat(date_str)
+            except ValueError:
+                pass
 
-        for fmt in formats:
+        for fmt in DATE_FORMATS:
             try:
                 return datetime.strptime(date_str, fmt).date()
             except ValueError:
@@ -369,222 +507,247 @@ class BulkDataImportService:
     def _save_temperature_data(
         self,
         profile_name: str,
-        temperature_data: List[Dict[str, Any]]
+        temperature_data: List[Tuple[date, float]]
     ) -> Dict[str, Any]:
-        """Save temperature data to database."""
-        # Create or get profile
-        profile, created = TemperatureProfile.objects.get_or_create(
+        """
+        Swap the profile's readings to the validated data in one transaction.
+
+        Readings are upserted on (profile, day_number); rows whose
+        temperature is unchanged are not written, and day numbers outside
+        the new range are removed afterwards.
+        """
+        self._report_progress(phase='saving')
+        # Lock the profile row so concurrent imports of the same profile
+        # are applied one after the other
+        profile, created = TemperatureProfile.objects.select_for_update().get_or_create(
             name=profile_name
         )
 
+        existing: Dict[int, float] = {}
         if not created:
-            # Delete existing readings if updating
-            profile.readings.all().delete()
+            existing = dict(profile.readings.values_list('day_number', 'temperature'))
             self.warnings.append(
                 f"Updated existing profile '{profile_name}' - "
                 "old data replaced"
             )
 
-        # Create temperature readings
-        readings = []
-        for data in temperature_data:
-            reading = TemperatureReading(
+        changed = [
+            TemperatureReading(
                 profile=profile,
-                day_number=data['day_number'],  # CHANGED: Use sequence index, not date
-                temperature=data['temperature']
+                day_number=day_number,  # Sequence index, not date
+                temperature=temperature
             )
-            readings.append(reading)
+            for day_number, (_, temperature) in enumerate(temperature_data, start=1)
+            if existing.get(day_number) != temperature
+        ]
+        for start in range(0, len(changed), self.chunk_size):
+            chunk = changed[start:start + self.chunk_size]
+            TemperatureReading.objects.bulk_create(
+                chunk,
+                update_conflicts=True,
+                unique_fields=['profile', 'day_number'],
+                update_fields=['temperature']
+            )
+            self._report_progress(rows_written=start + len(chunk))
 
-        # Bulk create for efficiency
-        TemperatureReading.objects.bulk_create(readings)
+        removed = 0
+        if not created:
+            # The queryset delete touches the profile itself when it removes rows
+            removed, _ = profile.readings.exclude(
+                day_number__range=(1, len(temperature_data))
+            ).delete()
+            if changed and not removed:
+                # bulk writes skip signals; bump updated_at so cached
+                # temperature series for this profile are reloaded
+                profile.save(update_fields=['updated_at'])
 
         return {
             'profile': profile,
-            'readings_count': len(readings),
+            'readings_count': len(temperature_data),
+            'written_count': len(changed),
+            'unchanged_count': len(temperature_data) - len(changed),
+            'removed_count': removed,
             'day_range': {
-                'start': temperature_data[0]['day_number'],
-                'end': temperature_data[-1]['day_number']
+                'start': 1,
+                'end': len(temperature_data)
             }
         }
 
     def _collect_fcr_rows(
-        self, reader: csv.DictReader
-    ) -> List[Dict[str, Any]]:
-        """Collect and parse FCR data rows from CSV."""
-        fcr_data: List[Dict[str, Any]] = []
-        row_num = 1
-        for row in reader:
-            row_num += 1
-            parsed = self._parse_fcr_row(row, row_num)
-            if parsed:
-                fcr_data.append(parsed)
+        self, reader
+    ) -> List[Tuple[str, float, int]]:
+        """Parse and validate (stage, fcr_value, duration_days) rows chunk by chunk."""
+        fcr_data: List[Tuple[str, float, int]] = []
+        for first_row, rows in self._iter_chunks(reader):
+            stage_names = self._column(rows, 0)
+            raw_fcr = self._column(rows, 1)
+            raw_duration = self._column(rows, 2)
+            fcr_values = self._parse_number_column(raw_fcr, float)
+            durations = self._parse_number_column(raw_duration, int)
+
+            for offset, stage_name in enumerate(stage_names):
+                row_num = first_row + offset
+                if not stage_name:
+                    self.errors.append(f"Row {row_num}: Missing stage name")
+                    continue
+
+                fcr_value = fcr_values[offset]
+                if fcr_value is None:
+                    self.errors.append(
+                        f"Row {row_num}: Invalid FCR value '{raw_fcr[offset]}'"
+                    )
+                    continue
+
+                if fcr_value < 0:
+                    self.errors.append(
+                        f"Row {row_num}: FCR value must be non-negative"
+                    )
+                    continue
+
+                if fcr_value > 10:
+                    self.warnings.append(
+                        f"Row {row_num}: Unusually high FCR value {fcr_value}"
+                    )
+
+                duration_days = durations[offset]
+                if duration_days is None:
+                    self.errors.append(
+                        f"Row {row_num}: Invalid duration_days "
+                        f"'{raw_duration[offset]}'"
+                    )
+                    continue
+
+                if duration_days < 1:
+                    self.errors.append(
+                        f"Row {row_num}: Duration must be at least 1 day"
+                    )
+                    continue
+
+                fcr_data.append((stage_name, fcr_value, duration_days))
+            self._chunk_done(len(rows))
         return fcr_data
 
-    def _parse_fcr_row(
-        self, row: Dict[str, Any], row_num: int
-    ) -> Optional[Dict[str, Any]]:
-        """Parse a single FCR data row."""
-        stage_name = row.get('stage', '').strip()
-        if not stage_name:
-            self.errors.append(f"Row {row_num}: Missing stage name")
-            return None
-
-        # Validate FCR value
-        fcr_str = row.get('fcr_value', '').strip()
-        try:
-            fcr_value = float(fcr_str)
-        except ValueError:
-            self.errors.append(
-                f"Row {row_num}: Invalid FCR value '{fcr_str}'"
-            )
-            return None
-
-        if fcr_value < 0:
-            self.errors.append(
-                f"Row {row_num}: FCR value must be non-negative"
-            )
-            return None
-
-        if fcr_value > 10:
-            self.warnings.append(
-                f"Row {row_num}: Unusually high FCR value {fcr_value}"
-            )
-
-        # Validate duration
-        duration_str = row.get('duration_days', '').strip()
-        try:
-            duration_days = int(duration_str)
-        except ValueError:
-            self.errors.append(
-                f"Row {row_num}: Invalid duration_days '{duration_str}'"
-            )
-            return None
-
-        if duration_days < 1:
-            self.errors.append(
-                f"Row {row_num}: Duration must be at least 1 day"
-            )
-            return None
-
-        return {
-            'stage_name': stage_name,
-            'fcr_value': fcr_value,
-            'duration_days': duration_days
-        }
-
     def _finalize_fcr_data(
-        self, fcr_data: List[Dict[str, Any]]
+        self, fcr_data: List[Tuple[str, float, int]]
     ) -> None:
         """Validate and finalize FCR data."""
         if not fcr_data:
             self.errors.append("No valid FCR data found in CSV")
             return
 
-        # Check for duplicate stages
-        stage_names = [entry['stage_name'] for entry in fcr_data]
+        # Stage lookup is case-insensitive, so 'Fry' and 'FRY' collide
+        stage_names = [stage_name.lower() for stage_name, _, _ in fcr_data]
         if len(stage_names) != len(set(stage_names)):
             self.errors.append("Duplicate stage names found in CSV")
 
-        self.preview_data = fcr_data[:10]
+        self.preview_data = [
+            {'stage_name': stage_name, 'fcr_value': fcr_value, 'duration_days': duration_days}
+            for stage_name, fcr_value, duration_days in fcr_data[:10]
+        ]
+        self._report_progress(phase='validated')
 
     @transaction.atomic
     def _save_fcr_data(
         self,
         model_name: str,
-        fcr_data: List[Dict[str, Any]]
+        fcr_data: List[Tuple[str, float, int]]
     ) -> Dict[str, Any]:
-        """Save FCR data to database."""
-        # Create or get FCR model
-        fcr_model, created = FCRModel.objects.get_or_create(
+        """Upsert FCR model stages, resolving lifecycle stages in one query."""
+        self._report_progress(phase='saving')
+        stages: Dict[str, LifeCycleStage] = {}
+        lifecycle_stages = LifeCycleStage.objects.annotate(
+            lower_name=Lower('name')
+        ).filter(
+            lower_name__in={stage_name.lower() for stage_name, _, _ in fcr_data}
+        ).order_by('pk')
+        for stage in lifecycle_stages:
+            stages.setdefault(stage.lower_name, stage)
+
+        missing = [name for name, _, _ in fcr_data if name.lower() not in stages]
+        if missing:
+            for stage_name in missing:
+                self.errors.append(
+                    f"Lifecycle stage '{stage_name}' not found "
+                    "in system. Please create it first."
+                )
+            raise ValidationError(f"Invalid lifecycle stage: {missing[0]}")
+
+        fcr_model, created = FCRModel.objects.select_for_update().get_or_create(
             name=model_name
         )
-
         if not created:
-            # Delete existing stages if updating
-            fcr_model.stages.all().delete()
             self.warnings.append(
                 f"Updated existing FCR model '{model_name}' - "
                 "old stages replaced"
             )
 
-        # Create FCR model stages
-        stages_created = 0
-        for data in fcr_data:
-            # Find or validate lifecycle stage
-            try:
-                stage = LifeCycleStage.objects.get(
-                    name__iexact=data['stage_name']
-                )
-            except LifeCycleStage.DoesNotExist:
-                self.errors.append(
-                    f"Lifecycle stage '{data['stage_name']}' not found "
-                    "in system. Please create it first."
-                )
-                raise ValidationError(
-                    f"Invalid lifecycle stage: {data['stage_name']}"
-                )
-
-            FCRModelStage.objects.create(
+        model_stages = [
+            FCRModelStage(
                 model=fcr_model,
-                stage=stage,
-                fcr_value=data['fcr_value'],
-                duration_days=data['duration_days']
+                stage=stages[stage_name.lower()],
+                fcr_value=fcr_value,
+                duration_days=duration_days
             )
-            stages_created += 1
+            for stage_name, fcr_value, duration_days in fcr_data
+        ]
+        FCRModelStage.objects.bulk_create(
+            model_stages,
+            update_conflicts=True,
+            unique_fields=['model', 'stage'],
+            update_fields=['fcr_value', 'duration_days', 'updated_at']
+        )
+        if not created:
+            fcr_model.stages.exclude(
+                stage_id__in=[model_stage.stage_id for model_stage in model_stages]
+            ).delete()
+        self._report_progress(rows_written=len(model_stages))
 
         return {
             'fcr_model': fcr_model,
-            'stages_count': stages_created
+            'stages_count': len(model_stages)
         }
 
     def _collect_mortality_rows(
-        self, reader: csv.DictReader
-    ) -> List[Dict[str, Any]]:
-        """Collect and parse mortality data rows from CSV."""
-        mortality_data: List[Dict[str, Any]] = []
-        row_num = 1
-        for row in reader:
-            row_num += 1
-            parsed = self._parse_mortality_row(row, row_num)
-            if parsed:
-                mortality_data.append(parsed)
+        self, reader
+    ) -> List[Tuple[date, float]]:
+        """Parse and validate (date, rate) rows chunk by chunk."""
+        mortality_data: List[Tuple[date, float]] = []
+        for first_row, rows in self._iter_chunks(reader):
+            raw_rates = self._column(rows, 1)
+            dates = self._parse_date_column(self._column(rows, 0))
+            rates = self._parse_number_column(raw_rates, float)
+
+            for offset, reading_date in enumerate(dates):
+                row_num = first_row + offset
+                if reading_date is None:
+                    self.errors.append(f"Row {row_num}: Invalid date format")
+                    continue
+
+                rate = rates[offset]
+                if rate is None:
+                    self.errors.append(
+                        f"Row {row_num}: Invalid mortality rate '{raw_rates[offset]}'"
+                    )
+                    continue
+
+                if rate < 0 or rate > 100:
+                    self.errors.append(
+                        f"Row {row_num}: Mortality rate must be "
+                        "between 0 and 100"
+                    )
+                    continue
+
+                if rate > 10:
+                    self.warnings.append(
+                        f"Row {row_num}: High mortality rate {rate}%"
+                    )
+
+                mortality_data.append((reading_date, rate))
+            self._chunk_done(len(rows))
         return mortality_data
 
-    def _parse_mortality_row(
-        self, row: Dict[str, Any], row_num: int
-    ) -> Optional[Dict[str, Any]]:
-        """Parse a single mortality data row."""
-        date_str = row.get('date', '').strip()
-        reading_date = self._parse_date(date_str)
-        if not reading_date:
-            self.errors.append(f"Row {row_num}: Invalid date format")
-            return None
-
-        rate_str = row.get('rate', '').strip()
-        try:
-            rate = float(rate_str)
-        except ValueError:
-            self.errors.append(
-                f"Row {row_num}: Invalid mortality rate '{rate_str}'"
-            )
-            return None
-
-        if rate < 0 or rate > 100:
-            self.errors.append(
-                f"Row {row_num}: Mortality rate must be "
-                "between 0 and 100"
-            )
-            return None
-
-        if rate > 10:
-            self.warnings.append(
-                f"Row {row_num}: High mortality rate {rate}%"
-            )
-
-        return {'date': reading_date, 'rate': rate}
-
     def _finalize_mortality_data(
-        self, mortality_data: List[Dict[str, Any]]
+        self, mortality_data: List[Tuple[date, float]]
     ) -> None:
         """Validate and finalize mortality data."""
         if not mortality_data:
@@ -592,18 +755,21 @@ class BulkDataImportService:
             return
 
         # Check for duplicate dates
-        dates = [entry['date'] for entry in mortality_data]
-        if len(dates) != len(set(dates)):
+        if len({reading_date for reading_date, _ in mortality_data}) != len(mortality_data):
             self.errors.append("Duplicate dates found in CSV")
 
-        mortality_data.sort(key=lambda item: item['date'])
-        self.preview_data = mortality_data[:10]
+        mortality_data.sort(key=itemgetter(0))
+        self.preview_data = [
+            {'date': reading_date, 'rate': rate}
+            for reading_date, rate in mortality_data[:10]
+        ]
+        self._report_progress(phase='validated')
 
     @transaction.atomic
     def _save_mortality_data(
         self,
         model_name: str,
-        mortality_data: List[Dict[str, Any]]
+        mortality_data: List[Tuple[date, float]]
     ) -> Dict[str, Any]:
         """
         Save mortality data to database.
@@ -611,9 +777,9 @@ class BulkDataImportService:
         Note: Calculates average rate from time-series data as current
         MortalityModel doesn't support time-series storage.
         """
+        self._report_progress(phase='saving')
         # Calculate average mortality rate
-        rates = [entry['rate'] for entry in mortality_data]
-        average_rate = sum(rates) / len(rates)
+        average_rate = sum(rate for _, rate in mortality_data) / len(mortality_data)
 
         # Create or update mortality model
         model, created = MortalityModel.objects.update_or_create(
@@ -635,14 +801,15 @@ class BulkDataImportService:
                 f"{average_rate:.2f}% from {len(mortality_data)} "
                 "data points"
             )
+        self._report_progress(rows_written=1)
 
         return {
             'mortality_model': model,
             'data_points_count': len(mortality_data),
             'average_rate': average_rate,
             'date_range': {
-                'start': mortality_data[0]['date'],
-                'end': mortality_data[-1]['date']
+                'start': mortality_data[0][0],
+                'end': mortality_data[-1][0]
             }
         }
 
@@ -652,5 +819,6 @@ class BulkDataImportService:
             'errors': self.errors,
             'warnings': self.warnings,
             'preview_data': self.preview_data,
-            'success': len(self.errors) == 0
+            'success': len(self.errors) == 0,
+            'summary': dict(self.progress)
         }
@@ -0,0 +1,153 @@
+"""
+Preloaded temperature profile series for TGC calculations.
+
+A TemperatureProfile is loaded once into a dense float list covering
+every day between its first and last reading. Missing days are filled by
+linear interpolation (rounded to 2 decimals), and days outside the profile
+clamp to the first/last reading, matching the day-by-day lookup rules
+TGCCalculator used before. Lookups are O(1) list indexing.
+
+Series are shared through a process-level LRU cache keyed by
+(profile_id, updated_at). ``touch_profiles()`` moves profiles onto a fresh
+key: single reading saves call it from the post_save signal in
+apps.scenario.signals, and reading deletes (instance or queryset) call it
+once per delete. Code that bulk-writes readings must touch the profile
+itself (``profile.save(update_fields=['updated_at'])``).
+"""
+import threading
+from collections import OrderedDict
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+DEFAULT_TEMPERATURE = 10.0
+SERIES_CACHE_SIZE = 128
+
+_series_cache: "OrderedDict[tuple, TemperatureSeries]" = OrderedDict()
+_series_lock = threading.Lock()
+
+
+class TemperatureSeries:
+    """Dense, gap-filled daily temperatures indexed by profile day_number."""
+
+    __slots__ = ('first_day', 'values')
+
+    def __init__(self, first_day: int, values: Sequence[float]):
+        self.first_day = first_day
+        self.values = list(values)
+
+    @classmethod
+    def from_readings(cls, readings: Iterable[Tuple[int, float]]) -> 'TemperatureSeries':
+        """Build a series from (day_number, temperature) pairs in any order."""
+        points = sorted((int(day), float(temp)) for day, temp in readings)
+        if not points:
+            return cls(1, [])
+
+        first_day = points[0][0]
+        values = [points[0][1]]
+        for (prev_day, prev_temp), (day, temp) in zip(points, points[1:]):
+            span = day - prev_day
+            diff = temp - prev_temp
+            for offset in range(1, span):
+                values.append(round(prev_temp + diff * offset / span, 2))
+            values.append(temp)
+        return cls(first_day, values)
+
+    @property
+    def last_day(self) -> int:
+        return self.first_day + len(self.values) - 1
+
+    def __len__(self) -> int:
+        return len(self.values)
+
+    def at(self, day_number: int) -> float:
+        """Temperature for a day number, clamped to the profile's range."""
+        if not self.values:
+            return DEFAULT_TEMPERATURE
+        index = day_number - self.first_day
+        if index <= 0:
+            return self.values[0]
+        if index >= len(self.values):
+            return self.values[-1]
+        return self.values[index]
+
+    def vector(self, start_day: int, end_day: int) -> List[float]:
+        """Temperatures for every day in [start_day, end_day]."""
+        if end_day < start_day:
+            return []
+        if not self.values:
+            return [DEFAULT_TEMPERATURE] * (end_day - start_day + 1)
+        lo = max(start_day, self.first_day)
+        hi = min(end_day, self.last_day)
+        head = [self.values[0]] * max(0, min(end_day + 1, self.first_day) - start_day)
+        body = self.values[lo - self.first_day:hi - self.first_day + 1] if lo <= hi else []
+        tail = [self.values[-1]] * max(0, end_day - max(start_day - 1, self.last_day))
+        return head + body + tail
+
+    def degree_day_vector(
+        self,
+        start_day: int,
+        end_day: int,
+        base_temperature: float = 0.0,
+    ) -> List[float]:
+        """Cumulative degree-days above base_temperature for each day in the range."""
+        total = 0.0
+        cumulative = []
+        for temperature in self.vector(start_day, end_day):
+            if temperature > base_temperature:
+                total += temperature - base_temperature
+            cumulative.append(total)
+        return cumulative
+
+
+def get_profile_series(profile) -> TemperatureSeries:
+    """
+    Return the cached series for a TemperatureProfile, loading it on a miss.
+
+    One query per (profile, updated_at) per process; older versions of the
+    same profile are dropped when a newer one is loaded.
+    """
+    key = (profile.pk, profile.updated_at)
+    with _series_lock:
+        series = _series_cache.get(key)
+        if series is not None:
+            _series_cache.move_to_end(key)
+            return series
+
+    series = TemperatureSeries.from_readings(
+        profile.readings.order_by('day_number').values_list('day_number', 'temperature')
+    )
+
+    with _series_lock:
+        for stale in [k for k in _series_cache if k[0] == profile.pk and k != key]:
+            del _series_cache[stale]
+        _series_cache[key] = series
+        while len(_series_cache) > SERIES_CACHE_SIZE:
+            _series_cache.popitem(last=False)
+    return series
+
+
+def clear_series_cache(profile_id: Optional[int] = None) -> None:
+    """Drop cached series (all, or only those of one profile)."""
+    with _series_lock:
+        if profile_id is None:
+            _series_cache.clear()
+            return
+        for key in [k for k in _series_cache if k[0] == profile_id]:
+            del _series_cache[key]
+
+
+def touch_profiles(profile_ids: Iterable[int]) -> None:
+    """
+    Bump updated_at of profiles whose readings changed, in one UPDATE.
+
+    Other processes then miss on the new key; local entries are dropped here.
+    """
+    from django.utils import timezone
+
+    from apps.scenario.models import TemperatureProfile
+
+    profile_ids = set(profile_ids)
+    if not profile_ids:
+        return
+    TemperatureProfile.objects.filter(pk__in=profile_ids).update(updated_at=timezone.now())
+    for profile_id in profile_ids:
+        clear_series_cache(profile_id)
@@ -16,6 +16,7 @@ from typing import Dict, List, Optional, Tuple
 from decimal import Decimal, ROUND_HALF_UP
 
 from ...models import TGCModel, TemperatureProfile, LifecycleStageChoices
+from .temperature_series import DEFAULT_TEMPERATURE, TemperatureSeries, get_profile_series
 
 
 class TGCCalculator:
@@ -360,10 +361,25 @@ class TGCCalculator:
         # Seawater stages (Post-Smolt, Adult, Harvest) use profile temperature
         return temperature
     
+    @property
+    def temperature_series(self) -> TemperatureSeries:
+        """
+        Dense day-indexed temperatures of the model's profile.
+
+        Loaded once per (profile, updated_at) and shared across calculators
+        in the process, so per-day lookups never hit the database.
+        """
+        if not self.temperature_profile:
+            return TemperatureSeries(1, [])
+        return get_profile_series(self.temperature_profile)
+
     def _get_temperature_for_day(self, day_number: int) -> float:
         """
         Get temperature from profile for a specific day number.
 
+        Days between readings are linearly interpolated; days outside the
+        profile use the nearest reading.
+
         Args:
             day_number: Relative day number (1-based) from scenario start
 
@@ -371,46 +387,44 @@ class TGCCalculator:
             Temperature in Celsius, or 10.0 as default
         """
         if not self.temperature_profile:
-            return 10.0  # Default temperature
+            return DEFAULT_TEMPERATURE  # Default temperature
 
         try:
-            # Direct lookup by day number
-            reading = self.temperature_profile.readings.filter(
-                day_number=day_number
-            ).first()
-
-            if reading:
-                return float(reading.temperature)
+            return self.temperature_series.at(day_number)
+        except Exception:
+            return DEFAULT_TEMPERATURE  # Default on any error
 
-            # If no exact match, try to interpolate between adjacent days
-            before = self.temperature_profile.readings.filter(
-                day_number__lt=day_number
-            ).order_by('-day_number').first()
+    def get_temperature_vector(self, start_day: int, end_day: int) -> List[float]:
+        """
+        Profile temperatures for every day number in [start_day, end_day].
 
-            after = self.temperature_profile.readings.filter(
-                day_number__gt=day_number
-            ).order_by('day_number').first()
+        Args:
+            start_day: First day number (inclusive)
+            end_day: Last day number (inclusive)
 
-            if before and after:
-                # Linear interpolation between days
-                days_total = after.day_number - before.day_number
-                days_from_before = day_number - before.day_number
+        Returns:
+            List of temperatures in Celsius, one per day
+        """
+        return self.temperature_series.vector(start_day, end_day)
 
-                temp_diff = float(after.temperature - before.temperature)
-                interpolated = float(before.temperature) + (temp_diff * days_from_before / days_total)
+    def get_degree_day_vector(
+        self,
+        start_day: int,
+        end_day: int,
+        base_temperature: float = 0.0
+    ) -> List[float]:
+        """
+        Cumulative degree-days for every day number in [start_day, end_day].
 
-                return round(interpolated, 2)
-            elif before:
-                # Use last known temperature
-                return float(before.temperature)
-            elif after:
-                # Use next known temperature
-                return float(after.temperature)
-            else:
-                return 10.0  # Default if no data
+        Args:
+            start_day: First day number (inclusive)
+            end_day: Last day number (inclusive)
+            base_temperature: Base temperature for calculation (default 0°C)
 
-        except Exception:
-            return 10.0  # Default on any error
+        Returns:
+            List of cumulative degree-days, one per day
+        """
+        return self.temperature_series.degree_day_vector(start_day, end_day, base_temperature)
     
     def validate_parameters(self) -> Tuple[bool, List[str]]:
         """
@@ -0,0 +1,26 @@
+"""
+Signal handlers for the scenario app.
+
+Keeps the process-level temperature series cache (see
+services.calculations.temperature_series) in step with profile edits.
+"""
+from django.db.models.signals import post_save
+from django.dispatch import receiver
+
+from apps.scenario.models import TemperatureReading
+from apps.scenario.services.calculations.temperature_series import touch_profiles
+
+
+@receiver(post_save, sender=TemperatureReading)
+def touch_temperature_profile(sender, instance, raw=False, **kwargs):
+    """
+    Bump the profile's updated_at when one of its readings changes.
+
+    Cached series are keyed by (profile_id, updated_at), so this moves other
+    processes onto a fresh key; the local cache entry is dropped directly.
+    Deletes are handled by TemperatureReading.delete() and its queryset, so
+    there is no post_delete receiver and readings keep Django's fast delete.
+    """
+    if raw:
+        return
+    touch_profiles([instance.profile_id])
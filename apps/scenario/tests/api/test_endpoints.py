@@ -610,6 +610,30 @@ class DataEntryAPITests(BaseScenarioAPITestCase):
         self.assertIn('success', response.data)
         self.assertIn('preview_data', response.data)
     
+    def test_upload_progress_is_pollable(self):
+        """Test upload_csv publishes progress for import_status."""
+        url = self.get_api_url('temperature-profiles') + 'upload_csv/'
+        csv_file = io.BytesIO(b"date,temperature\n2024-01-01,10.5\n2024-01-02,11.0\n")
+        csv_file.name = 'progress.csv'
+        
+        response = self.client.post(url, {
+            'file': csv_file,
+            'data_type': 'temperature',
+            'profile_name': 'Polled Profile',
+            'import_id': 'upload-1',
+        }, format='multipart')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['summary']['rows_processed'], 2)
+        
+        status_url = self.get_api_url('data-entry') + 'import_status/'
+        response = self.client.get(status_url + '?import_id=upload-1')
+        self.assertEqual(response.status_code, status.HTTP_200_OK)
+        self.assertEqual(response.data['phase'], 'done')
+        self.assertEqual(response.data['rows_written'], 2)
+        
+        response = self.client.get(status_url + '?import_id=unknown')
+        self.assertEqual(response.status_code, status.HTTP_404_NOT_FOUND)
+    
     def test_csv_template_download(self):
         """Test CSV template download."""
         url = self.get_api_url('data-entry') + 'csv_template/'
@@ -10,6 +10,7 @@ from django.test import TestCase
 from apps.scenario.services.bulk_import import BulkDataImportService
 from apps.scenario.models import (
     TemperatureProfile,
+    TemperatureReading,
     FCRModel,
     MortalityModel
 )
@@ -642,6 +643,114 @@ class BulkImportMortalityTestCase(TestCase):
         )
 
 
+class BulkImportStreamingTestCase(TestCase):
+    """Test chunked parsing, progress reporting and upsert writes."""
+
+    def setUp(self):
+        """Set up test fixtures."""
+        self.updates = []
+        self.service = BulkDataImportService(
+            chunk_size=2, progress_callback=self.updates.append
+        )
+
+    def _temperature_csv(self, temperatures):
+        rows = [f"2024-01-{day:02d},{temp}" for day, temp in enumerate(temperatures, start=1)]
+        return io.StringIO("date,temperature\n" + "\n".join(rows) + "\n")
+
+    def test_errors_keep_row_numbers_across_chunks(self):
+        """Test row numbers stay global when rows span several chunks."""
+        csv_content = (
+            "date,temperature\n"
+            "2024-01-01,10.5\n"
+            "\n"
+            "2024-01-02,11.0\n"
+            "2024-01-03,warm\n"
+            "bad-date,9.0\n"
+            "2024-01-05,60\n"
+        )
+
+        success, result = self.service.import_temperature_data(
+            io.StringIO(csv_content), "Chunked", validate_only=True
+        )
+
+        self.assertFalse(success)
+        self.assertEqual(result['errors'], [
+            "Row 4: Invalid temperature value 'warm'",
+            "Row 5: Invalid date format",
+        ])
+        self.assertEqual(result['warnings'], ["Row 6: Unusual temperature 60.0°C"])
+        self.assertEqual(result['summary']['chunks_processed'], 3)
+        self.assertEqual(result['summary']['rows_processed'], 5)
+        self.assertEqual(result['summary']['phase'], 'failed')
+
+    def test_progress_is_reported_per_chunk(self):
+        """Test the callback sees every chunk and the final write count."""
+        success, result = self.service.import_temperature_data(
+            self._temperature_csv([8.0, 8.5, 9.0, 9.5, 10.0]), "Progress"
+        )
+
+        self.assertTrue(success)
+        chunk_updates = [u['rows_processed'] for u in self.updates if u['phase'] == 'parsing']
+        self.assertEqual(chunk_updates, [0, 2, 4, 5])
+        self.assertEqual(self.updates[-1]['phase'], 'done')
+        self.assertEqual(self.updates[-1]['rows_written'], 5)
+
+    def test_reimport_upserts_and_trims_readings(self):
+        """Test re-importing updates changed days in place and drops the tail."""
+        self.service.import_temperature_data(
+            self._temperature_csv([8.0, 8.5, 9.0, 9.5]), "Upsert"
+        )
+        profile = TemperatureProfile.objects.get(name="Upsert")
+        original_ids = dict(profile.readings.values_list('day_number', 'reading_id'))
+
+        success, result = self.service.import_temperature_data(
+            self._temperature_csv([8.0, 8.7, 9.0]), "Upsert"
+        )
+
+        self.assertTrue(success)
+        created = result['created_objects']
+        self.assertEqual(created['readings_count'], 3)
+        self.assertEqual(created['written_count'], 1)
+        self.assertEqual(created['unchanged_count'], 2)
+        self.assertEqual(created['removed_count'], 1)
+        readings = dict(profile.readings.values_list('day_number', 'temperature'))
+        self.assertEqual(readings, {1: 8.0, 2: 8.7, 3: 9.0})
+        self.assertEqual(
+            dict(profile.readings.values_list('day_number', 'reading_id')),
+            {day: original_ids[day] for day in (1, 2, 3)}
+        )
+        self.assertEqual(TemperatureReading.objects.count(), 3)
+
+    def test_fcr_reimport_upserts_stages(self):
+        """Test FCR stages are upserted and stages resolved case-insensitively."""
+        species = Species.objects.create(name="Atlantic Salmon", scientific_name="Salmo salar")
+        LifeCycleStage.objects.create(name="Egg", species=species, order=1)
+        LifeCycleStage.objects.create(name="Fry", species=species, order=2)
+        self.service.import_fcr_data(
+            io.StringIO("stage,fcr_value,duration_days\nEgg,0.0,50\nFry,1.0,90\n"), "Upsert FCR"
+        )
+        fcr_model = FCRModel.objects.get(name="Upsert FCR")
+        fry_id = fcr_model.stages.get(stage__name="Fry").pk
+
+        success, result = self.service.import_fcr_data(
+            io.StringIO("stage,fcr_value,duration_days\nfry,1.2,80\n"), "Upsert FCR"
+        )
+
+        self.assertTrue(success)
+        fry = fcr_model.stages.get()
+        self.assertEqual(fry.pk, fry_id)
+        self.assertEqual((fry.fcr_value, fry.duration_days), (1.2, 80))
+
+    def test_fcr_case_variants_are_duplicates(self):
+        """Test stage names differing only by case are rejected."""
+        success, result = self.service.import_fcr_data(
+            io.StringIO("stage,fcr_value,duration_days\nFry,1.0,90\nFRY,1.1,90\n"), "Dup FCR"
+        )
+
+        self.assertFalse(success)
+        self.assertIn("Duplicate stage names", result['errors'][0])
+
+
 class CSVTemplateGenerationTestCase(TestCase):
     """Test CSV template generation functionality."""
 
@@ -0,0 +1,130 @@
+"""
+Tests for preloaded temperature profile series used by TGCCalculator.
+"""
+from django.test import TestCase
+
+from apps.scenario.models import TGCModel, TemperatureProfile, TemperatureReading
+from apps.scenario.services.calculations.temperature_series import (
+    TemperatureSeries,
+    clear_series_cache,
+)
+from apps.scenario.services.calculations.tgc_calculator import TGCCalculator
+
+
+class TemperatureSeriesTests(TestCase):
+    """Dense series semantics match the former per-day reading lookups."""
+
+    def test_gap_filling_and_clamping(self):
+        series = TemperatureSeries.from_readings([(5, 12.0), (2, 8.0), (8, 9.5)])
+
+        self.assertEqual(series.first_day, 2)
+        self.assertEqual(series.last_day, 8)
+        self.assertEqual(series.at(2), 8.0)
+        self.assertEqual(series.at(3), 9.33)  # interpolated, rounded to 2dp
+        self.assertEqual(series.at(5), 12.0)
+        self.assertEqual(series.at(7), 10.33)
+        self.assertEqual(series.at(1), 8.0)    # before first reading
+        self.assertEqual(series.at(40), 9.5)   # after last reading
+
+    def test_empty_series_uses_default(self):
+        series = TemperatureSeries.from_readings([])
+        self.assertEqual(series.at(3), 10.0)
+        self.assertEqual(series.vector(1, 2), [10.0, 10.0])
+
+    def test_vectors_span_outside_profile(self):
+        series = TemperatureSeries.from_readings([(3, 4.0), (4, 6.0)])
+
+        self.assertEqual(series.vector(1, 6), [4.0, 4.0, 4.0, 6.0, 6.0, 6.0])
+        self.assertEqual(series.vector(4, 3), [])
+        self.assertEqual(series.degree_day_vector(2, 4, base_temperature=5.0), [0.0, 0.0, 1.0])
+
+
+class TGCCalculatorPreloadTests(TestCase):
+    """TGCCalculator resolves profile temperatures without per-day queries."""
+
+    def setUp(self):
+        clear_series_cache()
+        self.profile = TemperatureProfile.objects.create(name="Preload Profile")
+        for day, temperature in ((1, 6.0), (11, 11.0), (21, 8.0)):
+            TemperatureReading.objects.create(
+                profile=self.profile, day_number=day, temperature=temperature
+            )
+        self.tgc_model = TGCModel.objects.create(
+            name="Preload TGC",
+            location="Test Location",
+            release_period="Test Period",
+            tgc_value=2.75,
+            exponent_n=1.0,
+            exponent_m=0.33,
+            profile=TemperatureProfile.objects.get(pk=self.profile.pk),
+        )
+
+    def test_profile_is_loaded_once_for_all_days(self):
+        calculator = TGCCalculator(self.tgc_model)
+        self.assertEqual(calculator._get_temperature_for_day(6), 8.5)
+
+        with self.assertNumQueries(0):
+            temperatures = [calculator._get_temperature_for_day(day) for day in range(1, 400)]
+            # A second calculator on the same profile shares the cached series
+            other = TGCCalculator(self.tgc_model)
+            vector = other.get_temperature_vector(1, 399)
+            degree_days = other.get_degree_day_vector(1, 3)
+
+        self.assertEqual(temperatures, vector)
+        self.assertEqual(temperatures[10], 11.0)
+        self.assertEqual(temperatures[-1], 8.0)
+        self.assertEqual(degree_days, [6.0, 12.5, 19.5])
+
+    def test_reading_edit_refreshes_series(self):
+        calculator = TGCCalculator(self.tgc_model)
+        self.assertEqual(calculator._get_temperature_for_day(11), 11.0)
+
+        reading = TemperatureReading.objects.get(profile=self.profile, day_number=11)
+        reading.temperature = 13.0
+        reading.save()
+
+        refreshed = TGCModel.objects.select_related('profile').get(pk=self.tgc_model.pk)
+        self.assertEqual(TGCCalculator(refreshed)._get_temperature_for_day(11), 13.0)
+        self.assertEqual(calculator._get_temperature_for_day(11), 13.0)
+
+    def test_reading_delete_refreshes_series(self):
+        calculator = TGCCalculator(self.tgc_model)
+        self.assertEqual(calculator._get_temperature_for_day(11), 11.0)
+        updated_at = TemperatureProfile.objects.get(pk=self.profile.pk).updated_at
+
+        TemperatureReading.objects.filter(profile=self.profile, day_number=11).delete()
+
+        self.assertGreater(
+            TemperatureProfile.objects.get(pk=self.profile.pk).updated_at, updated_at
+        )
+        refreshed = TGCModel.objects.select_related('profile').get(pk=self.tgc_model.pk)
+        # Day 11 now interpolates between days 1 (6.0) and 21 (8.0)
+        self.assertEqual(TGCCalculator(refreshed)._get_temperature_for_day(11), 7.0)
+        self.assertEqual(calculator._get_temperature_for_day(11), 7.0)
+
+    def test_bulk_delete_touches_profile_once(self):
+        TemperatureReading.objects.bulk_create([
+            TemperatureReading(profile=self.profile, day_number=day, temperature=9.0)
+            for day in range(30, 60)
+        ])
+        updated_at = TemperatureProfile.objects.get(pk=self.profile.pk).updated_at
+
+        # Profile ids, one fast DELETE, one profile UPDATE; not one per reading
+        with self.assertNumQueries(3):
+            deleted, _ = TemperatureReading.objects.filter(
+                profile=self.profile, day_number__gte=30
+            ).delete()
+
+        self.assertEqual(deleted, 30)
+        self.assertGreater(
+            TemperatureProfile.objects.get(pk=self.profile.pk).updated_at, updated_at
+        )
+
+    def test_instance_delete_refreshes_series(self):
+        calculator = TGCCalculator(self.tgc_model)
+        self.assertEqual(calculator._get_temperature_for_day(21), 8.0)
+
+        TemperatureReading.objects.get(profile=self.profile, day_number=21).delete()
+
+        refreshed = TGCModel.objects.select_related('profile').get(pk=self.tgc_model.pk)
+        self.assertEqual(TGCCalculator(refreshed)._get_temperature_for_day(21), 11.0)
@@ -0,0 +1,146 @@
+"""
+Compare legacy RBAC join filters with compiled-scope EXISTS filters.
+
+For the batch, feeding and health mortality list endpoints this command
+builds the queryset a given user would see both ways:
+
+- legacy: OR'ed ``<path>__name`` geography joins plus operator location Q
+  objects through multi-valued relations, followed by DISTINCT (the
+  pre-compiled-scope behaviour of RBACFilterMixin);
+- scoped: RBACFilterMixin.apply_rbac_filters with the cached AccessScope.
+
+It checks that both return the same rows, times a count plus the first page,
+and optionally prints each database query plan.
+
+Usage:
+    python manage.py benchmark_rbac_scope --username operator1
+    python manage.py benchmark_rbac_scope --username operator1 --repeat 20 --explain
+"""
+import statistics
+import time
+
+from django.contrib.auth import get_user_model
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+
+from aquamind.api.mixins import RBACFilterMixin
+from aquamind.api.rbac_scope import GEOGRAPHY_NAMES, get_access_scope
+from apps.batch.api.viewsets.batch import BatchViewSet
+from apps.health.api.viewsets.mortality import MortalityRecordViewSet
+from apps.inventory.api.viewsets.feeding import FeedingEventViewSet
+from apps.users.models import Geography, Role, Subsidiary
+
+ENDPOINTS = (
+    ('batch', BatchViewSet),
+    ('feeding', FeedingEventViewSet),
+    ('mortality', MortalityRecordViewSet),
+)
+
+
+class _Request:
+    def __init__(self, user):
+        self.user = user
+
+
+def legacy_filter(viewset, queryset, profile):
+    """Reproduce the per-request join-based RBAC filter for comparison."""
+    if profile.geography != Geography.ALL and GEOGRAPHY_NAMES.get(profile.geography):
+        paths = viewset.geography_filter_fields or (
+            [viewset.geography_filter_field] if viewset.geography_filter_field else []
+        )
+        if paths:
+            condition = Q()
+            for path in paths:
+                condition |= Q(**{f'{path}__name': GEOGRAPHY_NAMES[profile.geography]})
+            queryset = queryset.filter(condition)
+
+    if profile.subsidiary != Subsidiary.ALL and viewset.subsidiary_filter_field:
+        queryset = queryset.filter(**{viewset.subsidiary_filter_field: profile.subsidiary})
+
+    if not (viewset.enable_operator_location_filtering and profile.role == Role.OPERATOR):
+        return queryset
+
+    from apps.batch.models import Batch
+    model = queryset.model
+    area_ids = list(profile.allowed_areas.values_list('id', flat=True))
+    station_ids = list(profile.allowed_stations.values_list('id', flat=True))
+    container_ids = list(profile.allowed_containers.values_list('id', flat=True))
+    if not (area_ids or station_ids or container_ids):
+        return queryset.none()
+
+    prefixes = []
+    if model is Batch:
+        prefixes.append('batch_assignments__container')
+    elif hasattr(model, 'container'):
+        prefixes.append('container')
+    if hasattr(model, 'batch'):
+        prefixes.append('batch__batch_assignments__container')
+
+    condition = Q()
+    for prefix in prefixes:
+        if area_ids:
+            condition |= Q(**{f'{prefix}__area_id__in': area_ids})
+        if station_ids:
+            condition |= Q(**{f'{prefix}__hall__freshwater_station_id__in': station_ids})
+        if container_ids:
+            condition |= Q(**{f'{prefix}_id__in': container_ids})
+    if not condition:
+        return queryset.none()
+    return queryset.filter(condition).distinct()
+
+
+class Command(BaseCommand):
+    help = "Benchmark compiled RBAC scope filters against the legacy join filters"
+
+    def add_arguments(self, parser):
+        parser.add_argument('--username', required=True, help='User whose scope is benchmarked')
+        parser.add_argument('--repeat', type=int, default=10, help='Timed runs per variant (default: 10)')
+        parser.add_argument('--page-size', type=int, default=50, help='Rows fetched per run (default: 50)')
+        parser.add_argument('--explain', action='store_true', help='Print query plans')
+
+    def handle(self, *args, **options):
+        try:
+            user = get_user_model().objects.select_related('profile').get(username=options['username'])
+        except get_user_model().DoesNotExist:
+            raise CommandError(f"User not found: {options['username']}")
+        profile = getattr(user, 'profile', None)
+        if profile is None:
+            raise CommandError(f"User {user.username} has no profile")
+
+        scope = get_access_scope(user)
+        self.stdout.write(
+            f"User {user.username}: geography={scope.geography} role={scope.role} "
+            f"containers={len(scope.container_ids)}"
+        )
+
+        for name, viewset_class in ENDPOINTS:
+            viewset = viewset_class()
+            viewset.request = _Request(user)
+            base = viewset_class.queryset.all().order_by('-pk')
+
+            variants = {
+                'legacy': legacy_filter(viewset, base, profile),
+                'scoped': RBACFilterMixin.apply_rbac_filters(viewset, base),
+            }
+            legacy_ids = set(variants['legacy'].values_list('pk', flat=True))
+            scoped_ids = set(variants['scoped'].values_list('pk', flat=True))
+            parity = 'OK' if legacy_ids == scoped_ids else (
+                f"MISMATCH (legacy={len(legacy_ids)} scoped={len(scoped_ids)})"
+            )
+            self.stdout.write(self.style.MIGRATE_HEADING(f"\n{name}: {len(scoped_ids)} rows, parity {parity}"))
+
+            for label, queryset in variants.items():
+                timings = []
+                for _ in range(options['repeat']):
+                    started = time.perf_counter()
+                    queryset.count()
+                    list(queryset.values_list('pk', flat=True)[:options['page_size']])
+                    timings.append((time.perf_counter() - started) * 1000)
+                self.stdout.write(
+                    f"  {label:<7} median {statistics.median(timings):8.2f} ms  "
+                    f"max {max(timings):8.2f} ms"
+                )
+                if options['explain']:
+                    plan = queryset.values_list('pk', flat=True)[:options['page_size']].explain()
+                    for line in plan.splitlines():
+                        self.stdout.write(f"      {line}")
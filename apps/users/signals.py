@@ -1,6 +1,9 @@
-from django.db.models.signals import post_save
+from django.db import transaction
+from django.db.models.signals import m2m_changed, post_delete, post_save
 from django.dispatch import receiver
 from django.contrib.auth import get_user_model
+from aquamind.api.rbac_scope import invalidate_access_scopes
+from apps.infrastructure.models import Area, Container, FreshwaterStation, Geography, Hall
 from .models import UserProfile, Role
 
 User = get_user_model()
@@ -50,4 +53,33 @@ def save_user_profile(sender, instance, **kwargs):
         import sys
         is_testing = 'test' in sys.argv or hasattr(sys, '_called_from_test')
         default_role = Role.ADMIN if is_testing else Role.VIEWER
-        UserProfile.objects.create(user=instance, role=default_role)
\ No newline at end of file
+        UserProfile.objects.create(user=instance, role=default_role)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+@receiver(m2m_changed, sender=UserProfile.allowed_areas.through)
+@receiver(m2m_changed, sender=UserProfile.allowed_stations.through)
+@receiver(m2m_changed, sender=UserProfile.allowed_containers.through)
+@receiver(post_save, sender=Geography)
+@receiver(post_delete, sender=Geography)
+@receiver(post_save, sender=Area)
+@receiver(post_delete, sender=Area)
+@receiver(post_save, sender=FreshwaterStation)
+@receiver(post_delete, sender=FreshwaterStation)
+@receiver(post_save, sender=Hall)
+@receiver(post_delete, sender=Hall)
+@receiver(post_save, sender=Container)
+@receiver(post_delete, sender=Container)
+def invalidate_rbac_scopes(sender, action=None, **kwargs):
+    """
+    Invalidate compiled RBAC scopes when their inputs change.
+
+    Scopes hold resolved geography and container ids, so profile edits, location
+    grants and infrastructure moves (e.g. a container changing area) all
+    require recompilation. The version moves after commit, so a request running
+    concurrently with the write cannot cache the old scope under the new version.
+    """
+    if action is not None and not action.startswith('post_'):
+        return
+    transaction.on_commit(invalidate_access_scopes)
@@ -12,12 +12,22 @@ Usage:
         subsidiary_filter_field = 'lifecycle_stage__name'
         
         # The mixin will automatically filter queryset based on user profile
+
+Filters are built from the user's compiled access scope (aquamind.api.rbac_scope):
+geography paths that cross multi-valued relations and operator location
+grants are applied as EXISTS semi-joins, so filtered querysets need no DISTINCT.
 """
 
-from django.db.models import Q
 from django.db import transaction
 from rest_framework.exceptions import PermissionDenied
 
+from aquamind.api.rbac_scope import (
+    GEOGRAPHY_NAMES,
+    compile_access_scope,
+    geography_q,
+    get_access_scope,
+    location_q,
+)
 from apps.users.models import Geography, Subsidiary, Role
 
 
@@ -50,11 +60,7 @@ class RBACFilterMixin:
         Returns:
             Geography name string for filtering Infrastructure Geography model
         """
-        geography_mapping = {
-            Geography.FAROE_ISLANDS: 'Faroe Islands',
-            Geography.SCOTLAND: 'Scotland',
-        }
-        return geography_mapping.get(geography_choice)
+        return GEOGRAPHY_NAMES.get(geography_choice)
     
     def get_queryset(self):
         """
@@ -82,132 +88,76 @@ class RBACFilterMixin:
         if user.is_superuser:
             return queryset
         
-        profile = getattr(user, 'profile', None)
-        if not profile:
-            # No profile = no access
+        # Compiled, cached scope (None = no profile = no access)
+        scope = get_access_scope(user, self.request)
+        if scope is None:
             return queryset.none()
         
         # Apply geography filter
-        if profile.geography != Geography.ALL:
-            geography_name = self._get_geography_name(profile.geography)
-            if geography_name:
-                # Support multiple geography filter paths (for models with multiple location types)
-                filter_paths = []
-                if self.geography_filter_fields:
-                    # Use multiple paths if provided
-                    filter_paths = self.geography_filter_fields if isinstance(self.geography_filter_fields, (list, tuple)) else [self.geography_filter_fields]
-                elif self.geography_filter_field:
-                    # Fall back to single path for backward compatibility
-                    filter_paths = [self.geography_filter_field]
-                
-                if filter_paths:
-                    # Build OR query for multiple paths (e.g., area__geography OR hall__station__geography)
-                    geography_filters = Q()
-                    for path in filter_paths:
-                        geography_filters |= Q(**{f'{path}__name': geography_name})
-                    queryset = queryset.filter(geography_filters)
+        if scope.geography != Geography.ALL and self._get_geography_name(scope.geography):
+            # Support multiple geography filter paths (for models with multiple location types)
+            filter_paths = []
+            if self.geography_filter_fields:
+                # Use multiple paths if provided
+                filter_paths = self.geography_filter_fields if isinstance(self.geography_filter_fields, (list, tuple)) else [self.geography_filter_fields]
+            elif self.geography_filter_field:
+                # Fall back to single path for backward compatibility
+                filter_paths = [self.geography_filter_field]
+            
+            if filter_paths:
+                # OR over paths (e.g., area__geography OR hall__station__geography),
+                # with multi-valued paths pushed into EXISTS subqueries
+                queryset = queryset.filter(
+                    geography_q(queryset.model, filter_paths, scope.geography_id)
+                )
         
         # Apply subsidiary filter
-        if profile.subsidiary != Subsidiary.ALL and self.subsidiary_filter_field:
+        if scope.subsidiary != Subsidiary.ALL and self.subsidiary_filter_field:
             subsidiary_filter = {
-                f'{self.subsidiary_filter_field}': profile.subsidiary
+                f'{self.subsidiary_filter_field}': scope.subsidiary
             }
             queryset = queryset.filter(**subsidiary_filter)
         
         # Apply operator location filtering if enabled
-        if self.enable_operator_location_filtering and profile.role == Role.OPERATOR:
-            queryset = self.apply_operator_location_filters(queryset, profile)
+        if self.enable_operator_location_filtering and scope.role == Role.OPERATOR:
+            queryset = self.apply_operator_location_filters(queryset, scope)
         
         return queryset
     
-    def apply_operator_location_filters(self, queryset, profile):
+    def apply_operator_location_filters(self, queryset, scope):
         """
         Apply fine-grained location filtering for operators.
         
         Operators should only see data for their assigned areas, stations, or containers.
-        Filters data based on M2M relationships: allowed_areas, allowed_stations, allowed_containers.
+        The profile's allowed_areas, allowed_stations and allowed_containers are
+        resolved once into the compiled scope's container id set (containers
+        in allowed areas, in halls of allowed stations, or granted directly).
         
         Args:
             queryset: Base queryset to filter
-            profile: UserProfile instance
+            scope: AccessScope from get_access_scope() (a UserProfile is also
+                accepted and compiled on the fly)
             
         Returns:
             Filtered queryset for operator's assigned locations
         """
+        if not hasattr(scope, 'container_ids'):
+            scope = compile_access_scope(scope)
+        
         # If no locations are assigned, operator sees nothing
         # (Managers and Admins bypass this through role check above)
-        
-        area_ids = list(profile.allowed_areas.values_list('id', flat=True))
-        station_ids = list(profile.allowed_stations.values_list('id', flat=True))
-        container_ids = list(profile.allowed_containers.values_list('id', flat=True))
-        
-        # If no assignments at all, return empty queryset
-        if not area_ids and not station_ids and not container_ids:
+        if not scope.has_locations:
             return queryset.none()
         
         # Build filter conditions based on the model's location relationships
-        # This assumes the queryset model has relationships to containers, areas, or stations
+        # (batch assignments, container, area/hall/station FKs, batch FK).
         # Subclasses can override this method for custom location filtering logic
-        
-        # Import Batch model once to avoid redundant imports and potential circular import issues
-        from apps.batch.models import Batch
-        is_batch_model = queryset.model == Batch
-        
-        filters = Q()
-        
-        # Filter by assigned areas
-        if area_ids:
-            # Common patterns:
-            # - container__area_id__in (for models with direct container FK)
-            # - batch_assignments__container__area_id__in (for Batch model itself)
-            # - batch__batch_assignments__container__area_id__in (for batch-related)
-            # - area_id__in (for models with direct area FK)
-            
-            if is_batch_model:
-                filters |= Q(batch_assignments__container__area_id__in=area_ids)
-            elif hasattr(queryset.model, 'container'):
-                filters |= Q(container__area_id__in=area_ids)
-            elif hasattr(queryset.model, 'area'):
-                filters |= Q(area_id__in=area_ids)
-            
-            # Try batch relationships for related models
-            if hasattr(queryset.model, 'batch'):
-                filters |= Q(batch__batch_assignments__container__area_id__in=area_ids)
-        
-        # Filter by assigned stations
-        if station_ids:
-            if is_batch_model:
-                filters |= Q(batch_assignments__container__hall__freshwater_station_id__in=station_ids)
-            elif hasattr(queryset.model, 'container'):
-                filters |= Q(container__hall__freshwater_station_id__in=station_ids)
-            elif hasattr(queryset.model, 'hall'):
-                filters |= Q(hall__freshwater_station_id__in=station_ids)
-            elif hasattr(queryset.model, 'freshwater_station'):
-                filters |= Q(freshwater_station_id__in=station_ids)
-            
-            # Try batch relationships for related models
-            if hasattr(queryset.model, 'batch'):
-                filters |= Q(batch__batch_assignments__container__hall__freshwater_station_id__in=station_ids)
-        
-        # Filter by assigned containers (most specific)
-        if container_ids:
-            if is_batch_model:
-                filters |= Q(batch_assignments__container_id__in=container_ids)
-            elif hasattr(queryset.model, 'container'):
-                filters |= Q(container_id__in=container_ids)
-            
-            # Try batch relationships for related models
-            if hasattr(queryset.model, 'batch'):
-                filters |= Q(batch__batch_assignments__container_id__in=container_ids)
-        
-        # Apply the filters if any were built
-        if filters:
-            queryset = queryset.filter(filters).distinct()
-        else:
+        filters = location_q(queryset.model, scope)
+        if not filters:
             # No matching relationships found, return empty
             return queryset.none()
         
-        return queryset
+        return queryset.filter(filters)
     
     def validate_object_geography(self, obj):
         """
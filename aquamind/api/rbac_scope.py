@@ -0,0 +1,218 @@
+"""
+Compiled per-user RBAC access scope.
+
+RBACFilterMixin used to rebuild OR'ed multi-join Q objects on every request,
+re-reading the profile's allowed_areas/stations/containers and filtering
+through multi-valued relations (``batch__batch_assignments__container__...``),
+which forced DISTINCT and multiplied join cardinality on large tables.
+
+This module resolves a user's access once into an ``AccessScope`` (geography
+id plus the area/station/container id sets an operator may see), caches it
+and turns it into EXISTS / semi-join filters:
+
+- ``get_access_scope(user, request)`` returns the scope memoised on the
+  request. Across requests it is only cached when the default cache is
+  shared (CACHE_REDIS_URL set); a per-process LocMemCache would keep
+  serving revoked grants in every worker but the one that invalidated it.
+- ``geography_q(model, paths, geography_id)`` builds an EXISTS filter for
+  geography paths that cross a multi-valued relation.
+- ``location_q(model, scope)`` builds the operator location filter from the
+  resolved container id set.
+- ``invalidate_access_scopes()`` bumps the cache version; apps.users.signals
+  calls it after commit when profiles, their location M2Ms, or
+  infrastructure rows change.
+"""
+from dataclasses import dataclass
+from typing import FrozenSet, Iterable, Optional
+
+from django.core.cache import cache
+from django.db.models import Exists, OuterRef, Q
+
+from apps.users.models import Geography, Role
+from aquamind.utils.cache_backend import (
+    bump_cache_version,
+    cache_version,
+    default_cache_is_shared,
+)
+
+SCOPE_CACHE_TIMEOUT = 3600
+SCOPE_VERSION_KEY = "rbac_scope:version"
+_REQUEST_ATTR = "_rbac_access_scope"
+
+# UserProfile geography choice -> Infrastructure Geography name
+GEOGRAPHY_NAMES = {
+    Geography.FAROE_ISLANDS: 'Faroe Islands',
+    Geography.SCOTLAND: 'Scotland',
+}
+
+
+@dataclass(frozen=True)
+class AccessScope:
+    """Resolved access for one user. Empty id sets mean "no location grants"."""
+
+    user_id: int
+    geography: str
+    subsidiary: str
+    role: str
+    geography_id: Optional[int] = None
+    area_ids: FrozenSet[int] = frozenset()
+    station_ids: FrozenSet[int] = frozenset()
+    container_ids: FrozenSet[int] = frozenset()
+
+    @property
+    def has_locations(self) -> bool:
+        return bool(self.area_ids or self.station_ids or self.container_ids)
+
+
+def invalidate_access_scopes() -> None:
+    """Drop every cached scope by moving to a new cache version."""
+    bump_cache_version(SCOPE_VERSION_KEY)
+
+
+def get_access_scope(user, request=None) -> Optional[AccessScope]:
+    """
+    Return the compiled scope for user, or None when the user has no profile.
+
+    Pass the current request to memoise the scope on it, so repeated calls
+    within a request cost a single version lookup. With a shared cache
+    backend the scope is also cached per user under the current scope
+    version; otherwise each request compiles it again.
+    """
+    version = cache_version(SCOPE_VERSION_KEY)
+    holder = getattr(request, '_request', request)
+    memo = getattr(holder, _REQUEST_ATTR, None)
+    if memo is not None and memo[0] == (version, user.pk):
+        return memo[1]
+
+    shared = default_cache_is_shared()
+    cache_key = f"rbac_scope:{version}:{user.pk}"
+    scope = cache.get(cache_key) if shared else None
+    if scope is None:
+        profile = getattr(user, 'profile', None)
+        if profile is None:
+            return None
+        scope = compile_access_scope(profile)
+        if shared:
+            cache.set(cache_key, scope, SCOPE_CACHE_TIMEOUT)
+
+    if holder is not None:
+        setattr(holder, _REQUEST_ATTR, ((version, user.pk), scope))
+    return scope
+
+
+def compile_access_scope(profile) -> AccessScope:
+    """Resolve a UserProfile into id sets (a few queries, run on cache miss)."""
+    from apps.infrastructure.models import Container, Geography as GeographyModel
+
+    geography_id = None
+    geography_name = GEOGRAPHY_NAMES.get(profile.geography)
+    if geography_name:
+        geography_id = (
+            GeographyModel.objects.filter(name=geography_name)
+            .values_list('id', flat=True)
+            .first()
+        )
+
+    area_ids = station_ids = container_ids = frozenset()
+    if profile.role == Role.OPERATOR:
+        area_ids = frozenset(profile.allowed_areas.values_list('id', flat=True))
+        station_ids = frozenset(profile.allowed_stations.values_list('id', flat=True))
+        # Direct grants ride along as a subquery, so this is one query either way
+        location_filter = Q(id__in=profile.allowed_containers.values('id'))
+        if area_ids:
+            location_filter |= Q(area_id__in=area_ids)
+        if station_ids:
+            location_filter |= Q(hall__freshwater_station_id__in=station_ids)
+        container_ids = frozenset(
+            Container.objects.filter(location_filter).values_list('id', flat=True)
+        )
+
+    return AccessScope(
+        user_id=profile.user_id,
+        geography=profile.geography,
+        subsidiary=profile.subsidiary,
+        role=profile.role,
+        geography_id=geography_id,
+        area_ids=area_ids,
+        station_ids=station_ids,
+        container_ids=container_ids,
+    )
+
+
+def geography_q(model, paths: Iterable[str], geography_id: Optional[int]) -> Q:
+    """
+    OR of ``<path> == geography_id`` over paths, as semi-joins.
+
+    Paths that cross a reverse foreign key (e.g. ``batch_assignments__...``)
+    become ``EXISTS`` subqueries on the related table, so the outer query
+    never fans out and needs no DISTINCT. Single-valued paths stay plain
+    column comparisons; the final ``__id`` lets Django skip the geography join.
+    """
+    if geography_id is None:
+        return Q(pk__in=[])
+    condition = Q()
+    for path in paths:
+        condition |= _semi_join_q(model, path.split('__'), geography_id)
+    return condition
+
+
+def location_q(model, scope: AccessScope) -> Q:
+    """
+    Operator location filter for model, based on the resolved id sets.
+
+    Mirrors the relationship probing of RBACFilterMixin: Batch rows match via
+    an active-or-historic assignment in an allowed container, models with a
+    ``container`` FK match on container_id, area/hall/station models match on
+    their own FK, and models with a ``batch`` FK additionally match through
+    that batch's assignments. Returns an empty Q when nothing applies.
+    """
+    from apps.batch.models import Batch, BatchContainerAssignment
+
+    container_ids = scope.container_ids
+    condition = Q()
+
+    if model is Batch:
+        if container_ids:
+            condition |= Q(Exists(BatchContainerAssignment.objects.filter(
+                batch_id=OuterRef('pk'), container_id__in=container_ids,
+            )))
+        return condition
+
+    if hasattr(model, 'container'):
+        if container_ids:
+            condition |= Q(container_id__in=container_ids)
+    else:
+        if scope.area_ids and hasattr(model, 'area'):
+            condition |= Q(area_id__in=scope.area_ids)
+        if scope.station_ids:
+            if hasattr(model, 'hall'):
+                condition |= Q(hall__freshwater_station_id__in=scope.station_ids)
+            elif hasattr(model, 'freshwater_station'):
+                condition |= Q(freshwater_station_id__in=scope.station_ids)
+
+    if hasattr(model, 'batch') and container_ids:
+        condition |= Q(Exists(BatchContainerAssignment.objects.filter(
+            batch_id=OuterRef('batch_id'), container_id__in=container_ids,
+        )))
+    return condition
+
+
+def _semi_join_q(model, parts, value) -> Q:
+    """``parts == value`` on model, pushing the first multi-valued hop into EXISTS."""
+    opts = model._meta
+    for index, name in enumerate(parts):
+        field = opts.get_field(name)
+        if field.one_to_many and not field.concrete:
+            # Reverse FK: correlate the related table back to the outer row.
+            related = field.related_model
+            outer = '__'.join(parts[:index]) or 'pk'
+            inner = _semi_join_q(related, parts[index + 1:], value)
+            return Q(Exists(related.objects.filter(inner, **{field.field.name: OuterRef(outer)})))
+        if field.many_to_many:
+            # Rare for geography paths; a pk semi-join keeps the outer query flat.
+            return Q(pk__in=model.objects.filter(**{'__'.join(parts) + '__id': value}).values('pk'))
+        if not field.is_relation:
+            break
+        opts = field.related_model._meta
+    return Q(**{'__'.join(parts) + '__id': value})
+
@@ -4,7 +4,11 @@ API Root discovery view for AquaMind.
 This module provides a comprehensive overview of all available API endpoints,
 organized by app/module for easy discovery and navigation.
 """
+import functools
+import hmac
 from collections import OrderedDict
+from django.conf import settings
+from django.http import HttpResponse, JsonResponse
 from django.utils import timezone
 from rest_framework.views import APIView
 from rest_framework.response import Response
@@ -13,6 +17,11 @@ from rest_framework.permissions import AllowAny
 from rest_framework.decorators import api_view, permission_classes
 from drf_spectacular.utils import extend_schema
 from rest_framework import serializers
+from rest_framework.exceptions import APIException
+from rest_framework.request import Request
+from rest_framework.settings import api_settings
+
+from aquamind.utils import performance
 
 
 class APIRootView(APIView):
@@ -139,3 +148,75 @@ def health_check(request):
             'timestamp': timezone.now().isoformat(),
             'error': str(e)
         }, status=503)
+
+
+# ----------------------------------------------------------------------------
+# Performance metrics (plain Django views, kept out of the OpenAPI schema)
+# ----------------------------------------------------------------------------
+
+def _api_user(request):
+    """The session user, else the user of a valid API token/JWT, else None."""
+    user = getattr(request, 'user', None)
+    if user is not None and user.is_authenticated:
+        return user
+    drf_request = Request(request)
+    for authentication_class in api_settings.DEFAULT_AUTHENTICATION_CLASSES:
+        try:
+            result = authentication_class().authenticate(drf_request)
+        except APIException:
+            continue
+        if result is not None:
+            return result[0]
+    return None
+
+
+def _metrics_authorized(request):
+    """A bearer token equal to METRICS_AUTH_TOKEN (scrapers), or a staff user."""
+    token = settings.METRICS_AUTH_TOKEN
+    header = request.headers.get('Authorization', '')
+    if token and header.startswith('Bearer ') and hmac.compare_digest(header[len('Bearer '):], token):
+        return True
+    user = _api_user(request)
+    return bool(user and user.is_staff)
+
+
+def _metrics_view(view):
+    @functools.wraps(view)
+    def wrapper(request, *args, **kwargs):
+        if request.method != 'GET':
+            return JsonResponse({'detail': 'Method not allowed.'}, status=405)
+        if not _metrics_authorized(request):
+            return JsonResponse({'detail': 'Forbidden.'}, status=403)
+        return view(request, *args, **kwargs)
+    return wrapper
+
+
+@_metrics_view
+def metrics(request):
+    """Request, task and aggregate cache series in Prometheus text format."""
+    return HttpResponse(
+        performance.render_prometheus(),
+        content_type='text/plain; version=0.0.4; charset=utf-8',
+    )
+
+
+@_metrics_view
+def metrics_endpoints(request):
+    """Per-endpoint/task profile summaries (``?kind=request|task``)."""
+    return JsonResponse({
+        'results': performance.endpoint_profiles(request.GET.get('kind')),
+        'profiles': performance.recent_profiles(),
+    })
+
+
+@_metrics_view
+def metrics_profile(request, profile_id):
+    """One stored profiler report as text."""
+    entry = performance.get_profile(profile_id)
+    if entry is None:
+        return JsonResponse({'detail': 'Profile not found.'}, status=404)
+    header = (
+        f"# {entry['kind']} {entry['name']} ({entry['engine']}) at {entry['captured_at']}: "
+        f"{entry['duration_ms']} ms, {entry['queries']} queries, {entry['db_ms']} ms in DB\n"
+    )
+    return HttpResponse(header + entry['report'], content_type='text/plain; charset=utf-8')
@@ -0,0 +1,6 @@
+"""
+Query-budget and latency benchmarks for hot API endpoints and engines.
+
+Run with ``python manage.py run_benchmarks``; see
+apps/batch/management/commands/run_benchmarks.py.
+"""
@@ -0,0 +1,221 @@
+"""
+Deterministic benchmark dataset.
+
+Builds a scaled slice of the test-data world with the scripts/data_generation
+code rather than a parallel set of fixtures:
+
+- one synthetic freshwater station and one sea area per batch from
+  01_bootstrap_infrastructure (halls, tanks, rings, silos, barges, sensors);
+- the species, lifecycle stages, environmental parameters and feeds the
+  event engine expects;
+- one batch per station simulated by 03_event_engine_core's EventEngine in
+  simulation mode (buffered bulk writes) with a fixed seed per batch;
+- actual daily states for the active assignments over the last
+  ``STATE_DAYS`` simulated days, plus a live forward projection from each,
+  which the forecast endpoints read.
+
+The same parameters on an empty database produce the same rows, so query
+counts are comparable between runs.
+"""
+import contextlib
+import importlib.util
+import io
+import os
+from dataclasses import dataclass
+from datetime import date, timedelta
+from decimal import Decimal
+from pathlib import Path
+from typing import List
+
+from django.contrib.auth import get_user_model
+
+from apps.batch.models import BatchContainerAssignment, LifeCycleStage, Species
+from apps.batch.services.growth_assimilation import GrowthAssimilationEngine
+from apps.batch.services.live_projection_engine import LiveProjectionEngine
+from apps.environmental.models import EnvironmentalParameter
+from apps.inventory.models import Feed
+from apps.scenario.models import Scenario
+
+SCRIPTS_DIR = Path(__file__).resolve().parents[2] / 'scripts' / 'data_generation'
+START_DATE = date(2024, 1, 1)
+BATCH_STAGGER_DAYS = 30
+STATE_DAYS = 30
+EGGS_PER_BATCH = 3_500_000
+GEOGRAPHY = 'Faroe Islands'
+BENCHMARK_USERNAME = 'system_admin'
+
+STAGES = ['Egg&Alevin', 'Fry', 'Parr', 'Smolt', 'Post-Smolt', 'Adult']
+ENVIRONMENTAL_PARAMETERS = [
+    ('Temperature', '°C'),
+    ('Dissolved Oxygen', 'mg/L'),
+    ('pH', 'pH'),
+    ('Salinity', 'ppt'),
+]
+# Names the event engine looks up per stage
+FEEDS = [
+    ('Starter Feed 0.5mm', 'MICRO'),
+    ('Starter Feed 1.0mm', 'SMALL'),
+    ('Grower Feed 2.0mm', 'MEDIUM'),
+    ('Grower Feed 3.0mm', 'MEDIUM'),
+    ('Finisher Feed 4.5mm', 'LARGE'),
+]
+
+
+@dataclass(frozen=True)
+class BenchmarkDataset:
+    """Handles to the seeded rows the hot paths are pointed at."""
+
+    batches: int
+    days: int
+    seed: int
+    user_id: int
+    geography_id: int
+    batch_ids: List[int]
+    assignment_id: int
+    scenario_id: int
+    start_date: date
+    end_date: date
+
+    @property
+    def params(self) -> dict:
+        return {'batches': self.batches, 'days': self.days, 'seed': self.seed}
+
+
+def load_script(name: str):
+    """Import a scripts/data_generation module whose file name starts with a digit."""
+    spec = importlib.util.spec_from_file_location(
+        f"benchmark_{name.replace('-', '_')}", SCRIPTS_DIR / f'{name}.py'
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@contextlib.contextmanager
+def _quiet(verbose: bool):
+    """Silence the generation scripts' progress output unless verbose."""
+    if verbose:
+        yield
+        return
+    with contextlib.redirect_stdout(io.StringIO()), contextlib.redirect_stderr(io.StringIO()):
+        yield
+
+
+@contextlib.contextmanager
+def _skip_recompute_signals():
+    """Keep the event engine from recomputing daily states after every batch."""
+    previous = os.environ.get('SKIP_CELERY_SIGNALS')
+    os.environ['SKIP_CELERY_SIGNALS'] = '1'
+    try:
+        yield
+    finally:
+        if previous is None:
+            os.environ.pop('SKIP_CELERY_SIGNALS', None)
+        else:
+            os.environ['SKIP_CELERY_SIGNALS'] = previous
+
+
+def _ensure_master_data():
+    species, _ = Species.objects.get_or_create(
+        name='Atlantic Salmon', defaults={'scientific_name': 'Salmo salar'}
+    )
+    for order, name in enumerate(STAGES, start=1):
+        LifeCycleStage.objects.get_or_create(species=species, name=name, defaults={'order': order})
+    for name, unit in ENVIRONMENTAL_PARAMETERS:
+        EnvironmentalParameter.objects.get_or_create(name=name, defaults={'unit': unit})
+    for name, size_category in FEEDS:
+        Feed.objects.get_or_create(
+            name=name,
+            brand='Benchmark',
+            defaults={'size_category': size_category, 'protein_percentage': Decimal('45.0')},
+        )
+    user, _ = get_user_model().objects.get_or_create(
+        username=BENCHMARK_USERNAME,
+        defaults={'is_staff': True, 'is_superuser': True, 'email': 'benchmark@example.com'},
+    )
+    return user
+
+
+def _bootstrap_infrastructure(batches: int):
+    bootstrap = load_script('01_bootstrap_infrastructure')
+    scotland, faroe = bootstrap.create_geographies()
+    container_types = bootstrap.get_or_create_container_types()
+    area_groups = bootstrap.create_area_groups(scotland, faroe)[GEOGRAPHY]
+    for number in range(1, batches + 1):
+        bootstrap.create_freshwater_station(faroe, number, container_types)
+        bootstrap.create_sea_area(
+            faroe, number, container_types, area_groups[(number - 1) % len(area_groups)]
+        )
+    return faroe
+
+
+def seed_dataset(
+    batches: int = 2,
+    days: int = 180,
+    seed: int = 42,
+    verbose: bool = False,
+) -> BenchmarkDataset:
+    """
+    Seed the benchmark dataset into the current database.
+
+    Args:
+        batches: Number of batches (and stations/sea areas) to simulate
+        days: Days simulated per batch
+        seed: Base random seed; batch ``n`` uses ``seed + n``
+        verbose: Show the generation scripts' progress output
+
+    Returns:
+        BenchmarkDataset pointing at the seeded rows
+    """
+    with _quiet(verbose), _skip_recompute_signals():
+        user = _ensure_master_data()
+        geography = _bootstrap_infrastructure(batches)
+        engine_core = load_script('03_event_engine_core')
+        batch_ids = []
+        for index in range(batches):
+            engine = engine_core.EventEngine(
+                START_DATE + timedelta(days=index * BATCH_STAGGER_DAYS),
+                EGGS_PER_BATCH,
+                GEOGRAPHY,
+                duration=days,
+                station_name=f'FI-FW-{index + 1:02d}',
+                batch_number=f'BENCH-{index + 1:03d}',
+                simulate=True,
+                seed=seed + index,
+            )
+            if engine.run() != 0:
+                raise RuntimeError(f"Event engine failed for benchmark batch {index + 1}")
+            batch_ids.append(engine.batch.id)
+
+    assignments = list(
+        BatchContainerAssignment.objects.filter(batch_id__in=batch_ids, is_active=True)
+        .select_related('batch', 'container')
+        .order_by('batch_id', 'id')
+    )
+    if not assignments:
+        raise RuntimeError("Benchmark batches have no active assignments")
+    for assignment in assignments:
+        last_day = assignment.batch.start_date + timedelta(days=days - 1)
+        GrowthAssimilationEngine(assignment).recompute_range(
+            max(assignment.assignment_date, last_day - timedelta(days=STATE_DAYS - 1)), last_day
+        )
+        LiveProjectionEngine(assignment).compute_and_store(computed_date=last_day)
+
+    target = assignments[0]
+    scenario = Scenario.objects.filter(batch_id=target.batch_id).order_by('pk').first()
+    if scenario is None:
+        raise RuntimeError(f"Benchmark batch {target.batch.batch_number} has no scenario")
+
+    return BenchmarkDataset(
+        batches=batches,
+        days=days,
+        seed=seed,
+        user_id=user.id,
+        geography_id=geography.id,
+        batch_ids=batch_ids,
+        assignment_id=target.id,
+        scenario_id=scenario.pk,
+        start_date=START_DATE,
+        end_date=START_DATE + timedelta(days=(batches - 1) * BATCH_STAGGER_DAYS + days - 1),
+    )
+
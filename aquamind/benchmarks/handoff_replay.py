@@ -0,0 +1,547 @@
+"""
+Deterministic parallel replay of dynamic FW→Sea handoffs.
+
+Builds synthetic dynamic transfer workflows with the batch test fixtures
+(apps/batch/tests/models/test_utils, laid out like the dynamic execution
+API tests: station tank → vessel tank → sea ring, with historian links and
+readings for the mandatory start snapshot) and replays them from
+concurrent workers against the current database. Per load each workflow
+runs:
+
+    context → start STATION_TO_VESSEL → complete
+    context → start VESSEL_TO_RING → complete
+
+and finally completes the workflow. The workload is fixed by the seed
+(populations, loads, mortality, shared rings, which worker runs which
+workflow); only the interleaving between workers varies between runs.
+
+Every step reports latency percentiles and outcomes (ok, rejected,
+deadlock, lock timeout, error); deadlocked and lock-timed-out steps are
+retried like a client would. On PostgreSQL a sampler polls
+pg_stat_activity for replay backends waiting on locks, attributing the
+wait to the step each worker was running, and the server deadlock counter
+is read from pg_stat_database.
+
+Run with ``python manage.py replay_handoffs``; see
+apps/batch/management/commands/replay_handoffs.py.
+"""
+import math
+import random
+import threading
+import time
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from datetime import timedelta
+from decimal import Decimal
+from typing import Dict, List, Optional, Tuple
+
+from django.contrib.auth import get_user_model
+from django.core.exceptions import ValidationError
+from django.db import DatabaseError, connection, transaction
+from django.utils import timezone
+
+from apps.batch.models import BatchContainerAssignment, BatchTransferWorkflow, TransferAction
+from apps.batch.services.dynamic_execution import build_execution_context, start_dynamic_handoff
+from apps.batch.tests.models.test_utils import (
+    create_test_batch,
+    create_test_container_type,
+    create_test_geography,
+    create_test_lifecycle_stage,
+    create_test_species,
+    create_test_user,
+)
+from apps.environmental.models import EnvironmentalParameter, EnvironmentalReading
+from apps.historian.models import HistorianTag, HistorianTagLink
+from apps.infrastructure.models import Area, Container, FreshwaterStation, Hall, TransportCarrier
+from apps.users.models import Geography as UserGeography, Role
+
+STEPS = (
+    'context',
+    'start_station_to_vessel',
+    'complete_station_to_vessel',
+    'start_vessel_to_ring',
+    'complete_vessel_to_ring',
+    'complete_workflow',
+)
+OUTCOMES = ('ok', 'rejected', 'deadlock', 'lock_timeout', 'error')
+RETRYABLE = ('deadlock', 'lock_timeout')
+
+# Parameters the start snapshot requires on both sides
+SNAPSHOT_READINGS = (
+    ('Oxygen', 'mg/L', Decimal('9.10')),
+    ('Temperature', 'C', Decimal('11.50')),
+    ('CO2', 'mg/L', Decimal('3.20')),
+)
+
+REPLAY_USERNAME = 'handoff_replay'
+APPLICATION_NAME_PREFIX = 'handoff-replay-'
+
+# PostgreSQL error codes (psycopg2 pgcode)
+PG_DEADLOCK_DETECTED = '40P01'
+PG_LOCK_NOT_AVAILABLE = '55P03'
+
+
+@dataclass(frozen=True)
+class LoadPlan:
+    """One wellboat load: fish moved station → vessel → ring."""
+
+    count: int
+    biomass_kg: Decimal
+    mortality: int
+
+
+@dataclass(frozen=True)
+class WorkflowPlan:
+    """Handles and loads for one synthetic dynamic workflow."""
+
+    workflow_id: int
+    source_assignment_id: int
+    vessel_container_id: int
+    ring_container_id: int
+    shared_ring: bool
+    loads: Tuple[LoadPlan, ...]
+
+
+def _seed_snapshot_readings(container, parameters, batch=None):
+    for name, _unit, value in SNAPSHOT_READINGS:
+        parameter = parameters[name]
+        tag = HistorianTag.objects.create(tag_name=f"{container.name}-{name}")
+        HistorianTagLink.objects.create(tag=tag, container=container, parameter=parameter)
+        EnvironmentalReading.objects.create(
+            parameter=parameter,
+            container=container,
+            batch=batch,
+            value=value,
+            reading_time=timezone.now() - timedelta(minutes=5),
+            is_manual=False,
+            notes="handoff replay reading",
+        )
+
+
+def _plan_loads(rng: random.Random, population: int, avg_weight_g: int, loads: int) -> Tuple[LoadPlan, ...]:
+    """Split a population into loads; counts plus mortality move every fish."""
+    plans = []
+    remaining = population
+    for number in range(loads):
+        share = remaining if number == loads - 1 else population // loads
+        mortality = rng.randint(0, min(50, share // 100))
+        count = share - mortality
+        biomass = (Decimal(count) * avg_weight_g / Decimal(1000)).quantize(Decimal('0.01'))
+        plans.append(LoadPlan(count=count, biomass_kg=biomass, mortality=mortality))
+        remaining -= share
+    return tuple(plans)
+
+
+def build_handoff_fixtures(
+    workflows: int = 16,
+    loads: int = 2,
+    rings: Optional[int] = None,
+    seed: int = 42,
+) -> List[WorkflowPlan]:
+    """
+    Create synthetic dynamic FW→Sea workflows in the current database.
+
+    Each workflow gets its own batch, station tank and vessel tank; sea
+    rings are shared round-robin when ``rings`` < ``workflows`` (those
+    handoffs allow mixing, so they exercise the mixed-batch path).
+
+    Returns:
+        One WorkflowPlan per workflow, in creation order
+    """
+    rng = random.Random(seed)
+    rings = rings or workflows
+    today = timezone.now().date()
+
+    user = create_test_user(geography=UserGeography.ALL, role=Role.ADMIN, username=REPLAY_USERNAME)
+    geography = create_test_geography("Handoff Replay")
+    station = FreshwaterStation.objects.create(
+        name="Replay Station",
+        station_type="FRESHWATER",
+        geography=geography,
+        latitude=Decimal("62.0001"),
+        longitude=Decimal("-6.7713"),
+    )
+    hall = Hall.objects.create(name="Replay Hall", freshwater_station=station)
+    area = Area.objects.create(
+        name="Replay Area",
+        geography=geography,
+        latitude=Decimal("62.0500"),
+        longitude=Decimal("-6.7500"),
+        max_biomass=Decimal("10000000.00"),
+        active=True,
+    )
+    vessel = TransportCarrier.objects.create(
+        name="Replay Vessel",
+        carrier_type="VESSEL",
+        geography=geography,
+        capacity_m3=Decimal("5000.00"),
+        active=True,
+    )
+    container_type = create_test_container_type("Replay Tank")
+    species = create_test_species("Replay Salmon")
+    smolt = create_test_lifecycle_stage(species=species, name="Smolt", order=3)
+    post_smolt = create_test_lifecycle_stage(species=species, name="Post-Smolt", order=4)
+    parameters = {
+        name: EnvironmentalParameter.objects.get_or_create(name=name, defaults={'unit': unit})[0]
+        for name, unit, _value in SNAPSHOT_READINGS
+    }
+
+    def container(name, **location):
+        return Container.objects.create(
+            name=name,
+            container_type=container_type,
+            volume_m3=Decimal("100.00"),
+            max_biomass_kg=Decimal("500000.00"),
+            active=True,
+            **location,
+        )
+
+    ring_containers = []
+    for number in range(rings):
+        ring = container(f"Replay-R-{number:03d}", area=area)
+        _seed_snapshot_readings(ring, parameters)
+        ring_containers.append(ring)
+    ring_users = Counter(number % rings for number in range(workflows))
+
+    plans = []
+    for number in range(workflows):
+        population = rng.randrange(20_000, 60_001, 1_000)
+        avg_weight_g = rng.choice((80, 100, 120))
+        batch = create_test_batch(species=species, lifecycle_stage=smolt, batch_number=f"RPL-{number:03d}")
+        station_tank = container(f"Replay-S-{number:03d}", hall=hall)
+        vessel_tank = container(f"Replay-V-{number:03d}", carrier=vessel)
+        _seed_snapshot_readings(station_tank, parameters, batch=batch)
+        _seed_snapshot_readings(vessel_tank, parameters)
+        source = BatchContainerAssignment.objects.create(
+            batch=batch,
+            container=station_tank,
+            lifecycle_stage=smolt,
+            population_count=population,
+            avg_weight_g=Decimal(avg_weight_g),
+            assignment_date=today,
+            is_active=True,
+            notes="handoff replay source",
+        )
+        workflow = BatchTransferWorkflow.objects.create(
+            workflow_number=f"TRF-RPL-{number:03d}",
+            batch=batch,
+            workflow_type="LIFECYCLE_TRANSITION",
+            source_lifecycle_stage=smolt,
+            dest_lifecycle_stage=post_smolt,
+            planned_start_date=today,
+            status="PLANNED",
+            is_dynamic_execution=True,
+            dynamic_route_mode="DIRECT_STATION_TO_VESSEL",
+            estimated_total_count=population,
+            estimated_total_biomass_kg=Decimal(population * avg_weight_g) / Decimal(1000),
+            initiated_by=user,
+        )
+        plans.append(WorkflowPlan(
+            workflow_id=workflow.id,
+            source_assignment_id=source.id,
+            vessel_container_id=vessel_tank.id,
+            ring_container_id=ring_containers[number % rings].id,
+            shared_ring=ring_users[number % rings] > 1,
+            loads=_plan_loads(rng, population, avg_weight_g, loads),
+        ))
+    return plans
+
+
+def classify_error(exc: Exception) -> str:
+    """Map a step exception to a replay outcome."""
+    if isinstance(exc, ValidationError):
+        return 'rejected'
+    if isinstance(exc, DatabaseError):
+        pgcode = getattr(exc.__cause__, 'pgcode', None)
+        message = str(exc).lower()
+        if pgcode == PG_DEADLOCK_DETECTED or 'deadlock' in message:
+            return 'deadlock'
+        # SQLite reports writer contention as "database is locked"
+        if pgcode == PG_LOCK_NOT_AVAILABLE or 'lock timeout' in message or 'is locked' in message:
+            return 'lock_timeout'
+    return 'error'
+
+
+def _percentile(sorted_values: List[float], fraction: float) -> float:
+    """Nearest-rank percentile of an already sorted list."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(fraction * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+
+class _Recorder:
+    """Thread-safe step latencies, outcomes and the step each worker is in."""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.latencies = defaultdict(list)
+        self.outcomes = defaultdict(Counter)
+        self.conflicts = Counter()
+        self.retries = 0
+        self.errors = []
+        self.current_step = {}
+
+    def record(self, step, seconds, outcome, attempts, conflicts, message=None):
+        with self.lock:
+            self.latencies[step].append(seconds * 1000)
+            self.outcomes[step][outcome] += 1
+            self.retries += attempts - 1
+            self.conflicts.update(conflicts)
+            if message and len(self.errors) < 20:
+                self.errors.append(f"{step}: {message}")
+
+
+class _WorkflowAborted(Exception):
+    pass
+
+
+class _Worker:
+    """Replays its share of the workflows sequentially, step by step."""
+
+    def __init__(self, number, plans, user, recorder, retries):
+        self.number = number
+        self.plans = plans
+        self.user = user
+        self.recorder = recorder
+        self.retries = retries
+        self.workflows_completed = 0
+        # Jittered backoff so conflicting workers do not retry in lockstep
+        self.backoff = random.Random(number)
+
+    def _step(self, name, call):
+        self.recorder.current_step[self.number] = name
+        conflicts = []
+        attempts = 0
+        started = time.perf_counter()
+        try:
+            while True:
+                attempts += 1
+                try:
+                    result = call()
+                except Exception as exc:
+                    outcome = classify_error(exc)
+                    if outcome in RETRYABLE:
+                        conflicts.append(outcome)
+                        if attempts <= self.retries:
+                            time.sleep(0.02 * 2 ** (attempts - 1) * (1 + self.backoff.random()))
+                            continue
+                    self.recorder.record(
+                        name, time.perf_counter() - started, outcome, attempts, conflicts, str(exc)
+                    )
+                    raise _WorkflowAborted from exc
+                self.recorder.record(name, time.perf_counter() - started, 'ok', attempts, conflicts)
+                return result
+        finally:
+            self.recorder.current_step[self.number] = None
+
+    def _context(self, workflow_id):
+        return build_execution_context(BatchTransferWorkflow.objects.select_related('batch').get(pk=workflow_id))
+
+    def _start(self, plan, leg_type, source_assignment_id, dest_container_id, load):
+        workflow = BatchTransferWorkflow.objects.select_related('batch').get(pk=plan.workflow_id)
+        return start_dynamic_handoff(
+            workflow=workflow,
+            started_by=self.user,
+            leg_type=leg_type,
+            source_assignment_id=source_assignment_id,
+            dest_container_id=dest_container_id,
+            planned_transferred_count=load.count,
+            planned_transferred_biomass_kg=load.biomass_kg,
+            transfer_method="PUMP",
+            allow_mixed=leg_type == "VESSEL_TO_RING" and plan.shared_ring,
+        )['action'].id
+
+    def _complete(self, action_id, load, mortality):
+        action = TransferAction.objects.select_related('workflow__batch').get(pk=action_id)
+        action.complete_handoff(
+            executed_by=self.user,
+            transferred_count=load.count,
+            transferred_biomass_kg=load.biomass_kg,
+            mortality_count=mortality,
+        )
+        return action.dest_assignment_id
+
+    def _complete_workflow(self, workflow_id):
+        with transaction.atomic():
+            workflow = BatchTransferWorkflow.objects.select_for_update().get(pk=workflow_id)
+            workflow.complete_dynamic(completed_by=self.user, completion_note="Handoff replay")
+
+    def _replay(self, plan):
+        for load in plan.loads:
+            self._step('context', lambda: self._context(plan.workflow_id))
+            action_id = self._step('start_station_to_vessel', lambda: self._start(
+                plan, "STATION_TO_VESSEL", plan.source_assignment_id, plan.vessel_container_id, load
+            ))
+            vessel_assignment_id = self._step(
+                'complete_station_to_vessel', lambda: self._complete(action_id, load, load.mortality)
+            )
+            self._step('context', lambda: self._context(plan.workflow_id))
+            action_id = self._step('start_vessel_to_ring', lambda: self._start(
+                plan, "VESSEL_TO_RING", vessel_assignment_id, plan.ring_container_id, load
+            ))
+            self._step('complete_vessel_to_ring', lambda: self._complete(action_id, load, 0))
+        self._step('complete_workflow', lambda: self._complete_workflow(plan.workflow_id))
+
+    def run(self, barrier=None, close_connection=False):
+        try:
+            if connection.vendor == 'postgresql':
+                with connection.cursor() as cursor:
+                    cursor.execute("SET application_name = %s", [f"{APPLICATION_NAME_PREFIX}{self.number}"])
+            if barrier is not None:
+                barrier.wait()
+            for plan in self.plans:
+                try:
+                    self._replay(plan)
+                    self.workflows_completed += 1
+                except _WorkflowAborted:
+                    continue
+        finally:
+            if close_connection:
+                connection.close()
+
+
+class LockWaitSampler(threading.Thread):
+    """
+    Polls pg_stat_activity for replay backends waiting on a lock.
+
+    Each sample adds the interval to the lock wait of the step the waiting
+    worker is running and counts the waiting statement.
+    """
+
+    def __init__(self, recorder: _Recorder, interval_s: float):
+        super().__init__(daemon=True)
+        self.recorder = recorder
+        self.interval_s = interval_s
+        self.stop_event = threading.Event()
+        self.samples = 0
+        self.max_waiters = 0
+        self.wait_seconds = Counter()
+        self.statements = Counter()
+
+    def run(self):
+        try:
+            while not self.stop_event.wait(self.interval_s):
+                with connection.cursor() as cursor:
+                    cursor.execute(
+                        "SELECT application_name, left(query, 160) FROM pg_stat_activity "
+                        "WHERE datname = current_database() AND wait_event_type = 'Lock' "
+                        f"AND application_name LIKE '{APPLICATION_NAME_PREFIX}%'"
+                    )
+                    waiting = cursor.fetchall()
+                self.samples += 1
+                self.max_waiters = max(self.max_waiters, len(waiting))
+                for application_name, query in waiting:
+                    worker = int(application_name[len(APPLICATION_NAME_PREFIX):])
+                    step = self.recorder.current_step.get(worker) or 'unknown'
+                    self.wait_seconds[step] += self.interval_s
+                    self.statements[query] += 1
+        finally:
+            connection.close()
+
+    def stop(self):
+        self.stop_event.set()
+        self.join()
+
+
+def _server_deadlocks() -> Optional[int]:
+    if connection.vendor != 'postgresql':
+        return None
+    with connection.cursor() as cursor:
+        cursor.execute("SELECT deadlocks FROM pg_stat_database WHERE datname = current_database()")
+        return cursor.fetchone()[0]
+
+
+def replay_handoffs(
+    plans: List[WorkflowPlan],
+    concurrency: int = 4,
+    retries: int = 3,
+    sample_interval_ms: int = 50,
+) -> Dict:
+    """
+    Replay the planned workflows from ``concurrency`` workers.
+
+    Worker ``n`` runs plans ``n, n + concurrency, ...`` in order; workers
+    start together. With one worker the replay runs in the calling thread
+    (and its transaction), so it can run inside a test case.
+
+    Returns:
+        Report dict: throughput, deadlocks, lock timeouts, lock waits and
+        per-step latency/outcomes
+    """
+    concurrency = max(1, min(concurrency, len(plans) or 1))
+    user = get_user_model().objects.get(username=REPLAY_USERNAME)
+    recorder = _Recorder()
+    workers = [
+        _Worker(number, plans[number::concurrency], user, recorder, retries)
+        for number in range(concurrency)
+    ]
+    sampler = None
+    if connection.vendor == 'postgresql' and concurrency > 1:
+        sampler = LockWaitSampler(recorder, sample_interval_ms / 1000)
+    deadlocks_before = _server_deadlocks()
+
+    started = time.perf_counter()
+    if concurrency == 1:
+        workers[0].run()
+    else:
+        barrier = threading.Barrier(concurrency)
+        threads = [
+            threading.Thread(target=worker.run, kwargs={'barrier': barrier, 'close_connection': True})
+            for worker in workers
+        ]
+        if sampler:
+            sampler.start()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        if sampler:
+            sampler.stop()
+    wall_seconds = time.perf_counter() - started
+
+    deadlocks_after = _server_deadlocks()
+    handoffs = sum(
+        recorder.outcomes[step]['ok'] for step in ('complete_station_to_vessel', 'complete_vessel_to_ring')
+    )
+    steps = {}
+    for step in STEPS:
+        latencies = sorted(recorder.latencies[step])
+        if not latencies:
+            continue
+        steps[step] = {
+            'count': len(latencies),
+            **{outcome: recorder.outcomes[step][outcome] for outcome in OUTCOMES},
+            'mean_ms': round(sum(latencies) / len(latencies), 2),
+            'p50_ms': round(_percentile(latencies, 0.50), 2),
+            'p95_ms': round(_percentile(latencies, 0.95), 2),
+            'max_ms': round(latencies[-1], 2),
+            'lock_wait_s': round(sampler.wait_seconds[step], 3) if sampler else None,
+        }
+
+    return {
+        'vendor': connection.vendor,
+        'workflows': len(plans),
+        'concurrency': concurrency,
+        'wall_seconds': round(wall_seconds, 3),
+        'workflows_completed': sum(worker.workflows_completed for worker in workers),
+        'handoffs_completed': handoffs,
+        'handoffs_per_second': round(handoffs / wall_seconds, 2) if wall_seconds else 0.0,
+        'deadlocks': recorder.conflicts['deadlock'],
+        'lock_timeouts': recorder.conflicts['lock_timeout'],
+        'retries': recorder.retries,
+        'server_deadlocks': (
+            deadlocks_after - deadlocks_before if deadlocks_before is not None else None
+        ),
+        'lock_waits': {
+            'samples': sampler.samples,
+            'max_waiters': sampler.max_waiters,
+            'wait_seconds': round(sum(sampler.wait_seconds.values()), 3),
+            'top_statements': [
+                {'samples': samples, 'query': query}
+                for query, samples in sampler.statements.most_common(5)
+            ],
+        } if sampler else None,
+        'steps': steps,
+        'errors': recorder.errors,
+    }
@@ -0,0 +1,171 @@
+"""
+Measurement and baseline comparison for the hot path benchmarks.
+
+Every run of a hot path happens inside a transaction that is rolled back,
+after a cache clear, so engine writes do not accumulate between runs and
+aggregate caches never serve a warm result. Per hot path we record:
+
+- queries: statements executed by the last run, counted with an execute
+  wrapper (deterministic for a given dataset; this is the N+1 guard);
+- wall_ms: median wall time of the measured runs (a warm-up run is dropped);
+- peak_kb: peak traced Python allocation of one extra run under tracemalloc,
+  kept separate so tracing does not distort the timings.
+
+Baselines are JSON files per database vendor in ``baselines/``; a metric
+regresses when it exceeds its baseline by more than the metric's threshold.
+"""
+import json
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+from django.core.cache import cache
+from django.db import connection, transaction
+
+from aquamind.benchmarks.dataset import BenchmarkDataset
+from aquamind.benchmarks.hot_paths import HOT_PATHS, HotPath
+
+BASELINE_DIR = Path(__file__).resolve().parent / 'baselines'
+METRICS = ('queries', 'wall_ms', 'peak_kb')
+DEFAULT_THRESHOLDS = {'queries': 0.10, 'wall_ms': 0.50, 'peak_kb': 0.25}
+# Below these absolute increases a metric never counts as regressed
+ABSOLUTE_SLACK = {'queries': 2, 'wall_ms': 5.0, 'peak_kb': 64.0}
+
+
+@dataclass(frozen=True)
+class Regression:
+    name: str
+    metric: str
+    baseline: float
+    actual: float
+    limit: float
+
+    def __str__(self):
+        return (
+            f"{self.name}.{self.metric}: {self.actual:g} exceeds limit {self.limit:g} "
+            f"(baseline {self.baseline:g})"
+        )
+
+
+class _QueryCounter:
+    """Execute wrapper counting statements (no debug cursor, no log limit)."""
+
+    def __init__(self):
+        self.count = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        self.count += 1
+        return execute(sql, params, many, context)
+
+
+def _run_once(call):
+    """Run ``call`` in a rolled-back transaction; return (seconds, queries)."""
+    cache.clear()
+    counter = _QueryCounter()
+    with transaction.atomic():
+        with connection.execute_wrapper(counter):
+            started = time.perf_counter()
+            call()
+            elapsed = time.perf_counter() - started
+        transaction.set_rollback(True)
+    return elapsed, counter.count
+
+
+def measure(path: HotPath, dataset: BenchmarkDataset, repeat: int = 5) -> Dict[str, float]:
+    """Measure one hot path; see the module docstring for the metrics."""
+    timings = []
+    queries = 0
+    for index in range(repeat + 1):
+        elapsed, queries = _run_once(path.build(dataset))
+        if index:
+            timings.append(elapsed * 1000)
+
+    call = path.build(dataset)
+    tracemalloc.start()
+    try:
+        _run_once(call)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    return {
+        'queries': queries,
+        'wall_ms': round(statistics.median(timings), 2),
+        'peak_kb': round(peak / 1024, 1),
+    }
+
+
+def select_hot_paths(names: Optional[Iterable[str]] = None) -> List[HotPath]:
+    if not names:
+        return list(HOT_PATHS)
+    known = {path.name: path for path in HOT_PATHS}
+    unknown = sorted(set(names) - set(known))
+    if unknown:
+        raise KeyError(f"Unknown hot paths: {', '.join(unknown)} (known: {', '.join(known)})")
+    return [known[name] for name in names]
+
+
+def run_suite(
+    dataset: BenchmarkDataset,
+    paths: Optional[List[HotPath]] = None,
+    repeat: int = 5,
+) -> Dict[str, Dict[str, float]]:
+    return {path.name: measure(path, dataset, repeat) for path in (paths or HOT_PATHS)}
+
+
+def baseline_path(vendor: Optional[str] = None) -> Path:
+    return BASELINE_DIR / f'{vendor or connection.vendor}.json'
+
+
+def load_baseline(path: Path) -> Optional[dict]:
+    if not path.exists():
+        return None
+    with path.open() as handle:
+        return json.load(handle)
+
+
+def write_baseline(path: Path, dataset: BenchmarkDataset, results: Dict[str, Dict[str, float]]):
+    """Merge ``results`` into the baseline file, keeping hot paths not re-measured."""
+    existing = load_baseline(path)
+    merged = dict(existing['results']) if existing and existing['dataset'] == dataset.params else {}
+    merged.update(results)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open('w') as handle:
+        json.dump({'dataset': dataset.params, 'results': dict(sorted(merged.items()))}, handle, indent=2)
+        handle.write('\n')
+
+
+def compare(
+    results: Dict[str, Dict[str, float]],
+    baseline: Dict[str, Dict[str, float]],
+    thresholds: Optional[Dict[str, float]] = None,
+    metrics: Iterable[str] = METRICS,
+) -> List[Regression]:
+    """
+    Compare measured results with baseline results.
+
+    Hot paths without a baseline entry are skipped (nothing to regress from).
+    A metric's limit is ``baseline * (1 + threshold)``, but never less than
+    ``baseline + ABSOLUTE_SLACK[metric]`` so tiny values do not flap.
+    """
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    regressions = []
+    for name, measured in results.items():
+        expected = baseline.get(name)
+        if not expected:
+            continue
+        for metric in metrics:
+            if metric not in expected or metric not in measured:
+                continue
+            limit = max(
+                expected[metric] * (1 + thresholds[metric]),
+                expected[metric] + ABSOLUTE_SLACK[metric],
+            )
+            if measured[metric] > limit:
+                regressions.append(
+                    Regression(name, metric, expected[metric], measured[metric], round(limit, 2))
+                )
+    return regressions
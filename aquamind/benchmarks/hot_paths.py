@@ -0,0 +1,148 @@
+"""
+Hot endpoints and engines covered by the benchmark suite.
+
+Each HotPath builds a fresh zero-argument callable per measured run; the
+build step runs outside the measurement, so per-run setup (a new API client
+with a freshly loaded user, engine inputs) is not counted. Endpoint calls
+fail with BenchmarkError on a non-200 response so a broken endpoint cannot
+pass as a fast one.
+"""
+from dataclasses import dataclass
+from datetime import timedelta
+from typing import Callable, Dict, List
+
+from django.contrib.auth import get_user_model
+from rest_framework.test import APIClient
+
+from apps.batch.models import Batch, BatchContainerAssignment
+from apps.batch.services.growth_assimilation import (
+    GrowthAssimilationEngine,
+    recompute_batch_assignments,
+)
+from apps.batch.services.live_projection_engine import LiveProjectionEngine
+from apps.scenario.models import Scenario
+from apps.scenario.services.calculations.projection_engine import ProjectionEngine
+from aquamind.benchmarks.dataset import BenchmarkDataset
+
+
+class BenchmarkError(Exception):
+    """A hot path did not complete successfully."""
+
+
+@dataclass(frozen=True)
+class HotPath:
+    name: str
+    kind: str  # 'endpoint' or 'engine'
+    build: Callable[[BenchmarkDataset], Callable[[], object]]
+
+
+def _get(url: str, params_for: Callable[[BenchmarkDataset], Dict] = None):
+    def build(dataset: BenchmarkDataset):
+        client = APIClient()
+        client.force_authenticate(get_user_model().objects.get(pk=dataset.user_id))
+        resolved_url = url.format(batch_id=dataset.batch_ids[0])
+        params = params_for(dataset) if params_for else {}
+
+        def call():
+            response = client.get(resolved_url, params)
+            if response.status_code != 200:
+                raise BenchmarkError(
+                    f"GET {resolved_url} returned {response.status_code}: {response.content[:200]!r}"
+                )
+            return response
+
+        return call
+
+    return build
+
+
+def _target_assignment(dataset: BenchmarkDataset):
+    return BatchContainerAssignment.objects.select_related('batch', 'container').get(
+        pk=dataset.assignment_id
+    )
+
+
+def _growth_assimilation(dataset: BenchmarkDataset):
+    assignment = _target_assignment(dataset)
+    end_date = assignment.batch.start_date + timedelta(days=dataset.days - 1)
+
+    def call():
+        result = GrowthAssimilationEngine(assignment).recompute_range(
+            assignment.assignment_date, end_date
+        )
+        if result.get('errors'):
+            raise BenchmarkError(f"Growth assimilation failed: {result['errors'][:3]}")
+        return result
+
+    return call
+
+
+def _batch_recompute(dataset: BenchmarkDataset):
+    """Every assignment of a batch, sharing one batch-level daily input preload."""
+    batch = Batch.objects.get(pk=dataset.batch_ids[0])
+    end_date = batch.start_date + timedelta(days=dataset.days - 1)
+
+    def call():
+        result = recompute_batch_assignments(batch.id, batch.start_date, end_date)
+        if result['total_errors']:
+            raise BenchmarkError(f"Batch recompute failed with {result['total_errors']} errors")
+        return result
+
+    return call
+
+
+def _live_projection(dataset: BenchmarkDataset):
+    assignment = _target_assignment(dataset)
+    computed_date = assignment.batch.start_date + timedelta(days=dataset.days - 1)
+
+    def call():
+        result = LiveProjectionEngine(assignment).compute_and_store(computed_date=computed_date)
+        if not result.get('success'):
+            raise BenchmarkError(f"Live projection failed: {result.get('error')}")
+        return result
+
+    return call
+
+
+def _projection_engine(dataset: BenchmarkDataset):
+    scenario = Scenario.objects.get(pk=dataset.scenario_id)
+
+    def call():
+        result = ProjectionEngine(scenario).run_projection(save_results=True, label='benchmark')
+        if not result.get('success'):
+            raise BenchmarkError(f"Projection failed: {result.get('errors')}")
+        return result
+
+    return call
+
+
+HOT_PATHS: List[HotPath] = [
+    HotPath('batch_list', 'endpoint', _get('/api/v1/batch/batches/')),
+    HotPath(
+        'batch_insights_timeseries', 'endpoint',
+        _get(
+            '/api/v1/batch/batches/{batch_id}/insights-timeseries/',
+            lambda dataset: {
+                'start_date': dataset.start_date.isoformat(),
+                'end_date': dataset.end_date.isoformat(),
+            },
+        ),
+    ),
+    HotPath(
+        'batch_geography_summary', 'endpoint',
+        _get(
+            '/api/v1/batch/batches/geography-summary/',
+            lambda dataset: {'geography': dataset.geography_id},
+        ),
+    ),
+    HotPath('forecast_harvest', 'endpoint', _get('/api/v1/batch/forecast/harvest/')),
+    HotPath('forecast_sea_transfer', 'endpoint', _get('/api/v1/batch/forecast/sea-transfer/')),
+    HotPath(
+        'forecast_tiered_harvest', 'endpoint',
+        _get('/api/v1/batch/forecast/tiered-harvest/', lambda dataset: {'days_horizon': 3650}),
+    ),
+    HotPath('growth_assimilation', 'engine', _growth_assimilation),
+    HotPath('batch_recompute', 'engine', _batch_recompute),
+    HotPath('live_projection', 'engine', _live_projection),
+    HotPath('projection_engine', 'engine', _projection_engine),
+]
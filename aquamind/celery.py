@@ -25,6 +25,7 @@ Production considerations:
 """
 import os
 from celery import Celery
+from celery.signals import task_postrun, task_prerun
 
 # Set default Django settings module for 'celery' program
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'aquamind.settings')
@@ -39,6 +40,20 @@ app.config_from_object('django.conf:settings', namespace='CELERY')
 app.autodiscover_tasks()
 
 
+@task_prerun.connect
+def instrument_task_start(task_id=None, task=None, **kwargs):
+    """Start collecting performance metrics (aquamind.utils.performance)."""
+    from aquamind.utils.performance import task_started
+    task_started(task_id, task)
+
+
+@task_postrun.connect
+def instrument_task_finish(task_id=None, task=None, state=None, **kwargs):
+    """Record the task's metrics and any profiler report."""
+    from aquamind.utils.performance import task_finished
+    task_finished(task_id, task, state)
+
+
 @app.task(bind=True, ignore_result=True)
 def debug_task(self):
     """
@@ -1,5 +1,11 @@
 """
-TEMPORARY DEBUGGING MIDDLEWARE – API Authentication Diagnostics.
+AquaMind middleware.
+
+RequestMetricsMiddleware records per-request performance metrics (see
+aquamind.utils.performance) and runs the opt-in request profiler.
+
+AuthHeaderDebugMiddleware below is TEMPORARY DEBUGGING MIDDLEWARE – API
+Authentication Diagnostics.
 
 This middleware logs Authorization headers for every request to help debug
 authentication issues during API testing and development.
@@ -19,12 +25,16 @@ Created: July 18, 2025
 Updated: August 2025 (removed Schemathesis-specific references)
 """
 
+import hmac
 import logging
+import random
 import sys
 import time
 from datetime import datetime
 from django.conf import settings
 
+from aquamind.utils import performance
+
 # Configure logger
 logger = logging.getLogger('auth_header_debug')
 logger.setLevel(logging.DEBUG)
@@ -98,3 +108,69 @@ class AuthHeaderDebugMiddleware:
         logger.debug(f"RESPONSE: {path} | STATUS: {response.status_code}")
         
         return response
+
+
+class RequestMetricsMiddleware:
+    """
+    Record time, DB time, queries, duplicate queries, aggregate cache hits and
+    response size for every request, labelled by the resolved view name.
+
+    A request is profiled when PERF_PROFILER_ENABLED is on and it either
+    carries the PERF_PROFILE_HEADER header (equal to PERF_PROFILE_TOKEN when
+    one is configured) or is picked by PERF_PROFILE_SAMPLE_RATE. Profiled
+    responses carry ``X-Profile-Id``; the report is served by the metrics
+    profile endpoint. Responses to staff users, all responses when DEBUG is
+    on, or every response with PERF_SERVER_TIMING_PUBLIC carry a
+    ``Server-Timing`` header.
+    """
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+
+    def __call__(self, request):
+        if not settings.PERF_METRICS_ENABLED:
+            return self.get_response(request)
+
+        profiler = performance.Profiler() if self._should_profile(request) else None
+        with performance.collect() as profile:
+            if profiler:
+                profiler.start()
+            try:
+                response = self.get_response(request)
+            finally:
+                report = profiler.stop() if profiler else None
+
+        match = getattr(request, 'resolver_match', None)
+        view = match.view_name if match and match.view_name else 'unresolved'
+        size = None if response.streaming else len(response.content)
+        performance.record_request(view, request.method, response.status_code, profile, size)
+
+        if self._exposes_timing(request):
+            response['Server-Timing'] = (
+                f"db;dur={profile.db_seconds * 1000:.1f}, "
+                f"app;dur={profile.duration * 1000:.1f}"
+            )
+        if report is not None:
+            response['X-Profile-Id'] = performance.store_profile(
+                'request', f"{request.method} {view}", report, profile, profiler.engine
+            )
+        return response
+
+    @staticmethod
+    def _exposes_timing(request):
+        if settings.PERF_SERVER_TIMING_PUBLIC or settings.DEBUG:
+            return True
+        # DRF copies the authenticated user onto the Django request
+        user = getattr(request, 'user', None)
+        return bool(user is not None and user.is_authenticated and user.is_staff)
+
+    @staticmethod
+    def _should_profile(request):
+        if not settings.PERF_PROFILER_ENABLED or performance.Profiler.active():
+            return False
+        header = request.headers.get(settings.PERF_PROFILE_HEADER)
+        if header is not None:
+            token = settings.PERF_PROFILE_TOKEN
+            return not token or hmac.compare_digest(header, token)
+        rate = settings.PERF_PROFILE_SAMPLE_RATE
+        return rate > 0 and random.random() < rate
@@ -77,6 +77,7 @@ INSTALLED_APPS = DJANGO_APPS + THIRD_PARTY_APPS + LOCAL_APPS
 
 MIDDLEWARE = [
     "django.middleware.security.SecurityMiddleware",
+    "aquamind.middleware.RequestMetricsMiddleware",
     "django.contrib.sessions.middleware.SessionMiddleware",
     "corsheaders.middleware.CorsMiddleware",
     "django.middleware.common.CommonMiddleware",
@@ -337,26 +338,92 @@ SPECTACULAR_SETTINGS = {
 # ------------------------------------------------------------------
 # Caching configuration
 # ------------------------------------------------------------------
-# Local-memory cache provides a zero-config, thread-safe cache that is
-# perfectly adequate for development and small deployments.  In larger
-# environments you can switch BACKEND to a shared cache (e.g. Redis or
-# Memcached) via environment-specific settings without touching code.
+# Set CACHE_REDIS_URL to share one Redis cache across all gunicorn and
+# Celery workers.  Without it the local-memory cache is used, which is
+# zero-config and fine for development, but every process then has its own
+# cold copy and cross-process debouncing (the recompute dispatcher request
+# in batch.services.recompute_scheduler) only works within a process.
+# Compiled RBAC scopes (aquamind.api.rbac_scope) are then only memoised
+# per request and mixed-lineage payloads (batch.services.mixed_lineage) are
+# not memoised, since their invalidation could not reach the other
+# workers, and scenario CSV import progress (import_status) is only visible
+# to the worker that ran the import.
 #
-# Aggregated endpoints (infrastructure overview, assignment summary,
-# feeding events summary) use django.views.decorators.cache `cache_page`
-# with short TTLs (≈30-60 s).  A dedicated cache section centralises
-# those defaults and keeps LOCMEM fallback explicit.
+# Aggregated endpoints (infrastructure overview and summaries, assignment
+# summary, feeding summary/finance report) use
+# aquamind.utils.aggregate_cache.cache_aggregate with short TTLs
+# (≈30-60 s), keyed per RBAC scope and invalidated by tag on writes.
 #
-CACHES = {
-    'default': {
-        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
-        'LOCATION': 'unique-snowflake',   # Distinct per-process namespace
-        'TIMEOUT': 60,                    # Global fallback TTL (seconds)
-        'OPTIONS': {
-            'MAX_ENTRIES': 1000,
-        },
+CACHE_REDIS_URL = os.environ.get('CACHE_REDIS_URL')
+
+if CACHE_REDIS_URL:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.redis.RedisCache',
+            'LOCATION': CACHE_REDIS_URL,
+            'KEY_PREFIX': os.environ.get('CACHE_KEY_PREFIX', 'aquamind'),
+            'TIMEOUT': 60,                    # Global fallback TTL (seconds)
+        }
     }
-}
+else:
+    CACHES = {
+        'default': {
+            'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+            'LOCATION': 'unique-snowflake',   # Distinct per-process namespace
+            'TIMEOUT': 60,                    # Global fallback TTL (seconds)
+            'OPTIONS': {
+                'MAX_ENTRIES': 1000,
+            },
+        }
+    }
+
+# ------------------------------------------------------------------
+# Performance instrumentation
+# ------------------------------------------------------------------
+# aquamind.middleware.RequestMetricsMiddleware and the Celery task hooks
+# record time, DB time, query counts, duplicate-query fingerprints and cache
+# hits per request/task (aquamind.utils.performance).  Series are per
+# process and served in Prometheus text format at /metrics/ to staff users
+# or callers presenting "Authorization: Bearer <METRICS_AUTH_TOKEN>".
+PERF_METRICS_ENABLED = os.environ.get('PERF_METRICS_ENABLED', 'false').lower() == 'true'
+# Server-Timing (db/app durations) is sent to staff users and when DEBUG is
+# on; set this to send it on every response
+PERF_SERVER_TIMING_PUBLIC = os.environ.get('PERF_SERVER_TIMING_PUBLIC', 'false').lower() == 'true'
+METRICS_AUTH_TOKEN = os.environ.get('METRICS_AUTH_TOKEN', '')
+# Same query fingerprint repeated this often in one request/task = N+1 suspect
+PERF_NPLUSONE_THRESHOLD = int(os.environ.get('PERF_NPLUSONE_THRESHOLD', '5'))
+# Opt-in profiler (pyinstrument if installed, else cProfile).  Requests are
+# profiled when they carry PERF_PROFILE_HEADER (matching PERF_PROFILE_TOKEN
+# if set) or are sampled at PERF_PROFILE_SAMPLE_RATE; tasks when sent with
+# apply_async(headers={PERF_TASK_PROFILE_HEADER: True}).
+PERF_PROFILER_ENABLED = os.environ.get('PERF_PROFILER_ENABLED', 'false').lower() == 'true'
+PERF_PROFILE_HEADER = 'X-AquaMind-Profile'
+PERF_PROFILE_TOKEN = os.environ.get('PERF_PROFILE_TOKEN', '')
+PERF_PROFILE_SAMPLE_RATE = float(os.environ.get('PERF_PROFILE_SAMPLE_RATE', '0.0'))
+PERF_TASK_PROFILE_HEADER = 'x_profile'
+PERF_PROFILES_KEPT = int(os.environ.get('PERF_PROFILES_KEPT', '20'))
+
+# Growth/projection engines share batch-level daily inputs within one task
+# (apps.batch.services.batch_daily_data.daily_data_scope); at most this many
+# batches are held per task before the least recently used is evicted.
+BATCH_DAILY_DATA_CACHE_SIZE = int(os.environ.get('BATCH_DAILY_DATA_CACHE_SIZE', '16'))
+
+# Growth assimilation recompute scheduler (apps.batch.services.recompute_scheduler).
+# Events record dirty marks; a dispatcher merges them per assignment.
+# Seconds between the first mark and the dispatcher run (marks arriving
+# meanwhile are merged into the same run)
+RECOMPUTE_DISPATCH_DELAY_SECONDS = int(os.environ.get('RECOMPUTE_DISPATCH_DELAY_SECONDS', '30'))
+# Assignments dispatched per run; the rest go in the next run
+RECOMPUTE_DISPATCH_MAX_ASSIGNMENTS = int(os.environ.get('RECOMPUTE_DISPATCH_MAX_ASSIGNMENTS', '500'))
+# Dispatched marks not completed after this long are dispatched again
+RECOMPUTE_MARK_STALE_SECONDS = int(os.environ.get('RECOMPUTE_MARK_STALE_SECONDS', '3600'))
+# Open marks dispatched this many times are marked failed instead of dispatched again
+RECOMPUTE_MARK_MAX_ATTEMPTS = int(os.environ.get('RECOMPUTE_MARK_MAX_ATTEMPTS', '5'))
+# Completed marks are kept this long for the merge-ratio metrics
+RECOMPUTE_MARK_RETENTION_DAYS = int(os.environ.get('RECOMPUTE_MARK_RETENTION_DAYS', '7'))
+# Celery task priorities (Redis transport: 0 is highest)
+RECOMPUTE_PRIORITY_ACTIVE = int(os.environ.get('RECOMPUTE_PRIORITY_ACTIVE', '0'))
+RECOMPUTE_PRIORITY_INACTIVE = int(os.environ.get('RECOMPUTE_PRIORITY_INACTIVE', '6'))
 
 # Using Django's default User model with extended profiles
 
@@ -450,6 +517,13 @@ CELERY_WORKER_MAX_TASKS_PER_CHILD = 1000  # Restart worker after N tasks (preven
 # Task routing (future: can route different tasks to different queues)
 CELERY_TASK_DEFAULT_QUEUE = 'default'
 
+# Task priorities on the Redis transport (recompute scheduler: active
+# batches first); 0 is the highest of the ten levels
+CELERY_BROKER_TRANSPORT_OPTIONS = {
+    'priority_steps': list(range(10)),
+    'queue_order_strategy': 'priority',
+}
+
 # Disable celery for tests - run tasks synchronously
 import sys
 if 'test' in sys.argv:
@@ -502,6 +576,19 @@ LIVE_FORWARD_ATTENTION_THRESHOLD_DAYS = int(
 from celery.schedules import crontab
 
 CELERY_BEAT_SCHEDULE = {
+    # Growth assimilation recompute dispatcher
+    # Safety net for dirty marks whose on-commit dispatch request was lost
+    'dispatch-recompute-marks': {
+        'task': 'apps.batch.tasks.dispatch_recompute_marks',
+        'schedule': 60.0,
+        'options': {'queue': 'default'},
+    },
+    # Live-state rows for batches created without signals (bulk imports)
+    'rebuild-missing-batch-live-state': {
+        'task': 'apps.batch.tasks.rebuild_missing_batch_live_state',
+        'schedule': crontab(minute='*/15'),
+        'options': {'queue': 'default'},
+    },
     # Nightly live forward projection computation
     # Runs at 03:00 UTC daily, after ActualDailyAssignmentState is updated
     'compute-live-projections': {
@@ -509,8 +596,31 @@ CELERY_BEAT_SCHEDULE = {
         'schedule': crontab(hour=3, minute=0),
         'options': {'queue': 'default'},
     },
+    # Opening-of-month biology snapshots for finance-core valuation
+    # Locking a period captures its snapshot; this fills locked periods without one
+    'capture-opening-biology-snapshots': {
+        'task': 'apps.finance_core.tasks.capture_opening_biology_snapshots_task',
+        'schedule': crontab(hour=3, minute=30),
+        'options': {'queue': 'default'},
+    },
+    # Incremental daily feed consumption rollups (finance reports)
+    # Catches feeding writes that bypass signals (bulk imports, queryset updates)
+    'refresh-feed-consumption-rollups': {
+        'task': 'apps.inventory.tasks.refresh_feed_consumption_rollups_task',
+        'schedule': crontab(hour=2, minute=30),
+        'options': {'queue': 'default'},
+    },
 }
 
+# ------------------------------------------------------------------
+# Feed consumption rollups
+# ------------------------------------------------------------------
+# Trailing days the nightly job rebuilds in full
+FEED_ROLLUP_REFRESH_DAYS = int(os.environ.get('FEED_ROLLUP_REFRESH_DAYS', '7'))
+# Serve finance reports from the rollups (inventory migration 0018 backfills
+# existing events; `manage.py refresh_feed_rollups --all` rebuilds them)
+FINANCE_REPORT_USE_ROLLUPS = os.environ.get('FINANCE_REPORT_USE_ROLLUPS', 'true').lower() == 'true'
+
 # ------------------------------------------------------------------
 # Test configuration
 # ------------------------------------------------------------------
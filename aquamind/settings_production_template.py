@@ -277,10 +277,8 @@ LOGGING = {
 CACHES = {
     'default': {
         'BACKEND': 'django.core.cache.backends.redis.RedisCache',
-        'LOCATION': os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1'),
-        'OPTIONS': {
-            'CLIENT_CLASS': 'django_redis.client.DefaultClient',
-        }
+        'LOCATION': os.environ.get('CACHE_REDIS_URL', os.environ.get('REDIS_URL', 'redis://127.0.0.1:6379/1')),
+        'KEY_PREFIX': os.environ.get('CACHE_KEY_PREFIX', 'aquamind'),
     }
 }
 
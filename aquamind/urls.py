@@ -23,7 +23,13 @@ from django.views.generic import RedirectView
 from rest_framework import permissions
 from rest_framework_simplejwt.views import TokenObtainPairView, TokenRefreshView
 from apps.users.api.views import CustomObtainAuthToken
-from aquamind.api.views import APIRootView, health_check
+from aquamind.api.views import (
+    APIRootView,
+    health_check,
+    metrics,
+    metrics_endpoints,
+    metrics_profile,
+)
 # from apps.core.views import CSRFTokenView  # Temporarily disabled
 # drf-spectacular (OpenAPI 3.1) views – single source of truth
 from drf_spectacular.views import (
@@ -56,6 +62,11 @@ urlpatterns = [
     # Health check endpoint
     path("health-check/", health_check, name="health-check"),
 
+    # Performance metrics (Prometheus text, endpoint profiles, profiler reports)
+    path("metrics/", metrics, name="metrics"),
+    path("metrics/endpoints/", metrics_endpoints, name="metrics-endpoints"),
+    path("metrics/profiles/<str:profile_id>/", metrics_profile, name="metrics-profile"),
+
     # Redirect root URL to admin for now
     path('', RedirectView.as_view(url='/admin/'), name='index'),
     
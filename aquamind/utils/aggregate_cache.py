@@ -0,0 +1,203 @@
+"""
+Shared cache tier for aggregate API endpoints.
+
+``cache_page`` keyed entries on the URL only, so every RBAC scope shared one
+entry, and with the per-process LocMemCache each worker kept its own cold
+copy. ``cache_aggregate`` replaces it for the aggregate endpoints:
+
+- keys include a fingerprint of the caller's compiled RBAC scope
+  (aquamind.api.rbac_scope), so users with the same access share entries
+  and nobody is served another scope's numbers;
+- keys include the current version of every tag the endpoint depends on;
+  ``invalidate_tags()`` bumps a version (called from the post_save /
+  post_delete receivers for assignments, feeding and mortality), which
+  orphans every dependent entry at once;
+- a short-lived lock (``cache.add``) lets one request recompute a missing
+  entry while concurrent requests for the same key wait for it instead of
+  stampeding the database;
+- hits, misses and latency are counted per endpoint (``cache_metrics()``),
+  and against the current request's performance profile
+  (aquamind.utils.performance), and each response carries an
+  ``X-Cache: HIT|MISS`` header.
+
+Entries and tag versions live in the default cache, which is Redis when
+CACHE_REDIS_URL is set (see settings.CACHES), so all workers share them. With
+the per-process LocMemCache a tag bump would only reach the worker that made
+the write, so responses are not cached unless ``default_cache_is_shared()``.
+
+Usage:
+    @action(detail=False, methods=['get'])
+    @cache_aggregate(30, tags=(TAG_FEEDING,))
+    def summary(self, request):
+        ...
+"""
+import functools
+import hashlib
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, Iterable, Tuple
+
+from django.core.cache import cache
+from rest_framework.response import Response
+
+from aquamind.api.rbac_scope import get_access_scope
+from aquamind.utils.cache_backend import (
+    bump_cache_version,
+    cache_version,
+    default_cache_is_shared,
+)
+from aquamind.utils.performance import note_cache
+from apps.users.models import Role
+
+TAG_ASSIGNMENTS = 'assignments'
+TAG_FEEDING = 'feeding'
+TAG_MORTALITY = 'mortality'
+
+KEY_PREFIX = 'aggregate'
+TAG_VERSION_KEY = 'cache_tag:{}'
+LOCK_TIMEOUT = 30
+STAMPEDE_WAIT_SECONDS = 5.0
+STAMPEDE_POLL_SECONDS = 0.05
+
+_metrics_lock = threading.Lock()
+_metrics = defaultdict(lambda: {'hit': 0, 'miss': 0, 'hit_ms': 0.0, 'miss_ms': 0.0})
+
+
+def invalidate_tags(*tags: str) -> None:
+    """Move each tag to a new version, orphaning every entry that depends on it."""
+    for tag in tags:
+        bump_cache_version(TAG_VERSION_KEY.format(tag))
+
+
+def tag_versions(tags: Iterable[str]) -> Tuple[int, ...]:
+    """Current version of each tag (initialised on first use)."""
+    tags = tuple(tags)
+    keys = [TAG_VERSION_KEY.format(tag) for tag in tags]
+    found = cache.get_many(keys)
+    versions = []
+    for key in keys:
+        version = found.get(key)
+        versions.append(cache_version(key) if version is None else version)
+    return tuple(versions)
+
+
+def scope_fingerprint(user, request=None) -> str:
+    """Short stable hash of what ``user`` may see (shared by users with equal access)."""
+    if not getattr(user, 'is_authenticated', False):
+        return 'anonymous'
+    if user.is_superuser:
+        return 'superuser'
+    scope = get_access_scope(user, request)
+    if scope is None:
+        return 'no-profile'
+    parts = [scope.geography, scope.subsidiary, scope.role]
+    if scope.role == Role.OPERATOR:
+        parts.append(','.join(str(pk) for pk in sorted(scope.container_ids)))
+    return hashlib.sha1('|'.join(parts).encode()).hexdigest()[:16]
+
+
+def build_cache_key(endpoint: str, request, tags: Iterable[str]) -> str:
+    query = sorted(request.query_params.lists()) if hasattr(request, 'query_params') else []
+    target = hashlib.sha1(f"{request.path}?{query}".encode()).hexdigest()
+    versions = '.'.join(str(version) for version in tag_versions(tags))
+    return f"{KEY_PREFIX}:{endpoint}:{scope_fingerprint(request.user, request)}:{versions}:{target}"
+
+
+def _record(endpoint: str, outcome: str, started: float) -> None:
+    elapsed_ms = (time.perf_counter() - started) * 1000
+    with _metrics_lock:
+        stats = _metrics[endpoint]
+        stats[outcome] += 1
+        stats[f'{outcome}_ms'] += elapsed_ms
+    note_cache(outcome)
+
+
+def cache_metrics() -> Dict[str, Dict[str, float]]:
+    """Per-endpoint hit/miss counts, hit ratio and mean latency for this process."""
+    snapshot = {}
+    with _metrics_lock:
+        for endpoint, stats in _metrics.items():
+            hits, misses = stats['hit'], stats['miss']
+            snapshot[endpoint] = {
+                'hits': hits,
+                'misses': misses,
+                'hit_ratio': hits / (hits + misses) if hits + misses else 0.0,
+                'avg_hit_ms': stats['hit_ms'] / hits if hits else 0.0,
+                'avg_miss_ms': stats['miss_ms'] / misses if misses else 0.0,
+            }
+    return snapshot
+
+
+def reset_cache_metrics() -> None:
+    with _metrics_lock:
+        _metrics.clear()
+
+
+def _cached_response(entry) -> Response:
+    status_code, data = entry
+    response = Response(data, status=status_code)
+    response['X-Cache'] = 'HIT'
+    return response
+
+
+def _wait_for(key: str):
+    deadline = time.monotonic() + STAMPEDE_WAIT_SECONDS
+    while time.monotonic() < deadline:
+        time.sleep(STAMPEDE_POLL_SECONDS)
+        entry = cache.get(key)
+        if entry is not None:
+            return entry
+    return None
+
+
+def cache_aggregate(timeout: int, tags: Iterable[str] = (), endpoint: str = None):
+    """
+    Cache a DRF view method's successful GET responses in the shared cache.
+
+    Without a shared default cache the view method runs on every request.
+
+    Args:
+        timeout: Entry TTL in seconds.
+        tags: Invalidation tags the response depends on.
+        endpoint: Metrics/key name (defaults to the method's qualified name).
+    """
+    tags = tuple(tags)
+
+    def decorator(view_method):
+        name = endpoint or view_method.__qualname__
+
+        @functools.wraps(view_method)
+        def wrapper(view, request, *args, **kwargs):
+            if request.method not in ('GET', 'HEAD') or not default_cache_is_shared():
+                return view_method(view, request, *args, **kwargs)
+
+            started = time.perf_counter()
+            key = build_cache_key(name, request, tags)
+            entry = cache.get(key)
+            if entry is not None:
+                _record(name, 'hit', started)
+                return _cached_response(entry)
+
+            lock_key = f"{key}:lock"
+            locked = cache.add(lock_key, 1, timeout=LOCK_TIMEOUT)
+            if not locked:
+                # Another request is computing this entry; wait for it.
+                entry = _wait_for(key)
+                if entry is not None:
+                    _record(name, 'hit', started)
+                    return _cached_response(entry)
+            try:
+                response = view_method(view, request, *args, **kwargs)
+                if isinstance(response, Response) and response.status_code == 200:
+                    cache.set(key, (response.status_code, response.data), timeout)
+            finally:
+                if locked:
+                    cache.delete(lock_key)
+            _record(name, 'miss', started)
+            response['X-Cache'] = 'MISS'
+            return response
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,47 @@
+"""
+Bulk writes that keep the django-simple-history audit trail.
+
+simple_history.utils covers bulk creates and updates; these helpers fill the
+two gaps the services and nested serializers kept working around:
+
+- ``bulk_update_touching()`` is ``bulk_update_with_history`` that also sets
+  ``updated_at``, which ``bulk_update`` does not (it bypasses ``auto_now``);
+- ``delete_with_history()`` deletes rows one by one with the given history
+  user and change reason, since a queryset delete records neither.
+
+Both take the ``default_user`` / ``default_change_reason`` keywords of the
+simple_history helpers, so one kwargs dict serves every write of an operation.
+"""
+from typing import Iterable, Optional, Sequence
+
+from django.utils import timezone
+from simple_history.utils import bulk_update_with_history
+
+
+def bulk_update_touching(objs, model, fields: Sequence[str], updated_at=None, **history_kwargs):
+    """
+    Bulk-update ``fields`` and ``updated_at`` of ``objs`` with history rows.
+
+    Args:
+        objs: Model instances to update
+        model: Their model class
+        fields: Changed fields (``updated_at`` is added)
+        updated_at: Timestamp to record (defaults to now)
+        **history_kwargs: Passed on to ``bulk_update_with_history``
+
+    Returns:
+        Number of rows updated
+    """
+    updated_at = updated_at or timezone.now()
+    for obj in objs:
+        obj.updated_at = updated_at
+    return bulk_update_with_history(objs, model, [*fields, 'updated_at'], **history_kwargs)
+
+
+def delete_with_history(objs: Iterable, default_user=None, default_change_reason: Optional[str] = None) -> None:
+    """Delete ``objs`` one by one so simple_history records who removed them and why."""
+    for obj in objs:
+        if default_user is not None:
+            obj._history_user = default_user
+        obj._change_reason = default_change_reason
+        obj.delete()
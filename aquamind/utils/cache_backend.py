@@ -0,0 +1,51 @@
+"""
+Helpers for caches that live in the default cache backend.
+
+Without CACHE_REDIS_URL the default cache is a per-process LocMemCache (see
+settings.CACHES). A version bump there only reaches the process that made
+the write, while every other gunicorn worker keeps its own entries until
+they expire. Caches that are invalidated on writes therefore only keep
+entries across requests when ``default_cache_is_shared()`` is true.
+
+Such caches put a version counter in their keys: ``cache_version()`` reads
+it and ``bump_cache_version()`` orphans every entry built under the old one.
+"""
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+
+PROCESS_LOCAL_BACKENDS = frozenset({
+    'django.core.cache.backends.locmem.LocMemCache',
+    'django.core.cache.backends.dummy.DummyCache',
+})
+
+
+def default_cache_is_shared() -> bool:
+    """True when the default cache backend is visible to every worker process."""
+    backend = settings.CACHES.get('default', {}).get('BACKEND', '')
+    return backend not in PROCESS_LOCAL_BACKENDS
+
+
+def cache_version(key: str) -> int:
+    """Current value of the version counter at ``key`` (initialised on first use)."""
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, _fresh_version(), timeout=None)
+        version = cache.get(key, 0)
+    return version
+
+
+def bump_cache_version(key: str) -> None:
+    """Move the version counter at ``key`` on, orphaning entries keyed by the old value."""
+    if not cache.add(key, _fresh_version(), timeout=None):
+        try:
+            cache.incr(key)
+        except ValueError:
+            # Evicted between add() and incr(); a fresh version is just as good.
+            cache.set(key, _fresh_version(), timeout=None)
+
+
+def _fresh_version() -> int:
+    # Time-based so a version evicted from the cache never reuses old keys.
+    return int(time.time() * 1000)
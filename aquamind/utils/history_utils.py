@@ -16,6 +16,8 @@ from rest_framework import serializers
 import django_filters as filters
 from django_filters import rest_framework as rest_filters
 
+from aquamind.utils.pagination import KeysetPagination
+
 
 class HistoryFilter(filters.FilterSet):
     """
@@ -60,36 +62,21 @@ class HistoryFilter(filters.FilterSet):
     )
 
 
-class HistoryPagination:
+class HistoryPagination(KeysetPagination):
     """
     Pagination class optimized for history data.
 
-    Uses a default page size of 25 items, which is suitable for
+    Uses the API default page size of 20 items, which is suitable for
     most history browsing use cases. Allows customization via
-    query parameters.
+    query parameters. Historical tables grow with every write, so counts
+    are capped and ``?cursor=`` pages by (history_date, history_id)
+    instead of OFFSET (see KeysetPagination).
     """
 
-    page_size = 25
+    page_size = 20
     page_size_query_param = 'page_size'
     max_page_size = 100
 
-    def __init__(self):
-        # Import here to avoid Django settings requirement at module level
-        from rest_framework.pagination import PageNumberPagination
-        self._pagination_class = PageNumberPagination
-        self._pagination_class.page_size = self.page_size
-        self._pagination_class.page_size_query_param = self.page_size_query_param
-        self._pagination_class.max_page_size = self.max_page_size
-
-    def __getattr__(self, name):
-        return getattr(self._pagination_class, name)
-
-    def __setattr__(self, name, value):
-        if name.startswith('_'):
-            super().__setattr__(name, value)
-        else:
-            setattr(self._pagination_class, name, value)
-
 
 class HistorySerializer(serializers.ModelSerializer):
     """
@@ -141,6 +128,8 @@ class HistoryViewSetMixin:
             filterset_class = MyModelHistoryFilter
     """
 
+    pagination_class = HistoryPagination
+
     def get_queryset(self):
         """Order history records by date descending (most recent first)."""
         return super().get_queryset().order_by('-history_date')
@@ -3,12 +3,32 @@ Custom pagination classes for AquaMind API.
 
 This module provides pagination classes that enforce consistent
 validation and error handling for page parameters across the API.
+
+``KeysetPagination`` is an opt-in variant for large, append-heavy tables
+(environmental readings, feeding and mortality events, history tables).
+It keeps the page-number contract but caps the COUNT(*) and, when a
+``cursor`` query parameter is present, seeks on (ordering fields..., id)
+instead of using OFFSET.
 """
-from typing import Any, Dict, Optional, Union
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional, Tuple, Union
+
+from django.core.exceptions import FieldDoesNotExist, ValidationError as DjangoValidationError
+from django.core.paginator import EmptyPage, Page, PageNotAnInteger, Paginator as DjangoPaginator
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import Q
+from django.utils.functional import cached_property
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.exceptions import NotFound, ValidationError
 from rest_framework.request import Request
 from rest_framework.response import Response
+from rest_framework.utils.urls import remove_query_param, replace_query_param
+
+# Rows counted exactly before falling back to an estimate
+DEFAULT_COUNT_CAP = 10000
 
 
 class ValidatedPageNumberPagination(PageNumberPagination):
@@ -73,3 +93,296 @@ class ValidatedPageNumberPagination(PageNumberPagination):
             'previous': self.get_previous_link(),
             'results': data
         })
+
+
+def estimate_count(queryset) -> Optional[int]:
+    """
+    Planner row estimate for ``queryset`` (PostgreSQL only, else None).
+
+    Uses ``EXPLAIN (FORMAT JSON)`` so it reflects the query's filters, not
+    just the table size in pg_class.
+    """
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return None
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def capped_count(queryset, cap: int = DEFAULT_COUNT_CAP) -> Tuple[int, bool]:
+    """
+    Count at most ``cap`` rows exactly; beyond that return an estimate.
+
+    Returns ``(count, is_estimate)``. The estimate is never below ``cap + 1``.
+    """
+    count = queryset.order_by()[:cap + 1].count()
+    if count <= cap:
+        return count, False
+    return max(estimate_count(queryset) or 0, count), True
+
+
+class CappedCountPage(Page):
+    """Page whose ``has_next`` does not trust an estimated total."""
+
+    def has_next(self) -> bool:
+        if self.paginator.count_is_estimate:
+            return len(self.object_list) == self.paginator.per_page
+        return super().has_next()
+
+
+class CappedCountPaginator(DjangoPaginator):
+    """
+    Django paginator that counts at most ``count_cap`` rows exactly.
+
+    When the count is an estimate, page numbers are not bounded by it: a page
+    past the estimate is simply empty.
+    """
+
+    count_cap = DEFAULT_COUNT_CAP
+    count_is_estimate = False
+
+    def __init__(self, *args, count_cap: Optional[int] = None, **kwargs):
+        super().__init__(*args, **kwargs)
+        if count_cap is not None:
+            self.count_cap = count_cap
+
+    @cached_property
+    def count(self) -> int:
+        if not hasattr(self.object_list, 'query'):
+            return len(self.object_list)
+        count, self.count_is_estimate = capped_count(self.object_list, self.count_cap)
+        return count
+
+    def validate_number(self, number):
+        self.count  # resolves count_is_estimate
+        if not self.count_is_estimate:
+            return super().validate_number(number)
+        try:
+            number = int(number)
+        except (TypeError, ValueError):
+            raise PageNotAnInteger("That page number is not an integer")
+        if number < 1:
+            raise EmptyPage("That page number is less than 1")
+        return number
+
+    def page(self, number):
+        number = self.validate_number(number)
+        bottom = (number - 1) * self.per_page
+        top = bottom + self.per_page
+        if not self.count_is_estimate and top + self.orphans >= self.count:
+            top = self.count
+        return self._get_page(self.object_list[bottom:top], number, self)
+
+    def _get_page(self, *args, **kwargs):
+        return CappedCountPage(*args, **kwargs)
+
+
+class KeysetPagination(ValidatedPageNumberPagination):
+    """
+    Opt-in pagination for large list endpoints.
+
+    Enable per viewset with ``pagination_class = KeysetPagination``:
+
+    - Without ``cursor`` it behaves like ValidatedPageNumberPagination, but the
+      total is counted up to ``count_cap`` rows and estimated beyond that
+      (``count_approximate`` is true in the response).
+    - ``?cursor=`` (empty) starts keyset paging; ``next``/``previous`` links
+      carry an opaque cursor. Rows keep the queryset's full ordering (after
+      OrderingFilter), each term in its own direction, with the primary key
+      appended as tie-breaker. Each page is a lexicographic seek past the
+      last row's values plus ``LIMIT n``.
+
+    Every ordering term must be a non-nullable column on the model itself;
+    other orderings fall back to the view's ``keyset_ordering`` or ``-pk``.
+    """
+
+    cursor_query_param = 'cursor'
+    cursor_query_description = (
+        'Opaque keyset cursor. Pass an empty value to start cursor pagination; '
+        'follow the next/previous links for further pages.'
+    )
+    count_cap = DEFAULT_COUNT_CAP
+
+    def django_paginator_class(self, object_list, per_page, **kwargs):
+        return CappedCountPaginator(object_list, per_page, count_cap=self.count_cap, **kwargs)
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.cursor_mode = self.cursor_query_param in request.query_params
+        if not self.cursor_mode:
+            return super().paginate_queryset(queryset, request, view)
+
+        page_size = self.get_page_size(request)
+        if not page_size:
+            return None
+
+        self.request = request
+        keys = self.get_keyset_ordering(queryset, view)
+        values, backwards = self.decode_cursor(
+            request.query_params.get(self.cursor_query_param), queryset.model, keys
+        )
+
+        # Walking backwards flips every term; rows are reversed afterwards
+        page_keys = [(field, descending != backwards) for field, descending in keys]
+        page_queryset = queryset.order_by(
+            *(f"{'-' if descending else ''}{field}" for field, descending in page_keys)
+        )
+        if values is not None:
+            page_queryset = page_queryset.filter(self._seek_q(page_keys, values))
+
+        rows = list(page_queryset[:page_size + 1])
+        has_more = len(rows) > page_size
+        rows = rows[:page_size]
+        if backwards:
+            rows.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, values is not None
+
+        self.keyset_fields = [field for field, _ in keys]
+        self.page_rows = rows
+        self.count, self.count_is_estimate = capped_count(queryset, self.count_cap)
+        return rows
+
+    def get_keyset_ordering(self, queryset, view=None) -> List[Tuple[str, bool]]:
+        """
+        Return the keyset as ``[(field name, descending), ...]``.
+
+        Uses the queryset's ordering (or the model's Meta ordering), falling
+        back to the view's ``keyset_ordering`` and then ``-pk`` when a term is
+        not a non-nullable local column. The primary key is appended as
+        tie-breaker (in the direction of the last term) unless already present.
+        """
+        model = queryset.model
+        pk_name = model._meta.pk.name
+        query = queryset.query
+        queryset_ordering = query.order_by or (model._meta.ordering if query.default_ordering else [])
+        for ordering in (queryset_ordering, getattr(view, 'keyset_ordering', None)):
+            keys = self._keyset_terms(model, ordering or [])
+            if keys:
+                break
+        else:
+            keys = [(pk_name, True)]
+
+        fields = [field for field, _ in keys]
+        if pk_name in fields:
+            return keys[:fields.index(pk_name) + 1]
+        return keys + [(pk_name, keys[-1][1])]
+
+    @staticmethod
+    def _keyset_terms(model, ordering) -> Optional[List[Tuple[str, bool]]]:
+        """Resolve ordering terms to ``(field, descending)``, or None if any is unusable."""
+        keys = []
+        for term in ordering:
+            if not isinstance(term, str):
+                return None
+            name = term.lstrip('-')
+            if name == 'pk':
+                name = model._meta.pk.name
+            try:
+                field = model._meta.get_field(name)
+            except FieldDoesNotExist:
+                return None
+            if not field.concrete or field.is_relation or field.null:
+                return None
+            if field.name not in (existing for existing, _ in keys):
+                keys.append((field.name, term.startswith('-')))
+        return keys or None
+
+    @staticmethod
+    def _seek_q(keys: List[Tuple[str, bool]], values: List[Any]) -> Q:
+        """Rows strictly after ``values`` in the ``keys`` order (a lexicographic comparison)."""
+        seek = Q()
+        for index, (field, descending) in enumerate(keys):
+            equal = {name: value for (name, _), value in zip(keys[:index], values)}
+            lookup = 'lt' if descending else 'gt'
+            seek |= Q(**equal, **{f'{field}__{lookup}': values[index]})
+        return seek
+
+    def encode_cursor(self, row, backwards: bool = False) -> str:
+        values = []
+        for field in self.keyset_fields:
+            value = getattr(row, field)
+            # Full-precision isoformat: DjangoJSONEncoder truncates microseconds,
+            # which would break the equality terms of the seek predicate.
+            if hasattr(value, 'isoformat'):
+                value = value.isoformat()
+            values.append(value)
+        payload = {'v': values}
+        if backwards:
+            payload['b'] = 1
+        raw = json.dumps(payload, cls=DjangoJSONEncoder, separators=(',', ':'))
+        return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor: Optional[str], model, keys: List[Tuple[str, bool]]):
+        """Return ``(values, backwards)``; ``values`` is None for the first page."""
+        if not cursor:
+            return None, False
+        try:
+            padded = cursor + '=' * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()).decode())
+            raw_values = payload['v']
+            if not isinstance(raw_values, list) or len(raw_values) != len(keys):
+                raise ValueError("cursor does not match the ordering")
+            values = [
+                model._meta.get_field(field).to_python(value)
+                for (field, _), value in zip(keys, raw_values)
+            ]
+        except (binascii.Error, ValueError, TypeError, KeyError, AttributeError, DjangoValidationError) as exc:
+            raise ValidationError({self.cursor_query_param: 'Invalid cursor.'}) from exc
+        return values, bool(payload.get('b'))
+
+    def _cursor_link(self, row, backwards: bool) -> str:
+        url = remove_query_param(self.request.build_absolute_uri(), self.page_query_param)
+        return replace_query_param(url, self.cursor_query_param, self.encode_cursor(row, backwards))
+
+    def get_next_link(self) -> Optional[str]:
+        if not getattr(self, 'cursor_mode', False):
+            return super().get_next_link()
+        if not self.has_next or not self.page_rows:
+            return None
+        return self._cursor_link(self.page_rows[-1], backwards=False)
+
+    def get_previous_link(self) -> Optional[str]:
+        if not getattr(self, 'cursor_mode', False):
+            return super().get_previous_link()
+        if not self.has_previous or not self.page_rows:
+            return None
+        return self._cursor_link(self.page_rows[0], backwards=True)
+
+    def get_paginated_response(self, data: Any) -> Response:
+        if self.cursor_mode:
+            count, approximate = self.count, self.count_is_estimate
+        else:
+            count, approximate = self.page.paginator.count, self.page.paginator.count_is_estimate
+        return Response({
+            'count': count,
+            'count_approximate': approximate,
+            'next': self.get_next_link(),
+            'previous': self.get_previous_link(),
+            'results': data
+        })
+
+    def get_paginated_response_schema(self, schema: Dict) -> Dict:
+        response_schema = super().get_paginated_response_schema(schema)
+        response_schema['properties']['count_approximate'] = {
+            'type': 'boolean',
+            'example': False,
+            'description': 'True when count is a planner estimate beyond the exact-count cap.',
+        }
+        return response_schema
+
+    def get_schema_operation_parameters(self, view) -> List[Dict]:
+        parameters = super().get_schema_operation_parameters(view)
+        parameters.append({
+            'name': self.cursor_query_param,
+            'required': False,
+            'in': 'query',
+            'description': self.cursor_query_description,
+            'schema': {'type': 'string'},
+        })
+        return parameters
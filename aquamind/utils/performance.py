@@ -0,0 +1,525 @@
+"""
+Per-request and per-task performance instrumentation.
+
+``collect()`` wraps a unit of work (an HTTP request in
+``aquamind.middleware.RequestMetricsMiddleware``, a Celery task via the
+signal hooks in ``aquamind.celery``) and records:
+
+- wall time and DB time (every statement passes through an execute wrapper
+  on each connection; no debug cursor, so it is safe with DEBUG=False);
+- query count and a fingerprint per statement: literals and placeholders
+  are replaced by ``?`` and IN lists collapsed, so the same query issued
+  with different ids counts as a duplicate. A fingerprint repeated
+  PERF_NPLUSONE_THRESHOLD times or more within one unit is an N+1
+  suspect;
+- aggregate cache hits/misses (aquamind.utils.aggregate_cache reports into
+  the current collection);
+- response size (requests only).
+
+Results are folded into fixed-bucket histograms and counters in a
+process-local registry, rendered in Prometheus text format by
+``render_prometheus()`` and summarised per endpoint by
+``endpoint_profiles()``. With several gunicorn/Celery workers each process
+exposes its own series, which Prometheus sums per instance as usual.
+
+Profiling is opt-in: ``Profiler`` uses pyinstrument when installed and
+cProfile otherwise, and finished reports are kept in a small ring buffer
+(``recent_profiles()``/``get_profile()``).
+"""
+import contextvars
+import cProfile
+import hashlib
+import io
+import logging
+import pstats
+import re
+import threading
+import time
+import uuid
+from collections import Counter, deque
+from contextlib import ExitStack, contextmanager
+from typing import Dict, List, Optional
+
+from django.conf import settings
+from django.db import connections
+from django.utils import timezone
+
+try:
+    from pyinstrument import Profiler as _PyinstrumentProfiler
+    HAS_PYINSTRUMENT = True
+except ImportError:  # pragma: no cover - optional dependency
+    _PyinstrumentProfiler = None
+    HAS_PYINSTRUMENT = False
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200, 500, 1000)
+SIZE_BUCKETS = (1024, 10240, 102400, 1048576, 10485760)
+
+# Distinct duplicate fingerprints remembered per endpoint/task
+MAX_FINGERPRINTS = 20
+SQL_SAMPLE_LENGTH = 300
+PROFILE_STATS_LINES = 40
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER = re.compile(r"%s|%\(\w+\)s")
+_IN_LIST = re.compile(r"\bIN\s*\((?:\s*\?\s*,?)+\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+_current = contextvars.ContextVar('aquamind_execution_profile', default=None)
+
+
+def normalize_sql(sql: str) -> str:
+    """SQL with literals and placeholders replaced by ``?`` and IN lists collapsed."""
+    sql = _STRING_LITERAL.sub('?', sql)
+    sql = _PLACEHOLDER.sub('?', sql)
+    sql = _NUMBER_LITERAL.sub('?', sql)
+    sql = _IN_LIST.sub('IN (...)', sql)
+    return _WHITESPACE.sub(' ', sql).strip()
+
+
+def fingerprint(sql: str) -> str:
+    return hashlib.sha1(normalize_sql(sql).encode()).hexdigest()[:12]
+
+
+class ExecutionProfile:
+    """Statements, DB time and cache outcomes of one request or task."""
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.duration = 0.0
+        self.queries = 0
+        self.db_seconds = 0.0
+        self.cache_hits = 0
+        self.cache_misses = 0
+        self.statements = Counter()
+        self.samples = {}
+
+    def __call__(self, execute, sql, params, many, context):
+        started = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            self.db_seconds += time.perf_counter() - started
+            self.queries += 1
+            key = fingerprint(sql)
+            self.statements[key] += 1
+            if key not in self.samples:
+                self.samples[key] = normalize_sql(sql)[:SQL_SAMPLE_LENGTH]
+
+    def finish(self) -> None:
+        self.duration = time.perf_counter() - self.started
+
+    @property
+    def duplicate_queries(self) -> int:
+        """Statements that repeated an earlier fingerprint."""
+        return sum(count - 1 for count in self.statements.values() if count > 1)
+
+    def n_plus_one(self, threshold: Optional[int] = None) -> Dict[str, int]:
+        """Fingerprints repeated at least ``threshold`` times."""
+        threshold = threshold or settings.PERF_NPLUSONE_THRESHOLD
+        return {key: count for key, count in self.statements.items() if count >= threshold}
+
+
+@contextmanager
+def collect():
+    """Collect an ExecutionProfile for the enclosed block on every DB connection."""
+    profile = ExecutionProfile()
+    token = _current.set(profile)
+    try:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(profile))
+            yield profile
+    finally:
+        profile.finish()
+        _current.reset(token)
+
+
+def current_profile() -> Optional[ExecutionProfile]:
+    return _current.get()
+
+
+def note_cache(outcome: str) -> None:
+    """Count an aggregate cache ``'hit'`` or ``'miss'`` against the current collection."""
+    profile = _current.get()
+    if profile is None:
+        return
+    if outcome == 'hit':
+        profile.cache_hits += 1
+    else:
+        profile.cache_misses += 1
+
+
+# ----------------------------------------------------------------------------
+# Registry
+# ----------------------------------------------------------------------------
+
+METRICS = {
+    'aquamind_http_request_duration_seconds': ('histogram', 'Request wall time.', DURATION_BUCKETS),
+    'aquamind_http_request_db_seconds': ('histogram', 'Time spent in database statements per request.', DURATION_BUCKETS),
+    'aquamind_http_request_queries': ('histogram', 'Database statements per request.', QUERY_BUCKETS),
+    'aquamind_http_response_size_bytes': ('histogram', 'Response body size.', SIZE_BUCKETS),
+    'aquamind_http_requests_total': ('counter', 'Requests by status class.', None),
+    'aquamind_http_duplicate_queries_total': ('counter', 'Statements repeating an earlier fingerprint in the same request.', None),
+    'aquamind_http_n_plus_one_requests_total': ('counter', 'Requests with an N+1 query pattern.', None),
+    'aquamind_http_cache_requests_total': ('counter', 'Aggregate cache lookups by result.', None),
+    'aquamind_task_duration_seconds': ('histogram', 'Celery task wall time.', DURATION_BUCKETS),
+    'aquamind_task_db_seconds': ('histogram', 'Time spent in database statements per task.', DURATION_BUCKETS),
+    'aquamind_task_queries': ('histogram', 'Database statements per task.', QUERY_BUCKETS),
+    'aquamind_task_runs_total': ('counter', 'Celery task runs by final state.', None),
+    'aquamind_task_duplicate_queries_total': ('counter', 'Statements repeating an earlier fingerprint in the same task.', None),
+    'aquamind_task_n_plus_one_runs_total': ('counter', 'Task runs with an N+1 query pattern.', None),
+}
+
+
+class Histogram:
+    """Cumulative-bucket histogram as Prometheus expects it."""
+
+    def __init__(self, buckets):
+        self.buckets = tuple(buckets)
+        self.counts = [0] * len(self.buckets)
+        self.total = 0.0
+        self.count = 0
+
+    def observe(self, value: float) -> None:
+        self.total += value
+        self.count += 1
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[index] += 1
+
+
+class MetricsRegistry:
+    """Thread-safe, process-local store of histograms, counters and unit summaries."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self) -> None:
+        with self._lock:
+            self._histograms = {}
+            self._counters = Counter()
+            self._units = {}
+
+    def observe(self, name: str, labels: tuple, value: float) -> None:
+        with self._lock:
+            key = (name, labels)
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram(METRICS[name][2])
+            histogram.observe(value)
+
+    def inc(self, name: str, labels: tuple, amount: float = 1) -> None:
+        if amount:
+            with self._lock:
+                self._counters[(name, labels)] += amount
+
+    def record_unit(self, kind: str, name: str, profile: ExecutionProfile, size: Optional[int] = None) -> None:
+        """Fold one request/task into the summary served by ``endpoint_profiles()``."""
+        threshold = settings.PERF_NPLUSONE_THRESHOLD
+        with self._lock:
+            unit = self._units.get((kind, name))
+            if unit is None:
+                unit = self._units[(kind, name)] = {
+                    'count': 0, 'duration': 0.0, 'max_duration': 0.0, 'db_seconds': 0.0,
+                    'queries': 0, 'max_queries': 0, 'n_plus_one': 0, 'cache_hits': 0,
+                    'cache_misses': 0, 'bytes': 0, 'sized': 0,
+                    'duplicates': Counter(), 'samples': {},
+                }
+            unit['count'] += 1
+            unit['duration'] += profile.duration
+            unit['max_duration'] = max(unit['max_duration'], profile.duration)
+            unit['db_seconds'] += profile.db_seconds
+            unit['queries'] += profile.queries
+            unit['max_queries'] = max(unit['max_queries'], profile.queries)
+            unit['cache_hits'] += profile.cache_hits
+            unit['cache_misses'] += profile.cache_misses
+            if size is not None:
+                unit['bytes'] += size
+                unit['sized'] += 1
+            if any(count >= threshold for count in profile.statements.values()):
+                unit['n_plus_one'] += 1
+            for key, count in profile.statements.items():
+                if count > 1:
+                    unit['duplicates'][key] += count - 1
+                    unit['samples'].setdefault(key, profile.samples[key])
+            if len(unit['duplicates']) > 2 * MAX_FINGERPRINTS:
+                unit['duplicates'] = Counter(dict(unit['duplicates'].most_common(MAX_FINGERPRINTS)))
+                unit['samples'] = {key: unit['samples'][key] for key in unit['duplicates']}
+
+    def snapshot(self):
+        with self._lock:
+            histograms = {
+                key: (list(h.counts), h.total, h.count, h.buckets) for key, h in self._histograms.items()
+            }
+            counters = dict(self._counters)
+            units = {
+                key: {**unit, 'duplicates': unit['duplicates'].most_common(MAX_FINGERPRINTS),
+                      'samples': dict(unit['samples'])}
+                for key, unit in self._units.items()
+            }
+        return histograms, counters, units
+
+
+registry = MetricsRegistry()
+
+
+def _status_class(status_code: int) -> str:
+    return f"{status_code // 100}xx"
+
+
+def record_request(view: str, method: str, status_code: int, profile: ExecutionProfile,
+                   size: Optional[int] = None) -> None:
+    labels = (('view', view), ('method', method))
+    registry.observe('aquamind_http_request_duration_seconds', labels, profile.duration)
+    registry.observe('aquamind_http_request_db_seconds', labels, profile.db_seconds)
+    registry.observe('aquamind_http_request_queries', labels, profile.queries)
+    if size is not None:
+        registry.observe('aquamind_http_response_size_bytes', labels, size)
+    registry.inc('aquamind_http_requests_total', labels + (('status', _status_class(status_code)),))
+    registry.inc('aquamind_http_duplicate_queries_total', labels, profile.duplicate_queries)
+    registry.inc('aquamind_http_cache_requests_total', labels + (('result', 'hit'),), profile.cache_hits)
+    registry.inc('aquamind_http_cache_requests_total', labels + (('result', 'miss'),), profile.cache_misses)
+    suspects = profile.n_plus_one()
+    if suspects:
+        registry.inc('aquamind_http_n_plus_one_requests_total', labels)
+        _log_n_plus_one(f"{method} {view}", profile, suspects)
+    registry.record_unit('request', f"{method} {view}", profile, size)
+
+
+def record_task(task_name: str, state: str, profile: ExecutionProfile) -> None:
+    labels = (('task', task_name),)
+    registry.observe('aquamind_task_duration_seconds', labels, profile.duration)
+    registry.observe('aquamind_task_db_seconds', labels, profile.db_seconds)
+    registry.observe('aquamind_task_queries', labels, profile.queries)
+    registry.inc('aquamind_task_runs_total', labels + (('state', state or 'UNKNOWN'),))
+    registry.inc('aquamind_task_duplicate_queries_total', labels, profile.duplicate_queries)
+    suspects = profile.n_plus_one()
+    if suspects:
+        registry.inc('aquamind_task_n_plus_one_runs_total', labels)
+        _log_n_plus_one(task_name, profile, suspects)
+    registry.record_unit('task', task_name, profile)
+
+
+def _log_n_plus_one(name: str, profile: ExecutionProfile, suspects: Dict[str, int]) -> None:
+    key, count = max(suspects.items(), key=lambda item: item[1])
+    logger.warning(
+        "N+1 suspect in %s: %d queries, fingerprint %s repeated %d times: %s",
+        name, profile.queries, key, count, profile.samples[key],
+    )
+
+
+def _escape(value: str) -> str:
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+def _labels(labels, extra=()) -> str:
+    pairs = tuple(labels) + tuple(extra)
+    if not pairs:
+        return ''
+    return '{' + ','.join(f'{key}="{_escape(value)}"' for key, value in pairs) + '}'
+
+
+def _number(value) -> str:
+    return repr(float(value)) if isinstance(value, float) else str(value)
+
+
+def render_prometheus() -> str:
+    """All series of this process in Prometheus text exposition format 0.0.4."""
+    from aquamind.utils.aggregate_cache import cache_metrics
+
+    histograms, counters, _ = registry.snapshot()
+    lines = []
+    for name, (kind, help_text, _buckets) in METRICS.items():
+        if kind == 'histogram':
+            series = sorted((labels, data) for (metric, labels), data in histograms.items() if metric == name)
+        else:
+            series = sorted((labels, value) for (metric, labels), value in counters.items() if metric == name)
+        if not series:
+            continue
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} {kind}")
+        for labels, data in series:
+            if kind == 'counter':
+                lines.append(f"{name}{_labels(labels)} {_number(data)}")
+                continue
+            counts, total, count, buckets = data
+            for bound, bucket_count in zip(buckets, counts):
+                lines.append(f"{name}_bucket{_labels(labels, (('le', _number(bound)),))} {bucket_count}")
+            lines.append(f'{name}_bucket{_labels(labels, (("le", "+Inf"),))} {count}')
+            lines.append(f"{name}_sum{_labels(labels)} {_number(total)}")
+            lines.append(f"{name}_count{_labels(labels)} {count}")
+
+    aggregate = cache_metrics()
+    if aggregate:
+        lines.append("# HELP aquamind_aggregate_cache_lookups_total Aggregate endpoint cache lookups by result.")
+        lines.append("# TYPE aquamind_aggregate_cache_lookups_total counter")
+        for endpoint, stats in sorted(aggregate.items()):
+            for result, key in (('hit', 'hits'), ('miss', 'misses')):
+                labels = (('endpoint', endpoint), ('result', result))
+                lines.append(f"aquamind_aggregate_cache_lookups_total{_labels(labels)} {stats[key]}")
+    return '\n'.join(lines) + '\n'
+
+
+def endpoint_profiles(kind: Optional[str] = None) -> List[dict]:
+    """Per-endpoint (and per-task) summaries, slowest total time first."""
+    _, _, units = registry.snapshot()
+    profiles = []
+    for (unit_kind, name), unit in units.items():
+        if kind and unit_kind != kind:
+            continue
+        count = unit['count']
+        profiles.append({
+            'kind': unit_kind,
+            'name': name,
+            'count': count,
+            'total_ms': round(unit['duration'] * 1000, 2),
+            'avg_ms': round(unit['duration'] * 1000 / count, 2),
+            'max_ms': round(unit['max_duration'] * 1000, 2),
+            'avg_db_ms': round(unit['db_seconds'] * 1000 / count, 2),
+            'avg_queries': round(unit['queries'] / count, 2),
+            'max_queries': unit['max_queries'],
+            'n_plus_one': unit['n_plus_one'],
+            'cache_hits': unit['cache_hits'],
+            'cache_misses': unit['cache_misses'],
+            'avg_bytes': round(unit['bytes'] / unit['sized']) if unit['sized'] else None,
+            'duplicate_queries': [
+                {'fingerprint': key, 'repeats': repeats, 'sql': unit['samples'].get(key, '')}
+                for key, repeats in unit['duplicates']
+            ],
+        })
+    profiles.sort(key=lambda profile: profile['total_ms'], reverse=True)
+    return profiles
+
+
+def reset_metrics() -> None:
+    registry.reset()
+    with _profiles_lock:
+        _profiles.clear()
+
+
+# ----------------------------------------------------------------------------
+# Profiling
+# ----------------------------------------------------------------------------
+
+_profiles_lock = threading.Lock()
+_profiles = deque()
+_profiling = contextvars.ContextVar('aquamind_profiling', default=False)
+
+
+class Profiler:
+    """Start/stop wrapper over pyinstrument (when installed) or cProfile."""
+
+    def __init__(self):
+        self.engine = 'pyinstrument' if HAS_PYINSTRUMENT else 'cprofile'
+        self._profiler = _PyinstrumentProfiler() if HAS_PYINSTRUMENT else cProfile.Profile()
+        self._token = None
+
+    @staticmethod
+    def active() -> bool:
+        """True when a profiler already runs in this context (profilers do not nest)."""
+        return _profiling.get()
+
+    def start(self) -> None:
+        self._token = _profiling.set(True)
+        if HAS_PYINSTRUMENT:
+            self._profiler.start()
+        else:
+            self._profiler.enable()
+
+    def stop(self) -> str:
+        """Stop profiling and return the text report."""
+        try:
+            if HAS_PYINSTRUMENT:
+                self._profiler.stop()
+                return self._profiler.output_text(unicode=True, color=False)
+            self._profiler.disable()
+            stream = io.StringIO()
+            stats = pstats.Stats(self._profiler, stream=stream)
+            stats.sort_stats('cumulative').print_stats(PROFILE_STATS_LINES)
+            return stream.getvalue()
+        finally:
+            _profiling.reset(self._token)
+
+
+def store_profile(kind: str, name: str, report: str, profile: ExecutionProfile, engine: str) -> str:
+    """Keep a profiler report in the ring buffer; returns its id."""
+    profile_id = uuid.uuid4().hex[:16]
+    entry = {
+        'id': profile_id,
+        'kind': kind,
+        'name': name,
+        'engine': engine,
+        'captured_at': timezone.now().isoformat(),
+        'duration_ms': round(profile.duration * 1000, 2),
+        'db_ms': round(profile.db_seconds * 1000, 2),
+        'queries': profile.queries,
+        'duplicate_queries': profile.duplicate_queries,
+        'report': report,
+    }
+    with _profiles_lock:
+        _profiles.append(entry)
+        while len(_profiles) > settings.PERF_PROFILES_KEPT:
+            _profiles.popleft()
+    return profile_id
+
+
+def recent_profiles() -> List[dict]:
+    """Stored reports without their bodies, newest first."""
+    with _profiles_lock:
+        entries = list(_profiles)
+    return [{key: value for key, value in entry.items() if key != 'report'} for entry in reversed(entries)]
+
+
+def get_profile(profile_id: str) -> Optional[dict]:
+    with _profiles_lock:
+        for entry in _profiles:
+            if entry['id'] == profile_id:
+                return dict(entry)
+    return None
+
+
+# ----------------------------------------------------------------------------
+# Celery hooks (connected in aquamind.celery)
+# ----------------------------------------------------------------------------
+
+_running_tasks = {}
+_running_tasks_lock = threading.Lock()
+
+
+def _task_profile_requested(request) -> bool:
+    # Worker-delivered custom headers become request attributes; eager
+    # apply() keeps them in request.headers.
+    name = settings.PERF_TASK_PROFILE_HEADER
+    return bool(getattr(request, name, None) or (getattr(request, 'headers', None) or {}).get(name))
+
+
+def task_started(task_id: str, task) -> None:
+    if not settings.PERF_METRICS_ENABLED or task_id is None:
+        return
+    stack = ExitStack()
+    profile = stack.enter_context(collect())
+    profiler = None
+    requested = _task_profile_requested(task.request)
+    if settings.PERF_PROFILER_ENABLED and requested and not Profiler.active():
+        profiler = Profiler()
+        profiler.start()
+    with _running_tasks_lock:
+        _running_tasks[task_id] = (stack, profile, profiler)
+
+
+def task_finished(task_id: str, task, state: Optional[str]) -> None:
+    with _running_tasks_lock:
+        running = _running_tasks.pop(task_id, None)
+    if running is None:
+        return
+    stack, profile, profiler = running
+    report = profiler.stop() if profiler else None
+    stack.close()
+    record_task(task.name, state, profile)
+    if report is not None:
+        store_profile('task', task.name, report, profile, profiler.engine)
@@ -3,8 +3,10 @@
 AquaMind Phase 3: Core Event Generation Logic
 Compact implementation focusing on essential features
 """
-import os, sys, django, json, random, argparse, numpy as np
+import os, sys, django, json, random, argparse, statistics, numpy as np
+from collections import defaultdict
 from datetime import date, datetime, time, timedelta
+from time import perf_counter
 from decimal import Decimal
 from pathlib import Path
 
@@ -14,6 +16,7 @@ os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'aquamind.settings')
 django.setup()
 
 from django.db import transaction
+from django.db.backends.utils import format_number
 from django.utils import timezone
 from django.contrib.auth import get_user_model
 from apps.batch.models import *
@@ -32,7 +35,19 @@ from apps.scenario.models import (
 from apps.infrastructure.models import FeedContainer
 from apps.infrastructure.models import Container
 from apps.batch.models import BatchContainerAssignment, TransferAction, BatchTransferWorkflow
-from django.db.models import Q
+from django.db.models import F, Q
+from simple_history.exceptions import NotHistoricalModelError
+from simple_history.utils import (
+    bulk_create_with_history, bulk_update_with_history, get_history_manager_for_model
+)
+from apps.batch.services.live_state import BatchLiveStateService
+from apps.batch.services.recompute_scheduler import mark_assignment_dirty, mark_batch_dirty
+from apps.batch.signals import should_skip_celery_signals
+from apps.inventory.services.fcr_service import FCRCalculationService
+from apps.inventory.services.feed_rollup_service import FeedRollupService
+from aquamind.utils.aggregate_cache import (
+    TAG_ASSIGNMENTS, TAG_FEEDING, TAG_MORTALITY, invalidate_tags
+)
 
 User = get_user_model()
 HOLDING_ROLE = "HOLDING"
@@ -40,8 +55,207 @@ HOLDING_ROLE = "HOLDING"
 PROGRESS_DIR = Path(project_root) / 'aquamind' / 'docs' / 'progress' / 'test_data'
 PROGRESS_DIR.mkdir(parents=True, exist_ok=True)
 
+
+class SimulationBuffer:
+    """
+    Pending writes for in-memory simulation mode.
+
+    The engine appends new rows and marks changed rows here instead of saving
+    them one by one; flush() writes everything with bulk statements inside a
+    single transaction. Models with simple_history tracking get their
+    historical rows in bulk as well, so the audit trail is kept (one history
+    row per flushed change instead of one per save()).
+
+    Feed stock consumption is recorded as per-stock deltas and applied with
+    F() expressions, so engines running in parallel against shared feed
+    containers don't overwrite each other's consumption.
+
+    Bulk writes don't send post_save, so after writing, flush() runs what
+    those handlers derive from the rows (live state, feed rollups, weighing
+    dates and FCR summaries, recompute marks, cache tags) once per flush
+    for the touched batches and dates; see refresh_derived().
+    """
+
+    # Parents before children: FK targets must have primary keys first.
+    CREATE_ORDER = [
+        FeedPurchase, FeedContainerStock, EnvironmentalReading, FeedingEvent,
+        MortalityEvent, GrowthSample, IndividualGrowthObservation,
+    ]
+    CHANGE_REASON = 'Event engine simulation flush'
+
+    def __init__(self, user=None, batch_size=1000):
+        self.user = user
+        self.batch_size = batch_size
+        self.created = defaultdict(list)
+        self.changed = defaultdict(dict)
+        self.changed_fields = defaultdict(set)
+        self.stock_consumed = defaultdict(Decimal)
+        self.flushes = 0
+        self.rows_written = 0
+        self.flush_seconds = 0.0
+
+    def add(self, obj):
+        self.created[type(obj)].append(obj)
+
+    def touch(self, obj, *fields):
+        """Mark an already-persisted row as changed (saved on next flush)."""
+        model = type(obj)
+        self.changed[model][obj.pk] = obj
+        self.changed_fields[model].update(fields)
+
+    def consume_stock(self, stock, qty):
+        """Record consumption from a persisted stock row as a delta."""
+        self.stock_consumed[stock.pk] += qty
+
+    @staticmethod
+    def as_stored(obj, *field_names):
+        """Round decimal attributes the way saving and re-reading the row would."""
+        for name in field_names:
+            field = obj._meta.get_field(name)
+            value = getattr(obj, field.attname)
+            if value is not None:
+                stored = format_number(Decimal(str(value)), field.max_digits, field.decimal_places)
+                setattr(obj, field.attname, Decimal(stored))
+
+    def __len__(self):
+        return (
+            sum(len(objs) for objs in self.created.values())
+            + sum(len(objs) for objs in self.changed.values())
+            + len(self.stock_consumed)
+        )
+
+    @staticmethod
+    def _is_historical(model):
+        try:
+            get_history_manager_for_model(model)
+        except NotHistoricalModelError:
+            return False
+        return True
+
+    def flush(self):
+        """Write all pending rows. Returns the number of rows written."""
+        if not len(self):
+            return 0
+        started = perf_counter()
+        written = 0
+        now = timezone.now()
+        feedings = list(self.created.get(FeedingEvent, ()))
+        mortalities = list(self.created.get(MortalityEvent, ()))
+        samples = list(self.created.get(GrowthSample, ()))
+        assignments = list(self.changed.get(BatchContainerAssignment, {}).values())
+        with transaction.atomic():
+            for model in self.CREATE_ORDER + [m for m in self.created if m not in self.CREATE_ORDER]:
+                objs = self.created.pop(model, None)
+                if not objs:
+                    continue
+                if self._is_historical(model):
+                    bulk_create_with_history(
+                        objs, model, batch_size=self.batch_size,
+                        default_user=self.user, default_change_reason=self.CHANGE_REASON,
+                    )
+                else:
+                    model.objects.bulk_create(objs, batch_size=self.batch_size)
+                written += len(objs)
+
+            for model, by_pk in self.changed.items():
+                fields = set(self.changed_fields[model])
+                # bulk_update doesn't run pre_save(), so refresh auto_now stamps here
+                for field in model._meta.concrete_fields:
+                    if getattr(field, 'auto_now', False):
+                        fields.add(field.name)
+                        for obj in by_pk.values():
+                            setattr(obj, field.attname, now)
+                objs = list(by_pk.values())
+                if self._is_historical(model):
+                    bulk_update_with_history(
+                        objs, model, sorted(fields), batch_size=self.batch_size,
+                        default_user=self.user, default_change_reason=self.CHANGE_REASON,
+                    )
+                else:
+                    model.objects.bulk_update(objs, sorted(fields), batch_size=self.batch_size)
+                written += len(objs)
+
+            if self.stock_consumed:
+                for pk, qty in self.stock_consumed.items():
+                    FeedContainerStock.objects.filter(pk=pk).update(
+                        quantity_kg=F('quantity_kg') - qty, updated_at=now
+                    )
+                stocks = list(FeedContainerStock.objects.filter(pk__in=list(self.stock_consumed)))
+                FeedContainerStock.history.bulk_history_create(
+                    stocks, update=True, default_user=self.user,
+                    default_change_reason=self.CHANGE_REASON,
+                )
+                written += len(stocks)
+
+            self.refresh_derived(feedings, mortalities, samples, assignments)
+
+        self.changed.clear()
+        self.changed_fields.clear()
+        self.stock_consumed.clear()
+        self.flushes += 1
+        self.rows_written += written
+        self.flush_seconds += perf_counter() - started
+        return written
+
+    @staticmethod
+    def refresh_derived(feedings, mortalities, samples, assignments):
+        """
+        Apply the post_save side effects of flushed rows, once per flush.
+
+        Mirrors apps.batch.signals, apps.batch.services.growth_service and
+        apps.inventory.signals: the batches' live state, the feed rollups over
+        the fed date range, last_weighing_date and the rolling 30-day FCR
+        summaries, and the growth assimilation recompute marks. Mortality
+        marks are recorded once per (batch, day) rather than once per event;
+        the recompute scheduler merges overlapping marks, so the dispatched
+        ranges are the same.
+        """
+        batch_ids = {e.batch_id for e in feedings} | {e.batch_id for e in mortalities}
+        batch_ids |= {s.assignment.batch_id for s in samples} | {a.batch_id for a in assignments}
+        if batch_ids:
+            BatchLiveStateService.rebuild(batch_ids)
+
+        if feedings:
+            dates = [e.feeding_date for e in feedings]
+            FeedRollupService.refresh_range(
+                min(dates), max(dates), container_ids={e.container_id for e in feedings}
+            )
+
+        weighed = {}
+        for sample in samples:
+            batch_id = sample.assignment.batch_id
+            weighed[batch_id] = max(weighed.get(batch_id, sample.sample_date), sample.sample_date)
+        for batch_id, sample_date in weighed.items():
+            BatchContainerAssignment.objects.filter(
+                batch_id=batch_id, is_active=True
+            ).update(last_weighing_date=sample_date)
+
+        fcr_batches = {e.batch_id: e.batch for e in feedings if e.batch_assignment.is_active}
+        fcr_batches.update({s.assignment.batch_id: s.assignment.batch for s in samples})
+        if fcr_batches:
+            end_date = date.today()
+            start_date = end_date - timedelta(days=30)
+            for batch_id, batch in sorted(fcr_batches.items()):
+                for a in BatchContainerAssignment.objects.filter(batch_id=batch_id, is_active=True):
+                    FCRCalculationService.create_container_feeding_summary(a, start_date, end_date)
+                FCRCalculationService.aggregate_container_fcr_to_batch(batch, start_date, end_date)
+
+        if not should_skip_celery_signals():
+            for sample in samples:
+                mark_assignment_dirty(sample.assignment, sample.sample_date, window_days=2, reason='growth_sample')
+            mortality_days = {(e.batch_id, e.event_date): e.batch for e in mortalities}
+            for (_, event_date), batch in sorted(mortality_days.items(), key=lambda item: item[0]):
+                mark_batch_dirty(batch, event_date, window_days=1, reason='mortality')
+
+        tags = [tag for tag, rows in (
+            (TAG_FEEDING, feedings), (TAG_MORTALITY, mortalities), (TAG_ASSIGNMENTS, assignments)
+        ) if rows]
+        if tags:
+            transaction.on_commit(lambda: invalidate_tags(*tags))
+
 class EventEngine:
-    def __init__(self, start_date, eggs, geography, duration=900, station_name=None, batch_number=None, event_feed=None):
+    def __init__(self, start_date, eggs, geography, duration=900, station_name=None, batch_number=None, event_feed=None,
+                 simulate=False, flush_days=0, seed=None):
         self.start_date = start_date
         self.current_date = start_date
         self.initial_eggs = eggs
@@ -50,6 +264,20 @@ class EventEngine:
         self.event_feed = event_feed
         self.assigned_station_name = station_name  # DETERMINISTIC: Pre-assigned station
         self.assigned_batch_number = batch_number  # DETERMINISTIC: Pre-assigned batch number from schedule
+        self.seed = seed  # DETERMINISTIC: Same seed + same starting database -> identical data
+
+        # In-memory simulation: daily events accumulate in a SimulationBuffer and are
+        # bulk-flushed at stage boundaries, before harvest, and every flush_days days.
+        if simulate and event_feed:
+            raise ValueError("Simulation mode cannot be combined with an external event feed")
+        self.simulate = simulate
+        self.flush_days = flush_days
+        self.buffer = None
+        self._reload_assignments = True
+        self._sensor_cache = {}
+        self._feed_container_cache = {}
+        self._feed_cache = {}
+        self._stock_ledger = {}
         self.stats = {
             'days': 0, 'env': 0, 'feed': 0, 'mort': 0, 'growth': 0, 
             'purchases': 0, 'lice': 0, 'scenarios': 0, 'finance_facts': 0, 
@@ -646,7 +874,19 @@ class EventEngine:
         print(f"  → Renamed batch for sea stage: {old_name} -> {candidate}")
         
     def process_day(self):
-        self.assignments = list(BatchContainerAssignment.objects.filter(batch=self.batch, is_active=True))
+        if self.simulate:
+            if (
+                self._reload_assignments
+                or self._stage_transition_due()
+                or (self.flush_days and self.stats['days'] % self.flush_days == 0)
+            ):
+                self.flush_pending()
+            else:
+                # Direct mode re-reads assignments every day; match its rounding
+                for a in self.assignments:
+                    SimulationBuffer.as_stored(a, 'avg_weight_g', 'biomass_kg')
+        else:
+            self.assignments = list(BatchContainerAssignment.objects.filter(batch=self.batch, is_active=True))
         if not self.assignments: return
 
         if self.event_feed and hasattr(self.event_feed, 'process_day'):
@@ -656,7 +896,11 @@ class EventEngine:
                 return
 
         # Check for stage transition BEFORE processing events
+        stage_id = self.batch.lifecycle_stage_id
         self.check_stage_transition()
+        if self.batch.lifecycle_stage_id != stage_id:
+            # New assignments: flush today's events and reload them tomorrow
+            self._reload_assignments = True
         
         # 6 readings per day (optimized bulk insert)
         self.env_readings_bulk([6, 8, 10, 14, 16, 18])
@@ -681,6 +925,24 @@ class EventEngine:
         if self.event_feed and hasattr(self.event_feed, 'after_day'):
             self.event_feed.after_day(self)
 
+    def _save_assignment(self, a, *fields):
+        if self.buffer is None:
+            a.save()
+            return
+        # Mirror BatchContainerAssignment.save(), which bulk_update bypasses
+        if a.population_count is not None and a.avg_weight_g is not None and a.avg_weight_g > Decimal('0'):
+            a.biomass_kg = (Decimal(str(a.population_count)) * Decimal(str(a.avg_weight_g))) / Decimal('1000')
+        self.buffer.touch(a, *fields, 'biomass_kg')
+
+    def flush_pending(self):
+        """Write buffered simulation events, then re-read the active assignments."""
+        written = self.buffer.flush()
+        # Drop the stock ledger so consumption by other engines is picked up
+        self._stock_ledger.clear()
+        self.assignments = list(BatchContainerAssignment.objects.filter(batch=self.batch, is_active=True))
+        self._reload_assignments = False
+        return written
+
     def env_readings_bulk(self, hours):
         """Bulk create environmental readings for performance (M4 Max optimized)"""
         readings = []
@@ -688,7 +950,7 @@ class EventEngine:
             for a in self.assignments:
                 for param in self.env_params:
                     val = self.gen_env_value(param.name)
-                    sensor = a.container.sensors.filter(sensor_type=param.name).first()
+                    sensor = self._get_sensor(a.container, param.name)
                     if sensor:
                         readings.append(EnvironmentalReading(
                             reading_time=timezone.make_aware(datetime.combine(self.current_date, time(hour=hour))),
@@ -700,8 +962,29 @@ class EventEngine:
         
         # Bulk insert (100x faster than individual creates)
         if readings:
-            EnvironmentalReading.objects.bulk_create(readings, batch_size=500)
+            if self.buffer is not None:
+                for reading in readings:
+                    self.buffer.add(reading)
+            else:
+                EnvironmentalReading.objects.bulk_create(readings, batch_size=500)
             self.stats['env'] += len(readings)
+
+    def _get_sensor(self, container, sensor_type):
+        if not self.simulate:
+            return container.sensors.filter(sensor_type=sensor_type).first()
+        key = (container.id, sensor_type)
+        if key not in self._sensor_cache:
+            self._sensor_cache[key] = container.sensors.filter(sensor_type=sensor_type).first()
+        return self._sensor_cache[key]
+
+    def _get_feed_container(self, container):
+        if self.simulate and container.id in self._feed_container_cache:
+            return self._feed_container_cache[container.id]
+        fc = FeedContainer.objects.filter(hall=container.hall).first() if container.hall else \
+             FeedContainer.objects.filter(area=container.area).first()
+        if self.simulate:
+            self._feed_container_cache[container.id] = fc
+        return fc
     
     def gen_env_value(self, name):
         vals = {'Dissolved Oxygen': 90, 'CO2': 8, 'pH': 7.2, 'Temperature': 12,
@@ -723,18 +1006,23 @@ class EventEngine:
             amount = biomass * (rate / 100) / 2
             
             feed = self.get_feed(a.lifecycle_stage)
-            fc = FeedContainer.objects.filter(hall=a.container.hall).first() if a.container.hall else \
-                 FeedContainer.objects.filter(area=a.container.area).first()
+            fc = self._get_feed_container(a.container)
             
             if fc and feed:
                 cost = self.consume_fifo(fc, feed, amount)
-                FeedingEvent.objects.create(
+                event = FeedingEvent(
                     batch=self.batch, container=a.container, batch_assignment=a, feed=feed,
                     feeding_date=self.current_date, feeding_time=time(hour=hour),
                     amount_kg=Decimal(str(amount)), batch_biomass_kg=a.biomass_kg,
                     feeding_percentage=Decimal(str(amount / biomass * 100)) if biomass > 0 else Decimal('0'),
                     feed_cost=cost, method='AUTOMATIC'
                 )
+                if self.buffer is not None:
+                    # Mirror FeedingEvent.save(), which bulk_create bypasses
+                    event.feeding_percentage = event.calculate_feeding_percentage()
+                    self.buffer.add(event)
+                else:
+                    event.save()
                 self.stats['feed'] += 1
     
     def get_feed(self, stage):
@@ -748,9 +1036,17 @@ class EventEngine:
             'Finisher Feed 4.5mm'   # Adult
         ]
         feed_name = feed_names[stage.order - 1] if stage.order <= 6 else 'Starter Feed 0.5mm'
-        return Feed.objects.filter(name=feed_name).first() if feed_name else None
+        if not feed_name:
+            return None
+        if not self.simulate:
+            return Feed.objects.filter(name=feed_name).first()
+        if feed_name not in self._feed_cache:
+            self._feed_cache[feed_name] = Feed.objects.filter(name=feed_name).first()
+        return self._feed_cache[feed_name]
     
     def consume_fifo(self, fc, feed, amt):
+        if self.buffer is not None:
+            return self._consume_fifo_buffered(fc, feed, amt)
         stocks = FeedContainerStock.objects.filter(
             feed_container=fc, feed_purchase__feed=feed, quantity_kg__gt=0
         ).order_by('entry_date')
@@ -781,20 +1077,74 @@ class EventEngine:
         
         return cost
     
+    def _consume_fifo_buffered(self, fc, feed, amt):
+        """
+        consume_fifo() against an in-memory stock ledger.
+
+        Same FIFO order, cost and reorder decisions (and therefore the same
+        random draws) as the database path; consumption of persisted stock is
+        recorded as deltas on the buffer.
+        """
+        key = (fc.id, feed.id)
+        stocks = self._stock_ledger.get(key)
+        if stocks is None:
+            stocks = list(FeedContainerStock.objects.filter(
+                feed_container=fc, feed_purchase__feed=feed
+            ).select_related('feed_purchase').order_by('entry_date', 'id'))
+            self._stock_ledger[key] = stocks
+
+        rem = Decimal(str(amt))
+        cost = Decimal('0')
+
+        for s in stocks:
+            if rem <= 0: break
+            if s.quantity_kg <= 0: continue
+            cons = min(s.quantity_kg, rem)
+            cost += cons * s.feed_purchase.cost_per_kg
+            before = s.quantity_kg
+            s.quantity_kg -= cons
+            SimulationBuffer.as_stored(s, 'quantity_kg')
+            if s.pk is not None:
+                self.buffer.consume_stock(s, before - s.quantity_kg)
+            rem -= cons
+
+        total = sum((s.quantity_kg for s in stocks), Decimal('0'))
+        threshold = fc.capacity_kg * Decimal('0.2')
+
+        if total < threshold:
+            reorder_qty = min(fc.capacity_kg - total, fc.capacity_kg * Decimal('0.8'))
+            if reorder_qty > 100:
+                stock = self.reorder_feed(fc, feed, reorder_qty)
+                SimulationBuffer.as_stored(stock, 'quantity_kg')
+                # Keep the ledger in entry_date order
+                idx = len(stocks)
+                while idx > 0 and stocks[idx - 1].entry_date > stock.entry_date:
+                    idx -= 1
+                stocks.insert(idx, stock)
+
+        return cost
+
     def reorder_feed(self, fc, feed, qty):
-        p = FeedPurchase.objects.create(
+        p = FeedPurchase(
             feed=feed, purchase_date=self.current_date, supplier='BioMar',
             batch_number=f"AUTO-{self.current_date.strftime('%Y%m%d')}-{random.randint(1000,9999)}",
             quantity_kg=qty, cost_per_kg=Decimal('2.30'),
             expiry_date=self.current_date + timedelta(days=365)
         )
-        FeedContainerStock.objects.create(
+        stock = FeedContainerStock(
             feed_container=fc, feed_purchase=p, quantity_kg=qty,
             entry_date=timezone.make_aware(datetime.combine(
                 self.current_date + timedelta(days=3), datetime.min.time()
             ))
         )
+        if self.buffer is not None:
+            self.buffer.add(p)
+            self.buffer.add(stock)
+        else:
+            p.save()
+            stock.save()
         self.stats['purchases'] += 1
+        return stock
     
     def mortality_check(self):
         # Daily mortality rates by stage order: [Egg&Alevin, Fry, Parr, Smolt, Post-Smolt, Adult]
@@ -806,9 +1156,9 @@ class EventEngine:
             act = np.random.poisson(exp)
             
             if act > 0:
-                biomass_lost = Decimal(str(act * float(a.avg_weight_g) / 1000))
+                biomass_lost = Decimal(str(round(act * float(a.avg_weight_g) / 1000, 2)))
                 
-                MortalityEvent.objects.create(
+                event = MortalityEvent(
                     batch=self.batch,
                     assignment=a,  # ← FIXED: Container-specific mortality tracking
                     event_date=self.current_date,
@@ -819,7 +1169,11 @@ class EventEngine:
                 )
                 a.population_count -= act
                 a.biomass_kg = Decimal(str(a.population_count * float(a.avg_weight_g) / 1000))
-                a.save()
+                if self.buffer is not None:
+                    self.buffer.add(event)
+                else:
+                    event.save()
+                self._save_assignment(a, 'population_count')
                 self.stats['mort'] += 1
     
     def growth_update(self):
@@ -866,7 +1220,7 @@ class EventEngine:
             
             a.avg_weight_g = Decimal(str(round(new_w, 2)))
             a.biomass_kg = Decimal(str(round(a.population_count * new_w / 1000, 2)))
-            a.save()
+            self._save_assignment(a, 'avg_weight_g')
             
             # Weekly growth sampling (with individual fish observations)
             if self.stats['days'] % 7 == 0:
@@ -874,12 +1228,15 @@ class EventEngine:
                 from random import uniform
                 
                 # Create growth sample (initially with placeholder values)
-                growth_sample = GrowthSample.objects.create(
+                growth_sample = GrowthSample(
                     assignment=a,
                     sample_date=self.current_date,
                     sample_size=0,  # Will be recalculated
                     avg_weight_g=Decimal('0.0'),  # Will be recalculated
                 )
+                if self.buffer is None:
+                    growth_sample.save()
+                observations = []
                 
                 # Generate individual fish observations (30 fish sample)
                 num_fish = 30
@@ -893,16 +1250,41 @@ class EventEngine:
                     # Length: ±10% variation
                     fish_length = base_length * uniform(0.90, 1.10)
                     
-                    IndividualGrowthObservation.objects.create(
+                    observations.append(IndividualGrowthObservation(
                         growth_sample=growth_sample,
                         fish_identifier=str(fish_num),
                         weight_g=Decimal(str(round(fish_weight, 2))),
                         length_cm=Decimal(str(round(fish_length, 2)))
-                    )
+                    ))
                 
-                # Calculate aggregates from individual observations
-                growth_sample.calculate_aggregates()
+                if self.buffer is not None:
+                    self._set_growth_aggregates(growth_sample, observations)
+                    self.buffer.add(growth_sample)
+                    for observation in observations:
+                        self.buffer.add(observation)
+                else:
+                    for observation in observations:
+                        observation.save()
+                    # Calculate aggregates from individual observations
+                    growth_sample.calculate_aggregates()
                 self.stats['growth'] += 1
+
+    @staticmethod
+    def _set_growth_aggregates(growth_sample, observations):
+        """In-memory GrowthSample.calculate_aggregates() (population std dev, like StdDev())."""
+        weights = [float(o.weight_g) for o in observations]
+        lengths = [float(o.length_cm) for o in observations]
+        growth_sample.sample_size = len(observations)
+        growth_sample.avg_weight_g = statistics.fmean(weights)
+        growth_sample.std_deviation_weight = statistics.pstdev(weights)
+        growth_sample.min_weight_g = min(o.weight_g for o in observations)
+        growth_sample.max_weight_g = max(o.weight_g for o in observations)
+        growth_sample.avg_length_cm = statistics.fmean(lengths)
+        growth_sample.std_deviation_length = statistics.pstdev(lengths)
+        if growth_sample.avg_weight_g and growth_sample.avg_length_cm > 0:
+            growth_sample.condition_factor = (
+                growth_sample.avg_weight_g / (growth_sample.avg_length_cm ** 3)
+            ) * 100
     
     def lice_update(self):
         """
@@ -1014,14 +1396,17 @@ class EventEngine:
                 )
                 self.stats['lice'] += 1
     
-    def check_stage_transition(self):
-        """Check if batch should transition to next lifecycle stage"""
+    def _stage_transition_due(self):
+        """True when the batch has served its stage duration and a next stage exists."""
         days_in_stage = self.stats['days'] - self.current_stage_start_day
         current_stage_order = self.batch.lifecycle_stage.order
         # Get duration for current stage (order-1 indexed)
         target_duration = self.stage_durations[current_stage_order - 1] if current_stage_order <= 6 else 999999
-        
-        if days_in_stage >= target_duration:
+        return days_in_stage >= target_duration and self.batch.lifecycle_stage_id != self.stages[-1].id
+
+    def check_stage_transition(self):
+        """Check if batch should transition to next lifecycle stage"""
+        if self._stage_transition_due():
             # Get next stage
             current_idx = None
             for i, stage in enumerate(self.stages):
@@ -1566,8 +1951,6 @@ class EventEngine:
         - Test data for transfer workflow features
         """
         try:
-            from apps.batch.models import BatchTransferWorkflow, TransferAction
-            
             # Get source stage from old assignments
             source_stage = source_assignments[0].lifecycle_stage
             
@@ -2055,13 +2438,24 @@ class EventEngine:
     
     def run(self):
         try:
+            if self.seed is not None:
+                random.seed(self.seed)
+                np.random.seed(self.seed)
+                print(f"✓ DETERMINISTIC: Random seed {self.seed}")
+
             self.init()
             self.create_batch()
+            if self.simulate:
+                self.buffer = SimulationBuffer(user=self.user)
             
             print(f"{'='*80}")
             print(f"Processing {self.duration} Days")
+            if self.simulate:
+                flush_rule = f"every {self.flush_days} days and " if self.flush_days else ""
+                print(f"In-memory simulation: flushing {flush_rule}at stage boundaries")
             print(f"{'='*80}\n")
             
+            loop_started = perf_counter()
             for _ in range(self.duration):
                 self.process_day()
                 self.current_date += timedelta(days=1)
@@ -2069,6 +2463,8 @@ class EventEngine:
                 # Check harvest readiness DAILY (weight-based trigger)
                 if self.should_harvest():
                     print(f"\n  → Harvest trigger: Weight={self.assignments[0].avg_weight_g:.0f}g (target={self.target_harvest_weight:.0f}g)")
+                    if self.buffer is not None:
+                        self.flush_pending()
                     
                     # Recompute growth analysis BEFORE harvest (while assignments active)
                     self._recompute_growth_analysis()
@@ -2077,6 +2473,10 @@ class EventEngine:
                     self.harvest_batch()
                     break  # Stop processing after harvest
             
+            if self.buffer is not None:
+                self.flush_pending()
+            loop_seconds = perf_counter() - loop_started
+
             # Compute Growth Analysis if not already done
             # (harvest_batch() computes it before harvest, but non-harvested batches need it here)
             has_growth_analysis = ActualDailyAssignmentState.objects.filter(batch=self.batch).exists()
@@ -2119,7 +2519,15 @@ class EventEngine:
             print(f"  Population: {final_pop:,} fish")
             print(f"  Avg Weight: {final_weight}g")
             print(f"  Total Biomass: {final_biomass:,.2f}kg")
-            print(f"\nTotal Events: {sum(self.stats.values()):,}\n")
+            print(f"\nTotal Events: {sum(self.stats.values()):,}")
+
+            days_per_sec = self.stats['days'] / loop_seconds if loop_seconds > 0 else 0.0
+            print(f"\nThroughput ({'simulation' if self.simulate else 'direct'} mode):")
+            print(f"  {self.stats['days']} days in {loop_seconds:.1f}s = {days_per_sec:.2f} days/sec")
+            if self.buffer is not None:
+                print(f"  Flushes: {self.buffer.flushes} ({self.buffer.rows_written:,} rows "
+                      f"in {self.buffer.flush_seconds:.1f}s)")
+            print()
             return 0
         except Exception as e:
             print(f"\n✗ Error: {e}")
@@ -2139,6 +2547,12 @@ def main():
                        help='DETERMINISTIC: Pre-assigned batch number from schedule (eliminates race conditions)')
     parser.add_argument('--use-schedule', action='store_true',
                        help='Use pre-allocated containers from CONTAINER_SCHEDULE env var')
+    parser.add_argument('--simulate', action='store_true',
+                       help='In-memory simulation: buffer daily events and bulk-flush them at stage boundaries')
+    parser.add_argument('--flush-days', type=int, default=0,
+                       help='With --simulate, also flush every N simulated days (default: stage boundaries only)')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='DETERMINISTIC: Seed random/numpy so reruns produce identical data')
     args = parser.parse_args()
 
     start = datetime.strptime(args.start_date, '%Y-%m-%d').date()
@@ -2149,7 +2563,10 @@ def main():
     print("║" + " "*78 + "║")
     print("╚" + "═" * 78 + "╝\n")
     
-    engine = EventEngine(start, args.eggs, args.geography, args.duration, args.station, args.batch_number)
+    engine = EventEngine(
+        start, args.eggs, args.geography, args.duration, args.station, args.batch_number,
+        simulate=args.simulate, flush_days=args.flush_days, seed=args.seed,
+    )
     return engine.run()
 
 if __name__ == '__main__':
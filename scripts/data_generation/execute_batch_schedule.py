@@ -16,6 +16,7 @@ import argparse
 import subprocess
 import multiprocessing as mp
 import re
+import zlib
 from datetime import datetime
 from pathlib import Path
 import time
@@ -48,7 +49,12 @@ def _write_batch_log(log_path, stdout, stderr, success):
         f.write(stderr or "(empty)\n")
 
 
-def execute_batch_from_schedule(batch_config, log_dir=None, reference_pack_dir=None):
+def _batch_seed(seed, batch_id):
+    """Per-batch seed: deterministic, but different random streams per batch."""
+    return (seed + zlib.crc32(str(batch_id).encode('utf-8'))) % (2 ** 32)
+
+
+def execute_batch_from_schedule(batch_config, log_dir=None, reference_pack_dir=None, engine_args=None):
     """
     Execute single batch using pre-allocated containers from schedule.
     Running in a separate process via subprocess.
@@ -85,6 +91,11 @@ def execute_batch_from_schedule(batch_config, log_dir=None, reference_pack_dir=N
     station_name = batch_config.get('station')
     if station_name:
         cmd.extend(['--station', station_name])
+    engine_args = engine_args or {}
+    if engine_args.get('simulate'):
+        cmd.extend(['--simulate', '--flush-days', str(engine_args.get('flush_days', 0))])
+    if engine_args.get('seed') is not None:
+        cmd.extend(['--seed', str(_batch_seed(engine_args['seed'], batch_id))])
     
     try:
         # Capture output to avoid terminal spam, but save logs if needed
@@ -124,7 +135,7 @@ def execute_batch_from_schedule(batch_config, log_dir=None, reference_pack_dir=N
 
 def execute_worker_partition(args):
     """Execute a partition of batches assigned to a single worker."""
-    worker_id, batch_configs, log_dir, reference_pack_dir = args
+    worker_id, batch_configs, log_dir, reference_pack_dir, engine_args = args
     results = []
     
     for batch_config in batch_configs:
@@ -132,6 +143,7 @@ def execute_worker_partition(args):
             batch_config,
             log_dir=log_dir,
             reference_pack_dir=reference_pack_dir,
+            engine_args=engine_args,
         )
         result['worker_id'] = worker_id
         results.append(result)
@@ -155,7 +167,14 @@ def main():
             'If omitted, metadata.reference_pack_dir from the schedule is used when present.'
         ),
     )
+    parser.add_argument('--simulate', action='store_true',
+                       help='Run the event engine in in-memory simulation mode (bulk flushes)')
+    parser.add_argument('--flush-days', type=int, default=0,
+                       help='With --simulate, also flush every N simulated days (default: stage boundaries only)')
+    parser.add_argument('--seed', type=int, default=None,
+                       help='Base random seed; each batch gets a stable seed derived from its batch id')
     args = parser.parse_args()
+    engine_args = {'simulate': args.simulate, 'flush_days': args.flush_days, 'seed': args.seed}
     
     if not os.path.exists(args.schedule_file):
         print(f"❌ Schedule file not found: {args.schedule_file}")
@@ -165,6 +184,9 @@ def main():
     print(f"EXECUTING BATCH SCHEDULE: {args.schedule_file}")
     print(f"Workers: {args.workers}")
     print(f"Mode: {'Partitioned (Zero Conflicts)' if args.use_partitions else 'Standard'}")
+    if args.simulate:
+        flush_rule = f"every {args.flush_days} days and " if args.flush_days else ""
+        print(f"Event engine: in-memory simulation (flush {flush_rule}at stage boundaries)")
     print(f"{'='*80}\n")
     
     # Load schedule
@@ -194,7 +216,7 @@ def main():
         for worker_id, partition_info in worker_partitions.items():
             batch_indices = partition_info['batch_indices']
             worker_batches = [batches[i] for i in batch_indices]
-            worker_tasks.append((worker_id, worker_batches, args.log_dir, reference_pack_dir))
+            worker_tasks.append((worker_id, worker_batches, args.log_dir, reference_pack_dir, engine_args))
             print(f"  {worker_id}: {partition_info['count']} batches (indices {partition_info['batch_range']})")
         
         print(f"\nStarting {len(worker_tasks)} workers with partitioned execution...\n")
@@ -224,6 +246,7 @@ def main():
             execute_batch_from_schedule,
             log_dir=args.log_dir,
             reference_pack_dir=reference_pack_dir,
+            engine_args=engine_args,
         )
         with mp.Pool(processes=args.workers) as pool:
             for i, result in enumerate(pool.imap_unordered(execute_with_log, batches)):
@@ -243,6 +266,7 @@ def main():
                 batch,
                 log_dir=args.log_dir,
                 reference_pack_dir=reference_pack_dir,
+                engine_args=engine_args,
             )
             status = "✅" if result['success'] else "❌"
             print(f"[{i+1}/{total_batches}] {status} Batch {result['batch_id']} ({result.get('duration', 0):.1f}s)")
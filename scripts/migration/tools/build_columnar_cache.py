@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+# flake8: noqa
+"""Convert extracted FishTalk CSV files into a columnar Parquet cache.
+
+Each CSV becomes one Parquet file sorted by its lookup key (PopulationID or
+ContainerID) and event time, so ETLDataLoader can push PopulationID/ContainerID
+and time predicates down to row-group statistics and memory-map only the row
+groups a component actually needs.
+
+Values are kept as strings (dictionary-encoded where repetitive) so rows read
+back from Parquet are identical to rows read from the CSV. ISO timestamps sort
+lexicographically, so min/max statistics on time columns prune correctly.
+
+Usage:
+    python build_columnar_cache.py \
+      --input-dir scripts/migration/data/extract/ \
+      [--output-dir scripts/migration/data/extract/columnar] \
+      [--tables status_values feeding_actions] \
+      [--replace]
+
+Requires pyarrow.
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.migration.tools.etl_loader import COLUMNAR_DIR_NAME, TABLE_LOOKUP_KEYS
+
+try:
+    import pyarrow as pa
+    import pyarrow.csv as pa_csv
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Convert extracted CSV files into a Parquet cache")
+    parser.add_argument(
+        "--input-dir",
+        required=True,
+        help="Directory containing extracted CSV files",
+    )
+    parser.add_argument(
+        "--output-dir",
+        help=f"Output directory for Parquet files (default: <input-dir>/{COLUMNAR_DIR_NAME})",
+    )
+    parser.add_argument(
+        "--tables",
+        nargs="*",
+        help="Only convert these tables (CSV stems). Default: every CSV in input-dir",
+    )
+    parser.add_argument(
+        "--row-group-size",
+        type=int,
+        default=100_000,
+        help="Rows per Parquet row group; smaller groups prune more precisely (default: 100000)",
+    )
+    parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="Rebuild Parquet files even if they are newer than their CSV",
+    )
+    return parser
+
+
+def read_header(csv_path: Path) -> List[str]:
+    with csv_path.open("r", encoding="utf-8", newline="") as handle:
+        return next(csv.reader(handle), [])
+
+
+def convert_table(csv_path: Path, output_path: Path, row_group_size: int) -> int:
+    columns = read_header(csv_path)
+    if not columns:
+        return 0
+
+    table = pa_csv.read_csv(
+        csv_path,
+        read_options=pa_csv.ReadOptions(encoding="utf-8"),
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types={name: pa.string() for name in columns},
+            strings_can_be_null=False,
+        ),
+    )
+
+    key_column, time_column = TABLE_LOOKUP_KEYS.get(csv_path.stem, (None, None))
+    sort_keys = [
+        (name, "ascending")
+        for name in (key_column, time_column)
+        if name and name in table.column_names
+    ]
+    if sort_keys:
+        table = table.sort_by(sort_keys)
+
+    dictionary_columns = [name for name in (key_column,) if name and name in table.column_names]
+    tmp_path = output_path.with_suffix(".parquet.tmp")
+    pq.write_table(
+        table,
+        tmp_path,
+        row_group_size=row_group_size,
+        compression="zstd",
+        use_dictionary=dictionary_columns or False,
+        write_statistics=True,
+    )
+    tmp_path.replace(output_path)
+    return table.num_rows
+
+
+def main() -> int:
+    if not HAS_PYARROW:
+        print("pyarrow is required: pip install pyarrow")
+        return 1
+
+    args = build_parser().parse_args()
+    input_dir = Path(args.input_dir)
+    output_dir = Path(args.output_dir) if args.output_dir else input_dir / COLUMNAR_DIR_NAME
+
+    if not input_dir.exists():
+        print(f"Input directory not found: {input_dir}")
+        return 1
+
+    if args.tables:
+        csv_paths = [input_dir / f"{name}.csv" for name in args.tables]
+        missing = [str(p) for p in csv_paths if not p.exists()]
+        if missing:
+            print(f"Missing CSV files: {', '.join(missing)}")
+            return 1
+    else:
+        csv_paths = sorted(input_dir.glob("*.csv"))
+
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    converted = 0
+    skipped = 0
+    for csv_path in csv_paths:
+        output_path = output_dir / f"{csv_path.stem}.parquet"
+        if (
+            not args.replace
+            and output_path.exists()
+            and output_path.stat().st_mtime >= csv_path.stat().st_mtime
+        ):
+            skipped += 1
+            continue
+
+        started = time.monotonic()
+        print(f"Converting {csv_path.name}...")
+        rows = convert_table(csv_path, output_path, args.row_group_size)
+        elapsed = time.monotonic() - started
+        print(f"  Wrote {rows:,} rows to {output_path.name} in {elapsed:.1f}s")
+        converted += 1
+
+    print(f"Columnar cache ready: {output_dir} ({converted} converted, {skipped} up to date)")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+# flake8: noqa
+"""Build an indexed SQLite staging store for every extracted FishTalk table.
+
+Generalises build_environmental_sqlite.py: each CSV in the extract directory
+becomes a TEXT-column table of the same name, bulk-loaded in chunks under WAL
+journaling, then indexed on its lookup key and event time (TABLE_LOOKUP_KEYS)
+plus the extra lookup indexes in SQLITE_EXTRA_INDEXES. Pass the resulting file
+to ETLDataLoader(sqlite_path=...) / --use-sqlite and every loader accessor runs
+an indexed query instead of parsing CSVs.
+
+Tables are rebuilt only when their CSV changed since the last build (tracked in
+the _etl_tables metadata table), so re-running after a partial re-extract is
+cheap.
+
+Usage:
+    python build_etl_sqlite.py \
+      --input-dir scripts/migration/data/extract/ \
+      --output-path scripts/migration/data/extract/etl_staging.sqlite \
+      [--tables status_values populations] [--replace]
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import sqlite3
+import sys
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Iterable, List, Sequence, Tuple
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+from scripts.migration.tools.etl_loader import (
+    SQLITE_EXTRA_INDEXES,
+    SQLITE_META_TABLE,
+    TABLE_LOOKUP_KEYS,
+)
+
+
+def chunked(rows: Iterable[Tuple[str, ...]], size: int) -> Iterable[List[Tuple[str, ...]]]:
+    batch: List[Tuple[str, ...]] = []
+    for row in rows:
+        batch.append(row)
+        if len(batch) >= size:
+            yield batch
+            batch = []
+    if batch:
+        yield batch
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Build an indexed SQLite staging store for extracted CSV data")
+    parser.add_argument(
+        "--input-dir",
+        required=True,
+        help="Directory containing extracted CSV files",
+    )
+    parser.add_argument(
+        "--output-path",
+        required=True,
+        help="Output SQLite database path",
+    )
+    parser.add_argument(
+        "--tables",
+        nargs="*",
+        help="Only stage these tables (CSV stems). Default: every CSV in input-dir",
+    )
+    parser.add_argument(
+        "--batch-size",
+        type=int,
+        default=50000,
+        help="Insert batch size (default: 50000)",
+    )
+    parser.add_argument(
+        "--replace",
+        action="store_true",
+        help="Rebuild tables even if their CSV is unchanged since the last build",
+    )
+    return parser
+
+
+def quote(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def table_indexes(table_name: str, columns: Sequence[str]) -> List[Tuple[str, ...]]:
+    """Composite indexes for a table, limited to columns that were extracted."""
+    indexes: List[Tuple[str, ...]] = []
+    key_column, time_column = TABLE_LOOKUP_KEYS.get(table_name, (None, None))
+    if key_column:
+        indexes.append(tuple(name for name in (key_column, time_column) if name))
+    indexes.extend(SQLITE_EXTRA_INDEXES.get(table_name, []))
+    available = set(columns)
+    return [index for index in dict.fromkeys(indexes) if set(index) <= available]
+
+
+def ensure_meta_table(conn: sqlite3.Connection) -> None:
+    conn.execute(
+        f"CREATE TABLE IF NOT EXISTS {SQLITE_META_TABLE} ("
+        "table_name TEXT PRIMARY KEY, source_mtime REAL, row_count INTEGER, built_at TEXT)"
+    )
+    conn.commit()
+
+
+def is_current(conn: sqlite3.Connection, table_name: str, source_mtime: float) -> bool:
+    row = conn.execute(
+        f"SELECT source_mtime FROM {SQLITE_META_TABLE} WHERE table_name = ?",
+        (table_name,),
+    ).fetchone()
+    return row is not None and row[0] >= source_mtime
+
+
+def stage_table(
+    conn: sqlite3.Connection,
+    csv_path: Path,
+    batch_size: int,
+) -> int:
+    """(Re)create one table from its CSV, bulk insert in chunks, then index it."""
+    table_name = csv_path.stem
+    with csv_path.open("r", encoding="utf-8", newline="") as handle:
+        reader = csv.reader(handle)
+        columns = next(reader, [])
+        if not columns:
+            return 0
+
+        conn.execute(f"DROP TABLE IF EXISTS {quote(table_name)}")
+        conn.execute(
+            f"CREATE TABLE {quote(table_name)} ("
+            + ", ".join(f"{quote(name)} TEXT" for name in columns)
+            + ")"
+        )
+        insert_sql = (
+            f"INSERT INTO {quote(table_name)} VALUES ({', '.join('?' for _ in columns)})"
+        )
+        width = len(columns)
+        rows = (tuple(row[:width]) + ("",) * (width - len(row)) for row in reader)
+
+        total = 0
+        for batch in chunked(rows, batch_size):
+            with conn:
+                conn.executemany(insert_sql, batch)
+            total += len(batch)
+
+    for index in table_indexes(table_name, columns):
+        index_name = f"idx_{table_name}_{'_'.join(index)}".lower()
+        conn.execute(
+            f"CREATE INDEX IF NOT EXISTS {quote(index_name)} "
+            f"ON {quote(table_name)} ({', '.join(quote(name) for name in index)})"
+        )
+
+    with conn:
+        conn.execute(
+            f"INSERT OR REPLACE INTO {SQLITE_META_TABLE} (table_name, source_mtime, row_count, built_at) "
+            "VALUES (?, ?, ?, ?)",
+            (
+                table_name,
+                csv_path.stat().st_mtime,
+                total,
+                datetime.now(timezone.utc).isoformat(timespec="seconds"),
+            ),
+        )
+    return total
+
+
+def build_store(
+    input_dir: Path,
+    output_path: Path,
+    *,
+    tables: Sequence[str] | None = None,
+    batch_size: int = 50000,
+    replace: bool = False,
+) -> int:
+    """Stage CSV tables into output_path. Returns a process exit code."""
+    if tables:
+        csv_paths = [input_dir / f"{name}.csv" for name in tables]
+        missing = [str(p) for p in csv_paths if not p.exists()]
+        if missing:
+            print(f"Missing required CSV files: {', '.join(missing)}")
+            return 1
+    else:
+        csv_paths = sorted(input_dir.glob("*.csv"))
+
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+
+    conn = sqlite3.connect(output_path)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=200000")
+        ensure_meta_table(conn)
+
+        staged = 0
+        skipped = 0
+        for csv_path in csv_paths:
+            if not replace and is_current(conn, csv_path.stem, csv_path.stat().st_mtime):
+                skipped += 1
+                continue
+            started = time.monotonic()
+            print(f"Loading {csv_path.name}...")
+            count = stage_table(conn, csv_path, batch_size)
+            print(f"  Inserted {count:,} rows in {time.monotonic() - started:.1f}s")
+            staged += 1
+
+        print("Analyzing...")
+        conn.execute("ANALYZE")
+        conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    finally:
+        conn.close()
+
+    print(f"SQLite staging store built: {output_path} ({staged} staged, {skipped} up to date)")
+    return 0
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+    input_dir = Path(args.input_dir)
+    if not input_dir.exists():
+        print(f"Input directory not found: {input_dir}")
+        return 1
+    return build_store(
+        input_dir,
+        Path(args.output_path),
+        tables=args.tables,
+        batch_size=args.batch_size,
+        replace=args.replace,
+    )
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -19,8 +19,13 @@ Usage:
 
 Key features:
 - Lazy loading: DataFrames loaded on first access
-- Caching: Each CSV loaded only once per process
+- Caching: Decoded tables kept in a bounded LRU cache per process
 - Memory efficient: Large tables can be filtered before full load
+- SQLite staging: With sqlite_path (build_etl_sqlite.py), every accessor runs
+  an indexed query against the staged table instead of parsing the CSV
+- Columnar cache: When build_columnar_cache.py has produced Parquet files
+  (default: <data_dir>/columnar), per-population/per-container lookups read
+  only the matching row groups via memory-mapped predicate pushdown
 - Thread-safe: Safe for use with multiprocessing
 """
 
@@ -28,6 +33,7 @@ from __future__ import annotations
 
 import csv
 import sqlite3
+from collections import OrderedDict
 from datetime import datetime
 from decimal import Decimal
 from pathlib import Path
@@ -40,12 +46,67 @@ try:
 except ImportError:
     HAS_PANDAS = False
 
+try:
+    import pyarrow.parquet as pq
+    HAS_PYARROW = True
+except ImportError:
+    HAS_PYARROW = False
+
+
+COLUMNAR_DIR_NAME = "columnar"
+
+# Lookup key and event-time column per table. build_columnar_cache.py sorts each
+# Parquet file on these so row-group min/max statistics line up with the
+# loader's PopulationID/ContainerID/time predicates, and build_etl_sqlite.py
+# creates a composite (key, time) index for each.
+TABLE_LOOKUP_KEYS: Dict[str, tuple[str, Optional[str]]] = {
+    "status_values": ("PopulationID", "StatusTime"),
+    "feeding_actions": ("PopulationID", "FeedingTime"),
+    "feeding_hand_weights": ("FeedingID", None),
+    "mortality_actions": ("PopulationID", "OperationStartTime"),
+    "culling": ("PopulationID", "OperationStartTime"),
+    "escapes": ("PopulationID", "OperationStartTime"),
+    "harvest_result": ("PopulationID", "OperationStartTime"),
+    "treatments": ("PopulationID", "OperationStartTime"),
+    "ext_weight_samples_v2": ("PopulationID", "SampleDate"),
+    "public_weight_samples": ("PopulationID", "SampleDate"),
+    "public_lice_samples": ("PopulationID", "SampleDate"),
+    "public_lice_sample_data": ("SampleID", None),
+    "user_sample_sessions": ("PopulationID", "SampleTime"),
+    "user_sample_types": ("ActionID", None),
+    "user_sample_attributes": ("ActionID", None),
+    "ext_inputs": ("PopulationID", None),
+    "population_stages": ("PopulationID", None),
+    "populations": ("ContainerID", None),
+    "feed_reception_lines": ("ContainerID", "ReceptionTime"),
+    "daily_sensor_readings": ("ContainerID", "ReadingDate"),
+    "time_sensor_readings": ("ContainerID", "ReadingTime"),
+}
+
+# Further SQLite staging indexes for lookups that are not (key, time) shaped.
+SQLITE_EXTRA_INDEXES: Dict[str, List[tuple[str, ...]]] = {
+    "populations": [("PopulationID",), ("ProjectNumber", "InputYear", "RunningNumber")],
+    "containers": [("ContainerID",)],
+    "grouped_organisation": [("ContainerID",)],
+    "transfer_operations": [("OperationID",)],
+    "transfer_edges": [("SourcePop",), ("DestPop",)],
+    "sub_transfers": [("SourcePopBefore",), ("DestPopAfter",)],
+}
+
+# Metadata table written by build_etl_sqlite.py (table name, source mtime, rows).
+SQLITE_META_TABLE = "_etl_tables"
+
 
 class ETLDataLoader:
     """Cached loader for pre-extracted FishTalk CSV files."""
     
-    # Class-level cache for DataFrames (shared across instances)
-    _cache: Dict[str, Any] = {}
+    # Class-level LRU cache for decoded tables (shared across instances)
+    _cache: "OrderedDict[str, Any]" = OrderedDict()
+    cache_max_tables: int = 8
+
+    # Class-level LRU cache for per-population status slices read from Parquet
+    _slice_cache: "OrderedDict[str, Any]" = OrderedDict()
+    cache_max_slices: int = 512
 
     @staticmethod
     def _status_row_rank(row: Dict[str, str]) -> tuple[int, float, float]:
@@ -87,11 +148,23 @@ class ETLDataLoader:
         row = ranked.iloc[0].drop(labels=["_count_num", "_biomass_num", "_nonzero"], errors="ignore")
         return row.to_dict()
     
-    def __init__(self, data_dir: str | Path | None = None, *, sqlite_path: str | Path | None = None):
+    def __init__(
+        self,
+        data_dir: str | Path | None = None,
+        *,
+        sqlite_path: str | Path | None = None,
+        columnar_dir: str | Path | None = None,
+        use_columnar: bool = True,
+    ):
         """Initialize the loader with the directory containing CSV files.
         
         Args:
             data_dir: Path to directory containing extracted CSV files
+            sqlite_path: Optional SQLite staging store (build_etl_sqlite.py or
+                the environmental-only build_environmental_sqlite.py)
+            columnar_dir: Parquet cache directory (default: <data_dir>/columnar
+                when it exists)
+            use_columnar: Set False to force CSV reads even if a cache exists
         """
         self.data_dir = Path(data_dir) if data_dir is not None else None
         if self.data_dir is not None and not self.data_dir.exists():
@@ -105,6 +178,82 @@ class ETLDataLoader:
             raise ValueError("Provide data_dir or sqlite_path")
 
         self._sqlite_conn: Optional[sqlite3.Connection] = None
+        self._sqlite_table_names: Optional[Set[str]] = None
+        self._sqlite_source_mtimes: Dict[str, float] = {}
+        self._table_has_rows_cache: Dict[str, bool] = {}
+
+        self.columnar_dir: Optional[Path] = None
+        if use_columnar and HAS_PYARROW:
+            if columnar_dir is not None:
+                self.columnar_dir = Path(columnar_dir)
+            elif self.data_dir is not None and (self.data_dir / COLUMNAR_DIR_NAME).is_dir():
+                self.columnar_dir = self.data_dir / COLUMNAR_DIR_NAME
+
+    @classmethod
+    def _cache_get(cls, cache: "OrderedDict[str, Any]", key: str) -> Any:
+        if key not in cache:
+            return None
+        cache.move_to_end(key)
+        return cache[key]
+
+    @classmethod
+    def _cache_put(cls, cache: "OrderedDict[str, Any]", key: str, value: Any, max_entries: int) -> None:
+        cache[key] = value
+        cache.move_to_end(key)
+        while len(cache) > max_entries:
+            cache.popitem(last=False)
+
+    def _get_columnar_path(self, table_name: str) -> Optional[Path]:
+        """Get path to a table's Parquet file if present and not older than its CSV."""
+        if self.columnar_dir is None:
+            return None
+        path = self.columnar_dir / f"{table_name}.parquet"
+        if not path.exists():
+            return None
+        if self.data_dir is not None:
+            csv_path = self.data_dir / f"{table_name}.csv"
+            if csv_path.exists() and csv_path.stat().st_mtime > path.stat().st_mtime:
+                return None
+        return path
+
+    def _columnar_rows(
+        self,
+        table_name: str,
+        keys: Set[str],
+        *,
+        key_column: str | tuple[str, ...] | None = None,
+        time_column: Optional[str] = None,
+        start_value: str | None = None,
+        end_value: str | None = None,
+        as_frame: bool = False,
+    ) -> Any:
+        """Read only matching rows from the Parquet cache.
+
+        Returns None when the table has no columnar file, so callers fall back
+        to the CSV path. Predicates are pushed down to row-group statistics.
+        A tuple of key columns matches rows where any of them is in keys.
+        """
+        path = self._get_columnar_path(table_name)
+        if path is None:
+            return None
+        if key_column is None:
+            key_column = TABLE_LOOKUP_KEYS[table_name][0]
+        key_columns = (key_column,) if isinstance(key_column, str) else key_column
+
+        time_filters: List[tuple[str, str, Any]] = []
+        if time_column and start_value:
+            time_filters.append((time_column, ">=", start_value))
+        if time_column and end_value:
+            time_filters.append((time_column, "<=", end_value))
+        filters = [[(column, "in", sorted(keys)), *time_filters] for column in key_columns]
+
+        if keys:
+            table = pq.read_table(path, filters=filters, memory_map=True)
+        else:
+            table = pq.read_schema(path).empty_table()
+        if as_frame:
+            return table.to_pandas()
+        return table.to_pylist()
     
     def _get_csv_path(self, table_name: str) -> Path:
         """Get path to a CSV file."""
@@ -117,16 +266,23 @@ class ETLDataLoader:
     
     def _load_csv_dict(self, table_name: str) -> List[Dict[str, str]]:
         """Load CSV as list of dicts (memory efficient for small tables)."""
-        cache_key = f"dict:{self.data_dir}:{table_name}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        cache_key = f"dict:{self.data_dir}:{self.sqlite_path}:{table_name}"
+        cached = self._cache_get(self._cache, cache_key)
+        if cached is not None:
+            return cached
         
-        path = self._get_csv_path(table_name)
-        with path.open("r", encoding="utf-8", newline="") as f:
-            reader = csv.DictReader(f)
-            data = list(reader)
+        columnar_path = self._get_columnar_path(table_name)
+        if self._sqlite_has_table(table_name):
+            data = self._sqlite_select(table_name)
+        elif columnar_path is not None:
+            data = pq.read_table(columnar_path, memory_map=True).to_pylist()
+        else:
+            path = self._get_csv_path(table_name)
+            with path.open("r", encoding="utf-8", newline="") as f:
+                reader = csv.DictReader(f)
+                data = list(reader)
         
-        self._cache[cache_key] = data
+        self._cache_put(self._cache, cache_key, data, self.cache_max_tables)
         return data
     
     def _load_csv_pandas(self, table_name: str) -> "pd.DataFrame":
@@ -134,16 +290,41 @@ class ETLDataLoader:
         if not HAS_PANDAS:
             raise ImportError("pandas required for DataFrame operations")
         
-        cache_key = f"df:{self.data_dir}:{table_name}"
-        if cache_key in self._cache:
-            return self._cache[cache_key]
+        cache_key = f"df:{self.data_dir}:{self.sqlite_path}:{table_name}"
+        cached = self._cache_get(self._cache, cache_key)
+        if cached is not None:
+            return cached
         
-        path = self._get_csv_path(table_name)
-        df = pd.read_csv(path, dtype=str, keep_default_na=False)
+        columnar_path = self._get_columnar_path(table_name)
+        if self._sqlite_has_table(table_name):
+            df = pd.read_sql_query(f'SELECT * FROM "{table_name}"', self._ensure_sqlite())
+        elif columnar_path is not None:
+            df = pq.read_table(columnar_path, memory_map=True).to_pandas()
+        else:
+            path = self._get_csv_path(table_name)
+            df = pd.read_csv(path, dtype=str, keep_default_na=False)
         
-        self._cache[cache_key] = df
+        self._cache_put(self._cache, cache_key, df, self.cache_max_tables)
         return df
     
+    def _load_population_rows(self, table_name: str, population_ids: Set[str]) -> List[Dict[str, str]]:
+        """Rows for the given populations: an indexed slice or the cached full table."""
+        rows = self._lookup_rows(table_name, population_ids, key_column="PopulationID")
+        if rows is None:
+            rows = self._load_csv_dict(table_name)
+        return rows
+
+    def _table_has_rows(self, table_name: str) -> bool:
+        """True if the table exists (staged, columnar or CSV) and has at least one row."""
+        if table_name not in self._table_has_rows_cache:
+            try:
+                has_rows = self.get_row_count(table_name) > 0
+            except (FileNotFoundError, ValueError):
+                # No CSV for it (or no data_dir) and not staged/columnar
+                has_rows = False
+            self._table_has_rows_cache[table_name] = has_rows
+        return self._table_has_rows_cache[table_name]
+
     def _stream_csv(self, table_name: str) -> Generator[Dict[str, str], None, None]:
         """Stream CSV rows one at a time (for very large tables)."""
         path = self._get_csv_path(table_name)
@@ -170,36 +351,111 @@ class ETLDataLoader:
         if batch:
             yield batch
 
-    def _query_sqlite_readings(
+    def _sqlite_has_table(self, table_name: str) -> bool:
+        """True if the table is staged in SQLite and not older than its CSV."""
+        if self.sqlite_path is None:
+            return False
+        if self._sqlite_table_names is None:
+            conn = self._ensure_sqlite()
+            self._sqlite_table_names = {
+                row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")
+            }
+            self._sqlite_source_mtimes = {}
+            if SQLITE_META_TABLE in self._sqlite_table_names:
+                self._sqlite_source_mtimes = {
+                    row[0]: row[1]
+                    for row in conn.execute(f"SELECT table_name, source_mtime FROM {SQLITE_META_TABLE}")
+                }
+        if table_name not in self._sqlite_table_names:
+            return False
+        staged_mtime = self._sqlite_source_mtimes.get(table_name)
+        if staged_mtime is not None and self.data_dir is not None:
+            csv_path = self.data_dir / f"{table_name}.csv"
+            if csv_path.exists() and csv_path.stat().st_mtime > staged_mtime:
+                return False
+        return True
+
+    def _sqlite_select(self, table_name: str, where: str = "", params: Iterable[str] = ()) -> List[Dict[str, str]]:
+        conn = self._ensure_sqlite()
+        sql = f'SELECT * FROM "{table_name}"'
+        if where:
+            sql += f" WHERE {where}"
+        return [dict(row) for row in conn.execute(sql, list(params))]
+
+    def _sqlite_rows(
         self,
-        *,
         table_name: str,
-        time_column: str,
-        container_ids: Set[str],
-        start_value: str | None,
-        end_value: str | None,
-    ) -> List[Dict[str, str]]:
-        if not container_ids:
+        keys: Set[str],
+        *,
+        key_column: str | tuple[str, ...] | None = None,
+        time_column: Optional[str] = None,
+        start_value: str | None = None,
+        end_value: str | None = None,
+    ) -> Optional[List[Dict[str, str]]]:
+        """Indexed lookup in the SQLite staging store (None if the table is not staged)."""
+        if not self._sqlite_has_table(table_name):
+            return None
+        if not keys:
             return []
-        conn = self._ensure_sqlite()
+        if key_column is None:
+            key_column = TABLE_LOOKUP_KEYS[table_name][0]
+        key_columns = (key_column,) if isinstance(key_column, str) else key_column
+
         results: List[Dict[str, str]] = []
-        for chunk in self._chunked(sorted(container_ids), 500):
+        for chunk in self._chunked(sorted(keys), 500):
             placeholders = ",".join("?" for _ in chunk)
-            conditions = [f"ContainerID IN ({placeholders})"]
-            params: List[str] = list(chunk)
-            if start_value:
+            key_conditions = " OR ".join(f"{column} IN ({placeholders})" for column in key_columns)
+            conditions = [f"({key_conditions})"]
+            params: List[str] = list(chunk) * len(key_columns)
+            if time_column and start_value:
                 conditions.append(f"{time_column} >= ?")
                 params.append(start_value)
-            if end_value:
+            if time_column and end_value:
                 conditions.append(f"{time_column} <= ?")
                 params.append(end_value)
-            sql = (
-                f"SELECT ContainerID, SensorID, {time_column} AS {time_column}, Reading "
-                f"FROM {table_name} WHERE {' AND '.join(conditions)}"
-            )
-            rows = conn.execute(sql, params).fetchall()
-            results.extend(dict(row) for row in rows)
+            results.extend(self._sqlite_select(table_name, " AND ".join(conditions), params))
         return results
+
+    def _lookup_rows(
+        self,
+        table_name: str,
+        keys: Set[str],
+        *,
+        key_column: str | tuple[str, ...] | None = None,
+        time_column: Optional[str] = None,
+        start_value: str | None = None,
+        end_value: str | None = None,
+        as_frame: bool = False,
+    ) -> Any:
+        """Keyed lookup through the SQLite store, then the Parquet cache.
+
+        Returns None when neither has the table so callers scan the CSV.
+        """
+        rows = self._sqlite_rows(
+            table_name,
+            keys,
+            key_column=key_column,
+            time_column=time_column,
+            start_value=start_value,
+            end_value=end_value,
+        )
+        if rows is not None:
+            if as_frame:
+                return pd.DataFrame.from_records(rows, columns=self._sqlite_columns(table_name))
+            return rows
+        return self._columnar_rows(
+            table_name,
+            keys,
+            key_column=key_column,
+            time_column=time_column,
+            start_value=start_value,
+            end_value=end_value,
+            as_frame=as_frame,
+        )
+
+    def _sqlite_columns(self, table_name: str) -> List[str]:
+        conn = self._ensure_sqlite()
+        return [row[1] for row in conn.execute(f'PRAGMA table_info("{table_name}")')]
     
     # ====================
     # POPULATIONS
@@ -211,11 +467,19 @@ class ETLDataLoader:
     
     def get_populations_by_ids(self, population_ids: Set[str]) -> List[Dict[str, str]]:
         """Get populations for specific IDs."""
-        all_pops = self.get_all_populations()
+        all_pops = self._lookup_rows("populations", population_ids, key_column="PopulationID")
+        if all_pops is None:
+            all_pops = self.get_all_populations()
         return [p for p in all_pops if p.get("PopulationID") in population_ids]
     
     def get_populations_by_project(self, project_number: str, input_year: str, running_number: str) -> List[Dict[str, str]]:
         """Get populations for a specific project key."""
+        if self._sqlite_has_table("populations"):
+            return self._sqlite_select(
+                "populations",
+                "ProjectNumber = ? AND InputYear = ? AND RunningNumber = ?",
+                (project_number, input_year, running_number),
+            )
         all_pops = self.get_all_populations()
         return [
             p for p in all_pops
@@ -226,7 +490,9 @@ class ETLDataLoader:
     
     def get_populations_by_container(self, container_id: str) -> List[Dict[str, str]]:
         """Get populations for a specific container."""
-        all_pops = self.get_all_populations()
+        all_pops = self._lookup_rows("populations", {container_id}, key_column="ContainerID")
+        if all_pops is None:
+            all_pops = self.get_all_populations()
         return [p for p in all_pops if p.get("ContainerID") == container_id]
 
     # ====================
@@ -240,7 +506,7 @@ class ETLDataLoader:
     def get_input_counts_by_population(self, population_ids: Set[str]) -> Dict[str, float]:
         """Get summed InputCount per population."""
         results: Dict[str, float] = {}
-        for row in self.get_ext_inputs():
+        for row in self._load_population_rows("ext_inputs", population_ids):
             pop_id = row.get("PopulationID")
             if pop_id not in population_ids:
                 continue
@@ -257,7 +523,7 @@ class ETLDataLoader:
         if not population_ids:
             return results
 
-        for row in self.get_ext_inputs():
+        for row in self._load_population_rows("ext_inputs", population_ids):
             pop_id = row.get("PopulationID")
             if pop_id not in population_ids:
                 continue
@@ -273,7 +539,7 @@ class ETLDataLoader:
         if not population_ids:
             return results
 
-        for row in self.get_ext_inputs():
+        for row in self._load_population_rows("ext_inputs", population_ids):
             pop_id = row.get("PopulationID")
             if pop_id not in population_ids:
                 continue
@@ -286,9 +552,9 @@ class ETLDataLoader:
     
     def get_population_stages(self, population_ids: Optional[Set[str]] = None) -> List[Dict[str, str]]:
         """Get population stage assignments."""
-        all_stages = self._load_csv_dict("population_stages")
         if population_ids is None:
-            return all_stages
+            return self._load_csv_dict("population_stages")
+        all_stages = self._load_population_rows("population_stages", population_ids)
         return [s for s in all_stages if s.get("PopulationID") in population_ids]
     
     def get_production_stages(self) -> Dict[str, str]:
@@ -306,7 +572,9 @@ class ETLDataLoader:
     
     def get_containers_by_ids(self, container_ids: Set[str]) -> List[Dict[str, str]]:
         """Get containers for specific IDs."""
-        all_containers = self.get_all_containers()
+        all_containers = self._lookup_rows("containers", container_ids, key_column="ContainerID")
+        if all_containers is None:
+            all_containers = self.get_all_containers()
         return [c for c in all_containers if c.get("ContainerID") in container_ids]
 
     def get_grouped_organisation(self) -> List[Dict[str, str]]:
@@ -317,7 +585,9 @@ class ETLDataLoader:
         self, container_ids: Set[str]
     ) -> List[Dict[str, str]]:
         """Get grouped organisation rows for specific container IDs."""
-        rows = self.get_grouped_organisation()
+        rows = self._lookup_rows("grouped_organisation", container_ids, key_column="ContainerID")
+        if rows is None:
+            rows = self.get_grouped_organisation()
         return [r for r in rows if r.get("ContainerID") in container_ids]
     
     # ====================
@@ -340,8 +610,18 @@ class ETLDataLoader:
     ) -> List[Dict[str, str]]:
         """Get status values for specific populations within date range.
         
-        Uses pandas for efficient filtering of large dataset.
+        Uses the Parquet cache (row-group pushdown) when available, otherwise
+        pandas for efficient filtering of large dataset.
         """
+        rows = self._lookup_rows(
+            "status_values",
+            population_ids,
+            time_column="StatusTime",
+            start_value=start_date.strftime("%Y-%m-%d") if start_date else None,
+            end_value=end_date.strftime("%Y-%m-%d") if end_date else None,
+        )
+        if rows is not None:
+            return rows
         if HAS_PANDAS:
             df = self._load_csv_pandas("status_values")
             mask = df["PopulationID"].isin(population_ids)
@@ -366,10 +646,24 @@ class ETLDataLoader:
                 results.append(row)
             return results
     
+    def _status_frame_for_population(self, population_id: str) -> "pd.DataFrame":
+        """Status rows for one population, read as an indexed slice when staged."""
+        if not self._sqlite_has_table("status_values") and self._get_columnar_path("status_values") is None:
+            df = self._load_csv_pandas("status_values")
+            return df[df["PopulationID"] == population_id]
+
+        cache_key = f"status:{self.sqlite_path}:{self.columnar_dir}:{population_id}"
+        cached = self._cache_get(self._slice_cache, cache_key)
+        if cached is not None:
+            return cached
+        df = self._lookup_rows("status_values", {population_id}, as_frame=True)
+        self._cache_put(self._slice_cache, cache_key, df, self.cache_max_slices)
+        return df
+
     def get_latest_status_for_population(self, population_id: str, before_time: Optional[datetime] = None) -> Optional[Dict[str, str]]:
         """Get the most recent status value for a population."""
         if HAS_PANDAS:
-            df = self._load_csv_pandas("status_values")
+            df = self._status_frame_for_population(population_id)
             mask = df["PopulationID"] == population_id
             if before_time:
                 mask &= df["StatusTime"] <= before_time.strftime("%Y-%m-%d %H:%M:%S")
@@ -400,8 +694,7 @@ class ETLDataLoader:
     ) -> Optional[Dict[str, str]]:
         """Get nearest status snapshot (prefer before, else after)."""
         if HAS_PANDAS:
-            df = self._load_csv_pandas("status_values")
-            pop_df = df[df["PopulationID"] == population_id]
+            pop_df = self._status_frame_for_population(population_id)
             if pop_df.empty:
                 return None
 
@@ -450,8 +743,7 @@ class ETLDataLoader:
         """Get the earliest status snapshot after time with non-zero count/biomass."""
         ts = at_time.strftime("%Y-%m-%d %H:%M:%S")
         if HAS_PANDAS:
-            df = self._load_csv_pandas("status_values")
-            pop_df = df[df["PopulationID"] == population_id]
+            pop_df = self._status_frame_for_population(population_id)
             if pop_df.empty:
                 return None
             after_df = pop_df[pop_df["StatusTime"] >= ts]
@@ -504,14 +796,15 @@ class ETLDataLoader:
         
         These should be imported with is_manual=True.
         """
-        if self.sqlite_path is not None:
-            return self._query_sqlite_readings(
-                table_name="daily_sensor_readings",
-                time_column="ReadingDate",
-                container_ids=container_ids,
-                start_value=start_date.strftime("%Y-%m-%d") if start_date else None,
-                end_value=end_date.strftime("%Y-%m-%d") if end_date else None,
-            )
+        rows = self._lookup_rows(
+            "daily_sensor_readings",
+            container_ids,
+            time_column="ReadingDate",
+            start_value=start_date.strftime("%Y-%m-%d") if start_date else None,
+            end_value=end_date.strftime("%Y-%m-%d") if end_date else None,
+        )
+        if rows is not None:
+            return rows
         if HAS_PANDAS:
             df = self._load_csv_pandas("daily_sensor_readings")
             mask = df["ContainerID"].isin(container_ids)
@@ -545,14 +838,15 @@ class ETLDataLoader:
         
         These should be imported with is_manual=False.
         """
-        if self.sqlite_path is not None:
-            return self._query_sqlite_readings(
-                table_name="time_sensor_readings",
-                time_column="ReadingTime",
-                container_ids=container_ids,
-                start_value=start_time.strftime("%Y-%m-%d %H:%M:%S") if start_time else None,
-                end_value=end_time.strftime("%Y-%m-%d %H:%M:%S") if end_time else None,
-            )
+        rows = self._lookup_rows(
+            "time_sensor_readings",
+            container_ids,
+            time_column="ReadingTime",
+            start_value=start_time.strftime("%Y-%m-%d %H:%M:%S") if start_time else None,
+            end_value=end_time.strftime("%Y-%m-%d %H:%M:%S") if end_time else None,
+        )
+        if rows is not None:
+            return rows
         if HAS_PANDAS:
             df = self._load_csv_pandas("time_sensor_readings")
             mask = df["ContainerID"].isin(container_ids)
@@ -587,6 +881,15 @@ class ETLDataLoader:
         end_time: Optional[datetime] = None,
     ) -> List[Dict[str, str]]:
         """Get mortality actions for specific populations."""
+        rows = self._lookup_rows(
+            "mortality_actions",
+            population_ids,
+            time_column="OperationStartTime",
+            start_value=start_time.strftime("%Y-%m-%d %H:%M:%S") if start_time else None,
+            end_value=end_time.strftime("%Y-%m-%d %H:%M:%S") if end_time else None,
+        )
+        if rows is not None:
+            return rows
         results = []
         for row in self._stream_csv("mortality_actions"):
             if row.get("PopulationID") not in population_ids:
@@ -608,7 +911,9 @@ class ETLDataLoader:
         end_time: Optional[datetime] = None,
     ) -> List[Dict[str, str]]:
         """Get culling actions for specific populations."""
-        rows = self._load_csv_dict("culling")
+        rows = self._lookup_rows("culling", population_ids)
+        if rows is None:
+            rows = self._load_csv_dict("culling")
         start_str = start_time.strftime("%Y-%m-%d %H:%M:%S") if start_time else None
         end_str = end_time.strftime("%Y-%m-%d %H:%M:%S") if end_time else None
 
@@ -631,7 +936,9 @@ class ETLDataLoader:
         end_time: Optional[datetime] = None,
     ) -> List[Dict[str, str]]:
         """Get escape actions for specific populations."""
-        rows = self._load_csv_dict("escapes")
+        rows = self._lookup_rows("escapes", population_ids)
+        if rows is None:
+            rows = self._load_csv_dict("escapes")
         start_str = start_time.strftime("%Y-%m-%d %H:%M:%S") if start_time else None
         end_str = end_time.strftime("%Y-%m-%d %H:%M:%S") if end_time else None
 
@@ -654,7 +961,9 @@ class ETLDataLoader:
         end_time: Optional[datetime] = None,
     ) -> List[Dict[str, str]]:
         """Get harvest result rows for specific populations."""
-        rows = self._load_csv_dict("harvest_result")
+        rows = self._lookup_rows("harvest_result", population_ids)
+        if rows is None:
+            rows = self._load_csv_dict("harvest_result")
         start_str = start_time.strftime("%Y-%m-%d %H:%M:%S") if start_time else None
         end_str = end_time.strftime("%Y-%m-%d %H:%M:%S") if end_time else None
 
@@ -681,7 +990,15 @@ class ETLDataLoader:
         end_time: Optional[datetime] = None,
     ) -> List[Dict[str, str]]:
         """Get feeding actions for specific populations."""
-        all_actions = self._load_csv_dict("feeding_actions")
+        all_actions = self._lookup_rows(
+            "feeding_actions",
+            population_ids,
+            time_column="FeedingTime",
+            start_value=start_time.strftime("%Y-%m-%d %H:%M:%S") if start_time else None,
+            end_value=end_time.strftime("%Y-%m-%d %H:%M:%S") if end_time else None,
+        )
+        if all_actions is None:
+            all_actions = self._load_csv_dict("feeding_actions")
         
         results = []
         for row in all_actions:
@@ -699,7 +1016,9 @@ class ETLDataLoader:
     
     def get_hand_weights_for_feedings(self, feeding_ids: Set[str]) -> List[Dict[str, str]]:
         """Get hand weight samples for specific feeding IDs."""
-        all_weights = self._load_csv_dict("feeding_hand_weights")
+        all_weights = self._lookup_rows("feeding_hand_weights", feeding_ids)
+        if all_weights is None:
+            all_weights = self._load_csv_dict("feeding_hand_weights")
         return [w for w in all_weights if w.get("FeedingID") in feeding_ids]
 
     # ====================
@@ -718,21 +1037,15 @@ class ETLDataLoader:
 
         results: List[Dict[str, str]] = []
 
+        # The source is chosen per table, not per slice: public_weight_samples
+        # is only used when ext_weight_samples_v2 is missing or empty.
         rows_by_table: List[tuple[str, List[Dict[str, str]]]] = []
-        ext_rows = None
-        try:
-            ext_rows = self._load_csv_dict("ext_weight_samples_v2")
-        except FileNotFoundError:
-            ext_rows = None
-        if ext_rows:
-            rows_by_table.append(("ext_weight_samples_v2", ext_rows))
-        else:
-            try:
-                pub_rows = self._load_csv_dict("public_weight_samples")
-            except FileNotFoundError:
-                pub_rows = []
-            if pub_rows:
-                rows_by_table.append(("public_weight_samples", pub_rows))
+        for table_name in ("ext_weight_samples_v2", "public_weight_samples"):
+            if self._table_has_rows(table_name):
+                rows_by_table.append(
+                    (table_name, self._load_population_rows(table_name, population_ids))
+                )
+                break
 
         for table_name, rows in rows_by_table:
             for row in rows:
@@ -763,7 +1076,9 @@ class ETLDataLoader:
         end_time: Optional[datetime] = None,
     ) -> List[Dict[str, str]]:
         """Get treatment rows for specific populations."""
-        rows = self._load_csv_dict("treatments")
+        rows = self._lookup_rows("treatments", population_ids)
+        if rows is None:
+            rows = self._load_csv_dict("treatments")
         start_str = start_time.strftime("%Y-%m-%d %H:%M:%S") if start_time else None
         end_str = end_time.strftime("%Y-%m-%d %H:%M:%S") if end_time else None
 
@@ -790,8 +1105,9 @@ class ETLDataLoader:
         end_time: Optional[datetime] = None,
     ) -> tuple[List[Dict[str, str]], List[Dict[str, str]], Dict[str, str]]:
         """Get lice sample rows, data rows, and stage-name mapping."""
-        sample_rows = self._load_csv_dict("public_lice_samples")
-        data_rows = self._load_csv_dict("public_lice_sample_data")
+        sample_rows = self._lookup_rows("public_lice_samples", population_ids)
+        if sample_rows is None:
+            sample_rows = self._load_csv_dict("public_lice_samples")
         stage_rows = self._load_csv_dict("lice_stages")
 
         stage_name_by_id = {
@@ -816,6 +1132,9 @@ class ETLDataLoader:
             if row.get("SampleID"):
                 sample_ids.add(row["SampleID"])
 
+        data_rows = self._lookup_rows("public_lice_sample_data", sample_ids)
+        if data_rows is None:
+            data_rows = self._load_csv_dict("public_lice_sample_data")
         filtered_data = [row for row in data_rows if row.get("SampleID") in sample_ids]
         return filtered_samples, filtered_data, stage_name_by_id
 
@@ -829,7 +1148,9 @@ class ETLDataLoader:
         start_time: Optional[datetime] = None,
         end_time: Optional[datetime] = None,
     ) -> List[Dict[str, str]]:
-        rows = self._load_csv_dict("user_sample_sessions")
+        rows = self._lookup_rows("user_sample_sessions", population_ids)
+        if rows is None:
+            rows = self._load_csv_dict("user_sample_sessions")
         start_str = start_time.strftime("%Y-%m-%d %H:%M:%S") if start_time else None
         end_str = end_time.strftime("%Y-%m-%d %H:%M:%S") if end_time else None
 
@@ -846,11 +1167,15 @@ class ETLDataLoader:
         return results
 
     def get_user_sample_types(self, action_ids: Set[str]) -> List[Dict[str, str]]:
-        rows = self._load_csv_dict("user_sample_types")
+        rows = self._lookup_rows("user_sample_types", action_ids)
+        if rows is None:
+            rows = self._load_csv_dict("user_sample_types")
         return [row for row in rows if row.get("ActionID") in action_ids]
 
     def get_user_sample_attributes(self, action_ids: Set[str]) -> List[Dict[str, str]]:
-        rows = self._load_csv_dict("user_sample_attributes")
+        rows = self._lookup_rows("user_sample_attributes", action_ids)
+        if rows is None:
+            rows = self._load_csv_dict("user_sample_attributes")
         return [row for row in rows if row.get("ActionID") in action_ids]
 
     # ====================
@@ -864,7 +1189,9 @@ class ETLDataLoader:
         end_time: Optional[datetime] = None,
         include_all_receptions: bool = False,
     ) -> List[Dict[str, str]]:
-        rows = self._load_csv_dict("feed_reception_lines")
+        rows = self._lookup_rows("feed_reception_lines", container_ids)
+        if rows is None:
+            rows = self._load_csv_dict("feed_reception_lines")
         start_str = start_time.strftime("%Y-%m-%d %H:%M:%S") if start_time else None
         end_str = end_time.strftime("%Y-%m-%d %H:%M:%S") if end_time else None
 
@@ -893,12 +1220,18 @@ class ETLDataLoader:
     
     def get_transfer_operations_by_ids(self, operation_ids: Set[str]) -> List[Dict[str, str]]:
         """Get transfer operations by IDs."""
-        all_ops = self.get_transfer_operations()
+        all_ops = self._lookup_rows("transfer_operations", operation_ids, key_column="OperationID")
+        if all_ops is None:
+            all_ops = self.get_transfer_operations()
         return [o for o in all_ops if o.get("OperationID") in operation_ids]
     
     def get_transfer_edges_for_populations(self, population_ids: Set[str]) -> List[Dict[str, str]]:
         """Get transfer edges involving any of the specified populations."""
-        all_edges = self._load_csv_dict("transfer_edges")
+        all_edges = self._lookup_rows(
+            "transfer_edges", population_ids, key_column=("SourcePop", "DestPop")
+        )
+        if all_edges is None:
+            all_edges = self._load_csv_dict("transfer_edges")
         return [
             e for e in all_edges
             if e.get("SourcePop") in population_ids or e.get("DestPop") in population_ids
@@ -911,15 +1244,32 @@ class ETLDataLoader:
     def clear_cache(self):
         """Clear the cached data (useful for memory management)."""
         self._cache.clear()
+        self._slice_cache.clear()
+        self._sqlite_table_names = None
+        self._table_has_rows_cache.clear()
     
     def get_available_tables(self) -> List[str]:
-        """List available CSV files."""
-        if self.data_dir is None:
-            return []
-        return [f.stem for f in self.data_dir.glob("*.csv")]
+        """List available CSV files (and tables staged in SQLite)."""
+        tables: Set[str] = set()
+        if self.data_dir is not None:
+            tables.update(f.stem for f in self.data_dir.glob("*.csv"))
+        if self.sqlite_path is not None:
+            self._sqlite_has_table(SQLITE_META_TABLE)
+            tables.update(
+                name
+                for name in self._sqlite_table_names or ()
+                if not name.startswith(("_", "sqlite_"))
+            )
+        return sorted(tables)
     
     def get_row_count(self, table_name: str) -> int:
         """Get row count for a table without loading it fully."""
+        if self._sqlite_has_table(table_name):
+            row = self._ensure_sqlite().execute(f'SELECT COUNT(*) FROM "{table_name}"').fetchone()
+            return int(row[0])
+        columnar_path = self._get_columnar_path(table_name)
+        if columnar_path is not None:
+            return pq.ParquetFile(columnar_path).metadata.num_rows
         path = self._get_csv_path(table_name)
         with path.open("r", encoding="utf-8") as f:
             return sum(1 for _ in f) - 1  # Subtract header
@@ -5,6 +5,7 @@
 from __future__ import annotations
 
 import argparse
+import json
 import os
 import sys
 from pathlib import Path
@@ -41,6 +42,93 @@ from apps.inventory.models import FeedingEvent, FeedPurchase, FeedContainerStock
 from apps.migration_support.models import ExternalIdMap
 
 
+BATCH_COUNT_COLUMNS = (
+    "assignments",
+    "creation_workflows",
+    "creation_actions",
+    "workflows",
+    "actions",
+    "feeding",
+    "feed_purchases",
+    "feed_stock",
+    "mortality",
+    "treatments",
+    "lice",
+    "journal",
+    "environmental",
+)
+
+
+def collect_batch_counts(batch: Batch, *, component_key: str | None = None) -> dict[str, int]:
+    """Row counts per migrated table for one batch, keyed by BATCH_COUNT_COLUMNS."""
+    if component_key is None:
+        batch_map = ExternalIdMap.objects.filter(
+            source_system="FishTalk",
+            source_model="PopulationComponent",
+            target_object_id=batch.pk,
+        ).first()
+        component_key = batch_map.source_identifier if batch_map else None
+    purchase_ids = ExternalIdMap.objects.filter(
+        source_system="FishTalk",
+        source_model="FeedReceptionBatches",
+        metadata__component_key=component_key,
+    ).values_list("target_object_id", flat=True)
+    stock_ids = ExternalIdMap.objects.filter(
+        source_system="FishTalk",
+        source_model="FeedContainerStock",
+        metadata__component_key=component_key,
+    ).values_list("target_object_id", flat=True)
+
+    return {
+        "assignments": BatchContainerAssignment.objects.filter(batch=batch).count(),
+        "creation_workflows": BatchCreationWorkflow.objects.filter(batch=batch).count(),
+        "creation_actions": CreationAction.objects.filter(workflow__batch=batch).count(),
+        "workflows": BatchTransferWorkflow.objects.filter(batch=batch).count(),
+        "actions": TransferAction.objects.filter(workflow__batch=batch).count(),
+        "feeding": FeedingEvent.objects.filter(batch=batch).count(),
+        "feed_purchases": FeedPurchase.objects.filter(pk__in=purchase_ids).count(),
+        "feed_stock": FeedContainerStock.objects.filter(pk__in=stock_ids).count(),
+        "mortality": MortalityEvent.objects.filter(batch=batch).count(),
+        "treatments": Treatment.objects.filter(batch=batch).count(),
+        "lice": LiceCount.objects.filter(batch=batch).count(),
+        "journal": JournalEntry.objects.filter(batch=batch).count(),
+        "environmental": EnvironmentalReading.objects.filter(batch=batch).count(),
+    }
+
+
+def print_telemetry(path: Path) -> None:
+    """Summarise migration_orchestrator.py telemetry (JSONL) per script."""
+    totals: dict[str, dict[str, float]] = {}
+    with path.open("r", encoding="utf-8") as handle:
+        for line in handle:
+            line = line.strip()
+            if not line:
+                continue
+            record = json.loads(line)
+            if record.get("status") != "ok":
+                continue
+            bucket = totals.setdefault(
+                record["script"], {"runs": 0, "rows": 0, "seconds": 0.0}
+            )
+            bucket["runs"] += 1
+            bucket["rows"] += int(record.get("rows") or 0)
+            bucket["seconds"] += float(record.get("duration_seconds") or 0.0)
+
+    print(f"\n[Orchestrator throughput] ({path})")
+    if not totals:
+        print("No completed steps recorded.")
+        return
+    header = ("script", "runs", "rows", "seconds", "rows_per_second")
+    print(" | ".join(header))
+    print(" | ".join(["-" * len(col) for col in header]))
+    for script, bucket in sorted(totals.items(), key=lambda item: item[1]["seconds"], reverse=True):
+        rate = bucket["rows"] / bucket["seconds"] if bucket["seconds"] else 0.0
+        print(
+            f"{script} | {int(bucket['runs'])} | {int(bucket['rows'])} | "
+            f"{bucket['seconds']:.1f} | {rate:.1f}"
+        )
+
+
 def build_parser() -> argparse.ArgumentParser:
     parser = argparse.ArgumentParser(description="Report migration table counts and per-batch rollups")
     parser.add_argument(
@@ -54,6 +142,10 @@ def build_parser() -> argparse.ArgumentParser:
         default=[],
         help="Specific batch numbers to include (repeatable)",
     )
+    parser.add_argument(
+        "--telemetry",
+        help="migration_orchestrator.py telemetry JSONL to summarise (rows and throughput per script)",
+    )
     return parser
 
 
@@ -99,64 +191,21 @@ def main() -> int:
 
     print_counts("Core table counts", core_counts)
 
+    if args.telemetry:
+        print_telemetry(Path(args.telemetry))
+
     print("\n[Per-batch counts]")
     if not batch_qs.exists():
         print("No batches matched the filter.")
         return 0
 
-    header = (
-        "batch_number",
-        "assignments",
-        "creation_workflows",
-        "creation_actions",
-        "workflows",
-        "actions",
-        "feeding",
-        "feed_purchases",
-        "feed_stock",
-        "mortality",
-        "treatments",
-        "lice",
-        "journal",
-        "environmental",
-    )
+    header = ("batch_number", *BATCH_COUNT_COLUMNS)
     print(" | ".join(header))
     print(" | ".join(["-" * len(col) for col in header]))
 
     for batch in batch_qs:
-        batch_map = ExternalIdMap.objects.filter(
-            source_system="FishTalk",
-            source_model="PopulationComponent",
-            target_object_id=batch.pk,
-        ).first()
-        component_key = batch_map.source_identifier if batch_map else None
-        purchase_ids = ExternalIdMap.objects.filter(
-            source_system="FishTalk",
-            source_model="FeedReceptionBatches",
-            metadata__component_key=component_key,
-        ).values_list("target_object_id", flat=True)
-        stock_ids = ExternalIdMap.objects.filter(
-            source_system="FishTalk",
-            source_model="FeedContainerStock",
-            metadata__component_key=component_key,
-        ).values_list("target_object_id", flat=True)
-
-        row = (
-            batch.batch_number,
-            BatchContainerAssignment.objects.filter(batch=batch).count(),
-            BatchCreationWorkflow.objects.filter(batch=batch).count(),
-            CreationAction.objects.filter(workflow__batch=batch).count(),
-            BatchTransferWorkflow.objects.filter(batch=batch).count(),
-            TransferAction.objects.filter(workflow__batch=batch).count(),
-            FeedingEvent.objects.filter(batch=batch).count(),
-            FeedPurchase.objects.filter(pk__in=purchase_ids).count(),
-            FeedContainerStock.objects.filter(pk__in=stock_ids).count(),
-            MortalityEvent.objects.filter(batch=batch).count(),
-            Treatment.objects.filter(batch=batch).count(),
-            LiceCount.objects.filter(batch=batch).count(),
-            JournalEntry.objects.filter(batch=batch).count(),
-            EnvironmentalReading.objects.filter(batch=batch).count(),
-        )
+        counts = collect_batch_counts(batch)
+        row = (batch.batch_number, *(counts[column] for column in BATCH_COUNT_COLUMNS))
         print(" | ".join(str(value) for value in row))
 
     missing_creation = list(
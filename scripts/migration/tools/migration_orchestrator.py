@@ -0,0 +1,542 @@
+#!/usr/bin/env python3
+# flake8: noqa
+"""Run pilot component migrations for many components as one dependency DAG.
+
+Each (component, script) pair is a step. Steps depend on earlier steps of the
+same component (assignments -> transfers -> data kinds -> feed inventory) and,
+when the manifest says so, on every step of another component (for example a
+sea continuation that merges into an already migrated FW batch). Ready steps
+from independent components run concurrently; every step is its own Python
+subprocess, so each worker holds its own database connection.
+
+Scripts that write shared master data (infrastructure, feed) are guarded by a
+named resource so at most one step holding that resource runs at a time.
+
+Progress is checkpointed per step in <output-dir>/checkpoint.json, so a rerun
+skips completed steps and resumes from the first failure. Per-step telemetry
+(duration, rows the step added, rows/second) is appended to
+<output-dir>/telemetry.jsonl; summarise it with
+`migration_counts_report.py --telemetry <path>`. With --dry-run the checkpoint
+is read but neither it nor the telemetry is written, so a later real run
+still executes every step.
+
+Components come from prepared report directories (population_members.csv as
+written by pilot_migrate_input_batch.py) or from a manifest CSV with columns:
+    component_key, report_dir[, batch_number][, depends_on]
+where depends_on is a '|' separated list of component keys.
+
+Usage:
+    python migration_orchestrator.py --report-root scripts/migration/output/input_batch_migration \
+        --use-csv scripts/migration/data/extract --workers 8
+    python migration_orchestrator.py --manifest components.csv --use-csv ... --plan
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import sys
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from pathlib import Path
+
+PROJECT_ROOT = Path(__file__).resolve().parents[3]
+if str(PROJECT_ROOT) not in sys.path:
+    sys.path.insert(0, str(PROJECT_ROOT))
+
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "aquamind.settings")
+os.environ.setdefault("SKIP_CELERY_SIGNALS", "1")
+
+from scripts.migration.tools.pilot_migrate_input_batch import (
+    PIPELINE_CORE_SCRIPT_ORDER,
+    PIPELINE_PARALLEL_SCRIPT_ORDER,
+    PIPELINE_SCRIPT_LABELS,
+    PIPELINE_TAIL_SCRIPT_ORDER,
+    build_parallel_env,
+    run_migration_script,
+)
+from scripts.migration.tools.migration_counts_report import collect_batch_counts
+from scripts.migration.tools.migration_profiles import MIGRATION_PROFILE_NAMES
+
+from django.db import connection
+
+from apps.batch.models import Batch
+from apps.migration_support.models import ExternalIdMap
+
+
+ORCHESTRATOR_OUTPUT_DIR = PROJECT_ROOT / "scripts" / "migration" / "output" / "orchestrator"
+
+# Intra-component dependencies. Post-transfer data kinds only need assignments
+# and transfer workflows; feed inventory reconciles stock against feeding.
+SCRIPT_DEPENDENCIES: dict[str, tuple[str, ...]] = {
+    "pilot_migrate_component.py": (),
+    "pilot_migrate_component_transfers.py": ("pilot_migrate_component.py",),
+    **{
+        script_name: ("pilot_migrate_component_transfers.py",)
+        for script_name in PIPELINE_PARALLEL_SCRIPT_ORDER
+    },
+    "pilot_migrate_component_feed_inventory.py": ("pilot_migrate_component_feeding.py",),
+}
+
+# Steps that get_or_create shared master data must not overlap across components.
+SCRIPT_RESOURCES: dict[str, str] = {
+    "pilot_migrate_component.py": "infrastructure",
+    "pilot_migrate_component_feeding.py": "feed_master",
+    "pilot_migrate_component_feed_inventory.py": "feed_master",
+}
+
+# Batch count column (migration_counts_report.BATCH_COUNT_COLUMNS) each step fills.
+SCRIPT_ROW_COLUMNS: dict[str, tuple[str, ...]] = {
+    "pilot_migrate_component.py": ("assignments", "creation_workflows", "creation_actions"),
+    "pilot_migrate_component_transfers.py": ("workflows", "actions"),
+    "pilot_migrate_component_feeding.py": ("feeding",),
+    "pilot_migrate_component_mortality.py": ("mortality",),
+    "pilot_migrate_component_treatments.py": ("treatments",),
+    "pilot_migrate_component_lice.py": ("lice",),
+    "pilot_migrate_component_health_journal.py": ("journal",),
+    "pilot_migrate_component_environmental.py": ("environmental",),
+    "pilot_migrate_component_feed_inventory.py": ("feed_purchases", "feed_stock"),
+}
+
+PIPELINE_SCRIPTS = PIPELINE_CORE_SCRIPT_ORDER + PIPELINE_PARALLEL_SCRIPT_ORDER + PIPELINE_TAIL_SCRIPT_ORDER
+
+
+@dataclass
+class ComponentSpec:
+    component_key: str
+    report_dir: Path
+    batch_number: str | None = None
+    depends_on: list[str] = field(default_factory=list)
+
+
+@dataclass
+class Step:
+    component: ComponentSpec
+    script_name: str
+    depends_on: set[str] = field(default_factory=set)
+
+    @property
+    def step_id(self) -> str:
+        return step_id(self.component.component_key, self.script_name)
+
+    @property
+    def resource(self) -> str | None:
+        return SCRIPT_RESOURCES.get(self.script_name)
+
+
+def step_id(component_key: str, script_name: str) -> str:
+    return f"{component_key}::{script_name}"
+
+
+def utc_now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="seconds")
+
+
+def read_component_key(report_dir: Path) -> str | None:
+    members_path = report_dir / "population_members.csv"
+    if not members_path.exists():
+        return None
+    with members_path.open("r", encoding="utf-8", newline="") as handle:
+        for row in csv.DictReader(handle):
+            return (row.get("component_key") or "").strip() or None
+    return None
+
+
+def discover_components(report_root: Path) -> list[ComponentSpec]:
+    components: list[ComponentSpec] = []
+    for members_path in sorted(report_root.glob("*/population_members.csv")):
+        component_key = read_component_key(members_path.parent)
+        if component_key:
+            components.append(ComponentSpec(component_key=component_key, report_dir=members_path.parent))
+    return components
+
+
+def load_manifest(manifest_path: Path) -> list[ComponentSpec]:
+    components: list[ComponentSpec] = []
+    with manifest_path.open("r", encoding="utf-8", newline="") as handle:
+        for row in csv.DictReader(handle):
+            report_dir = Path((row.get("report_dir") or "").strip())
+            component_key = (row.get("component_key") or "").strip() or read_component_key(report_dir)
+            if not component_key:
+                raise ValueError(f"Manifest row has no component_key and no population_members.csv: {row}")
+            depends_on = [
+                value.strip()
+                for value in (row.get("depends_on") or "").split("|")
+                if value.strip()
+            ]
+            components.append(
+                ComponentSpec(
+                    component_key=component_key,
+                    report_dir=report_dir,
+                    batch_number=(row.get("batch_number") or "").strip() or None,
+                    depends_on=depends_on,
+                )
+            )
+    return components
+
+
+def build_steps(components: list[ComponentSpec], scripts: list[str]) -> dict[str, Step]:
+    """Expand components into steps and wire intra- and inter-component edges."""
+    known = {component.component_key for component in components}
+    steps: dict[str, Step] = {}
+
+    for component in components:
+        missing = [key for key in component.depends_on if key not in known]
+        if missing:
+            raise ValueError(
+                f"Component {component.component_key} depends on unknown components: {', '.join(missing)}"
+            )
+        for script_name in scripts:
+            step = Step(component=component, script_name=script_name)
+            for dependency in SCRIPT_DEPENDENCIES.get(script_name, ()):
+                if dependency in scripts:
+                    step.depends_on.add(step_id(component.component_key, dependency))
+            if not SCRIPT_DEPENDENCIES.get(script_name):
+                for upstream_key in component.depends_on:
+                    step.depends_on.update(step_id(upstream_key, name) for name in scripts)
+            steps[step.step_id] = step
+
+    check_acyclic(steps)
+    return steps
+
+
+def check_acyclic(steps: dict[str, Step]) -> None:
+    indegree = {sid: len(step.depends_on) for sid, step in steps.items()}
+    dependents: dict[str, list[str]] = {sid: [] for sid in steps}
+    for sid, step in steps.items():
+        for dependency in step.depends_on:
+            dependents[dependency].append(sid)
+    ready = [sid for sid, degree in indegree.items() if degree == 0]
+    visited = 0
+    while ready:
+        sid = ready.pop()
+        visited += 1
+        for dependent in dependents[sid]:
+            indegree[dependent] -= 1
+            if indegree[dependent] == 0:
+                ready.append(dependent)
+    if visited != len(steps):
+        raise ValueError("Component dependencies contain a cycle")
+
+
+class Checkpoint:
+    """Per-step status persisted after every transition (atomic rename).
+
+    With persist=False (dry runs) transitions are kept in memory only.
+    """
+
+    def __init__(self, path: Path, *, persist: bool = True):
+        self.path = path
+        self.persist = persist
+        self._lock = threading.Lock()
+        self.steps: dict[str, dict] = {}
+        if path.exists():
+            self.steps = json.loads(path.read_text(encoding="utf-8")).get("steps", {})
+
+    def is_done(self, sid: str) -> bool:
+        return self.steps.get(sid, {}).get("status") == "ok"
+
+    def record(self, sid: str, **values) -> None:
+        with self._lock:
+            self.steps[sid] = {**values, "updated_at": utc_now()}
+            if not self.persist:
+                return
+            tmp_path = self.path.with_suffix(".json.tmp")
+            tmp_path.write_text(json.dumps({"steps": self.steps}, indent=2, sort_keys=True), encoding="utf-8")
+            tmp_path.replace(self.path)
+
+
+def resolve_batch(component_key: str) -> Batch | None:
+    batch_map = ExternalIdMap.objects.filter(
+        source_system="FishTalk",
+        source_model="PopulationComponent",
+        source_identifier=component_key,
+    ).first()
+    if batch_map is None:
+        return None
+    return Batch.objects.filter(pk=batch_map.target_object_id).first()
+
+
+def count_step_rows(step: Step) -> int | None:
+    """Rows in the step's tables for the component's batch (None if unknown).
+
+    The counts cover the whole batch, which another component may share (a
+    sea continuation merged into its FW batch) and which a rerun may already
+    have filled; compare the counts taken before and after the step.
+    """
+    columns = SCRIPT_ROW_COLUMNS.get(step.script_name)
+    if not columns:
+        return None
+    batch = resolve_batch(step.component.component_key)
+    if batch is None:
+        return None
+    counts = collect_batch_counts(batch, component_key=step.component.component_key)
+    return sum(counts[column] for column in columns)
+
+
+def rows_added(before: int | None, after: int | None) -> int | None:
+    """Rows a step added, given count_step_rows() before and after it ran."""
+    if after is None:
+        return None
+    return max(after - (before or 0), 0)
+
+
+def print_plan(steps: dict[str, Step], checkpoint: Checkpoint) -> None:
+    print(f"\nPlanned steps: {len(steps)}")
+    for sid, step in steps.items():
+        state = "done" if checkpoint.is_done(sid) else "pending"
+        resource = f" [resource={step.resource}]" if step.resource else ""
+        print(f"  - {sid} ({state}){resource}")
+        for dependency in sorted(step.depends_on):
+            print(f"      after {dependency}")
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        description="Run pilot component migrations across many components as a dependency DAG"
+    )
+    source = parser.add_mutually_exclusive_group(required=True)
+    source.add_argument(
+        "--report-root",
+        help="Directory whose subdirectories contain population_members.csv (one component each)",
+    )
+    source.add_argument(
+        "--manifest",
+        help="CSV with component_key, report_dir[, batch_number][, depends_on]",
+    )
+    parser.add_argument("--use-csv", help="CSV extract directory passed to every script")
+    parser.add_argument("--use-sqlite", help="SQLite index passed to the environmental script")
+    parser.add_argument(
+        "--migration-profile",
+        choices=MIGRATION_PROFILE_NAMES,
+        default="fw_default",
+        help="Migration profile passed to pilot_migrate_component.py (default: fw_default)",
+    )
+    parser.add_argument(
+        "--transfer-edge-scope",
+        choices=["source-in-scope", "internal-only"],
+        default="source-in-scope",
+        help="Transfer edge scope passed to the transfers script (default: source-in-scope)",
+    )
+    parser.add_argument("--skip-environmental", action="store_true", help="Skip environmental steps")
+    parser.add_argument("--skip-feed-inventory", action="store_true", help="Skip feed inventory steps")
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=4,
+        help="Concurrent script subprocesses (default: 4)",
+    )
+    parser.add_argument(
+        "--blas-threads",
+        type=int,
+        default=1,
+        help="BLAS/vecLib thread cap per subprocess when --workers > 1 (default: 1)",
+    )
+    parser.add_argument(
+        "--script-timeout-seconds",
+        type=int,
+        default=900,
+        help="Timeout per script subprocess (default: 900)",
+    )
+    parser.add_argument(
+        "--output-dir",
+        default=str(ORCHESTRATOR_OUTPUT_DIR),
+        help="Checkpoint and telemetry directory (default: scripts/migration/output/orchestrator)",
+    )
+    parser.add_argument(
+        "--restart",
+        action="store_true",
+        help="Ignore the existing checkpoint and rerun every step",
+    )
+    parser.add_argument("--plan", action="store_true", help="Print the step DAG and exit")
+    parser.add_argument("--dry-run", action="store_true", help="Pass --dry-run to every script")
+    return parser
+
+
+def main() -> int:
+    args = build_parser().parse_args()
+
+    if args.workers < 1:
+        print("Error: --workers must be >= 1")
+        return 1
+
+    if args.report_root:
+        components = discover_components(Path(args.report_root))
+    else:
+        components = load_manifest(Path(args.manifest))
+    if not components:
+        print("[ERROR] No components found")
+        return 1
+
+    scripts = [
+        script_name
+        for script_name in PIPELINE_SCRIPTS
+        if not (args.skip_environmental and script_name == "pilot_migrate_component_environmental.py")
+        and not (args.skip_feed_inventory and script_name == "pilot_migrate_component_feed_inventory.py")
+    ]
+    try:
+        steps = build_steps(components, scripts)
+    except ValueError as exc:
+        print(f"[ERROR] {exc}")
+        return 1
+
+    output_dir = Path(args.output_dir)
+    output_dir.mkdir(parents=True, exist_ok=True)
+    checkpoint_path = output_dir / "checkpoint.json"
+    if args.restart and checkpoint_path.exists() and not args.dry_run:
+        checkpoint_path.unlink()
+    checkpoint = Checkpoint(checkpoint_path, persist=not args.dry_run)
+    if args.restart and args.dry_run:
+        checkpoint.steps = {}
+    telemetry_path = output_dir / "telemetry.jsonl"
+    telemetry_lock = threading.Lock()
+
+    print("\n" + "=" * 70)
+    print("MIGRATION ORCHESTRATOR")
+    print("=" * 70)
+    print(f"Components: {len(components)}")
+    print(f"Steps: {len(steps)} ({sum(1 for sid in steps if checkpoint.is_done(sid))} already done)")
+    print(f"Workers: {args.workers}")
+    print(f"Checkpoint: {checkpoint_path}{' (dry run: read only)' if args.dry_run else ''}")
+
+    if args.plan:
+        print_plan(steps, checkpoint)
+        return 0
+
+    parallel_env = build_parallel_env(args.workers, args.blas_threads)
+
+    def count_rows(step: Step) -> int | None:
+        try:
+            return count_step_rows(step)
+        except Exception as exc:
+            print(f"  [WARN] Row count failed for {step.step_id}: {exc}")
+            return None
+
+    def run_step(step: Step) -> dict:
+        try:
+            return execute_step(step)
+        finally:
+            # Pool threads each open their own database connection
+            connection.close()
+
+    def execute_step(step: Step) -> dict:
+        rows_before = None if args.dry_run else count_rows(step)
+        result = run_migration_script(
+            step.script_name,
+            step.component.component_key,
+            step.component.report_dir,
+            use_csv=args.use_csv,
+            use_sqlite=args.use_sqlite,
+            dry_run=args.dry_run,
+            batch_number=step.component.batch_number,
+            migration_profile=args.migration_profile,
+            skip_synthetic_stage_transitions=True,
+            transfer_edge_scope=args.transfer_edge_scope,
+            timeout_seconds=args.script_timeout_seconds,
+            extra_env=parallel_env,
+            announce=False,
+        )
+        rows = None
+        if result.success and not args.dry_run:
+            rows = rows_added(rows_before, count_rows(step))
+        return {
+            "status": "ok" if result.success else "failed",
+            "duration_seconds": round(result.duration_seconds, 3),
+            "rows": rows,
+        }
+
+    pending = {sid: step for sid, step in steps.items() if not checkpoint.is_done(sid)}
+    done = {sid for sid in steps if checkpoint.is_done(sid)}
+    failed: set[str] = set()
+    blocked: set[str] = set()
+    held_resources: set[str] = set()
+    started = time.perf_counter()
+
+    with ThreadPoolExecutor(max_workers=args.workers) as executor:
+        running: dict = {}
+        while pending or running:
+            for sid, step in list(pending.items()):
+                if len(running) >= args.workers:
+                    break
+                if step.depends_on & (failed | blocked):
+                    blocked.add(sid)
+                    del pending[sid]
+                    checkpoint.record(sid, status="blocked")
+                    continue
+                if not step.depends_on <= done:
+                    continue
+                if step.resource and step.resource in held_resources:
+                    continue
+                if step.resource:
+                    held_resources.add(step.resource)
+                label = PIPELINE_SCRIPT_LABELS.get(step.script_name, step.script_name)
+                print(f"  - start {step.component.component_key}: {label}")
+                running[executor.submit(run_step, step)] = step
+                del pending[sid]
+
+            if not running:
+                # Nothing runnable: any remaining steps sit downstream of a
+                # failure and are marked blocked on the next scan.
+                if pending:
+                    continue
+                break
+
+            finished, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in finished:
+                step = running.pop(future)
+                if step.resource:
+                    held_resources.discard(step.resource)
+                try:
+                    outcome = future.result()
+                except Exception as exc:
+                    print(f"  [ERROR] {step.step_id} crashed: {exc}")
+                    outcome = {"status": "failed", "duration_seconds": 0.0, "rows": None}
+
+                checkpoint.record(step.step_id, **outcome)
+                rows = outcome["rows"]
+                duration = outcome["duration_seconds"]
+                record = {
+                    "finished_at": utc_now(),
+                    "component_key": step.component.component_key,
+                    "script": step.script_name,
+                    **outcome,
+                    "rows_per_second": round(rows / duration, 2) if rows and duration else None,
+                }
+                if not args.dry_run:
+                    with telemetry_lock, telemetry_path.open("a", encoding="utf-8") as handle:
+                        handle.write(json.dumps(record) + "\n")
+
+                if outcome["status"] == "ok":
+                    done.add(step.step_id)
+                    rows_text = f", {rows} rows" if rows is not None else ""
+                    print(f"  [OK] {step.step_id} ({duration:.1f}s{rows_text})")
+                else:
+                    failed.add(step.step_id)
+                    print(f"  [ERROR] {step.step_id} ({duration:.1f}s)")
+
+    elapsed = time.perf_counter() - started
+    print("\n" + "=" * 70)
+    print("ORCHESTRATOR SUMMARY")
+    print("=" * 70)
+    print(f"Steps completed: {len(done)}/{len(steps)}")
+    print(f"Wall time: {elapsed:.1f}s")
+    if not args.dry_run:
+        print(f"Telemetry: {telemetry_path}")
+    if failed or blocked:
+        print(f"Failed: {len(failed)}  Blocked by failures: {len(blocked)}")
+        for sid in sorted(failed):
+            print(f"  - {sid}")
+        print("Rerun the same command to resume from the checkpoint.")
+        return 1
+
+    print("[SUCCESS] All components migrated.")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
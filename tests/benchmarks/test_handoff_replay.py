@@ -0,0 +1,78 @@
+"""
+Tests for the dynamic FW→Sea handoff replay tool.
+
+Covers the seeded workload plan, error classification and a single-worker
+replay through the real start/complete handoff paths.
+"""
+from django.core.exceptions import ValidationError
+from django.db import OperationalError, transaction
+from django.test import TestCase
+
+from apps.batch.models import BatchContainerAssignment, BatchTransferWorkflow, TransferAction
+from aquamind.benchmarks.dataset import _skip_recompute_signals
+from aquamind.benchmarks.handoff_replay import (
+    build_handoff_fixtures,
+    classify_error,
+    replay_handoffs,
+)
+
+
+class _PgError(Exception):
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+class ClassifyErrorTest(TestCase):
+
+    def test_outcomes(self):
+        deadlock = OperationalError("deadlock detected")
+        deadlock.__cause__ = _PgError('40P01')
+        lock_not_available = OperationalError("could not obtain lock")
+        lock_not_available.__cause__ = _PgError('55P03')
+
+        self.assertEqual(classify_error(ValidationError("no fish")), 'rejected')
+        self.assertEqual(classify_error(deadlock), 'deadlock')
+        self.assertEqual(classify_error(lock_not_available), 'lock_timeout')
+        self.assertEqual(classify_error(OperationalError("database is locked")), 'lock_timeout')
+        self.assertEqual(classify_error(RuntimeError("boom")), 'error')
+
+
+class HandoffReplayTest(TestCase):
+
+    def test_plan_moves_every_fish_and_is_seeded(self):
+        with transaction.atomic():
+            first_run = build_handoff_fixtures(workflows=3, loads=2, rings=2, seed=7)
+            transaction.set_rollback(True)
+
+        plans = build_handoff_fixtures(workflows=3, loads=2, rings=2, seed=7)
+
+        self.assertEqual([plan.loads for plan in plans], [plan.loads for plan in first_run])
+        for plan in plans:
+            source = BatchContainerAssignment.objects.get(pk=plan.source_assignment_id)
+            moved = sum(load.count + load.mortality for load in plan.loads)
+            self.assertEqual(moved, source.population_count)
+        # Rings 0 and 1 serve workflows 0/2 and 1: only ring 0 is shared
+        self.assertEqual([plan.shared_ring for plan in plans], [True, False, True])
+
+    def test_single_worker_replay_completes_every_handoff(self):
+        plans = build_handoff_fixtures(workflows=2, loads=2, seed=42)
+
+        with _skip_recompute_signals():
+            report = replay_handoffs(plans, concurrency=1)
+
+        self.assertEqual(report['errors'], [])
+        self.assertEqual((report['workflows_completed'], report['handoffs_completed']), (2, 8))
+        self.assertEqual(report['steps']['context']['ok'], 8)
+        self.assertEqual(report['steps']['complete_workflow']['ok'], 2)
+        self.assertGreater(report['steps']['start_station_to_vessel']['p95_ms'], 0)
+        self.assertEqual(report['deadlocks'], 0)
+        self.assertEqual(
+            set(BatchTransferWorkflow.objects.values_list('status', flat=True)), {'COMPLETED'}
+        )
+        self.assertEqual(TransferAction.objects.filter(status='COMPLETED').count(), 8)
+        for plan in plans:
+            ring_fish = BatchContainerAssignment.objects.get(
+                container_id=plan.ring_container_id, is_active=True
+            ).population_count
+            self.assertEqual(ring_fish, sum(load.count for load in plan.loads))
@@ -0,0 +1,126 @@
+"""
+Tests for the hot path benchmark harness.
+
+Covers baseline comparison thresholds, baseline files, rolled-back
+measurement, and a small end-to-end run over the seeded dataset.
+"""
+import tempfile
+from pathlib import Path
+
+from django.core.cache import cache
+from django.test import TestCase
+
+from apps.batch.models import ActualDailyAssignmentState, Batch
+from apps.infrastructure.models import Geography
+from aquamind.benchmarks import harness
+from aquamind.benchmarks.dataset import BenchmarkDataset, seed_dataset
+from aquamind.benchmarks.hot_paths import HotPath
+
+
+class CompareTest(TestCase):
+
+    baseline = {'batch_list': {'queries': 20, 'wall_ms': 100.0, 'peak_kb': 1000.0}}
+
+    def test_within_thresholds_passes(self):
+        results = {'batch_list': {'queries': 22, 'wall_ms': 149.0, 'peak_kb': 1200.0}}
+        self.assertEqual(harness.compare(results, self.baseline), [])
+
+    def test_each_metric_regresses_beyond_its_threshold(self):
+        results = {'batch_list': {'queries': 23, 'wall_ms': 151.0, 'peak_kb': 1300.0}}
+
+        regressions = harness.compare(results, self.baseline)
+
+        self.assertEqual([r.metric for r in regressions], ['queries', 'wall_ms', 'peak_kb'])
+        self.assertEqual(regressions[0].limit, 22.0)
+
+    def test_absolute_slack_and_metric_selection(self):
+        baseline = {'batch_list': {'queries': 3, 'wall_ms': 2.0, 'peak_kb': 10.0}}
+        results = {'batch_list': {'queries': 5, 'wall_ms': 50.0, 'peak_kb': 70.0}}
+
+        self.assertEqual(harness.compare(results, baseline, metrics=['queries', 'peak_kb']), [])
+        self.assertEqual(
+            [r.metric for r in harness.compare(results, baseline)], ['wall_ms']
+        )
+
+    def test_unknown_hot_paths_are_skipped(self):
+        results = {'new_endpoint': {'queries': 500, 'wall_ms': 1.0, 'peak_kb': 1.0}}
+        self.assertEqual(harness.compare(results, self.baseline), [])
+
+
+class BaselineFileTest(TestCase):
+
+    def _dataset(self, days=180):
+        return BenchmarkDataset(
+            batches=1, days=days, seed=42, user_id=1, geography_id=1, batch_ids=[1],
+            assignment_id=1, scenario_id=1, start_date=None, end_date=None,
+        )
+
+    def test_write_merges_results_for_the_same_dataset(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = Path(directory) / 'sqlite.json'
+            harness.write_baseline(path, self._dataset(), {'a': {'queries': 1}})
+            harness.write_baseline(path, self._dataset(), {'b': {'queries': 2}})
+            self.assertEqual(
+                harness.load_baseline(path)['results'], {'a': {'queries': 1}, 'b': {'queries': 2}}
+            )
+
+            harness.write_baseline(path, self._dataset(days=30), {'b': {'queries': 3}})
+            self.assertEqual(harness.load_baseline(path), {
+                'dataset': {'batches': 1, 'days': 30, 'seed': 42},
+                'results': {'b': {'queries': 3}},
+            })
+
+    def test_committed_baselines_cover_every_hot_path(self):
+        names = {path.name for path in harness.HOT_PATHS}
+        for baseline_file in harness.BASELINE_DIR.glob('*.json'):
+            with self.subTest(baseline=baseline_file.name):
+                self.assertEqual(set(harness.load_baseline(baseline_file)['results']), names)
+
+    def test_select_hot_paths_rejects_unknown_names(self):
+        self.assertEqual([p.name for p in harness.select_hot_paths(['batch_list'])], ['batch_list'])
+        with self.assertRaises(KeyError):
+            harness.select_hot_paths(['no_such_path'])
+
+
+class MeasureTest(TestCase):
+
+    def test_runs_are_rolled_back_and_counted(self):
+        def build(dataset):
+            return lambda: [
+                Geography.objects.create(name=f"Bench {Geography.objects.count()}"),
+                list(Geography.objects.all()),
+            ]
+
+        metrics = harness.measure(HotPath('writes', 'engine', build), dataset=None, repeat=2)
+
+        # count, insert plus its history row, select
+        self.assertEqual(metrics['queries'], 4)
+        self.assertGreater(metrics['peak_kb'], 0)
+        self.assertFalse(Geography.objects.filter(name__startswith='Bench').exists())
+
+
+class SeededSuiteTest(TestCase):
+    """A short simulation exercises the dataset seeding and every hot path."""
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.dataset = seed_dataset(batches=1, days=20, seed=7)
+
+    def setUp(self):
+        cache.clear()
+
+    def test_dataset_is_seeded_from_the_event_engine(self):
+        batch = Batch.objects.get(pk=self.dataset.batch_ids[0])
+        self.assertEqual(batch.batch_number, 'BENCH-001')
+        self.assertTrue(batch.feeding_events.exists() or batch.mortality_events.exists())
+        self.assertTrue(
+            ActualDailyAssignmentState.objects.filter(assignment_id=self.dataset.assignment_id).exists()
+        )
+
+    def test_every_hot_path_runs(self):
+        results = harness.run_suite(self.dataset, repeat=1)
+
+        self.assertEqual(set(results), {path.name for path in harness.HOT_PATHS})
+        for name, metrics in results.items():
+            with self.subTest(hot_path=name):
+                self.assertGreater(metrics['queries'], 0)
@@ -0,0 +1,172 @@
+"""
+Tests for the compiled RBAC access scope.
+
+Covers scope caching and invalidation, EXISTS-based geography/location
+filters (no duplicate rows without DISTINCT), and the benchmark command.
+"""
+
+from datetime import date
+from io import StringIO
+from unittest import mock
+
+from django.contrib.auth import get_user_model
+from django.core.cache import cache
+from django.core.management import call_command
+from django.test import RequestFactory, TestCase
+from rest_framework.test import APIClient
+
+from aquamind.api.rbac_scope import geography_q, get_access_scope, location_q
+from apps.batch.models import Batch, BatchContainerAssignment, LifeCycleStage, Species
+from apps.infrastructure.models import (
+    Area,
+    Container,
+    ContainerType,
+    FreshwaterStation,
+    Geography as GeographyModel,
+    Hall,
+)
+from apps.users.models import Geography, Role, Subsidiary
+
+User = get_user_model()
+
+BATCH_GEOGRAPHY_PATHS = [
+    'batch_assignments__container__area__geography',
+    'batch_assignments__container__hall__freshwater_station__geography',
+]
+
+
+class CompiledAccessScopeTest(TestCase):
+    """Scope resolution, caching and semi-join filters."""
+
+    def setUp(self):
+        cache.clear()
+        self.geo = GeographyModel.objects.create(name='Scotland', description='Scotland operations')
+        self.area = Area.objects.create(
+            name='Scope Area', geography=self.geo, latitude=56.0, longitude=-4.0, max_biomass=1000000
+        )
+        self.station = FreshwaterStation.objects.create(
+            name='Scope Station', station_type='FRESHWATER', geography=self.geo,
+            latitude=56.1, longitude=-4.1,
+        )
+        self.hall = Hall.objects.create(name='Scope Hall', freshwater_station=self.station)
+        container_type = ContainerType.objects.create(name='Scope Tank', category='TANK', max_volume_m3=100)
+        self.sea_pen_a = Container.objects.create(
+            name='Pen A', container_type=container_type, area=self.area, volume_m3=100, max_biomass_kg=10000
+        )
+        self.sea_pen_b = Container.objects.create(
+            name='Pen B', container_type=container_type, area=self.area, volume_m3=100, max_biomass_kg=10000
+        )
+        self.tank = Container.objects.create(
+            name='Hall Tank', container_type=container_type, hall=self.hall, volume_m3=50, max_biomass_kg=5000
+        )
+
+        species = Species.objects.create(name='Atlantic Salmon', scientific_name='Salmo salar')
+        stage = LifeCycleStage.objects.create(name='Smolt', order=4, species=species)
+        self.sea_batch = Batch.objects.create(
+            batch_number='SCOPE-SEA', species=species, lifecycle_stage=stage,
+            status='ACTIVE', batch_type='STANDARD', start_date=date.today(),
+        )
+        self.fw_batch = Batch.objects.create(
+            batch_number='SCOPE-FW', species=species, lifecycle_stage=stage,
+            status='ACTIVE', batch_type='STANDARD', start_date=date.today(),
+        )
+        for container in (self.sea_pen_a, self.sea_pen_b):
+            BatchContainerAssignment.objects.create(
+                batch=self.sea_batch, container=container, lifecycle_stage=stage,
+                assignment_date=date.today(), population_count=500, avg_weight_g=100, biomass_kg=50,
+            )
+        BatchContainerAssignment.objects.create(
+            batch=self.fw_batch, container=self.tank, lifecycle_stage=stage,
+            assignment_date=date.today(), population_count=500, avg_weight_g=10, biomass_kg=5,
+        )
+
+        self.operator = User.objects.create_user(username='scope_operator', password='testpass123')
+        profile = self.operator.profile
+        profile.geography = Geography.SCOTLAND
+        profile.subsidiary = Subsidiary.ALL
+        profile.role = Role.OPERATOR
+        profile.save()
+
+    def _fresh_user(self):
+        return User.objects.select_related('profile').get(pk=self.operator.pk)
+
+    @mock.patch('aquamind.api.rbac_scope.default_cache_is_shared', return_value=True)
+    def test_scope_is_cached_until_profile_change_commits(self, _shared):
+        self.operator.profile.allowed_stations.add(self.station)
+        scope = get_access_scope(self._fresh_user())
+        self.assertEqual(scope.geography_id, self.geo.id)
+        self.assertEqual(scope.container_ids, frozenset({self.tank.id}))
+
+        user = self._fresh_user()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_access_scope(user), scope)
+
+        with self.captureOnCommitCallbacks() as callbacks:
+            self.operator.profile.allowed_areas.add(self.area)
+            # Not committed yet: the cached scope stays in place
+            self.assertEqual(get_access_scope(self._fresh_user()), scope)
+        for callback in callbacks:
+            callback()
+
+        scope = get_access_scope(self._fresh_user())
+        self.assertEqual(
+            scope.container_ids, frozenset({self.tank.id, self.sea_pen_a.id, self.sea_pen_b.id})
+        )
+
+    def test_scope_is_not_cached_across_requests_with_local_cache(self):
+        self.operator.profile.allowed_stations.add(self.station)
+        scope = get_access_scope(self._fresh_user())
+
+        user = self._fresh_user()
+        request = RequestFactory().get('/')
+        self.assertEqual(get_access_scope(user, request), scope)
+        with self.assertNumQueries(0):
+            get_access_scope(user, request)
+
+        # Without a shared cache the next request compiles again and sees the
+        # grant, even for the same user object and with no invalidation run.
+        self.operator.profile.allowed_areas.add(self.area)
+        next_request = RequestFactory().get('/')
+        self.assertIn(self.sea_pen_a.id, get_access_scope(user, next_request).container_ids)
+
+    def test_infrastructure_change_invalidates_scope(self):
+        self.operator.profile.allowed_areas.add(self.area)
+        self.assertNotIn(self.tank.id, get_access_scope(self._fresh_user()).container_ids)
+
+        self.tank.hall = None
+        self.tank.area = self.area
+        self.tank.save()
+
+        self.assertIn(self.tank.id, get_access_scope(self._fresh_user()).container_ids)
+
+    def test_geography_semi_join_returns_each_batch_once(self):
+        queryset = Batch.objects.filter(geography_q(Batch, BATCH_GEOGRAPHY_PATHS, self.geo.id))
+
+        self.assertIn('EXISTS', str(queryset.query))
+        self.assertNotIn('DISTINCT', str(queryset.query))
+        self.assertEqual(
+            sorted(queryset.values_list('batch_number', flat=True)), ['SCOPE-FW', 'SCOPE-SEA']
+        )
+
+    def test_location_filter_uses_resolved_container_ids(self):
+        self.operator.profile.allowed_stations.add(self.station)
+        scope = get_access_scope(self._fresh_user())
+
+        batches = Batch.objects.filter(location_q(Batch, scope))
+        assignments = BatchContainerAssignment.objects.filter(location_q(BatchContainerAssignment, scope))
+
+        self.assertEqual(list(batches), [self.fw_batch])
+        self.assertEqual(list(assignments.values_list('container_id', flat=True)), [self.tank.id])
+
+    def test_operator_list_endpoint_and_benchmark_parity(self):
+        self.operator.profile.allowed_areas.add(self.area)
+        client = APIClient()
+        client.force_authenticate(user=self.operator)
+
+        response = client.get('/api/v1/batch/batches/')
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual([row['batch_number'] for row in response.data['results']], ['SCOPE-SEA'])
+
+        out = StringIO()
+        call_command('benchmark_rbac_scope', '--username', 'scope_operator', '--repeat', '1', stdout=out)
+        self.assertEqual(out.getvalue().count('parity OK'), 3)
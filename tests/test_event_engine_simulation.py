@@ -0,0 +1,130 @@
+"""
+Tests for the event engine's in-memory simulation mode.
+
+Runs the same seeded simulation in direct mode (row-by-row saves, post_save
+signals) and in simulation mode (buffered bulk flushes followed by
+SimulationBuffer.refresh_derived) and compares the rows both leave behind,
+including the tables the skipped signals maintain.
+"""
+from collections import defaultdict
+from datetime import date, timedelta
+
+from django.db import transaction
+from django.test import TestCase
+
+from apps.batch.models import (
+    BatchContainerAssignment,
+    BatchLiveState,
+    GrowthSample,
+    MortalityEvent,
+    RecomputeMark,
+)
+from apps.batch.services.recompute_scheduler import merge_ranges
+from apps.inventory.models import (
+    BatchFeedingSummary,
+    ContainerFeedingSummary,
+    FeedConsumptionDailyRollup,
+    FeedingEvent,
+)
+from aquamind.benchmarks.dataset import (
+    GEOGRAPHY,
+    _bootstrap_infrastructure,
+    _ensure_master_data,
+    _quiet,
+    load_script,
+)
+
+DAYS = 14
+BATCH_NUMBER = 'SIM-001'
+# Assignments are identified by container and stage; their ids differ between runs
+ASSIGNMENT_KEY = ('assignment__container_id', 'assignment__lifecycle_stage_id')
+
+
+def snapshot():
+    """Rows of the simulated batch, keyed by natural keys rather than ids."""
+    batch_filter = {'batch__batch_number': BATCH_NUMBER}
+    marks = defaultdict(list)
+    for *key, start, end in RecomputeMark.objects.filter(**batch_filter).values_list(
+        *ASSIGNMENT_KEY, 'start_date', 'end_date'
+    ):
+        marks[tuple(key)].append((start, end))
+
+    return {
+        'assignments': sorted(BatchContainerAssignment.objects.filter(**batch_filter).values_list(
+            'container_id', 'lifecycle_stage_id', 'is_active', 'population_count',
+            'avg_weight_g', 'biomass_kg', 'last_weighing_date', 'departure_date',
+        )),
+        'feeding': sorted(FeedingEvent.objects.filter(**batch_filter).values_list(
+            'container_id', 'feed_id', 'feeding_date', 'feeding_time', 'amount_kg',
+            'batch_biomass_kg', 'feeding_percentage', 'feed_cost',
+        )),
+        'mortality': sorted(MortalityEvent.objects.filter(**batch_filter).values_list(
+            *ASSIGNMENT_KEY, 'event_date', 'count', 'biomass_kg', 'cause',
+        )),
+        'growth_samples': sorted(GrowthSample.objects.filter(
+            assignment__batch__batch_number=BATCH_NUMBER
+        ).values_list(
+            *ASSIGNMENT_KEY, 'sample_date', 'sample_size', 'avg_weight_g',
+            'std_deviation_weight', 'min_weight_g', 'max_weight_g', 'condition_factor',
+        )),
+        'live_state': list(BatchLiveState.objects.filter(**batch_filter).values_list(
+            'population_count', 'avg_weight_g', 'biomass_kg', 'current_lifecycle_stage_id',
+            'active_container_ids',
+        )),
+        'rollups': sorted(FeedConsumptionDailyRollup.objects.values_list(
+            'container_id', 'feed_id', 'feeding_date', 'total_kg', 'total_cost', 'events_count',
+        )),
+        'container_fcr': sorted(ContainerFeedingSummary.objects.filter(**batch_filter).values_list(
+            'container_assignment__container_id', 'period_start', 'period_end',
+            'total_feed_kg', 'growth_kg', 'fcr', 'confidence_level', 'data_points',
+        )),
+        'batch_fcr': sorted(BatchFeedingSummary.objects.filter(**batch_filter).values_list(
+            'period_start', 'period_end', 'total_feed_kg', 'weighted_avg_fcr',
+            'container_count', 'overall_confidence_level',
+        )),
+        'recompute_ranges': {key: merge_ranges(ranges) for key, ranges in marks.items()},
+    }
+
+
+class SimulationModeTest(TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        # Not in setUpTestData: Django deep-copies those attributes per test,
+        # and a module cannot be copied
+        cls.engine_core = load_script('03_event_engine_core')
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        with _quiet(False):
+            _ensure_master_data()
+            _bootstrap_infrastructure(1)
+
+    def _run(self, **mode):
+        engine = self.engine_core.EventEngine(
+            # Recent dates so the rolling 30-day FCR window covers the run
+            date.today() - timedelta(days=DAYS), 3_500_000, GEOGRAPHY, duration=DAYS,
+            station_name='FI-FW-01', batch_number=BATCH_NUMBER, seed=11, **mode,
+        )
+        # Short egg stage: the batch moves to Fry (a stage transition) and starts feeding
+        engine.stage_durations = [4] + engine.stage_durations[1:]
+        with _quiet(False):
+            self.assertEqual(engine.run(), 0)
+        return snapshot()
+
+    def test_simulation_mode_matches_direct_mode(self):
+        with transaction.atomic():
+            direct = self._run()
+            transaction.set_rollback(True)
+
+        simulated = self._run(simulate=True, flush_days=3)
+
+        self.assertTrue(direct['feeding'])
+        self.assertTrue(direct['mortality'])
+        self.assertTrue(direct['growth_samples'])
+        self.assertTrue(direct['rollups'])
+        self.assertTrue(direct['recompute_ranges'])
+        for table, rows in direct.items():
+            with self.subTest(table=table):
+                self.assertEqual(simulated[table], rows)
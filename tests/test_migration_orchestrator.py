@@ -0,0 +1,83 @@
+"""
+Tests for the pilot migration orchestrator's checkpointing.
+
+The migration scripts themselves run as subprocesses against the migration
+database, so run_migration_script is replaced by a recorder here; the
+orchestrator's scheduling and checkpoint logic run unchanged.
+"""
+import json
+import os
+import sys
+import tempfile
+from io import StringIO
+from pathlib import Path
+from unittest import mock
+
+from django.test import SimpleTestCase
+
+# The tools point Django at the migration database and turn off the Celery
+# signals on import; keep the test database and the environment other tests see
+with mock.patch('scripts.migration.safety.configure_migration_environment'), \
+        mock.patch('scripts.migration.safety.assert_default_db_is_migration_db'), \
+        mock.patch.dict(os.environ):
+    from scripts.migration.tools import migration_orchestrator as orchestrator
+    from scripts.migration.tools.pilot_migrate_input_batch import ScriptRunResult
+
+
+class MigrationOrchestratorCheckpointTest(SimpleTestCase):
+
+    def setUp(self):
+        tmp = tempfile.TemporaryDirectory()
+        self.addCleanup(tmp.cleanup)
+        self.root = Path(tmp.name)
+        report_dir = self.root / 'reports' / 'component-a'
+        report_dir.mkdir(parents=True)
+        (report_dir / 'population_members.csv').write_text('component_key\nCOMP-A\n', encoding='utf-8')
+        self.output_dir = self.root / 'orchestrator'
+        self.calls = []
+
+    def _run(self, *extra_args):
+        def run_migration_script(script_name, component_key, report_dir, **kwargs):
+            self.calls.append((script_name, kwargs['dry_run']))
+            return ScriptRunResult(
+                script_name=script_name, success=True, duration_seconds=0.01
+            )
+
+        argv = [
+            'migration_orchestrator.py',
+            '--report-root', str(self.root / 'reports'),
+            '--output-dir', str(self.output_dir),
+            '--workers', '2',
+            *extra_args,
+        ]
+        with mock.patch.object(sys, 'argv', argv), \
+                mock.patch.object(orchestrator, 'run_migration_script', run_migration_script), \
+                mock.patch.object(orchestrator, 'count_step_rows', return_value=None), \
+                mock.patch('sys.stdout', new_callable=StringIO):
+            return orchestrator.main()
+
+    def test_dry_run_does_not_mark_steps_done_for_the_real_run(self):
+        scripts = orchestrator.PIPELINE_SCRIPTS
+
+        self.assertEqual(self._run('--dry-run'), 0)
+        self.assertEqual(sorted(self.calls), sorted((name, True) for name in scripts))
+        self.assertFalse((self.output_dir / 'checkpoint.json').exists())
+        self.assertFalse((self.output_dir / 'telemetry.jsonl').exists())
+
+        self.calls.clear()
+        self.assertEqual(self._run(), 0)
+        self.assertEqual(sorted(self.calls), sorted((name, False) for name in scripts))
+        steps = json.loads((self.output_dir / 'checkpoint.json').read_text())['steps']
+        self.assertEqual(len(steps), len(scripts))
+        self.assertTrue(all(step['status'] == 'ok' for step in steps.values()))
+
+        # A rerun resumes from the checkpoint and has nothing left to do
+        self.calls.clear()
+        self.assertEqual(self._run(), 0)
+        self.assertEqual(self.calls, [])
+
+    def test_rows_added_ignores_rows_present_before_the_step(self):
+        self.assertEqual(orchestrator.rows_added(120, 150), 30)
+        self.assertEqual(orchestrator.rows_added(None, 40), 40)
+        self.assertEqual(orchestrator.rows_added(150, 150), 0)
+        self.assertIsNone(orchestrator.rows_added(10, None))
@@ -0,0 +1,186 @@
+"""
+Tests for the per-request/per-task performance instrumentation.
+
+Covers SQL fingerprinting and N+1 detection, the request middleware, the
+protected metrics endpoints, the header-triggered profiler and the Celery
+task hooks.
+"""
+from celery import shared_task
+from django.contrib.auth import get_user_model
+from django.test import Client, TestCase, override_settings
+from rest_framework.authtoken.models import Token
+
+from apps.infrastructure.models import Geography
+from aquamind.utils import performance
+
+GEOGRAPHIES_URL = '/api/v1/infrastructure/geographies/'
+
+
+def _token_client(user):
+    return Client(HTTP_AUTHORIZATION=f'Token {Token.objects.create(user=user).key}')
+
+
+@shared_task
+def _list_geographies_one_by_one():
+    for pk in Geography.objects.values_list('pk', flat=True):
+        Geography.objects.get(pk=pk)
+
+
+class FingerprintTest(TestCase):
+
+    def test_literals_and_in_lists_share_a_fingerprint(self):
+        self.assertEqual(
+            performance.fingerprint("SELECT * FROM t WHERE id = 1 AND name = 'a'"),
+            performance.fingerprint("SELECT * FROM t WHERE id = 42 AND name = 'it''s'"),
+        )
+        self.assertEqual(
+            performance.normalize_sql("SELECT * FROM t WHERE id IN (%s, %s,  %s)"),
+            "SELECT * FROM t WHERE id IN (...)",
+        )
+        self.assertNotEqual(
+            performance.fingerprint("SELECT * FROM t WHERE id = 1"),
+            performance.fingerprint("SELECT * FROM u WHERE id = 1"),
+        )
+
+    @override_settings(PERF_NPLUSONE_THRESHOLD=3)
+    def test_collect_counts_duplicates_and_flags_n_plus_one(self):
+        geographies = [Geography.objects.create(name=f"Geo {i}") for i in range(3)]
+
+        with performance.collect() as profile:
+            for geography in geographies:
+                Geography.objects.get(pk=geography.pk)
+            Geography.objects.count()
+
+        self.assertEqual(profile.queries, 4)
+        self.assertEqual(profile.duplicate_queries, 2)
+        self.assertEqual(list(profile.n_plus_one().values()), [3])
+        self.assertGreater(profile.duration, 0)
+        self.assertIsNone(performance.current_profile())
+
+
+@override_settings(PERF_METRICS_ENABLED=True)
+class RequestMetricsMiddlewareTest(TestCase):
+
+    def setUp(self):
+        performance.reset_metrics()
+        staff = get_user_model().objects.create_user('ops', password='pw', is_staff=True)
+        self.client = _token_client(staff)
+        Geography.objects.create(name='Faroe Islands')
+
+    def test_requests_are_recorded_per_view(self):
+        response = self.client.get(GEOGRAPHIES_URL)
+
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('db;dur=', response['Server-Timing'])
+        [profile] = performance.endpoint_profiles('request')
+        self.assertTrue(profile['name'].startswith('GET '))
+        self.assertEqual(profile['count'], 1)
+        self.assertGreater(profile['avg_queries'], 0)
+        self.assertEqual(profile['avg_bytes'], len(response.content))
+
+    def test_metrics_endpoint_renders_prometheus_text(self):
+        self.client.get(GEOGRAPHIES_URL)
+
+        response = self.client.get('/metrics/')
+
+        self.assertEqual(response.status_code, 200)
+        self.assertTrue(response['Content-Type'].startswith('text/plain; version=0.0.4'))
+        body = response.content.decode()
+        self.assertIn('# TYPE aquamind_http_request_duration_seconds histogram', body)
+        self.assertIn('status="2xx"', body)
+        self.assertIn('le="+Inf"', body)
+
+    @override_settings(METRICS_AUTH_TOKEN='scrape-secret')
+    def test_metrics_endpoints_are_protected(self):
+        anonymous = Client()
+        self.assertEqual(anonymous.get('/metrics/').status_code, 403)
+        self.assertEqual(anonymous.get('/metrics/', HTTP_AUTHORIZATION='Bearer wrong').status_code, 403)
+        self.assertEqual(
+            anonymous.get('/metrics/', HTTP_AUTHORIZATION='Bearer scrape-secret').status_code, 200
+        )
+
+        non_staff = _token_client(get_user_model().objects.create_user('viewer', password='pw'))
+        self.assertEqual(non_staff.get('/metrics/endpoints/').status_code, 403)
+
+        session = Client()
+        session.force_login(get_user_model().objects.get(username='ops'))
+        self.assertEqual(session.get('/metrics/endpoints/').status_code, 200)
+
+    def test_server_timing_is_staff_only_unless_public(self):
+        non_staff = _token_client(get_user_model().objects.create_user('viewer', password='pw'))
+
+        response = non_staff.get(GEOGRAPHIES_URL)
+        self.assertEqual(response.status_code, 200)
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(performance.endpoint_profiles('request')[0]['count'], 1)
+
+        with self.settings(PERF_SERVER_TIMING_PUBLIC=True):
+            self.assertIn('app;dur=', non_staff.get(GEOGRAPHIES_URL)['Server-Timing'])
+
+    @override_settings(PERF_METRICS_ENABLED=False)
+    def test_disabled_metrics_record_nothing(self):
+        response = self.client.get(GEOGRAPHIES_URL)
+
+        self.assertNotIn('Server-Timing', response)
+        self.assertEqual(performance.endpoint_profiles(), [])
+
+
+@override_settings(PERF_METRICS_ENABLED=True, PERF_PROFILER_ENABLED=True, PERF_PROFILE_TOKEN='profile-me')
+class RequestProfilerTest(TestCase):
+
+    def setUp(self):
+        performance.reset_metrics()
+        self.client = _token_client(
+            get_user_model().objects.create_user('ops', password='pw', is_staff=True)
+        )
+
+    def test_header_with_token_profiles_the_request(self):
+        response = self.client.get(GEOGRAPHIES_URL, HTTP_X_AQUAMIND_PROFILE='profile-me')
+
+        profile_id = response['X-Profile-Id']
+        report = self.client.get(f'/metrics/profiles/{profile_id}/')
+        self.assertEqual(report.status_code, 200)
+        self.assertIn('queries', report.content.decode().splitlines()[0])
+        listed = self.client.get('/metrics/endpoints/').json()['profiles']
+        self.assertEqual([entry['id'] for entry in listed], [profile_id])
+
+    def test_wrong_token_or_no_header_is_not_profiled(self):
+        self.assertNotIn('X-Profile-Id', self.client.get(GEOGRAPHIES_URL))
+        self.assertNotIn(
+            'X-Profile-Id', self.client.get(GEOGRAPHIES_URL, HTTP_X_AQUAMIND_PROFILE='nope')
+        )
+        self.assertEqual(self.client.get('/metrics/profiles/missing/').status_code, 404)
+
+    @override_settings(PERF_PROFILES_KEPT=2)
+    def test_only_recent_profiles_are_kept(self):
+        for _ in range(3):
+            self.client.get(GEOGRAPHIES_URL, HTTP_X_AQUAMIND_PROFILE='profile-me')
+        self.assertEqual(len(performance.recent_profiles()), 2)
+
+
+@override_settings(PERF_METRICS_ENABLED=True)
+class TaskHooksTest(TestCase):
+
+    def setUp(self):
+        performance.reset_metrics()
+        for i in range(5):
+            Geography.objects.create(name=f"Geo {i}")
+
+    def test_task_runs_are_recorded_with_n_plus_one(self):
+        _list_geographies_one_by_one.apply()
+
+        [profile] = performance.endpoint_profiles('task')
+        self.assertEqual(profile['name'], _list_geographies_one_by_one.name)
+        self.assertEqual(profile['n_plus_one'], 1)
+        self.assertEqual(profile['duplicate_queries'][0]['repeats'], 4)
+        body = performance.render_prometheus()
+        self.assertIn('aquamind_task_runs_total{task="', body)
+        self.assertIn('state="SUCCESS"', body)
+
+    @override_settings(PERF_PROFILER_ENABLED=True)
+    def test_profile_header_profiles_the_task(self):
+        _list_geographies_one_by_one.apply(headers={'x_profile': True})
+
+        [entry] = performance.recent_profiles()
+        self.assertEqual(entry['kind'], 'task')
+        self.assertEqual(entry['queries'], 6)